@@ -33,6 +33,7 @@ from loguru import logger
 
 from omnisense.core import OmniSense
 from omnisense.config import config
+from omnisense.storage.redis_cache import RedisCache, TieredCache
 from omnisense.utils.logger import get_logger
 
 # ==================== Configuration ====================
@@ -105,6 +106,12 @@ async def lifespan(app: FastAPI):
         decode_responses=True
     )
 
+    # Two-tier cache for hot lookups such as API keys
+    app.state.cache = TieredCache(RedisCache(
+        aioredis.from_url(os.getenv("REDIS_URL", "redis://localhost:6379"))
+    ))
+    await app.state.cache.start()
+
     # Initialize OmniSense
     app.state.omnisense = OmniSense()
 
@@ -115,6 +122,7 @@ async def lifespan(app: FastAPI):
     # Shutdown
     api_logger.info("Shutting down OmniSense API...")
     await app.state.omnisense.close()
+    await app.state.cache.close()
     await app.state.redis.close()
     api_logger.info("OmniSense API shut down")
 
@@ -335,10 +343,10 @@ async def get_current_user(
 
     # Try API Key first
     if api_key:
-        # Validate API key from Redis
-        stored_user = await request.app.state.redis.get(f"apikey:{api_key}")
+        # Validate API key, usually without a Redis round trip
+        stored_user = await request.app.state.cache.get(f"apikey:{api_key}")
         if stored_user:
-            return User(username=stored_user)
+            return User(username=str(stored_user))
 
     # Try JWT token
     if credentials:
@@ -550,10 +558,10 @@ async def create_api_key(
     api_key = secrets.token_urlsafe(32)
 
     # Store API key in Redis
-    await request.app.state.redis.set(
+    await request.app.state.cache.set(
         f"apikey:{api_key}",
         current_user.username,
-        ex=86400 * 30  # 30 days
+        ttl=86400 * 30  # 30 days
     )
 
     return APIResponse(
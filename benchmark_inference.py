@@ -0,0 +1,153 @@
+#!/usr/bin/env python
+"""
+OmniSense Inference Benchmark
+Compares CPU latency, throughput and memory of the torch and ONNX Runtime
+backends for the sentiment and embedding models
+
+Usage:
+    python benchmark_inference.py                      # compare all backends
+    python benchmark_inference.py --model embedding --batch-size 64
+    python benchmark_inference.py --backend onnx --no-quantize   # one run
+"""
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import time
+
+SAMPLE_TEXTS = [
+    "This is the best product I have bought this year, totally worth it",
+    "Terrible customer service, I waited two hours and nobody answered",
+    "这个视频讲得很清楚，学到了很多",
+    "Not sure how I feel about the new update, some things are better",
+    "物流太慢了，等了一个星期才到",
+    "lol",
+    "The camera is great but the battery barely lasts half a day, which is "
+    "disappointing for a phone at this price point",
+    "还可以吧，一般般",
+]
+
+RUNS = [
+    ("torch", False),
+    ("onnx", False),
+    ("onnx", True),
+]
+
+
+def peak_rss_mb() -> float:
+    """Peak resident memory of this process in MiB"""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_once(args) -> dict:
+    """Load the model with the configured backend and time batched inference"""
+    from omnisense.config import config
+
+    config.inference.backend = args.backend
+    config.inference.quantize = args.quantize
+    if args.threads:
+        config.inference.onnx_threads = args.threads
+        config.analysis.sentiment_threads = args.threads
+
+    texts = [f"{SAMPLE_TEXTS[i % len(SAMPLE_TEXTS)]} #{i}" for i in range(args.texts)]
+
+    start = time.perf_counter()
+    if args.model == "sentiment":
+        from omnisense.analysis.engine import SentimentAnalyzer
+
+        analyzer = SentimentAnalyzer(batch_size=args.batch_size, num_threads=args.threads)
+        infer = analyzer.analyze_batch
+    else:
+        from omnisense.matcher.embedding import EmbeddingService
+
+        service = EmbeddingService(batch_size=args.batch_size)
+        service.model  # load now, not inside the timed loop
+        infer = service.encode
+    load_time = time.perf_counter() - start
+
+    infer(texts[:args.batch_size])  # warm up
+
+    latencies = []
+    for offset in range(0, len(texts), args.batch_size):
+        batch = texts[offset:offset + args.batch_size]
+        start = time.perf_counter()
+        infer(batch)
+        latencies.append(time.perf_counter() - start)
+
+    latencies.sort()
+    return {
+        "backend": args.backend + ("-int8" if args.backend == "onnx" and args.quantize else ""),
+        "load_s": round(load_time, 2),
+        "batch_ms_p50": round(latencies[len(latencies) // 2] * 1000, 1),
+        "batch_ms_mean": round(sum(latencies) / len(latencies) * 1000, 1),
+        "texts_per_s": round(len(texts) / sum(latencies), 1),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }
+
+
+def compare(args) -> None:
+    """Run every backend in its own process so memory figures do not overlap"""
+    rows = []
+    for backend, quantize in RUNS:
+        command = [
+            sys.executable, __file__, "--json",
+            "--model", args.model,
+            "--backend", backend,
+            "--quantize" if quantize else "--no-quantize",
+            "--batch-size", str(args.batch_size),
+            "--texts", str(args.texts),
+            "--threads", str(args.threads),
+        ]
+        result = subprocess.run(command, capture_output=True, text=True)
+        if result.returncode != 0:
+            print(f"❌ {backend} failed:\n{result.stderr[-2000:]}")
+            continue
+        rows.append(json.loads(result.stdout.strip().splitlines()[-1]))
+
+    if not rows:
+        return
+
+    print("=" * 78)
+    print(f"  {args.model} model, {args.texts} texts, batch size {args.batch_size}")
+    print("=" * 78)
+    columns = list(rows[0])
+    print("  ".join(f"{name:>14}" for name in columns))
+    for row in rows:
+        print("  ".join(f"{row[name]:>14}" for name in columns))
+
+    baseline = rows[0]
+    for row in rows[1:]:
+        speedup = baseline["batch_ms_mean"] / row["batch_ms_mean"]
+        print(f"{row['backend']}: {speedup:.2f}x faster per batch than {baseline['backend']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark OmniSense inference backends")
+    parser.add_argument("--model", choices=["sentiment", "embedding"], default="sentiment")
+    parser.add_argument("--backend", choices=["torch", "onnx"],
+                        help="Benchmark one backend (default: compare all)")
+    parser.add_argument("--quantize", action=argparse.BooleanOptionalAction, default=True,
+                        help="Use int8 weights with the onnx backend")
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--texts", type=int, default=512)
+    parser.add_argument("--threads", type=int, default=0,
+                        help="CPU threads for inference (0 = library default)")
+    parser.add_argument("--json", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.backend is None:
+        compare(args)
+        return
+
+    result = run_once(args)
+    if args.json:
+        print(json.dumps(result))
+    else:
+        for name, value in result.items():
+            print(f"{name:>14}: {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,35 +3,95 @@ Analysis engine for OmniSense
 Sentiment analysis, clustering, prediction, and comparison
 """
 
-from typing import Any, Dict, List, Optional, Tuple
+import asyncio
+import os
+import pickle
+import re
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Union
 import numpy as np
 from collections import Counter
-from sklearn.cluster import KMeans
-from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.cluster import KMeans, MiniBatchKMeans
+from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS, HashingVectorizer, TfidfVectorizer
 
 from omnisense.config import config
 from omnisense.utils.logger import get_logger
+from omnisense.analysis.executor import AnalysisExecutor, get_analysis_executor, pack_texts, unpack_texts
+from omnisense.storage.columnar import is_arrow_table
+from omnisense.utils.inference_cache import InferenceCache, get_inference_cache
+from omnisense.utils.onnx_backend import OnnxModel, backend_version, load_sequence_classifier
+
+if TYPE_CHECKING:
+    import pyarrow as pa
 
 logger = get_logger(__name__)
 
+try:
+    import jieba
+    jieba.setLogLevel(60)
+    JIEBA_AVAILABLE = True
+except ImportError:
+    logger.warning("jieba not installed. Chinese topic terms will be character bigrams.")
+    JIEBA_AVAILABLE = False
+
 
 class SentimentAnalyzer:
-    """Sentiment analysis for text content"""
+    """
+    Sentiment analysis for text content
+
+    Features:
+    - Batched inference: identical texts are analyzed once, and the rest are
+      sorted by token length and padded only to the longest text of their batch
+    - Inference runs under torch.inference_mode with a configurable CPU thread count,
+      or through ONNX Runtime when config.inference.backend is "onnx"
+    - analyze_batch_async runs inference in a worker thread
+    - Predictions are kept in the shared inference cache, so only texts not
+      analyzed before reach the model
+    """
+
+    MAX_LENGTH = 512
+
+    def __init__(self, batch_size: Optional[int] = None, num_threads: Optional[int] = None,
+                 cache: Optional[InferenceCache] = None):
+        """
+        Initialize sentiment analyzer
 
-    def __init__(self):
+        Args:
+            batch_size: Texts per model call (default from config)
+            num_threads: Torch CPU threads, 0 for the torch default (default from config)
+            cache: Inference cache (default process-wide cache, if enabled)
+        """
         self.model = None
+        self.tokenizer = None
+        self.cache = cache or get_inference_cache()
+        self.batch_size = max(1, batch_size or config.analysis.sentiment_batch_size)
+        self.num_threads = config.analysis.sentiment_threads if num_threads is None else num_threads
         self._load_model()
 
     def _load_model(self):
         """Load sentiment analysis model"""
+        if config.inference.backend == 'onnx':
+            try:
+                self.model, self.tokenizer = load_sequence_classifier(config.analysis.sentiment_model)
+                logger.info("Sentiment analysis model loaded (ONNX Runtime)")
+                return
+            except Exception as e:
+                logger.warning(f"Failed to load ONNX sentiment model, using torch: {e}")
+
         try:
-            # Use a lightweight sentiment model
-            from transformers import pipeline
-            self.model = pipeline(
-                "sentiment-analysis",
-                model=config.analysis.sentiment_model,
-                device=0 if config.matcher.use_gpu else -1
+            import torch
+            from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+            if self.num_threads > 0:
+                torch.set_num_threads(self.num_threads)
+            self.tokenizer = AutoTokenizer.from_pretrained(config.analysis.sentiment_model)
+            self.model = AutoModelForSequenceClassification.from_pretrained(
+                config.analysis.sentiment_model
             )
+            self.model.eval()
+            if config.matcher.use_gpu:
+                self.model.to('cuda')
             logger.info("Sentiment analysis model loaded")
         except Exception as e:
             logger.warning(f"Failed to load sentiment model: {e}")
@@ -39,23 +99,92 @@ class SentimentAnalyzer:
 
     def analyze(self, text: str) -> Dict[str, Any]:
         """Analyze sentiment of text"""
-        if not text or not self.model:
-            return {'label': 'neutral', 'score': 0.0}
+        return self.analyze_batch([text])[0]
+
+    def analyze_batch(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """
+        Analyze sentiment for multiple texts in batched model calls
+
+        Args:
+            texts: Texts to analyze
+
+        Returns:
+            Sentiment per text (label, score, polarity)
+        """
+        results: List[Dict[str, Any]] = [{'label': 'neutral', 'score': 0.0} for _ in texts]
+        if not self.model:
+            return results
+
+        # Identical texts are inferred once
+        positions: Dict[str, List[int]] = {}
+        for i, text in enumerate(texts):
+            if text:
+                positions.setdefault(text[:self.MAX_LENGTH], []).append(i)
+        if not positions:
+            return results
 
         try:
-            result = self.model(text[:512])[0]  # Truncate for model limits
-            return {
-                'label': result['label'].lower(),
-                'score': float(result['score']),
-                'polarity': self._map_to_polarity(result['label'])
-            }
+            if self.cache is not None:
+                predictions = self.cache.get_or_compute(
+                    config.analysis.sentiment_model, backend_version(self.model),
+                    list(positions), self._predict
+                )
+            else:
+                predictions = self._predict(list(positions))
         except Exception as e:
             logger.error(f"Sentiment analysis error: {e}")
-            return {'label': 'neutral', 'score': 0.0, 'polarity': 0}
+            for indices in positions.values():
+                for i in indices:
+                    results[i] = {'label': 'neutral', 'score': 0.0, 'polarity': 0}
+            return results
+
+        for indices, (label, score) in zip(positions.values(), predictions):
+            for i in indices:
+                results[i] = {
+                    'label': label.lower(),
+                    'score': score,
+                    'polarity': self._map_to_polarity(label)
+                }
+        return results
 
-    def analyze_batch(self, texts: List[str]) -> List[Dict[str, Any]]:
-        """Analyze sentiment for multiple texts"""
-        return [self.analyze(text) for text in texts]
+    async def analyze_batch_async(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """Run analyze_batch in a worker thread so the event loop stays responsive"""
+        return await asyncio.to_thread(self.analyze_batch, texts)
+
+    def _predict(self, texts: List[str]) -> List[Tuple[str, float]]:
+        """Predict (label, score) per text, batching texts of similar length"""
+        encodings = self.tokenizer(texts, truncation=True, max_length=self.MAX_LENGTH)
+        order = np.argsort([len(ids) for ids in encodings['input_ids']], kind='stable')
+
+        predictions: List[Tuple[str, float]] = [('neutral', 0.0)] * len(texts)
+        for start in range(0, len(order), self.batch_size):
+            batch = order[start:start + self.batch_size]
+            features = [{key: encodings[key][i] for key in encodings.keys()} for i in batch]
+            logits = self._logits(features)
+            logits = logits - logits.max(axis=1, keepdims=True)
+            probabilities = np.exp(logits) / np.exp(logits).sum(axis=1, keepdims=True)
+            label_ids = probabilities.argmax(axis=1)
+            scores = probabilities[np.arange(len(batch)), label_ids]
+            for i, label_id, score in zip(batch, label_ids.tolist(), scores.tolist()):
+                predictions[i] = (self._label(label_id), float(score))
+        return predictions
+
+    def _logits(self, features: List[Dict[str, Any]]) -> np.ndarray:
+        """Pad one batch of encodings and run the model"""
+        if isinstance(self.model, OnnxModel):
+            return self.model.run(self.tokenizer.pad(features, return_tensors='np'))
+
+        import torch
+
+        device = next(self.model.parameters()).device
+        inputs = self.tokenizer.pad(features, return_tensors='pt').to(device)
+        with torch.inference_mode():
+            return self.model(**inputs).logits.float().cpu().numpy()
+
+    def _label(self, label_id: int) -> str:
+        if isinstance(self.model, OnnxModel):
+            return self.model.meta['id2label'][str(label_id)]
+        return self.model.config.id2label[label_id]
 
     def _map_to_polarity(self, label: str) -> int:
         """Map sentiment label to polarity (-1, 0, 1)"""
@@ -85,13 +214,74 @@ class SentimentAnalyzer:
         }
 
 
+_CJK = re.compile(r'[\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]')
+_CJK_RUN = re.compile(r'[\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]+')
+_WORD = re.compile(r'[^\W\d_]{2,}|\d+[^\W\d_]+', re.UNICODE)
+_CHINESE_STOP_WORDS = frozenset(
+    "的 了 是 在 我 有 和 就 不 人 都 一个 上 也 很 到 说 要 去 你 会 着 没有 看 好 自己 这 那 "
+    "这个 那个 什么 我们 你们 他们 她们 它们 因为 所以 但是 而且 如果 还是 就是 可以 没 吗 吧 呢 啊 "
+    "哈哈 哈哈哈 真的 一下 一样 这样 那样 现在 已经 还有 然后 觉得 知道 其实 可能 大家 视频".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into topic terms
+
+    Chinese runs are segmented with jieba when it is installed, otherwise
+    split into character bigrams. Other scripts are split into words.
+    Stop words and one-character terms are dropped.
+    """
+    text = text.lower()
+    terms = [word for word in _WORD.findall(_CJK_RUN.sub(' ', text))
+             if word not in ENGLISH_STOP_WORDS]
+    for run in _CJK_RUN.findall(text):
+        if JIEBA_AVAILABLE:
+            words = jieba.lcut(run)
+        else:
+            words = [run[i:i + 2] for i in range(len(run) - 1)]
+        terms.extend(word for word in words if len(word) > 1 and word not in _CHINESE_STOP_WORDS)
+    return terms
+
+
 class TopicClusterer:
-    """Topic clustering for content analysis"""
+    """
+    Topic clustering for content analysis
+
+    Features:
+    - cluster(): one-off TF-IDF + KMeans over the given texts
+    - cluster_incremental(): MiniBatchKMeans over hashed term vectors, updated
+      with partial_fit and persisted per topic key, so each call only costs
+      the new texts and items are assigned to the nearest of k centroids
+    - Chinese text is segmented with jieba (character bigrams without it)
+    """
 
-    def __init__(self, n_clusters: int = 5):
-        self.n_clusters = n_clusters
-        self.vectorizer = TfidfVectorizer(max_features=100, stop_words='english')
-        self.clusterer = KMeans(n_clusters=n_clusters, random_state=42)
+    # Terms counted per topic for its keywords
+    MAX_TERMS = 500
+
+    def __init__(self, n_clusters: Optional[int] = None, state_dir: Optional[Union[str, Path]] = None):
+        """
+        Initialize topic clusterer
+
+        Args:
+            n_clusters: Number of topics (default from config)
+            state_dir: Directory incremental topic models persist to (default from config)
+        """
+        self.n_clusters = n_clusters or config.analysis.topic_clusters
+        self.state_dir = Path(
+            state_dir or config.analysis.topic_dir or Path(config.data_dir) / 'topics'
+        )
+        self.vectorizer = TfidfVectorizer(
+            max_features=1000, tokenizer=tokenize, lowercase=False, token_pattern=None
+        )
+        self.clusterer = KMeans(n_clusters=self.n_clusters, random_state=42, n_init=10)
+        self.hasher = HashingVectorizer(
+            n_features=config.analysis.topic_hash_features, tokenizer=tokenize,
+            lowercase=False, token_pattern=None, alternate_sign=False, norm='l2'
+        )
+        self._states: Dict[str, Dict[str, Any]] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_lock = threading.Lock()
 
     def cluster(self, texts: List[str]) -> Tuple[np.ndarray, List[str]]:
         """Cluster texts into topics"""
@@ -128,14 +318,106 @@ class TopicClusterer:
 
         return topics
 
+    def _state_path(self, key: str) -> Path:
+        name = re.sub(r'[^\w.-]+', '_', key)
+        return self.state_dir / f"{name}.topics.pkl"
+
+    def _key_lock(self, key: str) -> threading.Lock:
+        with self._locks_lock:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def _get_state(self, key: str) -> Dict[str, Any]:
+        """Get the incremental model of a topic key, loading it from disk if saved"""
+        if key not in self._states:
+            path = self._state_path(key)
+            state = None
+            if path.exists():
+                with open(path, 'rb') as f:
+                    state = pickle.load(f)
+                if state['model'].n_clusters != self.n_clusters:
+                    logger.warning(f"Ignoring topic state {path}: cluster count changed")
+                    state = None
+            if state is None:
+                state = {
+                    'model': MiniBatchKMeans(
+                        n_clusters=self.n_clusters, random_state=42, n_init=3,
+                        batch_size=1024
+                    ),
+                    'terms': [Counter() for _ in range(self.n_clusters)],
+                    'seen': 0,
+                }
+            self._states[key] = state
+        return self._states[key]
+
+    def cluster_incremental(self, texts: List[str], key: str = 'default',
+                            update: bool = True) -> Tuple[np.ndarray, List[str]]:
+        """
+        Assign texts to the persisted topics of a key, updating them with the texts
+
+        Args:
+            texts: New texts
+            key: Collection or topic the clusters belong to
+            update: Update centroids and keywords with the texts (False only assigns)
+
+        Returns:
+            (cluster label per text, keywords per topic)
+        """
+        # Runs on executor threads; one key's model and counters are updated by one at a time
+        with self._key_lock(key):
+            state = self._get_state(key)
+            model = state['model']
+            fitted = hasattr(model, 'cluster_centers_')
+            if not fitted and len(texts) < self.n_clusters:
+                logger.warning(f"Not enough texts ({len(texts)}) to start {self.n_clusters} topics")
+                return np.zeros(len(texts)), []
+            if not texts:
+                return np.zeros(0), self._incremental_keywords(state)
+
+            try:
+                X = self.hasher.transform(texts)
+                if update or not fitted:
+                    model.partial_fit(X)
+                labels = model.predict(X)
+
+                if update:
+                    for text, label in zip(texts, labels):
+                        state['terms'][label].update(tokenize(text))
+                    for i, terms in enumerate(state['terms']):
+                        # Keep the keyword counters bounded
+                        if len(terms) > self.MAX_TERMS:
+                            state['terms'][i] = Counter(dict(terms.most_common(self.MAX_TERMS)))
+                    state['seen'] += len(texts)
+                    self._save_state(key, state)
+
+                return labels, self._incremental_keywords(state)
+
+            except Exception as e:
+                logger.error(f"Incremental clustering error: {e}")
+                return np.zeros(len(texts)), []
+
+    @staticmethod
+    def _incremental_keywords(state: Dict[str, Any], top_n: int = 5) -> List[str]:
+        return [', '.join(term for term, _ in terms.most_common(top_n)) for terms in state['terms']]
+
+    def _save_state(self, key: str, state: Dict[str, Any]) -> None:
+        path = self._state_path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp, 'wb') as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        tmp.replace(path)
+
 
 class TrendAnalyzer:
     """Trend analysis and prediction"""
 
-    def analyze_trend(self, data: List[Dict[str, Any]],
+    def analyze_trend(self, data: Union[List[Dict[str, Any]], "pa.Table"],
                      time_field: str = 'publish_time',
                      value_field: str = 'view_count') -> Dict[str, Any]:
-        """Analyze trend over time"""
+        """Analyze trend over time (list of items or Arrow table)"""
+        if is_arrow_table(data):
+            return self._analyze_trend_arrow(data, time_field, value_field)
+
         if not data:
             return {}
 
@@ -169,25 +451,72 @@ class TrendAnalyzer:
 
         return trend
 
+    def _analyze_trend_arrow(self, table: "pa.Table", time_field: str,
+                             value_field: str) -> Dict[str, Any]:
+        """Analyze trend on Arrow columns without materializing rows"""
+        import pyarrow.compute as pc
+
+        if table.num_rows == 0:
+            return {}
+
+        table = table.select([time_field, value_field]).sort_by(time_field)
+        times = table.column(time_field)
+        values = pc.fill_null(table.column(value_field), 0).to_numpy()
+
+        trend = {
+            'total_items': table.num_rows,
+            'time_range': {'start': times[0].as_py(), 'end': times[-1].as_py()},
+            'value_stats': {
+                'min': values.min(),
+                'max': values.max(),
+                'mean': np.mean(values),
+                'median': np.median(values),
+                'std': np.std(values)
+            }
+        }
+
+        if len(values) > 1:
+            x = np.arange(len(values))
+            trend['slope'] = np.polyfit(x, values, 1)[0]
+            trend['direction'] = 'up' if trend['slope'] > 0 else 'down'
+
+        return trend
+
+
+def _cluster_job(text_data: np.ndarray, offsets: np.ndarray,
+                 n_clusters: int) -> Tuple[np.ndarray, List[str]]:
+    """Batch topic clustering as run by an analysis worker"""
+    return TopicClusterer(n_clusters).cluster(unpack_texts(text_data, offsets))
+
 
 class AnalysisEngine:
     """Main analysis engine coordinating all analyzers"""
 
-    def __init__(self):
+    def __init__(self, executor: Optional[AnalysisExecutor] = None):
+        """
+        Initialize analysis engine
+
+        Args:
+            executor: Executor for CPU-bound steps (default: the process-wide one);
+                shared with its other users, so close() leaves it running
+        """
         self.sentiment_analyzer = SentimentAnalyzer()
         self.topic_clusterer = TopicClusterer()
         self.trend_analyzer = TrendAnalyzer()
+        self.executor = executor or get_analysis_executor()
 
-    async def analyze(self, data: List[Dict[str, Any]],
+    async def analyze(self, data: Union[List[Dict[str, Any]], "pa.Table"],
                      analysis_types: Optional[List[str]] = None,
                      **kwargs) -> Dict[str, Any]:
         """
         Run analysis on data
 
         Args:
-            data: List of content items
+            data: List of content items, or an Arrow table with the columnar
+                content schema (items are then not annotated in place)
             analysis_types: List of analysis types to run
-            **kwargs: Additional parameters
+            **kwargs: Additional parameters (topic_key: cluster incrementally
+                into the persisted topics of this key)
 
         Returns:
             Analysis results
@@ -196,6 +525,7 @@ class AnalysisEngine:
             analysis_types = ['sentiment', 'clustering']
 
         results = {}
+        annotate = not is_arrow_table(data)
 
         # Extract texts for analysis
         texts = self._extract_texts(data)
@@ -203,17 +533,28 @@ class AnalysisEngine:
         # Sentiment analysis
         if 'sentiment' in analysis_types and texts:
             logger.info("Running sentiment analysis...")
-            sentiments = self.sentiment_analyzer.analyze_batch(texts)
+            sentiments = await self.sentiment_analyzer.analyze_batch_async(texts)
             results['sentiment'] = self.sentiment_analyzer.aggregate_sentiment(sentiments)
 
             # Add sentiment to individual items
-            for item, sentiment in zip(data, sentiments):
-                item['sentiment'] = sentiment
+            if annotate:
+                for item, sentiment in zip(data, sentiments):
+                    item['sentiment'] = sentiment
 
         # Topic clustering
-        if 'clustering' in analysis_types and len(texts) >= 5:
+        topic_key = kwargs.get('topic_key')
+        if 'clustering' in analysis_types and texts and (topic_key or len(texts) >= 5):
             logger.info("Running topic clustering...")
-            labels, topics = self.topic_clusterer.cluster(texts)
+            if topic_key:
+                # Update the persisted topics of the key with the new texts only
+                # (in a thread: the model state lives in this process)
+                labels, topics = await self.executor.run_thread(
+                    self.topic_clusterer.cluster_incremental, texts, topic_key
+                )
+            else:
+                labels, topics = await self.executor.run(
+                    _cluster_job, *pack_texts(texts), self.topic_clusterer.n_clusters
+                )
             results['clusters'] = {
                 'n_clusters': len(topics),
                 'topics': topics,
@@ -221,23 +562,41 @@ class AnalysisEngine:
             }
 
             # Add cluster labels to items
-            for item, label in zip(data, labels):
-                item['cluster'] = int(label)
+            if annotate:
+                for item, label in zip(data, labels):
+                    item['cluster'] = int(label)
 
         # Trend analysis
         if 'trend' in analysis_types:
             logger.info("Running trend analysis...")
-            results['trend'] = self.trend_analyzer.analyze_trend(data)
+            results['trend'] = await self.executor.run_thread(self.trend_analyzer.analyze_trend, data)
 
         # Comparison analysis
         if 'comparison' in analysis_types:
             logger.info("Running comparison analysis...")
-            results['comparison'] = self._compare_items(data)
+            results['comparison'] = await self.executor.run_thread(self._compare_items, data)
 
         return results
 
-    def _extract_texts(self, data: List[Dict[str, Any]]) -> List[str]:
+    async def close(self):
+        """
+        Release the engine
+
+        The executor is not shut down: it was passed in by the caller or is
+        the process-wide one, and both have other users.
+        """
+
+    def _extract_texts(self, data: Union[List[Dict[str, Any]], "pa.Table"]) -> List[str]:
         """Extract text from content items"""
+        if is_arrow_table(data):
+            import pyarrow.compute as pc
+            joined = pc.binary_join_element_wise(
+                pc.fill_null(data.column('title'), ''),
+                pc.fill_null(data.column('description'), ''),
+                ' '
+            )
+            return pc.utf8_trim_whitespace(joined).to_pylist()
+
         texts = []
         for item in data:
             parts = []
@@ -248,11 +607,14 @@ class AnalysisEngine:
             texts.append(' '.join(parts) if parts else '')
         return texts
 
-    def _compare_items(self, data: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _compare_items(self, data: Union[List[Dict[str, Any]], "pa.Table"]) -> Dict[str, Any]:
         """Compare content items"""
         if len(data) < 2:
             return {}
 
+        if is_arrow_table(data):
+            return self._compare_items_arrow(data)
+
         # Compare by platform
         by_platform = {}
         for item in data:
@@ -273,3 +635,29 @@ class AnalysisEngine:
             }
 
         return {'by_platform': platform_stats}
+
+    def _compare_items_arrow(self, table: "pa.Table") -> Dict[str, Any]:
+        """Compare platforms with a columnar group-by"""
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        engagement = pc.add(
+            pc.fill_null(table.column('like_count'), 0),
+            pc.fill_null(table.column('comment_count'), 0)
+        )
+        grouped = pa.table({
+            'platform': pc.fill_null(table.column('platform'), 'unknown'),
+            'engagement': engagement,
+        }).group_by('platform').aggregate([
+            ('engagement', 'count'),
+            ('engagement', 'mean'),
+        ])
+
+        platform_stats = {
+            row['platform']: {
+                'count': row['engagement_count'],
+                'avg_engagement': row['engagement_mean']
+            }
+            for row in grouped.to_pylist()
+        }
+        return {'by_platform': platform_stats}
@@ -0,0 +1,269 @@
+"""
+Executor for CPU-bound analysis steps
+Runs GIL-bound work in a process pool and GIL-releasing native code in a
+thread pool, so analysis requests never block the event loop
+"""
+
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Callable, List, Optional, Tuple
+
+import numpy as np
+
+from omnisense.config import config
+from omnisense.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+EXECUTOR_MODES = ("process", "thread", "inline")
+
+
+@dataclass(frozen=True)
+class SharedArray:
+    """Picklable handle to a NumPy array placed in shared memory"""
+
+    name: str
+    shape: Tuple[int, ...]
+    dtype: str
+
+    @classmethod
+    def create(cls, array: np.ndarray) -> Tuple["SharedArray", SharedMemory]:
+        """Copy an array into a new shared memory block (the caller unlinks it)"""
+        shm = SharedMemory(create=True, size=max(1, array.nbytes))
+        np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)[...] = array
+        return cls(shm.name, array.shape, array.dtype.str), shm
+
+    def attach(self) -> Tuple[np.ndarray, SharedMemory]:
+        """
+        Map the block without taking ownership of it
+
+        Pool workers share the parent's resource tracker, where the block is
+        already registered; the parent's unlink() clears the registration.
+        """
+        shm = SharedMemory(name=self.name)
+        return np.ndarray(self.shape, dtype=np.dtype(self.dtype), buffer=shm.buf), shm
+
+
+def _close(shm: SharedMemory) -> None:
+    try:
+        shm.close()
+    except BufferError:
+        # A view is still referenced; the mapping goes away with it
+        pass
+
+
+def pack_texts(texts: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Pack texts into arrays that can travel through shared memory
+
+    Returns:
+        (UTF-8 bytes as uint8, int64 offsets of len(texts) + 1)
+    """
+    encoded = [text.encode("utf-8") for text in texts]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(data) for data in encoded], out=offsets[1:])
+    return np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets
+
+
+def unpack_texts(data: np.ndarray, offsets: np.ndarray) -> List[str]:
+    """Inverse of pack_texts()"""
+    raw = data.tobytes()
+    bounds = offsets.tolist()
+    return [raw[start:end].decode("utf-8") for start, end in zip(bounds, bounds[1:])]
+
+
+def _invoke(fn: Callable, args: tuple, kwargs: dict, min_bytes: int) -> Any:
+    """Worker side of AnalysisExecutor.run(): resolve shared arguments, share a large result"""
+    attached = []
+
+    def resolve(value):
+        if isinstance(value, SharedArray):
+            array, shm = value.attach()
+            attached.append(shm)
+            return array
+        return value
+
+    try:
+        result = fn(*[resolve(arg) for arg in args],
+                    **{name: resolve(value) for name, value in kwargs.items()})
+    finally:
+        for shm in attached:
+            _close(shm)
+
+    def share(value):
+        if isinstance(value, np.ndarray) and value.nbytes >= min_bytes:
+            handle, shm = SharedArray.create(value)
+            # The parent owns the block from here on (it registers it again
+            # when it attaches, before unlinking)
+            resource_tracker.unregister(shm._name, "shared_memory")
+            _close(shm)
+            return handle
+        return value
+
+    if isinstance(result, tuple):
+        return tuple(share(value) for value in result)
+    return share(result)
+
+
+def _receive(result: Any) -> Any:
+    """Parent side: copy shared result arrays out and free their blocks"""
+
+    def load(value):
+        if isinstance(value, SharedArray):
+            shm = SharedMemory(name=value.name)
+            try:
+                return np.ndarray(value.shape, dtype=np.dtype(value.dtype), buffer=shm.buf).copy()
+            finally:
+                _close(shm)
+                shm.unlink()
+        return value
+
+    if isinstance(result, tuple):
+        return tuple(load(value) for value in result)
+    return load(result)
+
+
+class AnalysisExecutor:
+    """
+    Executor for CPU-bound analysis steps
+
+    Features:
+    - run(): GIL-bound Python work (TF-IDF, KMeans) in a process pool, with
+      "thread" and "inline" modes for small deployments and tests
+    - run_thread(): GIL-releasing native code (NumPy, torch, ONNX Runtime)
+      in the default thread pool
+    - NumPy arguments and results of at least shared_memory_min_bytes move
+      through shared memory instead of being pickled
+    - The pool starts on first use and is replaced if a worker dies
+    """
+
+    def __init__(self, mode: Optional[str] = None, workers: Optional[int] = None,
+                 start_method: Optional[str] = None,
+                 shared_memory_min_bytes: Optional[int] = None):
+        """
+        Initialize analysis executor
+
+        Args:
+            mode: "process", "thread" or "inline" (default from config)
+            workers: Worker processes, 0 for one per CPU (default from config)
+            start_method: multiprocessing start method (default from config)
+            shared_memory_min_bytes: Smallest array sent through shared memory (default from config)
+        """
+        analysis_config = config.analysis
+        self.mode = mode or analysis_config.executor
+        if self.mode not in EXECUTOR_MODES:
+            raise ValueError(f"Unknown analysis executor mode: {self.mode}")
+        workers = analysis_config.executor_workers if workers is None else workers
+        self.workers = workers or os.cpu_count() or 1
+        self.start_method = start_method or analysis_config.executor_start_method
+        self.shared_memory_min_bytes = (
+            analysis_config.shared_memory_min_bytes
+            if shared_memory_min_bytes is None else shared_memory_min_bytes
+        )
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                # Workers inherit a running tracker instead of starting their
+                # own, which would unlink blocks when the worker exits
+                resource_tracker.ensure_running()
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context(self.start_method),
+                )
+                logger.info(f"Started analysis process pool ({self.workers} workers, {self.start_method})")
+            return self._pool
+
+    async def run(self, fn: Callable, *args, **kwargs) -> Any:
+        """
+        Run a CPU-bound function off the event loop
+
+        In process mode fn and its arguments must be picklable; NumPy arrays
+        among the arguments, and in the result (or a result tuple), are
+        shared instead.
+
+        Args:
+            fn: Module-level function
+            *args: Positional arguments
+            **kwargs: Keyword arguments
+
+        Returns:
+            fn's result
+        """
+        if self.mode == "inline":
+            return fn(*args, **kwargs)
+        if self.mode == "thread":
+            return await asyncio.to_thread(fn, *args, **kwargs)
+
+        blocks: List[SharedMemory] = []
+
+        def share(value):
+            if isinstance(value, np.ndarray) and value.nbytes >= self.shared_memory_min_bytes:
+                handle, shm = SharedArray.create(value)
+                blocks.append(shm)
+                return handle
+            return value
+
+        try:
+            future = self._get_pool().submit(
+                _invoke, fn, tuple(share(arg) for arg in args),
+                {name: share(value) for name, value in kwargs.items()},
+                self.shared_memory_min_bytes,
+            )
+            try:
+                result = await asyncio.wrap_future(future)
+            except asyncio.CancelledError:
+                # The job keeps running; free its result once it finishes
+                future.add_done_callback(self._discard)
+                raise
+            except BrokenProcessPool:
+                with self._lock:
+                    self._pool = None
+                raise
+        finally:
+            for shm in blocks:
+                _close(shm)
+                shm.unlink()
+        return _receive(result)
+
+    @staticmethod
+    def _discard(future: Future) -> None:
+        if not future.cancelled() and future.exception() is None:
+            _receive(future.result())
+
+    async def run_thread(self, fn: Callable, *args, **kwargs) -> Any:
+        """Run GIL-releasing native code in a worker thread ("inline" mode runs it directly)"""
+        if self.mode == "inline":
+            return fn(*args, **kwargs)
+        return await asyncio.to_thread(fn, *args, **kwargs)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the process pool; it is restarted on next use"""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait, cancel_futures=True)
+
+
+# Process-wide executor instance
+_analysis_executor: Optional[AnalysisExecutor] = None
+_analysis_executor_lock = threading.Lock()
+
+
+def get_analysis_executor() -> AnalysisExecutor:
+    """Get the process-wide analysis executor"""
+    global _analysis_executor
+    if _analysis_executor is None:
+        with _analysis_executor_lock:
+            if _analysis_executor is None:
+                _analysis_executor = AnalysisExecutor()
+    return _analysis_executor
@@ -14,10 +14,34 @@ class DatabaseConfig(BaseSettings):
     """Database configuration"""
     sqlite_path: str = Field(default="data/omnisense.db", description="SQLite database path")
     chroma_path: str = Field(default="data/chroma", description="ChromaDB vector database path")
+    vector_batch_size: int = Field(default=1000, description="Documents per vector database write")
+    vector_matcher_embeddings: bool = Field(default=True, description="Embed vector database documents with the matcher's model instead of Chroma's default")
+    vector_backend: str = Field(default="chroma", description="Vector database backend: chroma or hnsw (local faiss HNSW segments)")
+    vector_path: str = Field(default="data/vectors", description="Local HNSW vector database path")
+    vector_hnsw_m: int = Field(default=32, description="HNSW graph degree")
+    vector_hnsw_ef_construction: int = Field(default=200, description="HNSW build beam width")
+    vector_hnsw_ef_search: int = Field(default=64, description="HNSW search beam width")
+    vector_segment_size: int = Field(default=1000000, description="Vectors per HNSW segment before it is sealed and memory-mapped")
+    vector_brute_force_max: int = Field(default=10000, description="Largest where-filtered set searched exactly instead of through HNSW")
     redis_host: str = Field(default="localhost", description="Redis host")
     redis_port: int = Field(default=6379, description="Redis port")
     redis_db: int = Field(default=0, description="Redis database number")
     redis_password: Optional[str] = Field(default=None, description="Redis password")
+    redis_compress_min_bytes: int = Field(default=4096, description="Smallest cached value compressed with zstd")
+    redis_local_cache_items: int = Field(default=10000, description="Values kept in the in-process tier in front of Redis")
+    redis_local_cache_ttl: float = Field(default=30.0, description="Seconds a value stays in the in-process tier")
+    redis_invalidation: bool = Field(default=True, description="Evict in-process copies when another process writes a key")
+    redis_invalidation_channel: str = Field(default="omnisense:cache:invalidate", description="Pub/sub channel of cache invalidations")
+    redis_memo_shared: bool = Field(default=False, description="Share @cached_async results and locks across processes through Redis")
+    redis_memo_lock_timeout: float = Field(default=60.0, description="Seconds other processes wait for a shared @cached_async call")
+    write_batch_size: int = Field(default=500, description="Rows per executemany batch on bulk writes")
+    sqlite_readers: int = Field(default=4, description="Pooled SQLite reader connections")
+    sqlite_busy_timeout: int = Field(default=5000, description="SQLite busy timeout in milliseconds")
+    sqlite_cache_size_kb: int = Field(default=65536, description="SQLite page cache size per connection in KiB")
+    sqlite_mmap_size: int = Field(default=268435456, description="SQLite memory-mapped I/O size in bytes")
+    sqlite_cached_statements: int = Field(default=256, description="Prepared statements cached per SQLite connection")
+    parquet_path: str = Field(default="data/parquet", description="Parquet content dataset directory")
+    parquet_append: bool = Field(default=False, description="Append saved collections to the Parquet dataset")
 
 
 class StorageConfig(BaseSettings):
@@ -52,11 +76,23 @@ class AntiCrawlConfig(BaseSettings):
 class SpiderConfig(BaseSettings):
     """Spider configuration"""
     concurrent_tasks: int = Field(default=5, description="Number of concurrent tasks")
+    per_platform_concurrency: int = Field(default=1, description="Maximum concurrent tasks per platform in SpiderManager")
+    task_timeout: int = Field(default=600, description="Timeout of a single SpiderManager task (seconds, 0 disables)")
+    platform_rate_limit: int = Field(default=0, description="Requests per minute per platform across all workers (0 disables)")
     timeout: int = Field(default=30, description="Request timeout (seconds)")
     download_media: bool = Field(default=True, description="Download media files")
     media_formats: List[str] = Field(default=["jpg", "png", "mp4", "mp3"], description="Allowed media formats")
     max_media_size: int = Field(default=100 * 1024 * 1024, description="Maximum media file size (bytes)")
     cookie_persist: bool = Field(default=True, description="Persist cookies between sessions")
+    browser_pool_enabled: bool = Field(default=True, description="Share pooled browsers between spiders in SpiderManager")
+    browser_pool_size: int = Field(default=2, description="Number of browser processes in the shared pool")
+    browser_pool_max_contexts: int = Field(default=10, description="Maximum leased contexts per pooled browser")
+    context_max_navigations: int = Field(default=200, description="Navigations before a pooled context is recycled")
+    max_pages_per_spider: int = Field(default=4, description="Maximum extra tabs a spider opens for concurrent fetches")
+    detail_concurrency: int = Field(default=4, description="Number of tabs used by fetch_details")
+    response_capture_enabled: bool = Field(default=True, description="Read platform JSON responses instead of scraping the DOM when available")
+    capture_idle_timeout: float = Field(default=3.0, description="Seconds without a captured response before capture is considered done")
+    capture_queue_size: int = Field(default=200, description="Maximum buffered captured responses per page")
 
 
 class MatcherConfig(BaseSettings):
@@ -66,17 +102,63 @@ class MatcherConfig(BaseSettings):
                            description="BERT model for semantic analysis")
     use_gpu: bool = Field(default=False, description="Use GPU for model inference")
     vector_dim: int = Field(default=384, description="Vector dimension")
+    embedding_batch_size: int = Field(default=128, description="Maximum texts per embedding model call")
+    embedding_max_wait_ms: float = Field(default=5.0, description="Time to wait for an embedding batch to fill")
+    query_cache_size: int = Field(default=1024, description="Cached query embeddings")
+    dedup_semantic: bool = Field(default=True, description="Detect near-duplicates with embeddings")
+    dedup_threshold: float = Field(default=0.95, description="Cosine similarity for near-duplicates")
+    dedup_simhash: bool = Field(default=True, description="Drop near-identical text with SimHash before embedding")
+    simhash_distance: int = Field(default=3, description="Hamming distance for SimHash near-duplicates")
+    dedup_hnsw_threshold: int = Field(default=100000, description="Vectors before the dedup index switches to HNSW")
+    dedup_persist: bool = Field(default=False, description="Persist dedup indexes to disk")
+    dedup_index_dir: str = Field(default="data/dedup", description="Directory for persisted dedup indexes")
+    dedup_store: str = Field(default="memory", description="Seen-hash store: memory or redis")
+    dedup_capacity: int = Field(default=1000000, description="Seen hashes per platform within one TTL window")
+    dedup_error_rate: float = Field(default=0.001, description="False positive rate of the seen-hash filter")
+    dedup_ttl: int = Field(default=7 * 24 * 3600, description="Seconds a seen hash is remembered (0 = forever)")
+    dedup_generations: int = Field(default=4, description="Filters the dedup TTL window is split into")
+    dedup_redis_prefix: str = Field(default="omnisense:dedup", description="Redis key prefix of the dedup store")
 
 
 class AnalysisConfig(BaseSettings):
     """Analysis configuration"""
     sentiment_model: str = Field(default="cardiffnlp/twitter-roberta-base-sentiment",
                                 description="Sentiment analysis model")
+    sentiment_batch_size: int = Field(default=32, description="Texts per sentiment model call")
+    sentiment_threads: int = Field(default=0, description="Torch CPU threads for inference (0 = torch default)")
+    interaction_sentiment: bool = Field(default=False, description="Run the sentiment model on collected interaction texts")
+    topic_clusters: int = Field(default=5, description="Number of topics for clustering")
+    topic_hash_features: int = Field(default=2 ** 16, description="Hashed term features of incremental topic clustering")
+    topic_dir: Optional[str] = Field(default=None, description="Incremental topic model directory (default {data_dir}/topics)")
+    executor: str = Field(default="process", description="Executor for CPU-bound analysis: process, thread or inline")
+    executor_workers: int = Field(default=0, description="Analysis worker processes (0 for one per CPU)")
+    executor_start_method: str = Field(default="spawn", description="multiprocessing start method of analysis workers")
+    shared_memory_min_bytes: int = Field(default=1 << 20, description="Smallest array passed to analysis workers through shared memory")
     language_detection: bool = Field(default=True, description="Enable language detection")
     supported_languages: List[str] = Field(default=["zh", "en", "ja", "ko"],
                                           description="Supported languages")
 
 
+class InferenceConfig(BaseSettings):
+    """Model inference backend configuration"""
+    backend: str = Field(default="torch", description="Inference backend for sentiment and embeddings: torch or onnx")
+    quantize: bool = Field(default=True, description="Use int8-quantized weights with the onnx backend")
+    onnx_threads: int = Field(default=0, description="ONNX Runtime intra-op threads (0 = runtime default)")
+    cache_enabled: bool = Field(default=True, description="Cache model outputs by content hash")
+    cache_memory_items: int = Field(default=100000, description="Model outputs kept in the in-process cache tier")
+    cache_persist: bool = Field(default=True, description="Keep model outputs in a persistent SQLite tier")
+    cache_path: Optional[str] = Field(default=None, description="Persistent inference cache file (default {cache_dir}/inference.db)")
+    cache_max_mb: float = Field(default=1024, description="Size limit of the persistent inference cache in MiB")
+
+
+class PipelineConfig(BaseSettings):
+    """Streaming collection pipeline configuration"""
+    streaming: bool = Field(default=False, description="Stream collected items through the pipeline by default")
+    batch_size: int = Field(default=50, description="Maximum items per pipeline batch")
+    queue_size: int = Field(default=4, description="Maximum batches buffered between pipeline stages")
+    flush_interval: float = Field(default=1.0, description="Seconds before a partial batch is flushed")
+
+
 class AgentConfig(BaseSettings):
     """Agent configuration"""
     llm_provider: str = Field(default="ollama", description="LLM provider (ollama, openai, anthropic)")
@@ -214,6 +296,8 @@ class Config(BaseSettings):
     spider: SpiderConfig = Field(default_factory=SpiderConfig)
     matcher: MatcherConfig = Field(default_factory=MatcherConfig)
     analysis: AnalysisConfig = Field(default_factory=AnalysisConfig)
+    inference: InferenceConfig = Field(default_factory=InferenceConfig)
+    pipeline: PipelineConfig = Field(default_factory=PipelineConfig)
     agent: AgentConfig = Field(default_factory=AgentConfig)
     platform: PlatformConfig = Field(default_factory=PlatformConfig)
     cookie: CookieConfig = Field(default_factory=CookieConfig)
@@ -5,10 +5,12 @@ Core OmniSense class - Main entry point for the system
 
 from typing import Any, Dict, List, Optional, Union
 from pathlib import Path
+from datetime import datetime
 import asyncio
 
 from omnisense.config import config
 from omnisense.utils.logger import get_logger
+from omnisense.utils.pipeline import StreamPipeline
 from omnisense.spider.manager import SpiderManager
 from omnisense.anti_crawl.manager import AntiCrawlManager
 from omnisense.matcher.manager import MatcherManager
@@ -51,9 +53,12 @@ class OmniSense:
         self.spider_manager = SpiderManager()
         self.anti_crawl_manager = AntiCrawlManager()
         self.matcher_manager = MatcherManager()
-        self.interaction_manager = InteractionManager()
         self.agent_manager = AgentManager()
         self.analysis_engine = AnalysisEngine()
+        self.interaction_manager = InteractionManager(
+            sentiment_analyzer=self.analysis_engine.sentiment_analyzer
+            if config.analysis.interaction_sentiment else None
+        )
         self.viz_renderer = VisualizationRenderer()
 
         logger.info("OmniSense system initialized successfully")
@@ -66,6 +71,7 @@ class OmniSense:
         url: Optional[str] = None,
         max_count: int = 100,
         filters: Optional[Dict[str, Any]] = None,
+        streaming: Optional[bool] = None,
         **kwargs
     ) -> Dict[str, Any]:
         """
@@ -78,6 +84,8 @@ class OmniSense:
             url: 直接URL
             max_count: 最大采集数量
             filters: 过滤条件
+            streaming: 流式模式，边采集边匹配、处理、入库（默认读取配置）
+                流式模式下结果不包含完整数据列表，可通过 collection_id 从数据库读取
             **kwargs: 平台特定参数
 
         Returns:
@@ -85,13 +93,24 @@ class OmniSense:
         """
         logger.info(f"Starting data collection for platform: {platform}")
 
+        if streaming is None:
+            streaming = config.pipeline.streaming
+
+        meta = {
+            "keyword": keyword,
+            "user_id": user_id,
+            "url": url,
+            "filters": filters
+        }
+
         try:
-            # Get platform spider
-            spider = self.spider_manager.get_spider(platform)
+            # Get platform spider (anti-crawl measures are applied by the spider)
+            spider = await self.spider_manager.get_started_spider(platform)
 
-            # Apply anti-crawl measures
-            anti_crawl = self.anti_crawl_manager.get_handler(platform)
-            await anti_crawl.setup()
+            if streaming:
+                return await self._collect_streaming(
+                    spider, platform, max_count, meta, **kwargs
+                )
 
             # Collect data
             raw_data = await spider.collect(
@@ -116,9 +135,12 @@ class OmniSense:
             )
 
             # Save to database
-            await self.db.save_collection(
+            collection_id = await self.db.save_collection(
                 platform=platform,
-                data=processed_data
+                data=processed_data,
+                keyword=keyword,
+                user_id=user_id,
+                url=url
             )
 
             logger.info(f"Data collection completed: {len(processed_data)} items")
@@ -126,19 +148,85 @@ class OmniSense:
             return {
                 "platform": platform,
                 "count": len(processed_data),
+                "collection_id": collection_id,
                 "data": processed_data,
-                "meta": {
-                    "keyword": keyword,
-                    "user_id": user_id,
-                    "url": url,
-                    "filters": filters
-                }
+                "meta": meta
             }
 
         except Exception as e:
             logger.error(f"Error collecting data from {platform}: {e}")
             raise
 
+    async def _collect_streaming(
+        self,
+        spider,
+        platform: str,
+        max_count: int,
+        meta: Dict[str, Any],
+        **kwargs
+    ) -> Dict[str, Any]:
+        """
+        流式采集：爬虫逐条产出，匹配 → 互动处理 → 入库 各阶段通过有界队列衔接
+
+        下游变慢时队列写满，背压一直传递到爬虫，内存占用与 max_count 无关。
+
+        Args:
+            spider: 已启动的平台爬虫
+            platform: 平台名称
+            max_count: 最大采集数量
+            meta: 采集参数
+            **kwargs: 平台特定参数
+
+        Returns:
+            采集结果字典（不含完整数据列表）
+        """
+        collection_id = f"{platform}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+
+        async def match(batch):
+            return await self.matcher_manager.match(platform=platform, data=batch)
+
+        async def process(batch):
+            return await self.interaction_manager.process(platform=platform, data=batch)
+
+        async def save(batch):
+            await self.db.save_collection(
+                platform=platform,
+                data=batch,
+                collection_id=collection_id,
+                keyword=meta["keyword"],
+                user_id=meta["user_id"],
+                url=meta["url"]
+            )
+            return batch
+
+        pipeline = StreamPipeline([
+            ("match", match),
+            ("interaction", process),
+            ("save", save),
+        ])
+        stats = await pipeline.run(spider.collect_stream(
+            keyword=meta["keyword"],
+            user_id=meta["user_id"],
+            url=meta["url"],
+            max_count=max_count,
+            filters=meta["filters"],
+            **kwargs
+        ))
+
+        count = stats["stages"]["save"]["items_out"]
+        logger.info(
+            f"Streaming collection completed: {count} items saved "
+            f"({stats['source_items']} collected) in {stats['elapsed']:.1f}s"
+        )
+
+        return {
+            "platform": platform,
+            "count": count,
+            "collection_id": collection_id,
+            "data": None,
+            "meta": {**meta, "pipeline": stats}
+        }
+
     def collect(
         self,
         platform: str,
@@ -343,8 +431,10 @@ class OmniSense:
     async def close(self):
         """关闭所有连接"""
         logger.info("Closing OmniSense system...")
+        await self.matcher_manager.close()
         await self.db.close()
         await self.spider_manager.close()
+        await self.analysis_engine.close()
         logger.info("OmniSense system closed")
 
     def __enter__(self):
@@ -11,6 +11,9 @@ from typing import List, Dict, Any, Optional, Tuple, Set
 from dataclasses import dataclass, field
 from loguru import logger
 
+from omnisense.utils.inference_cache import InferenceCache, get_inference_cache
+from omnisense.utils.onnx_backend import backend_version
+
 try:
     from transformers import (
         AutoTokenizer,
@@ -73,7 +76,8 @@ class EntityExtractor:
         self,
         model_name: str = "dslim/bert-base-NER",
         use_gpu: bool = False,
-        batch_size: int = 16
+        batch_size: int = 16,
+        cache: Optional[InferenceCache] = None
     ):
         """
         初始化实体抽取器
@@ -82,11 +86,13 @@ class EntityExtractor:
             model_name: Hugging Face模型名称
             use_gpu: 是否使用GPU
             batch_size: 批处理大小
+            cache: 推理缓存（默认使用进程级共享缓存）
         """
         self.model_name = model_name
         self.use_gpu = use_gpu and TRANSFORMERS_AVAILABLE
         self.batch_size = batch_size
         self.ner_pipeline = None
+        self.cache = cache or get_inference_cache()
 
         if TRANSFORMERS_AVAILABLE:
             self._initialize_model()
@@ -147,7 +153,7 @@ class EntityExtractor:
         """使用Transformers模型抽取实体"""
         try:
             # Run NER pipeline
-            ner_results = self.ner_pipeline(text)
+            ner_results = self._run_ner(text)
 
             entities = []
             for result in ner_results:
@@ -188,6 +194,19 @@ class EntityExtractor:
             logger.error(f"Transformer extraction failed: {e}, falling back to patterns")
             return self._extract_with_patterns(text, entity_types)
 
+    def _run_ner(self, text: str) -> List[Dict[str, Any]]:
+        """运行NER模型，结果按文本哈希缓存（偏移量依赖原文，因此不做文本归一化）"""
+        if self.cache is None:
+            return self.ner_pipeline(text)
+
+        return self.cache.get_or_compute(
+            self.model_name,
+            backend_version(self.ner_pipeline.model),
+            [text],
+            lambda texts: [self.ner_pipeline(t) for t in texts],
+            normalize=False
+        )[0]
+
     def _extract_with_patterns(
         self,
         text: str,
@@ -6,9 +6,11 @@ Query Engine
 知识图谱查询引擎，支持自然语言查询和Cypher查询
 """
 
+import asyncio
 from typing import List, Dict, Any, Optional
 from loguru import logger
 
+from omnisense.storage.redis_cache import cached_async
 from .storage import Neo4jStorage
 
 
@@ -273,6 +275,24 @@ class QueryEngine:
                 "question": question
             }
 
+    @cached_async(ttl=300, stale_ttl=600)
+    async def query_with_natural_language_async(
+        self,
+        question: str,
+        max_results: int = 10
+    ) -> Dict[str, Any]:
+        """
+        异步自然语言查询，相同问题的并发请求只调用一次LLM，结果缓存5分钟
+
+        Args:
+            question: 自然语言问题
+            max_results: 最大结果数量
+
+        Returns:
+            查询结果
+        """
+        return await asyncio.to_thread(self.query_with_natural_language, question, max_results)
+
     def _generate_cypher_from_nl(self, question: str) -> Optional[str]:
         """
         使用LLM将自然语言转换为Cypher查询
@@ -3,21 +3,89 @@ Interaction processing for OmniSense
 Handles comments, likes, shares, and other user interactions
 """
 
-from typing import Any, Dict, List, Optional
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 from datetime import datetime
+import gc
 import re
 
 from omnisense.config import config
 from omnisense.utils.logger import get_logger
 
+if TYPE_CHECKING:
+    from omnisense.analysis.engine import SentimentAnalyzer
+
 logger = get_logger(__name__)
 
+_SPECIAL_CHARS = re.compile(r'[^\w\s,.!?;:\-@#]')
+_MENTION = re.compile(r'@(\w+)')
+_HASHTAG = re.compile(r'#(\w+)')
+_STOP_WORDS = frozenset({'the', 'is', 'at', 'which', 'on', 'a', 'an', 'as', 'are', 'was', 'were'})
+_MAX_KEYWORDS = 10
+
+_POLARITY_LABELS = {1: 'positive', -1: 'negative', 0: 'neutral'}
+
+
+def clean_text(text: str) -> str:
+    """Collapse whitespace and remove special characters (keep basic punctuation)"""
+    text = ' '.join(text.split())
+    text = _SPECIAL_CHARS.sub('', text)
+    return text.strip()
+
+
+def extract_keywords(text: str) -> List[str]:
+    """Up to 10 distinct words of text that are not stop words, in order of appearance"""
+    words = text.lower().split()
+    keywords = [w for w in words if w not in _STOP_WORDS and len(w) > 2]
+    return list(dict.fromkeys(keywords))[:_MAX_KEYWORDS]
+
+
+@contextmanager
+def _gc_paused():
+    """
+    Pause the cyclic garbage collector
+
+    A batch allocates a few objects per interaction and keeps them all, which
+    otherwise triggers repeated full collections over every live object.
+    Only wraps synchronous code, so other tasks never run with it paused.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
 
 class BaseInteractionProcessor:
-    """Base class for interaction processing"""
+    """
+    Base class for interaction processing
+
+    Features:
+    - process(): one content item at a time
+    - process_batch(): the interactions of many items flattened into one
+      list, each distinct text cleaned and extracted once with precompiled
+      regexes, and sentiment analyzed in one batched call
+    - Optional sentiment analyzer; without one sentiment stays neutral
+    """
+
+    # Per-interaction steps; a subclass overriding any of them is run through
+    # process() per item so its behavior is kept
+    _STEPS = ('process_single', '_clean_text', '_extract_mentions', '_extract_hashtags',
+              '_analyze_sentiment', '_analyze_sentiments', '_extract_keywords',
+              '_generate_summary')
+
+    def __init__(self, platform: str, sentiment_analyzer: Optional["SentimentAnalyzer"] = None):
+        """
+        Initialize interaction processor
 
-    def __init__(self, platform: str):
+        Args:
+            platform: Platform name
+            sentiment_analyzer: Analyzer for interaction texts (None keeps them neutral)
+        """
         self.platform = platform
+        self.sentiment_analyzer = sentiment_analyzer
 
     async def process(self, content: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -44,6 +112,112 @@ class BaseInteractionProcessor:
 
         return content
 
+    async def process_batch(self, data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Process interactions for many content items at once
+
+        Produces the same items as process() on each of them. Items that
+        cannot be flattened (malformed interactions) go through process()
+        and are returned unchanged if that fails.
+
+        Args:
+            data: Content items with raw interaction data
+
+        Returns:
+            Content items with processed interactions
+        """
+        if any(getattr(type(self), step) is not getattr(BaseInteractionProcessor, step)
+               for step in self._STEPS):
+            return [await self._process_item(item) for item in data]
+
+        results = list(data)
+        items = []
+        rows: List[Dict[str, Any]] = []
+        counts = []
+        for index, item in enumerate(results):
+            interactions = item.get('interactions', []) if isinstance(item, dict) else None
+            if isinstance(item, dict) and not interactions:
+                self._complete(item)
+                continue
+            kept = [interaction for interaction in interactions if interaction] \
+                if isinstance(interactions, list) else None
+            if kept is None or not all(
+                isinstance(interaction, dict)
+                and isinstance(interaction.get('text', ''), str)
+                and isinstance(interaction.get('user', {}), dict)
+                for interaction in kept
+            ):
+                results[index] = await self._process_item(item)
+                continue
+            items.append(item)
+            rows.extend(kept)
+            counts.append(len(kept))
+
+        if items:
+            try:
+                await self._process_rows(items, rows, counts)
+            except Exception as e:
+                logger.warning(f"Batch interaction processing failed, processing per item: {e}")
+                for item in items:
+                    await self._process_item(item)
+            else:
+                for item in items:
+                    self._complete(item)
+        return results
+
+    def _complete(self, content: Dict[str, Any]) -> None:
+        """Finish an item processed by process_batch() (hook for subclasses)"""
+
+    async def _process_item(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            return await self.process(item)
+        except Exception as e:
+            logger.error(f"Error processing interactions for {item.get('content_id')}: {e}")
+            return item  # Return original on error
+
+    async def _process_rows(self, items: List[Dict[str, Any]], rows: List[Dict[str, Any]],
+                            counts: List[int]) -> None:
+        """Process the flattened interactions of items and write the results back"""
+        with _gc_paused():
+            text_rows = [row for row in rows if 'text' in row]
+            raw_texts = [row['text'] for row in text_rows]
+
+            # Repeated texts (copied comments, emoji-only replies) are processed once
+            positions = {text: i for i, text in enumerate(dict.fromkeys(raw_texts))}
+            texts = [clean_text(text) for text in positions]
+            mentions = [_MENTION.findall(text) if '@' in text else [] for text in texts]
+            hashtags = [_HASHTAG.findall(text) if '#' in text else [] for text in texts]
+            keywords = [extract_keywords(text) for text in texts]
+
+        # One batched call for every distinct text of the batch
+        sentiments = await self._analyze_sentiments(texts)
+
+        with _gc_paused():
+            if len(positions) == len(raw_texts):
+                for row, text, row_mentions, row_hashtags, sentiment, row_keywords in zip(
+                    text_rows, texts, mentions, hashtags, sentiments, keywords
+                ):
+                    row['text'] = text
+                    row['mentions'] = row_mentions
+                    row['hashtags'] = row_hashtags
+                    row['sentiment'] = sentiment
+                    row['keywords'] = row_keywords
+            else:
+                # Every interaction gets its own lists and dicts
+                for row, raw_text in zip(text_rows, raw_texts):
+                    i = positions[raw_text]
+                    row['text'] = texts[i]
+                    row['mentions'] = list(mentions[i])
+                    row['hashtags'] = list(hashtags[i])
+                    row['sentiment'] = dict(sentiments[i])
+                    row['keywords'] = list(keywords[i])
+
+            start = 0
+            for item, count in zip(items, counts):
+                item['interactions'] = rows[start:start + count]
+                item['interaction_summary'] = self._generate_summary(item['interactions'])
+                start += count
+
     async def process_single(self, interaction: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Process a single interaction"""
         # Clean text
@@ -55,7 +229,7 @@ class BaseInteractionProcessor:
             interaction['mentions'] = self._extract_mentions(interaction['text'])
             interaction['hashtags'] = self._extract_hashtags(interaction['text'])
 
-        # Sentiment analysis (placeholder)
+        # Sentiment analysis
         if 'text' in interaction:
             interaction['sentiment'] = await self._analyze_sentiment(interaction['text'])
 
@@ -67,38 +241,40 @@ class BaseInteractionProcessor:
 
     def _clean_text(self, text: str) -> str:
         """Clean text content"""
-        # Remove extra whitespace
-        text = ' '.join(text.split())
-        # Remove special characters (keep basic punctuation)
-        text = re.sub(r'[^\w\s,.!?;:\-@#]', '', text)
-        return text.strip()
+        return clean_text(text)
 
     def _extract_mentions(self, text: str) -> List[str]:
         """Extract @mentions from text"""
-        return re.findall(r'@(\w+)', text)
+        return _MENTION.findall(text)
 
     def _extract_hashtags(self, text: str) -> List[str]:
         """Extract #hashtags from text"""
-        return re.findall(r'#(\w+)', text)
+        return _HASHTAG.findall(text)
 
     async def _analyze_sentiment(self, text: str) -> Dict[str, Any]:
         """Analyze sentiment of text"""
-        # Placeholder for sentiment analysis
-        # TODO: Implement with proper NLP model
-        return {
-            'score': 0.0,
-            'label': 'neutral',
-            'confidence': 0.0
-        }
+        return (await self._analyze_sentiments([text]))[0]
+
+    async def _analyze_sentiments(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """Analyze sentiment of texts in batched model calls"""
+        if self.sentiment_analyzer is None:
+            with _gc_paused():
+                return [{'score': 0.0, 'label': 'neutral', 'confidence': 0.0} for _ in texts]
+
+        results = await self.sentiment_analyzer.analyze_batch_async(texts)
+        return [
+            {
+                'score': result['score'] * result.get('polarity', 0),
+                'label': _POLARITY_LABELS[result.get('polarity', 0)],
+                'confidence': result['score'],
+            }
+            for result in results
+        ]
 
     def _extract_keywords(self, text: str) -> List[str]:
         """Extract keywords from text"""
         # Simple keyword extraction (can be improved with TF-IDF, etc.)
-        words = text.lower().split()
-        # Filter out common words
-        stop_words = {'the', 'is', 'at', 'which', 'on', 'a', 'an', 'as', 'are', 'was', 'were'}
-        keywords = [w for w in words if w not in stop_words and len(w) > 2]
-        return list(set(keywords))[:10]  # Top 10 unique keywords
+        return extract_keywords(text)  # Top 10 unique keywords
 
     def _generate_summary(self, interactions: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Generate summary statistics for interactions"""
@@ -161,6 +337,17 @@ class CommentProcessor(BaseInteractionProcessor):
 
         return content
 
+    async def process_batch(self, data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Process comments of many items with threading support"""
+        if type(self).process is not CommentProcessor.process:
+            return [await self._process_item(item) for item in data]
+        return await super().process_batch(data)
+
+    def _complete(self, content: Dict[str, Any]) -> None:
+        """Build the comment thread tree of an item processed by process_batch()"""
+        if 'interactions' in content:
+            content['comment_tree'] = self._build_comment_tree(content['interactions'])
+
     def _build_comment_tree(self, interactions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Build hierarchical comment tree"""
         # Create lookup dictionary
@@ -191,14 +378,22 @@ class CommentProcessor(BaseInteractionProcessor):
 class InteractionManager:
     """Manager for interaction processing across platforms"""
 
-    def __init__(self):
+    def __init__(self, sentiment_analyzer: Optional["SentimentAnalyzer"] = None):
+        """
+        Initialize interaction manager
+
+        Args:
+            sentiment_analyzer: Analyzer for interaction texts, shared by the
+                default processors (None keeps interaction sentiment neutral)
+        """
         self.processors = {}
+        self.sentiment_analyzer = sentiment_analyzer
 
     def get_processor(self, platform: str) -> BaseInteractionProcessor:
         """Get processor for platform"""
         if platform not in self.processors:
             # Default to comment processor for most platforms
-            self.processors[platform] = CommentProcessor(platform)
+            self.processors[platform] = CommentProcessor(platform, self.sentiment_analyzer)
         return self.processors[platform]
 
     async def process(self, platform: str, data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
@@ -213,15 +408,7 @@ class InteractionManager:
             Content items with processed interactions
         """
         processor = self.get_processor(platform)
-        results = []
-
-        for item in data:
-            try:
-                processed_item = await processor.process(item)
-                results.append(processed_item)
-            except Exception as e:
-                logger.error(f"Error processing interactions for {item.get('content_id')}: {e}")
-                results.append(item)  # Return original on error
+        results = await processor.process_batch(list(data))
 
         logger.info(f"Processed interactions for {len(results)} items on {platform}")
         return results
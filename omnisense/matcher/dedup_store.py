@@ -0,0 +1,366 @@
+"""
+Dedup stores for OmniSense
+Bounded, aging sets of seen content hashes: an in-process Bloom filter with
+on-disk snapshots, and a Redis Bloom filter shared by every worker
+"""
+
+import hashlib
+import math
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import redis.asyncio as redis
+
+from omnisense.config import config
+from omnisense.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def bloom_parameters(capacity: int, error_rate: float) -> Tuple[int, int]:
+    """
+    Size a Bloom filter
+
+    Args:
+        capacity: Expected number of items
+        error_rate: Target false positive rate
+
+    Returns:
+        (number of bits, number of hash functions)
+    """
+    capacity = max(1, capacity)
+    bits = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+    bits = (bits + 7) // 8 * 8
+    hashes = max(1, round(bits / capacity * math.log(2)))
+    return bits, hashes
+
+
+def bloom_positions(keys: List[str], num_bits: int, num_hashes: int) -> np.ndarray:
+    """
+    Bit positions of each key (double hashing over a 128-bit digest)
+
+    Returns:
+        int64 array of shape (len(keys), num_hashes)
+    """
+    digests = b''.join(hashlib.blake2b(key.encode(), digest_size=16).digest() for key in keys)
+    halves = np.frombuffer(digests, dtype=np.uint64).reshape(-1, 2)
+    h1 = halves[:, :1]
+    h2 = halves[:, 1:] | np.uint64(1)
+    steps = np.arange(num_hashes, dtype=np.uint64)[None, :]
+    return ((h1 + steps * h2) % np.uint64(num_bits)).astype(np.int64)
+
+
+class DedupStore:
+    """
+    Base class for dedup stores
+
+    A store keeps the content hashes seen per namespace (platform). Hashes
+    age out after the TTL, and memory is fixed by the capacity rather than
+    by how many items were ever seen. Membership is probabilistic: a small
+    false positive rate (error_rate) is traded for the fixed size.
+    """
+
+    def __init__(self, capacity: Optional[int] = None, error_rate: Optional[float] = None,
+                 ttl: Optional[int] = None, generations: Optional[int] = None):
+        """
+        Initialize dedup store
+
+        Args:
+            capacity: Items per namespace within one TTL window (default from config)
+            error_rate: False positive rate at capacity (default from config)
+            ttl: Seconds a hash is remembered, 0 to never forget (default from config)
+            generations: Filters per namespace the TTL window is split into (default from config)
+        """
+        matcher_config = config.matcher
+        self.capacity = capacity or matcher_config.dedup_capacity
+        self.error_rate = error_rate or matcher_config.dedup_error_rate
+        self.ttl = matcher_config.dedup_ttl if ttl is None else ttl
+        self.generations = max(2, generations or matcher_config.dedup_generations)
+        if self.ttl <= 0:
+            self.generations = 1
+
+        # Each generation holds the hashes added during one span; a hash is
+        # remembered for at least ttl and less than ttl + span
+        self.span = self.ttl / (self.generations - 1) if self.ttl > 0 else 0
+        self.num_bits, self.num_hashes = bloom_parameters(self.capacity, self.error_rate)
+
+    def _epoch(self, now: Optional[float] = None) -> int:
+        if not self.span:
+            return 0
+        return int((time.time() if now is None else now) // self.span)
+
+    async def check_and_add(self, namespace: str, keys: List[str]) -> List[bool]:
+        """
+        Flag keys already seen and remember the new ones
+
+        A key repeated within the call is flagged after its first occurrence.
+
+        Args:
+            namespace: Namespace (platform)
+            keys: Content hashes
+
+        Returns:
+            Seen flag per key
+        """
+        raise NotImplementedError
+
+    def save(self) -> None:
+        """Snapshot the store, if it supports it"""
+
+    async def reset(self) -> None:
+        """Forget every key"""
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        """Release resources"""
+
+
+class BloomDedupStore(DedupStore):
+    """
+    In-process dedup store
+
+    Features:
+    - One Bloom filter per namespace and generation, sized from capacity
+      and error_rate, so memory stays fixed
+    - Generations rotate every ttl / (generations - 1) seconds; the oldest
+      one is cleared and reused
+    - Optional snapshots to {snapshot_dir}/{namespace}.bloom.npz, reloaded
+      on startup
+    """
+
+    def __init__(self, snapshot_dir: Optional[Union[str, Path]] = None, **kwargs):
+        """
+        Initialize Bloom dedup store
+
+        Args:
+            snapshot_dir: Directory for snapshots; None keeps the filters in memory only
+            **kwargs: DedupStore parameters
+        """
+        super().__init__(**kwargs)
+        self.snapshot_dir = Path(snapshot_dir) if snapshot_dir else None
+        self._filters: Dict[str, Dict[str, np.ndarray]] = {}
+        self._dirty = set()
+
+    def _snapshot_path(self, namespace: str) -> Optional[Path]:
+        return self.snapshot_dir / f"{namespace}.bloom.npz" if self.snapshot_dir else None
+
+    def _filter(self, namespace: str) -> Dict[str, np.ndarray]:
+        """Get the generations of a namespace, loading its snapshot if present"""
+        if namespace in self._filters:
+            return self._filters[namespace]
+
+        state = {
+            "bits": np.zeros((self.generations, self.num_bits // 8), dtype=np.uint8),
+            "epochs": np.full(self.generations, -1, dtype=np.int64),
+            "counts": np.zeros(self.generations, dtype=np.int64),
+        }
+        path = self._snapshot_path(namespace)
+        if path is not None and path.exists():
+            with np.load(path) as data:
+                if data["bits"].shape == state["bits"].shape and float(data["span"]) == self.span \
+                        and int(data["num_hashes"]) == self.num_hashes:
+                    state = {name: data[name].copy() for name in state}
+                    logger.info(f"Loaded dedup snapshot {path}")
+                else:
+                    logger.warning(f"Ignoring dedup snapshot {path}: filter parameters changed")
+        self._filters[namespace] = state
+        return state
+
+    async def check_and_add(self, namespace: str, keys: List[str]) -> List[bool]:
+        return self.check_and_add_now(namespace, keys)
+
+    def check_and_add_now(self, namespace: str, keys: List[str]) -> List[bool]:
+        """Synchronous check_and_add"""
+        if not keys:
+            return []
+
+        state = self._filter(namespace)
+        epoch = self._epoch()
+        slot = epoch % self.generations
+        if state["epochs"][slot] != epoch:
+            state["bits"][slot] = 0
+            state["epochs"][slot] = epoch
+            state["counts"][slot] = 0
+        live = np.nonzero(state["epochs"] > epoch - self.generations)[0]
+
+        # Repeats inside the call are decided by their first occurrence
+        first: Dict[str, int] = {}
+        for i, key in enumerate(keys):
+            first.setdefault(key, i)
+        unique = list(first)
+
+        positions = bloom_positions(unique, self.num_bits, self.num_hashes)
+        byte_index = positions >> 3
+        masks = (1 << (positions & 7)).astype(np.uint8)
+        present = (state["bits"][live][:, byte_index] & masks) != 0
+        seen = present.all(axis=2).any(axis=0)
+
+        new = ~seen
+        if new.any():
+            np.bitwise_or.at(state["bits"][slot], byte_index[new].ravel(), masks[new].ravel())
+            state["counts"][slot] += int(new.sum())
+            self._dirty.add(namespace)
+            if state["counts"][slot] > self.capacity:
+                logger.warning(
+                    f"Dedup filter for {namespace} is over capacity "
+                    f"({state['counts'][slot]} > {self.capacity}); false positives will rise"
+                )
+
+        seen_by_key = dict(zip(unique, seen.tolist()))
+        return [seen_by_key[key] if first[key] == i else True for i, key in enumerate(keys)]
+
+    def save(self) -> None:
+        """Write snapshots of the namespaces that changed"""
+        if self.snapshot_dir is None:
+            return
+        self.snapshot_dir.mkdir(parents=True, exist_ok=True)
+        for namespace in list(self._dirty):
+            state = self._filters[namespace]
+            with open(self._snapshot_path(namespace), 'wb') as f:
+                np.savez(f, span=self.span, num_hashes=self.num_hashes, **state)
+        self._dirty.clear()
+
+    async def reset(self) -> None:
+        self._filters.clear()
+        self._dirty.clear()
+        if self.snapshot_dir is not None:
+            for path in self.snapshot_dir.glob("*.bloom.npz"):
+                path.unlink(missing_ok=True)
+
+
+_CHECK_AND_ADD_SCRIPT = """
+-- KEYS: live generation bitmaps, current generation first
+-- ARGV[1]: hashes per item, ARGV[2]: expiry of the current generation (unix time, 0 for none)
+-- ARGV[3..]: bit positions, num_hashes per item
+local k = tonumber(ARGV[1])
+local n = (#ARGV - 2) / k
+local result = {}
+local added = 0
+for i = 0, n - 1 do
+    local base = 3 + i * k
+    local seen = 0
+    for _, key in ipairs(KEYS) do
+        local all = 1
+        for j = 0, k - 1 do
+            if redis.call('GETBIT', key, ARGV[base + j]) == 0 then
+                all = 0
+                break
+            end
+        end
+        if all == 1 then
+            seen = 1
+            break
+        end
+    end
+    if seen == 0 then
+        for j = 0, k - 1 do
+            redis.call('SETBIT', KEYS[1], ARGV[base + j], 1)
+        end
+        added = added + 1
+    end
+    result[i + 1] = seen
+end
+if added > 0 and tonumber(ARGV[2]) > 0 then
+    redis.call('EXPIREAT', KEYS[1], ARGV[2])
+end
+return result
+"""
+
+
+class RedisDedupStore(DedupStore):
+    """
+    Dedup store shared through Redis
+
+    Features:
+    - One Redis bitmap per namespace and generation, so every Celery worker
+      and API process sees the same seen set
+    - Check-and-add runs as one Lua script, so two workers racing on the
+      same item cannot both keep it
+    - Generation keys expire on their own once they leave the TTL window
+    - Keys of a namespace share a hash tag and work with Redis Cluster
+    """
+
+    BATCH_SIZE = 1000
+
+    def __init__(self, client: Optional["redis.Redis"] = None, prefix: Optional[str] = None,
+                 **kwargs):
+        """
+        Initialize Redis dedup store
+
+        Args:
+            client: Redis client (default built from the database config)
+            prefix: Key prefix (default from config)
+            **kwargs: DedupStore parameters
+        """
+        super().__init__(**kwargs)
+        self.prefix = prefix or config.matcher.dedup_redis_prefix
+        self.client = client or redis.Redis(
+            host=config.database.redis_host,
+            port=config.database.redis_port,
+            db=config.database.redis_db,
+            password=config.database.redis_password,
+            socket_connect_timeout=5,
+            socket_keepalive=True,
+        )
+        self._script = self.client.register_script(_CHECK_AND_ADD_SCRIPT)
+
+    def _key(self, namespace: str, epoch: int) -> str:
+        return f"{self.prefix}:{{{namespace}}}:{epoch}"
+
+    async def check_and_add(self, namespace: str, keys: List[str]) -> List[bool]:
+        if not keys:
+            return []
+
+        epoch = self._epoch()
+        generation_keys = [self._key(namespace, epoch - g) for g in range(self.generations)]
+        expire_at = int((epoch + self.generations) * self.span) + 1 if self.span else 0
+
+        flags: List[bool] = []
+        try:
+            for start in range(0, len(keys), self.BATCH_SIZE):
+                positions = bloom_positions(
+                    keys[start:start + self.BATCH_SIZE], self.num_bits, self.num_hashes
+                )
+                result = await self._script(
+                    keys=generation_keys,
+                    args=[self.num_hashes, expire_at, *positions.ravel().tolist()],
+                )
+                flags.extend(bool(seen) for seen in result)
+        except Exception as e:
+            # Keep collecting without fleet-wide dedup rather than failing
+            logger.error(f"Redis dedup check failed for {namespace}: {e}")
+            flags.extend([False] * (len(keys) - len(flags)))
+        return flags
+
+    async def reset(self) -> None:
+        try:
+            keys = [key async for key in self.client.scan_iter(match=f"{self.prefix}:*")]
+            if keys:
+                await self.client.delete(*keys)
+        except Exception as e:
+            logger.error(f"Error resetting Redis dedup store: {e}")
+
+    async def close(self) -> None:
+        await self.client.close()
+
+
+def create_dedup_store(backend: Optional[str] = None,
+                       snapshot_dir: Optional[Union[str, Path]] = None) -> DedupStore:
+    """
+    Create the configured dedup store
+
+    Args:
+        backend: "memory" or "redis" (default from config)
+        snapshot_dir: Snapshot directory of the memory store
+
+    Returns:
+        Dedup store
+    """
+    backend = backend or config.matcher.dedup_store
+    if backend == "redis":
+        return RedisDedupStore()
+    if backend == "memory":
+        return BloomDedupStore(snapshot_dir=snapshot_dir)
+    raise ValueError(f"Unknown dedup store: {backend}")
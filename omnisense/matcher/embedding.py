@@ -0,0 +1,269 @@
+"""
+Process-wide embedding service
+Loads the sentence-transformer once and coalesces concurrent encode calls
+into micro-batches
+"""
+
+import asyncio
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from omnisense.config import config
+from omnisense.utils.logger import get_logger
+from omnisense.utils.inference_cache import InferenceCache, get_inference_cache
+from omnisense.utils.onnx_backend import backend_version, load_sentence_encoder
+
+logger = get_logger(__name__)
+
+
+class EmbeddingService:
+    """
+    Shared sentence embedding service
+
+    Features:
+    - The model is loaded once per process, on first use, through torch or
+      ONNX Runtime (config.inference.backend)
+    - Concurrent embed() calls are coalesced into batches of up to batch_size
+      texts, waiting at most max_wait_ms for a batch to fill
+    - Embeddings are L2-normalized, so a dot product is the cosine similarity
+    - Query embeddings are kept in a bounded LRU cache, and text embeddings
+      in the shared inference cache
+    """
+
+    def __init__(
+        self,
+        model_name: Optional[str] = None,
+        batch_size: Optional[int] = None,
+        max_wait_ms: Optional[float] = None,
+        query_cache_size: Optional[int] = None,
+        cache: Optional[InferenceCache] = None,
+    ):
+        """
+        Initialize embedding service
+
+        Args:
+            model_name: Sentence-transformers model (default from config)
+            batch_size: Maximum texts per model call (default from config)
+            max_wait_ms: Time to wait for a batch to fill (default from config)
+            query_cache_size: Cached query embeddings (default from config)
+            cache: Inference cache for text embeddings (default process-wide cache, if enabled)
+        """
+        self.model_name = model_name or config.matcher.bert_model
+        self.batch_size = max(1, batch_size or config.matcher.embedding_batch_size)
+        self.max_wait = (
+            config.matcher.embedding_max_wait_ms if max_wait_ms is None else max_wait_ms
+        ) / 1000
+        self.query_cache_size = (
+            config.matcher.query_cache_size if query_cache_size is None else query_cache_size
+        )
+
+        self.cache = cache or get_inference_cache()
+        self._model = None
+        self._model_lock = threading.Lock()
+        self._query_cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+        # Batching queue and worker, bound to the running event loop; the worker
+        # exits once the queue drains and is restarted by the next request
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        self._stats = {
+            "model_calls": 0,
+            "texts_encoded": 0,
+            "query_cache_hits": 0,
+            "query_cache_misses": 0,
+        }
+
+    @property
+    def model(self):
+        """The sentence-transformer, loaded on first access"""
+        if self._model is None:
+            with self._model_lock:
+                if self._model is None:
+                    self._model = self._load_model()
+        return self._model
+
+    def _load_model(self):
+        if config.inference.backend == 'onnx':
+            try:
+                model = load_sentence_encoder(self.model_name)
+                logger.info(f"Loaded model: {self.model_name} (ONNX Runtime)")
+                return model
+            except Exception as e:
+                logger.warning(f"Failed to load ONNX model, using torch: {e}")
+
+        from sentence_transformers import SentenceTransformer
+
+        try:
+            model = SentenceTransformer(self.model_name)
+            if config.matcher.use_gpu:
+                model = model.to('cuda')
+            logger.info(f"Loaded model: {self.model_name}")
+            return model
+        except Exception as e:
+            logger.error(f"Failed to load model: {e}")
+            raise
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """
+        Encode texts synchronously
+
+        Args:
+            texts: Texts to encode
+
+        Returns:
+            Normalized embeddings, shape (len(texts), dim)
+        """
+        if not texts:
+            return np.zeros((0, config.matcher.vector_dim), dtype=np.float32)
+        if self.cache is None:
+            return self._encode(texts)
+
+        vectors = self.cache.get_or_compute(
+            self.model_name, backend_version(self.model), list(texts),
+            lambda missing: list(self._encode(missing))
+        )
+        return np.stack(vectors)
+
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        """Run the model on texts"""
+        self._stats["model_calls"] += 1
+        self._stats["texts_encoded"] += len(texts)
+        embeddings = self.model.encode(
+            texts,
+            batch_size=self.batch_size,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            show_progress_bar=False,
+        )
+        return np.asarray(embeddings, dtype=np.float32)
+
+    def _cached_query(self, query: str) -> Optional[np.ndarray]:
+        with self._cache_lock:
+            cached = self._query_cache.get(query)
+            if cached is None:
+                self._stats["query_cache_misses"] += 1
+                return None
+            self._query_cache.move_to_end(query)
+            self._stats["query_cache_hits"] += 1
+            return cached
+
+    def _cache_query(self, query: str, vector: np.ndarray) -> None:
+        if self.query_cache_size <= 0:
+            return
+        with self._cache_lock:
+            self._query_cache[query] = vector
+            while len(self._query_cache) > self.query_cache_size:
+                self._query_cache.popitem(last=False)
+
+    def encode_query(self, query: str) -> np.ndarray:
+        """Encode a query, using the LRU cache"""
+        vector = self._cached_query(query)
+        if vector is None:
+            vector = self.encode([query])[0]
+            self._cache_query(query, vector)
+        return vector
+
+    async def embed_query(self, query: str) -> np.ndarray:
+        """Encode a query through the batching queue, using the LRU cache"""
+        vector = self._cached_query(query)
+        if vector is None:
+            vector = (await self.embed([query]))[0]
+            self._cache_query(query, vector)
+        return vector
+
+    async def embed(self, texts: List[str]) -> np.ndarray:
+        """
+        Encode texts through the micro-batching queue
+
+        Calls from concurrent coroutines are merged into shared model calls.
+
+        Args:
+            texts: Texts to encode
+
+        Returns:
+            Normalized embeddings, shape (len(texts), dim)
+        """
+        if not texts:
+            return self.encode([])
+
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = None
+
+        future = loop.create_future()
+        self._queue.put_nowait((list(texts), future))
+        if self._worker is None or self._worker.done():
+            self._worker = loop.create_task(self._run_worker(self._queue))
+        return await future
+
+    async def _run_worker(self, queue: asyncio.Queue) -> None:
+        """Coalesce queued requests into batches and encode them until the queue drains"""
+        while not queue.empty():
+            pending: List[Tuple[List[str], asyncio.Future]] = [queue.get_nowait()]
+            size = len(pending[0][0])
+
+            # Give concurrent callers a moment to join the batch
+            deadline = asyncio.get_running_loop().time() + self.max_wait
+            while size < self.batch_size:
+                timeout = deadline - asyncio.get_running_loop().time()
+                if timeout <= 0:
+                    break
+                try:
+                    request = await asyncio.wait_for(queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                pending.append(request)
+                size += len(request[0])
+
+            texts = [text for request_texts, _ in pending for text in request_texts]
+            try:
+                embeddings = await asyncio.to_thread(self.encode, texts)
+            except Exception as e:
+                for _, future in pending:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            offset = 0
+            for request_texts, future in pending:
+                end = offset + len(request_texts)
+                if not future.done():
+                    future.set_result(embeddings[offset:end])
+                offset = end
+
+    def clear_cache(self) -> None:
+        """Clear cached query embeddings"""
+        with self._cache_lock:
+            self._query_cache.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get service statistics"""
+        return {
+            **self._stats,
+            "model_loaded": self._model is not None,
+            "query_cache_size": len(self._query_cache),
+            "inference_cache": self.cache.get_stats() if self.cache is not None else None,
+        }
+
+
+# Process-wide service instance
+_embedding_service: Optional[EmbeddingService] = None
+_embedding_service_lock = threading.Lock()
+
+
+def get_embedding_service() -> EmbeddingService:
+    """Get the process-wide embedding service, creating it on first use"""
+    global _embedding_service
+    if _embedding_service is None:
+        with _embedding_service_lock:
+            if _embedding_service is None:
+                _embedding_service = EmbeddingService()
+    return _embedding_service
@@ -4,13 +4,15 @@ Semantic matching, deduplication, and relevance scoring
 """
 
 import hashlib
-from typing import Any, Dict, List, Optional, Tuple
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
 import numpy as np
-from sentence_transformers import SentenceTransformer
 import faiss
 
 from omnisense.config import config
 from omnisense.utils.logger import get_logger
+from omnisense.matcher.dedup_store import DedupStore, create_dedup_store
+from omnisense.matcher.embedding import EmbeddingService, get_embedding_service
 
 logger = get_logger(__name__)
 
@@ -18,30 +20,23 @@ logger = get_logger(__name__)
 class BaseMatcher:
     """Base class for content matching"""
 
-    def __init__(self):
-        self.model = None
+    def __init__(self, embeddings: Optional[EmbeddingService] = None):
+        # The model lives in the process-wide embedding service and is shared
+        # by every matcher instead of being loaded per instance
+        self.embeddings = embeddings or get_embedding_service()
         self.index = None
-        self._load_model()
 
-    def _load_model(self):
-        """Load BERT model for semantic matching"""
-        try:
-            self.model = SentenceTransformer(config.matcher.bert_model)
-            if config.matcher.use_gpu:
-                self.model = self.model.to('cuda')
-            logger.info(f"Loaded model: {config.matcher.bert_model}")
-        except Exception as e:
-            logger.error(f"Failed to load model: {e}")
-            raise
+    @property
+    def model(self):
+        """Sentence-transformer used for semantic matching"""
+        return self.embeddings.model
 
     def compute_similarity(self, text1: str, text2: str) -> float:
-        """Compute semantic similarity between two texts"""
+        """Compute semantic similarity between a text and a (cached) query"""
         try:
-            embeddings = self.model.encode([text1, text2])
-            similarity = np.dot(embeddings[0], embeddings[1]) / (
-                np.linalg.norm(embeddings[0]) * np.linalg.norm(embeddings[1])
-            )
-            return float(similarity)
+            embedding = self.embeddings.encode([text1])[0]
+            query = self.embeddings.encode_query(text2)
+            return float(np.dot(embedding, query))
         except Exception as e:
             logger.error(f"Error computing similarity: {e}")
             return 0.0
@@ -59,6 +54,16 @@ class BaseMatcher:
         """
         raise NotImplementedError
 
+    async def match_batch(self, contents: List[Dict[str, Any]],
+                          criteria: Dict[str, Any]) -> List[Tuple[bool, float]]:
+        """
+        Match a list of contents against criteria
+
+        Returns:
+            (is_match, score) per content
+        """
+        return [self.match(content, criteria) for content in contents]
+
 
 class TextMatcher(BaseMatcher):
     """Text-based content matcher"""
@@ -69,6 +74,39 @@ class TextMatcher(BaseMatcher):
         if not text:
             return False, 0.0
 
+        similarity = None
+        if 'semantic_query' in criteria:
+            similarity = self.compute_similarity(text, criteria['semantic_query'])
+        return self._score(text, criteria, similarity)
+
+    async def match_batch(self, contents: List[Dict[str, Any]],
+                          criteria: Dict[str, Any]) -> List[Tuple[bool, float]]:
+        """Match texts against criteria, embedding them in one batch"""
+        texts = [self._extract_text(content) for content in contents]
+        indices = [i for i, text in enumerate(texts) if text]
+
+        similarities = np.zeros(len(texts), dtype=np.float32)
+        if 'semantic_query' in criteria and indices:
+            try:
+                query = await self.embeddings.embed_query(criteria['semantic_query'])
+                embeddings = await self.embeddings.embed([texts[i] for i in indices])
+                # One matrix-vector product scores every text (embeddings are normalized)
+                similarities[indices] = embeddings @ query
+            except Exception as e:
+                logger.error(f"Error computing similarity: {e}")
+
+        results = []
+        for i, text in enumerate(texts):
+            if not text:
+                results.append((False, 0.0))
+                continue
+            similarity = float(similarities[i]) if 'semantic_query' in criteria else None
+            results.append(self._score(text, criteria, similarity))
+        return results
+
+    def _score(self, text: str, criteria: Dict[str, Any],
+               similarity: Optional[float]) -> Tuple[bool, float]:
+        """Combine keyword and semantic scores"""
         score = 0.0
 
         # Keyword matching
@@ -77,9 +115,8 @@ class TextMatcher(BaseMatcher):
             score += keyword_score * 0.4
 
         # Semantic matching
-        if 'semantic_query' in criteria:
-            semantic_score = self.compute_similarity(text, criteria['semantic_query'])
-            score += semantic_score * 0.6
+        if similarity is not None:
+            score += similarity * 0.6
 
         is_match = score >= config.matcher.similarity_threshold
         return is_match, score
@@ -105,14 +142,40 @@ class TextMatcher(BaseMatcher):
 class MultiModalMatcher(BaseMatcher):
     """Multi-modal content matcher (text + image + video)"""
 
+    def __init__(self, embeddings: Optional[EmbeddingService] = None):
+        super().__init__(embeddings)
+        self.text_matcher = TextMatcher(self.embeddings)
+
     def match(self, content: Dict[str, Any], criteria: Dict[str, Any]) -> Tuple[bool, float]:
         """Match multi-modal content"""
+        text_score = None
+        if self._has_text(content):
+            _, text_score = self.text_matcher.match(content, criteria)
+        return self._combine(content, criteria, text_score)
+
+    async def match_batch(self, contents: List[Dict[str, Any]],
+                          criteria: Dict[str, Any]) -> List[Tuple[bool, float]]:
+        """Match multi-modal contents, scoring all texts in one batch"""
+        text_items = [content for content in contents if self._has_text(content)]
+        text_results = iter(await self.text_matcher.match_batch(text_items, criteria))
+
+        results = []
+        for content in contents:
+            text_score = next(text_results)[1] if self._has_text(content) else None
+            results.append(self._combine(content, criteria, text_score))
+        return results
+
+    @staticmethod
+    def _has_text(content: Dict[str, Any]) -> bool:
+        return 'text' in content or 'title' in content or 'description' in content
+
+    def _combine(self, content: Dict[str, Any], criteria: Dict[str, Any],
+                 text_score: Optional[float]) -> Tuple[bool, float]:
+        """Average the text, image and video scores"""
         scores = []
 
         # Text matching
-        if 'text' in content or 'title' in content or 'description' in content:
-            text_matcher = TextMatcher()
-            _, text_score = text_matcher.match(content, criteria)
+        if text_score is not None:
             scores.append(text_score)
 
         # Image matching (if available)
@@ -142,30 +205,385 @@ class MultiModalMatcher(BaseMatcher):
         return 0.5
 
 
-class Deduplicator:
-    """Content deduplication"""
+_SHINGLE_SIZE = 3
+_BIT_SHIFTS = np.arange(64, dtype=np.uint64)
+_SHINGLE_KEYS = np.array(
+    [0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9], dtype=np.uint64
+)
+_MAX_SHINGLES_PER_CHUNK = 1 << 20
+_MAX_LANE_VOTES = 255
+
+
+def _mix64(x: np.ndarray) -> np.ndarray:
+    """splitmix64 finalizer, vectorized (uint64 arithmetic wraps)"""
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+def _popcount64(x: np.ndarray) -> np.ndarray:
+    """Number of set bits per uint64 element"""
+    x = np.ascontiguousarray(x, dtype=np.uint64)
+    bits = np.unpackbits(x.view(np.uint8).reshape(x.shape + (8,)), axis=-1)
+    return bits.sum(axis=-1, dtype=np.int32)
+
+
+def simhash64(texts: List[str]) -> np.ndarray:
+    """
+    64-bit SimHash of character 3-shingles for each text
+
+    Character shingles need no word segmentation, so Chinese text works as
+    well as English. Shingle hashing and bit voting are vectorized over the
+    whole batch.
+
+    Returns:
+        uint64 array, one fingerprint per text
+    """
+    result = np.zeros(len(texts), dtype=np.uint64)
+    start = 0
+    while start < len(texts):
+        # Chunk the batch so the shingle-by-bit vote matrix stays bounded
+        end, shingles = start, 0
+        while end < len(texts) and (end == start or shingles < _MAX_SHINGLES_PER_CHUNK):
+            shingles += len(texts[end])
+            end += 1
+        result[start:end] = _simhash_chunk(texts[start:end])
+        start = end
+    return result
+
+
+def _simhash_chunk(texts: List[str]) -> np.ndarray:
+    lengths = np.fromiter((len(text) for text in texts), dtype=np.int64, count=len(texts))
+    flat = np.frombuffer(''.join(texts).lower().encode('utf-32-le'), dtype=np.uint32)
+    flat = np.append(flat, np.zeros(_SHINGLE_SIZE, dtype=np.uint32)).astype(np.uint64)
+
+    # One shingle per position, at least one per text (short texts are zero padded)
+    counts = np.maximum(lengths - _SHINGLE_SIZE + 1, 1)
+    firsts = np.cumsum(counts) - counts
+    offsets = np.cumsum(lengths) - lengths
+    owner = np.repeat(np.arange(len(texts)), counts)
+    positions = np.arange(counts.sum()) - firsts[owner] + offsets[owner]
+    limits = offsets[owner] + lengths[owner]
+
+    hashes = np.zeros(len(positions), dtype=np.uint64)
+    for k in range(_SHINGLE_SIZE):
+        index = positions + k
+        codes = np.where(index < limits, flat[index], np.uint64(0))
+        hashes ^= _mix64(codes * _SHINGLE_KEYS[k])
+    hashes = _mix64(hashes)
+
+    # Each shingle votes per bit; a bit is set when most shingles have it set.
+    # The 64 one-byte votes of a shingle are summed as eight uint64 words, one
+    # byte lane per bit, over segments of at most 255 shingles so no lane carries
+    bits = np.unpackbits(hashes.view(np.uint8).reshape(-1, 8), axis=1, bitorder='little')
+    segments = (counts + _MAX_LANE_VOTES - 1) // _MAX_LANE_VOTES
+    seg_owner = np.repeat(np.arange(len(texts)), segments)
+    seg_firsts = np.cumsum(segments) - segments
+    seg_starts = firsts[seg_owner] + _MAX_LANE_VOTES * (np.arange(len(seg_owner)) - seg_firsts[seg_owner])
+    lanes = np.add.reduceat(bits.view(np.uint64), seg_starts, axis=0)
+    ones = np.add.reduceat(lanes.view(np.uint8), seg_firsts, axis=0, dtype=np.int32)
+    return ((2 * ones > counts[:, None]).astype(np.uint64) << _BIT_SHIFTS).sum(
+        axis=1, dtype=np.uint64
+    )
+
+
+class SimHashIndex:
+    """
+    Banded LSH index over 64-bit SimHash fingerprints
+
+    The fingerprint is split into distance + 1 bands, so any two fingerprints
+    within the Hamming distance share at least one band exactly. Each band is
+    kept as a sorted array searched with np.searchsorted. New fingerprints go
+    to a small unsorted tail that is scanned directly and merged into the
+    sorted arrays once it grows.
+    """
+
+    TAIL_SIZE = 4096
+
+    def __init__(self, distance: Optional[int] = None, path: Optional[Path] = None):
+        self.distance = config.matcher.simhash_distance if distance is None else distance
+        self.path = path
+        self.dirty = False
+
+        self.hashes = np.zeros(0, dtype=np.uint64)
+        if path is not None and path.exists():
+            with np.load(path) as data:
+                self.hashes = data['hashes'].astype(np.uint64)
+                self.distance = int(data['distance'])
+            logger.info(f"Loaded SimHash index {path} ({len(self.hashes)} fingerprints)")
+
+        bands = self.distance + 1
+        width = 64 // bands
+        self._bands = [
+            (b * width, width if b < bands - 1 else 64 - b * width) for b in range(bands)
+        ]
+        self._sorted = 0
+        self._band_keys: List[np.ndarray] = []
+        self._band_ids: List[np.ndarray] = []
+        self._merge_tail()
+
+    @property
+    def size(self) -> int:
+        return len(self.hashes)
+
+    def _band_values(self, hashes: np.ndarray, band: int) -> np.ndarray:
+        shift, width = self._bands[band]
+        mask = np.uint64((1 << width) - 1)
+        return (hashes >> np.uint64(shift)) & mask
+
+    def _merge_tail(self) -> None:
+        """Rebuild the sorted band arrays to include the tail"""
+        self._band_keys, self._band_ids = [], []
+        for band in range(len(self._bands)):
+            values = self._band_values(self.hashes, band)
+            order = np.argsort(values, kind='stable')
+            self._band_keys.append(values[order])
+            self._band_ids.append(order)
+        self._sorted = len(self.hashes)
+
+    def query(self, hashes: np.ndarray) -> np.ndarray:
+        """Flag fingerprints within the Hamming distance of an indexed one"""
+        flags = np.zeros(len(hashes), dtype=bool)
+        if self.size == 0 or len(hashes) == 0:
+            return flags
+
+        # Unsorted tail: compare every query against it directly
+        tail = self.hashes[self._sorted:]
+        if len(tail):
+            flags |= (_popcount64(hashes[:, None] ^ tail[None, :]) <= self.distance).any(axis=1)
+
+        for band in range(len(self._bands)):
+            keys = self._band_keys[band]
+            values = self._band_values(hashes, band)
+            lo = np.searchsorted(keys, values, side='left')
+            hi = np.searchsorted(keys, values, side='right')
+            for q in np.nonzero((hi > lo) & ~flags)[0]:
+                ids = self._band_ids[band][lo[q]:hi[q]]
+                if (_popcount64(self.hashes[ids] ^ hashes[q]) <= self.distance).any():
+                    flags[q] = True
+        return flags
+
+    def within_batch(self, hashes: np.ndarray, skip: np.ndarray) -> np.ndarray:
+        """Flag fingerprints near an earlier, unskipped fingerprint of the same batch"""
+        flags = np.zeros(len(hashes), dtype=bool)
+        buckets: List[Dict[int, List[int]]] = [{} for _ in self._bands]
+        band_values = [self._band_values(hashes, band).tolist() for band in range(len(self._bands))]
+
+        for j in range(len(hashes)):
+            if skip[j]:
+                continue
+            candidates = {i for band, bucket in enumerate(buckets)
+                          for i in bucket.get(band_values[band][j], ())}
+            if candidates:
+                ids = np.fromiter(candidates, dtype=np.int64)
+                if (_popcount64(hashes[ids] ^ hashes[j]) <= self.distance).any():
+                    flags[j] = True
+                    continue
+            for band, bucket in enumerate(buckets):
+                bucket.setdefault(band_values[band][j], []).append(j)
+        return flags
+
+    def add(self, hashes: np.ndarray) -> None:
+        """Add fingerprints to the index"""
+        if len(hashes) == 0:
+            return
+        self.hashes = np.concatenate([self.hashes, hashes.astype(np.uint64)])
+        self.dirty = True
+        if self.size - self._sorted > self.TAIL_SIZE:
+            self._merge_tail()
+
+    def save(self) -> None:
+        """Write the fingerprints to their path if they changed"""
+        if self.path is None or not self.dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, 'wb') as f:
+            np.savez(f, hashes=self.hashes, distance=self.distance)
+        self.dirty = False
+
+
+class VectorIndex:
+    """
+    Inner-product FAISS index over normalized embeddings
+
+    Starts as an exact flat index and switches to HNSW once it holds
+    hnsw_threshold vectors, so lookups stay sub-millisecond at millions of
+    items. HNSW needs no training, so vectors can keep being added.
+    """
+
+    def __init__(self, dim: int, hnsw_threshold: Optional[int] = None,
+                 path: Optional[Path] = None):
+        self.dim = dim
+        self.hnsw_threshold = hnsw_threshold or config.matcher.dedup_hnsw_threshold
+        self.path = path
+        self.dirty = False
+
+        if path is not None and path.exists():
+            self.index = faiss.read_index(str(path))
+            self.dim = self.index.d
+            logger.info(f"Loaded dedup index {path} ({self.index.ntotal} vectors)")
+        else:
+            self.index = faiss.IndexFlatIP(dim)
+
+    @property
+    def size(self) -> int:
+        return self.index.ntotal
+
+    @property
+    def is_hnsw(self) -> bool:
+        return isinstance(self.index, faiss.IndexHNSWFlat)
+
+    def search(self, vectors: np.ndarray) -> np.ndarray:
+        """Return the best inner product for each vector (-1 when empty)"""
+        if self.size == 0 or len(vectors) == 0:
+            return np.full(len(vectors), -1.0, dtype=np.float32)
+        scores, _ = self.index.search(np.ascontiguousarray(vectors, dtype=np.float32), 1)
+        return scores[:, 0]
+
+    def add(self, vectors: np.ndarray) -> None:
+        """Add vectors, upgrading to HNSW past the threshold"""
+        if len(vectors) == 0:
+            return
+        self.index.add(np.ascontiguousarray(vectors, dtype=np.float32))
+        self.dirty = True
+        if not self.is_hnsw and self.size >= self.hnsw_threshold:
+            self._upgrade()
+
+    def _upgrade(self) -> None:
+        existing = self.index.reconstruct_n(0, self.size)
+        index = faiss.IndexHNSWFlat(self.dim, 32, faiss.METRIC_INNER_PRODUCT)
+        index.hnsw.efSearch = 64
+        index.add(existing)
+        self.index = index
+        logger.info(f"Dedup index switched to HNSW at {self.size} vectors")
+
+    def save(self) -> None:
+        """Write the index to its path if it changed"""
+        if self.path is None or not self.dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        faiss.write_index(self.index, str(self.path))
+        self.dirty = False
 
-    def __init__(self):
-        self.seen_hashes = set()
-        self.vector_index = None
-        self.vectors = []
 
-    def is_duplicate(self, content: Dict[str, Any], threshold: float = 0.95) -> bool:
+class Deduplicator:
+    """
+    Content deduplication
+
+    Exact duplicates are caught by a hash of title + description, kept in a
+    bounded, aging dedup store that may be shared by every worker. Textually
+    near-identical items are caught next by a per-platform SimHash LSH index,
+    without running the model. Only the remaining items are embedded and
+    compared against a per-platform FAISS index with a cosine threshold.
+    """
+
+    def __init__(self, embeddings: Optional[EmbeddingService] = None,
+                 threshold: Optional[float] = None,
+                 semantic: Optional[bool] = None,
+                 index_dir: Optional[Union[str, Path]] = None,
+                 simhash: Optional[bool] = None,
+                 store: Optional[DedupStore] = None):
+        """
+        Initialize deduplicator
+
+        Args:
+            embeddings: Embedding service (default process-wide service)
+            threshold: Cosine similarity above which items are duplicates (default from config)
+            semantic: Enable embedding-based near-duplicate detection (default from config)
+            index_dir: Directory the per-platform indexes persist to; None keeps
+                them in memory (default from config when dedup_persist is set)
+            simhash: Enable the SimHash near-identical tier (default from config)
+            store: Store of seen content hashes (default from config; the memory
+                store snapshots to index_dir)
+        """
+        self._embeddings = embeddings
+        self.threshold = threshold if threshold is not None else config.matcher.dedup_threshold
+        self.semantic = config.matcher.dedup_semantic if semantic is None else semantic
+        if index_dir is None and config.matcher.dedup_persist:
+            index_dir = config.matcher.dedup_index_dir
+        self.index_dir = Path(index_dir) if index_dir else None
+        self.indexes: Dict[str, VectorIndex] = {}
+        self.simhash = config.matcher.dedup_simhash if simhash is None else simhash
+        self.simhash_indexes: Dict[str, SimHashIndex] = {}
+        self.store = store or create_dedup_store(snapshot_dir=self.index_dir)
+
+    @property
+    def embeddings(self) -> EmbeddingService:
+        if self._embeddings is None:
+            self._embeddings = get_embedding_service()
+        return self._embeddings
+
+    def get_index(self, platform: str, dim: Optional[int] = None) -> VectorIndex:
+        """Get the vector index for a platform, loading it from disk if persisted"""
+        if platform not in self.indexes:
+            path = self.index_dir / f"{platform}.faiss" if self.index_dir else None
+            self.indexes[platform] = VectorIndex(dim or config.matcher.vector_dim, path=path)
+        return self.indexes[platform]
+
+    def get_simhash_index(self, platform: str) -> SimHashIndex:
+        """Get the SimHash index for a platform, loading it from disk if persisted"""
+        if platform not in self.simhash_indexes:
+            path = self.index_dir / f"{platform}.simhash.npz" if self.index_dir else None
+            self.simhash_indexes[platform] = SimHashIndex(path=path)
+        return self.simhash_indexes[platform]
+
+    async def is_duplicate(self, content: Dict[str, Any], threshold: Optional[float] = None,
+                           platform: Optional[str] = None) -> bool:
         """Check if content is duplicate"""
-        # Hash-based deduplication
-        content_hash = self._compute_content_hash(content)
-        if content_hash in self.seen_hashes:
-            return True
-
-        # Vector-based deduplication
-        if self.vectors:
-            is_dup = self._check_vector_duplicate(content, threshold)
-            if is_dup:
-                return True
+        return (await self.check_batch([content], platform=platform, threshold=threshold))[0]
+
+    async def check_batch(self, contents: List[Dict[str, Any]],
+                          platform: Optional[str] = None,
+                          threshold: Optional[float] = None) -> List[bool]:
+        """
+        Check a batch of contents for duplicates
+
+        Exact duplicates are removed by the hash store (atomically, so
+        concurrent workers never both keep an item) and near-identical text by
+        SimHash; only the rest are embedded together and queried against the
+        vector index in one call. Near duplicates inside the batch are caught
+        as well. Non-duplicates are added to the indexes.
+
+        Returns:
+            Duplicate flag per content
+        """
+        flags = [False] * len(contents)
+        by_platform: Dict[str, List[int]] = {}
+        for i, content in enumerate(contents):
+            by_platform.setdefault(self._platform(content, platform), []).append(i)
+
+        for name, indices in by_platform.items():
+            # Exact duplicates; the store records every hash it has not seen
+            seen = await self.store.check_and_add(
+                name, [self._compute_content_hash(contents[i]) for i in indices]
+            )
+            for i, is_dup in zip(indices, seen):
+                flags[i] = is_dup
+            indices = [i for i in indices if not flags[i] and self._content_text(contents[i])]
+            if not indices:
+                continue
+
+            texts = [self._content_text(contents[i]) for i in indices]
+
+            if self.simhash:
+                index = self.get_simhash_index(name)
+                fingerprints = simhash64(texts)
+                near = index.query(fingerprints)
+                near |= index.within_batch(fingerprints, skip=near)
+                for i, is_dup in zip(indices, near):
+                    flags[i] = bool(is_dup)
+
+            # Only items SimHash could not decide go to the model
+            remaining = [k for k, i in enumerate(indices) if not flags[i]]
+            if self.semantic and remaining:
+                vectors = await self.embeddings.embed([texts[k] for k in remaining])
+                for k, is_dup in zip(remaining, self._check_vector_duplicate(vectors, name, threshold)):
+                    flags[indices[k]] = is_dup
+
+            if self.simhash:
+                index.add(fingerprints[[k for k, i in enumerate(indices) if not flags[i]]])
 
-        # Not duplicate, add to seen
-        self.seen_hashes.add(content_hash)
-        return False
+        return flags
 
     def _compute_content_hash(self, content: Dict[str, Any]) -> str:
         """Compute content hash for deduplication"""
@@ -173,23 +591,77 @@ class Deduplicator:
         text = f"{content.get('title', '')}{content.get('description', '')}"
         return hashlib.md5(text.encode()).hexdigest()
 
-    def _check_vector_duplicate(self, content: Dict[str, Any], threshold: float) -> bool:
-        """Check for near-duplicates using vector similarity"""
-        # TODO: Implement vector-based deduplication with FAISS
-        return False
+    @staticmethod
+    def _content_text(content: Dict[str, Any]) -> str:
+        return ' '.join(
+            str(content[key]) for key in ('title', 'description', 'text') if content.get(key)
+        )
 
-    def add_content(self, content: Dict[str, Any], vector: Optional[np.ndarray] = None):
+    @staticmethod
+    def _platform(content: Dict[str, Any], platform: Optional[str]) -> str:
+        return platform or content.get('platform') or 'default'
+
+    def _check_vector_duplicate(self, vectors: np.ndarray, platform: str,
+                                threshold: Optional[float] = None) -> List[bool]:
+        """
+        Check normalized vectors for near-duplicates and index the new ones
+
+        A vector is a duplicate if it is within the cosine threshold of an
+        indexed vector or of an earlier non-duplicate vector in the same batch.
+        """
+        threshold = self.threshold if threshold is None else threshold
+        index = self.get_index(platform, vectors.shape[1])
+
+        flags = (index.search(vectors) >= threshold).tolist()
+
+        # Near duplicates within the batch, against earlier kept items
+        similarities = vectors @ vectors.T
+        kept: List[int] = []
+        for j, is_dup in enumerate(flags):
+            if is_dup:
+                continue
+            if kept and similarities[j, kept].max() >= threshold:
+                flags[j] = True
+            else:
+                kept.append(j)
+
+        index.add(vectors[kept])
+        return flags
+
+    async def add_content(self, content: Dict[str, Any], vector: Optional[np.ndarray] = None,
+                          platform: Optional[str] = None):
         """Add content to deduplication index"""
-        content_hash = self._compute_content_hash(content)
-        self.seen_hashes.add(content_hash)
+        platform = self._platform(content, platform)
+        await self.store.check_and_add(platform, [self._compute_content_hash(content)])
+        text = self._content_text(content)
+        if text and self.simhash:
+            self.get_simhash_index(platform).add(simhash64([text]))
         if vector is not None:
-            self.vectors.append(vector)
-
-    def reset(self):
-        """Reset deduplication state"""
-        self.seen_hashes.clear()
-        self.vectors.clear()
-        self.vector_index = None
+            vector = np.asarray(vector, dtype=np.float32).reshape(1, -1)
+            vector /= max(np.linalg.norm(vector), 1e-12)
+            self.get_index(platform, vector.shape[1]).add(vector)
+
+    def save(self):
+        """Persist the per-platform vector and SimHash indexes and the hash store"""
+        for index in self.indexes.values():
+            index.save()
+        for index in self.simhash_indexes.values():
+            index.save()
+        self.store.save()
+
+    async def reset(self):
+        """Reset deduplication state, including the persisted indexes"""
+        await self.store.reset()
+        self.indexes.clear()
+        self.simhash_indexes.clear()
+        if self.index_dir is not None:
+            for pattern in ("*.faiss", "*.simhash.npz"):
+                for path in self.index_dir.glob(pattern):
+                    path.unlink(missing_ok=True)
+
+    async def close(self):
+        """Release the hash store"""
+        await self.store.close()
 
 
 class MatcherManager:
@@ -222,25 +694,41 @@ class MatcherManager:
         matcher = self.get_matcher(platform)
         results = []
 
-        for item in data:
-            # Check for duplicates
-            if self.deduplicator.is_duplicate(item):
+        # Check for duplicates
+        candidates = []
+        duplicates = await self.deduplicator.check_batch(data, platform=platform)
+        for item, is_duplicate in zip(data, duplicates):
+            if is_duplicate:
                 logger.debug(f"Skipping duplicate: {item.get('content_id')}")
                 continue
+            candidates.append(item)
 
-            # Match against criteria
+        # Match against criteria, scoring the whole batch at once
+        if criteria and candidates:
+            scored = await matcher.match_batch(candidates, criteria)
+        else:
+            scored = [(True, None)] * len(candidates)
+
+        for item, (is_match, score) in zip(candidates, scored):
             if criteria:
-                is_match, score = matcher.match(item, criteria)
                 if not is_match:
                     continue
                 item['match_score'] = score
 
             results.append(item)
-            self.deduplicator.add_content(item)
 
         logger.info(f"Matched {len(results)}/{len(data)} items for {platform}")
         return results
 
-    def reset(self):
+    def save(self):
+        """Persist deduplication state"""
+        self.deduplicator.save()
+
+    async def reset(self):
         """Reset matching state"""
-        self.deduplicator.reset()
+        await self.deduplicator.reset()
+
+    async def close(self):
+        """Persist deduplication state and release the dedup store"""
+        self.save()
+        await self.deduplicator.close()
@@ -5,11 +5,13 @@ Provides core functionality for all platform-specific spiders
 
 import asyncio
 import hashlib
+import inspect
 import json
 import time
 from abc import ABC, abstractmethod
+from contextvars import ContextVar
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set, Callable
+from typing import Any, AsyncIterator, Awaitable, Dict, List, Optional, Set, Callable, Tuple
 from contextlib import asynccontextmanager
 
 from playwright.async_api import (
@@ -23,8 +25,11 @@ from playwright.async_api import (
 
 from omnisense.config import config
 from omnisense.utils.logger import get_logger
+from omnisense.spider.browser_pool import BrowserPool, ContextLease
 from omnisense.spider.utils.playwright_helper import PlaywrightHelper
 from omnisense.spider.utils.parser import ContentParser
+from omnisense.spider.utils.response_capture import ResponseCapture
+from omnisense.storage.redis_cache import get_rate_limiter
 
 
 class BaseSpider(ABC):
@@ -33,6 +38,9 @@ class BaseSpider(ABC):
 
     Features:
     - Async Playwright browser automation
+    - Optional shared browser pool (contexts leased per task)
+    - Bounded tab pool for concurrent detail fetching
+    - Network response capture of platform JSON APIs (DOM parsing as fallback)
     - Cookie management and session persistence
     - Configurable timeouts and retries
     - Media download support
@@ -41,6 +49,10 @@ class BaseSpider(ABC):
     - Abstract methods for platform-specific implementation
     """
 
+    # URL regex patterns of the platform APIs per capture kind
+    # ("search", "user_posts", "comments"), see capture_responses()
+    response_patterns: Dict[str, List[str]] = {}
+
     def __init__(
         self,
         platform: str,
@@ -70,13 +82,36 @@ class BaseSpider(ABC):
         self._playwright: Optional[Playwright] = None
         self._browser: Optional[Browser] = None
         self._context: Optional[BrowserContext] = None
-        self._page: Optional[Page] = None
+        self._main_page: Optional[Page] = None
+
+        # Tab pool: extra pages in the same context, bound per task so that
+        # methods using self._page run on the tab leased by their task
+        self.max_pages = config.spider.max_pages_per_spider
+        self._task_page: ContextVar[Optional[Page]] = ContextVar(
+            f"task_page_{platform}_{id(self)}", default=None
+        )
+        self._extra_pages: List[Page] = []
+        self._idle_pages: Optional[asyncio.Queue] = None
+        self._page_pool_lock = asyncio.Lock()
+
+        # Item sink bound by collect_stream(): accepted items are pushed here
+        # as soon as they are ready instead of when the whole list returns
+        self._item_sink: ContextVar[Optional[asyncio.Queue]] = ContextVar(
+            f"item_sink_{platform}_{id(self)}", default=None
+        )
+
+        # Shared browser pool (set by SpiderManager); when None the spider
+        # launches its own browser
+        self.browser_pool: Optional[BrowserPool] = None
+        self._lease: Optional[ContextLease] = None
 
         # Helpers
         self.helper = PlaywrightHelper(self.logger)
         self.parser = ContentParser(self.logger)
+        self.capture_enabled = config.spider.response_capture_enabled
 
-        # Rate limiting
+        # Rate limiting (shared by all tabs of the spider)
+        self._rate_limit_lock = asyncio.Lock()
         self._last_request_time = 0.0
         self._request_count = 0
         self._rate_limit_window_start = time.time()
@@ -98,9 +133,20 @@ class BaseSpider(ABC):
         # Request delays
         self.request_delay_min = config.anti_crawl.request_delay_min
         self.request_delay_max = config.anti_crawl.request_delay_max
+        # Fleet-wide budget of the platform, enforced through Redis
+        self.platform_rate_limit = config.spider.platform_rate_limit
 
         self.logger.info(f"Initialized {platform} spider")
 
+    @property
+    def _page(self) -> Optional[Page]:
+        """Page of the current task: its leased tab, or the spider's main page"""
+        return self._task_page.get() or self._main_page
+
+    @_page.setter
+    def _page(self, page: Optional[Page]) -> None:
+        self._main_page = page
+
     @abstractmethod
     async def login(self, username: str, password: str) -> bool:
         """
@@ -185,6 +231,10 @@ class BaseSpider(ABC):
 
     async def start(self) -> None:
         """Start the browser and create context"""
+        if self.browser_pool is not None:
+            await self._start_from_pool()
+            return
+
         try:
             self.logger.info("Starting browser...")
 
@@ -233,8 +283,65 @@ class BaseSpider(ABC):
             self.logger.error(f"Failed to start browser: {e}")
             raise
 
+    async def _start_from_pool(self) -> None:
+        """Lease a context from the shared browser pool instead of launching a browser"""
+        try:
+            self.logger.info("Leasing browser context from pool...")
+
+            context_options = await self.helper.get_browser_context_options()
+            self._lease = await self.browser_pool.acquire(
+                self.platform,
+                context_options,
+                proxy=self.proxy,
+            )
+            self._browser = self._lease.browser
+            self._context = self._lease.context
+
+            # Cookies only need loading into a freshly created context
+            if self._lease.is_fresh and self._cookies_file.exists():
+                await self._load_cookies()
+
+            self._page = await self._context.new_page()
+            self._page.on("crash", self._lease.mark_crashed)
+            await self.helper.apply_stealth_scripts(self._page)
+            self._page.set_default_timeout(self.timeout)
+
+            self.logger.info("Browser context leased successfully")
+
+        except Exception as e:
+            if self._lease is not None:
+                self._lease.mark_crashed()
+                await self.browser_pool.release(self._lease)
+                self._lease = None
+            self.logger.error(f"Failed to lease browser context: {e}")
+            raise
+
+    async def _release_to_pool(self) -> None:
+        """Close the spider's page and hand its context back to the pool"""
+        lease = self._lease
+        try:
+            if self._context and config.spider.cookie_persist:
+                await self._save_cookies()
+            await self._close_extra_pages()
+            if self._page:
+                await self._page.close()
+        except Exception as e:
+            lease.mark_crashed()
+            self.logger.error(f"Error closing pooled page: {e}")
+        finally:
+            self._lease = None
+            self._page = None
+            self._context = None
+            self._browser = None
+            await self.browser_pool.release(lease)
+            self.logger.info("Browser context released to pool")
+
     async def stop(self) -> None:
         """Stop the browser and clean up resources"""
+        if self._lease is not None:
+            await self._release_to_pool()
+            return
+
         try:
             self.logger.info("Stopping browser...")
 
@@ -243,6 +350,7 @@ class BaseSpider(ABC):
                 await self._save_cookies()
 
             # Close browser
+            await self._close_extra_pages()
             if self._page:
                 await self._page.close()
             if self._context:
@@ -257,6 +365,459 @@ class BaseSpider(ABC):
         except Exception as e:
             self.logger.error(f"Error stopping browser: {e}")
 
+    async def _init_page(self, page: Page) -> None:
+        """
+        Platform hook for preparing an extra tab before first use
+
+        Args:
+            page: Newly opened page
+        """
+        pass
+
+    async def _open_page(self) -> Page:
+        """Open an extra tab in the spider's context"""
+        page = await self._context.new_page()
+        if self._lease is not None:
+            page.on("crash", self._lease.mark_crashed)
+        await self.helper.apply_stealth_scripts(page)
+        page.set_default_timeout(self.timeout)
+        await self._init_page(page)
+        return page
+
+    async def _acquire_page(self) -> Page:
+        """Take an idle tab, opening a new one while under max_pages"""
+        async with self._page_pool_lock:
+            if self._idle_pages is None:
+                self._idle_pages = asyncio.Queue()
+            if self._idle_pages.empty() and len(self._extra_pages) < self.max_pages:
+                page = await self._open_page()
+                self._extra_pages.append(page)
+                return page
+        return await self._idle_pages.get()
+
+    async def _close_extra_pages(self) -> None:
+        """Close all tabs of the tab pool"""
+        for page in self._extra_pages:
+            try:
+                await page.close()
+            except Exception as e:
+                self.logger.debug(f"Error closing tab: {e}")
+        self._extra_pages.clear()
+        self._idle_pages = None
+
+    @asynccontextmanager
+    async def page_slot(self):
+        """
+        Lease a tab from the spider's tab pool for the current task
+
+        While inside the block, self._page refers to the leased tab, so existing
+        page-based methods (navigate, get_post_detail, ...) run on it unchanged.
+        """
+        current = self._task_page.get()
+        if current is not None or self._context is None:
+            # Nested use, or no browser context: run on the current page
+            yield self._page
+            return
+
+        page = await self._acquire_page()
+        token = self._task_page.set(page)
+        try:
+            yield page
+        finally:
+            self._task_page.reset(token)
+            if self._idle_pages is None:
+                # The pool was closed while the tab was leased
+                if not page.is_closed():
+                    await page.close()
+            elif page.is_closed():
+                self._extra_pages.remove(page)
+            else:
+                self._idle_pages.put_nowait(page)
+
+    async def fetch_details(
+        self,
+        post_ids: List[str],
+        concurrency: Optional[int] = None,
+        limit: Optional[int] = None,
+        accept: Optional[Callable[[str, Dict[str, Any]], Awaitable[bool]]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetch post details concurrently across tabs
+
+        Request starts still go through the spider's rate limiter; the page
+        loads and parsing of different posts overlap.
+
+        Args:
+            post_ids: Post IDs to fetch
+            concurrency: Number of tabs to use (default from config, capped by max_pages)
+            limit: Stop fetching once this many details were accepted
+            accept: Optional async filter called as accept(post_id, detail)
+
+        Returns:
+            Accepted post details, in the order of post_ids
+        """
+        if not post_ids:
+            return []
+
+        concurrency = concurrency or config.spider.detail_concurrency
+        concurrency = max(1, min(concurrency, self.max_pages, len(post_ids)))
+        pending = iter(enumerate(post_ids))
+        accepted: Dict[int, Dict[str, Any]] = {}
+        # Held from the limit check until the detail is recorded, so details
+        # still in flight once the limit is reached are neither accepted
+        # (which may mark them collected) nor emitted
+        accept_lock = asyncio.Lock()
+
+        def full() -> bool:
+            return limit is not None and len(accepted) >= limit
+
+        async def worker():
+            for index, post_id in pending:
+                if full():
+                    return
+                try:
+                    async with self.page_slot():
+                        detail = await self.get_post_detail(post_id)
+                    if not detail:
+                        continue
+                    async with accept_lock:
+                        if full():
+                            return
+                        if accept is not None and not await accept(post_id, detail):
+                            continue
+                        accepted[index] = detail
+                    await self._emit(detail)
+                except Exception as e:
+                    self.logger.error(f"Error fetching detail {post_id}: {e}")
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+        results = [accepted[i] for i in sorted(accepted)]
+
+        self.logger.debug(
+            f"Fetched {len(results)}/{len(post_ids)} details with {concurrency} tabs"
+        )
+        return results
+
+    async def _extract_post_ids(
+        self,
+        elements: List[Any],
+        extract_id: Callable[[str], Optional[str]],
+        collected: Set[str],
+        link_selector: str = "a",
+    ) -> List[str]:
+        """
+        Extract the IDs of posts not collected yet from list elements, for fetch_details()
+
+        Args:
+            elements: List item elements
+            extract_id: Parses a post ID from a link URL
+            collected: IDs collected already
+            link_selector: Selector of the post link inside an element
+
+        Returns:
+            New post IDs, in page order
+        """
+        post_ids = []
+        for elem in elements:
+            try:
+                link_elem = await elem.query_selector(link_selector)
+                if not link_elem:
+                    continue
+
+                url = await link_elem.get_attribute('href')
+                if not url:
+                    continue
+                if url.startswith('//'):
+                    url = 'https:' + url
+
+                post_id = extract_id(url)
+                if post_id and post_id not in collected and post_id not in post_ids:
+                    post_ids.append(post_id)
+            except Exception as e:
+                self.logger.error(f"Error parsing list item: {e}")
+        return post_ids
+
+    def _make_detail_filter(
+        self,
+        criteria: Optional[Dict[str, Any]],
+        collected: Set[str],
+        match: Callable[[Dict[str, Any], Dict[str, Any]], Awaitable[Tuple[bool, float]]],
+    ) -> Callable[[str, Dict[str, Any]], Awaitable[bool]]:
+        """
+        Build a fetch_details() accept filter
+
+        The filter skips collected posts, matches the rest against criteria
+        (storing match_score on the detail) and marks accepted posts collected.
+
+        Args:
+            criteria: Match criteria, or None to accept every new post
+            collected: IDs collected already; accepted IDs are added
+            match: Async matcher returning (is_match, score)
+
+        Returns:
+            Async accept(post_id, detail) filter
+        """
+        async def accept(post_id: str, detail: Dict[str, Any]) -> bool:
+            if post_id in collected:
+                return False
+
+            if criteria:
+                is_match, match_score = await match(detail, criteria)
+                if not is_match:
+                    return False
+                detail['match_score'] = match_score
+
+            collected.add(post_id)
+            return True
+
+        return accept
+
+    async def _emit(self, item: Dict[str, Any]) -> None:
+        """Push an accepted item to the collect_stream() consumer, if any"""
+        sink = self._item_sink.get()
+        if sink is not None:
+            await sink.put(item)
+
+    async def _collect_list(
+        self,
+        keyword: Optional[str] = None,
+        user_id: Optional[str] = None,
+        url: Optional[str] = None,
+        max_count: int = 100,
+        filters: Optional[Dict[str, Any]] = None,
+        **kwargs,
+    ) -> List[Dict[str, Any]]:
+        """Dispatch a collection request to search/get_user_posts/get_post_detail"""
+        if keyword:
+            method, args = self.search, (keyword, max_count)
+        elif user_id:
+            method, args = self.get_user_posts, (user_id, max_count)
+        elif url:
+            detail = await self.get_post_detail(url)
+            return [detail] if detail else []
+        else:
+            raise ValueError("One of keyword, user_id or url is required")
+
+        # Platform spiders that filter while collecting take the filters as criteria
+        if filters and "criteria" in inspect.signature(method).parameters:
+            kwargs["criteria"] = filters
+
+        return await method(*args, **kwargs) or []
+
+    async def collect_stream(
+        self,
+        keyword: Optional[str] = None,
+        user_id: Optional[str] = None,
+        url: Optional[str] = None,
+        max_count: int = 100,
+        filters: Optional[Dict[str, Any]] = None,
+        **kwargs,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Collect items and yield them as soon as they are accepted
+
+        Items accepted through fetch_details() or filter_items() are yielded
+        while the spider keeps collecting; the bounded sink makes the spider
+        wait when the consumer falls behind. Items only available once the
+        underlying method returns are yielded at the end.
+
+        Args:
+            keyword: Search keyword
+            user_id: User ID whose posts are collected
+            url: Post URL or ID
+            max_count: Maximum number of items
+            filters: Filter criteria, passed to methods accepting criteria
+            **kwargs: Platform-specific arguments
+
+        Yields:
+            Collected items
+        """
+        sink: asyncio.Queue = asyncio.Queue(maxsize=config.pipeline.batch_size)
+        token = self._item_sink.set(sink)
+        try:
+            task = asyncio.create_task(
+                self._collect_list(keyword, user_id, url, max_count, filters, **kwargs)
+            )
+        finally:
+            self._item_sink.reset(token)
+
+        emitted: Set[int] = set()
+        count = 0
+        try:
+            while count < max_count:
+                get = asyncio.ensure_future(sink.get())
+                done, _ = await asyncio.wait(
+                    {get, task}, return_when=asyncio.FIRST_COMPLETED
+                )
+                if get not in done:
+                    get.cancel()
+                    break
+                item = get.result()
+                emitted.add(id(item))
+                count += 1
+                yield item
+
+            # Items emitted just before the task finished, then the rest of the list
+            while count < max_count and not sink.empty():
+                item = sink.get_nowait()
+                emitted.add(id(item))
+                count += 1
+                yield item
+
+            if count < max_count:
+                for item in await task:
+                    if count >= max_count:
+                        break
+                    if id(item) in emitted:
+                        continue
+                    count += 1
+                    yield item
+        finally:
+            if not task.done():
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+
+    async def collect(
+        self,
+        keyword: Optional[str] = None,
+        user_id: Optional[str] = None,
+        url: Optional[str] = None,
+        max_count: int = 100,
+        filters: Optional[Dict[str, Any]] = None,
+        **kwargs,
+    ) -> List[Dict[str, Any]]:
+        """
+        Collect items by keyword, user or URL
+
+        Args:
+            keyword: Search keyword
+            user_id: User ID whose posts are collected
+            url: Post URL or ID
+            max_count: Maximum number of items
+            filters: Filter criteria, passed to methods accepting criteria
+            **kwargs: Platform-specific arguments
+
+        Returns:
+            Collected items
+        """
+        return [
+            item async for item in self.collect_stream(
+                keyword, user_id, url, max_count, filters, **kwargs
+            )
+        ]
+
+    @asynccontextmanager
+    async def capture_responses(self, kind: str):
+        """
+        Capture the platform API responses of a kind on the current page
+
+        Start the capture before navigating or scrolling so the requests it
+        triggers are seen. Yields None when capture is disabled or the
+        platform has no patterns for the kind, so callers fall back to the DOM.
+
+        Args:
+            kind: Capture kind, a key of response_patterns
+        """
+        patterns = self.response_patterns.get(kind)
+        if not self.capture_enabled or not patterns or self._page is None:
+            yield None
+            return
+
+        capture = ResponseCapture(self._page, patterns, self.logger).start()
+        try:
+            yield capture
+        finally:
+            await capture.stop()
+
+    async def collect_captured(
+        self,
+        capture: Optional[ResponseCapture],
+        kind: str,
+        limit: Optional[int] = None,
+        idle_timeout: Optional[float] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Convert captured responses into items
+
+        Args:
+            capture: Active capture (None returns no items)
+            kind: Capture kind passed to convert_response
+            limit: Stop once this many items were collected
+            idle_timeout: Seconds without a response that ends collection
+
+        Returns:
+            Items converted from the captured payloads, de-duplicated by ID
+        """
+        if capture is None:
+            return []
+
+        items: List[Dict[str, Any]] = []
+        seen: Set[str] = set()
+        async for response in capture.responses(idle_timeout):
+            try:
+                converted = self.convert_response(kind, response.payload)
+            except Exception as e:
+                self.logger.warning(f"Failed to convert {kind} response {response.url}: {e}")
+                continue
+
+            for item in converted:
+                key = item.get("content_id") or item.get("comment_id")
+                if key:
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                items.append(item)
+
+            if limit is not None and len(items) >= limit:
+                break
+
+        if items:
+            self.logger.debug(f"Captured {len(items)} {kind} items from network responses")
+        return items[:limit] if limit is not None else items
+
+    async def filter_items(
+        self,
+        items: List[Dict[str, Any]],
+        limit: Optional[int] = None,
+        accept: Optional[Callable[[str, Dict[str, Any]], Awaitable[bool]]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Apply a fetch_details accept filter to already collected items
+
+        Args:
+            items: Items, e.g. converted from captured responses
+            limit: Maximum number of accepted items
+            accept: Optional async filter called as accept(content_id, item)
+
+        Returns:
+            Accepted items in their original order
+        """
+        results = []
+        for item in items:
+            if limit is not None and len(results) >= limit:
+                break
+            try:
+                if accept is None or await accept(item.get("content_id"), item):
+                    results.append(item)
+                    await self._emit(item)
+            except Exception as e:
+                self.logger.error(f"Error filtering item {item.get('content_id')}: {e}")
+        return results
+
+    def convert_response(self, kind: str, payload: Any) -> List[Dict[str, Any]]:
+        """
+        Convert a captured API payload into items (platform-specific)
+
+        Args:
+            kind: Capture kind
+            payload: Parsed JSON payload
+
+        Returns:
+            List of items in the same format the DOM parsers produce
+        """
+        return []
+
     async def _load_cookies(self) -> None:
         """Load cookies from file"""
         try:
@@ -279,20 +840,27 @@ class BaseSpider(ABC):
 
     async def _wait_for_rate_limit(self) -> None:
         """Apply rate limiting between requests"""
-        current_time = time.time()
-        elapsed = current_time - self._last_request_time
+        # Tabs fetching concurrently queue here so request starts stay spaced
+        async with self._rate_limit_lock:
+            current_time = time.time()
+            elapsed = current_time - self._last_request_time
 
-        # Random delay between requests
-        import random
-        delay = random.uniform(self.request_delay_min, self.request_delay_max)
+            # Random delay between requests
+            import random
+            delay = random.uniform(self.request_delay_min, self.request_delay_max)
 
-        if elapsed < delay:
-            wait_time = delay - elapsed
-            self.logger.debug(f"Rate limiting: waiting {wait_time:.2f}s")
-            await asyncio.sleep(wait_time)
+            if elapsed < delay:
+                wait_time = delay - elapsed
+                self.logger.debug(f"Rate limiting: waiting {wait_time:.2f}s")
+                await asyncio.sleep(wait_time)
 
-        self._last_request_time = time.time()
-        self._request_count += 1
+            if self.platform_rate_limit:
+                await get_rate_limiter().acquire(
+                    f"crawl:{self.platform}", self.platform_rate_limit, 60
+                )
+
+            self._last_request_time = time.time()
+            self._request_count += 1
 
     async def _retry_on_error(
         self,
@@ -415,6 +983,9 @@ class BaseSpider(ABC):
                 await self._page.goto(url, wait_until=wait_until, timeout=self.timeout)
                 return True
 
+            if self._lease is not None:
+                self._lease.record_navigation()
+
             return await self._retry_on_error(_navigate)
 
         except Exception as e:
@@ -0,0 +1,360 @@
+"""
+Process-wide browser pool
+Shares a few Chromium processes between spiders and leases lightweight
+BrowserContexts per task instead of launching one browser per spider
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Dict, List, Optional, Tuple
+
+from playwright.async_api import (
+    Browser,
+    BrowserContext,
+    Playwright,
+    async_playwright,
+)
+
+from omnisense.config import config
+from omnisense.utils.logger import get_logger
+
+
+class ContextLease:
+    """
+    A BrowserContext leased from the pool
+
+    The lease tracks how many navigations the context has served and whether
+    it crashed, so the pool can decide to recycle it on release.
+    """
+
+    def __init__(
+        self,
+        pool: "BrowserPool",
+        slot: "_BrowserSlot",
+        context: BrowserContext,
+        key: Tuple[str, Optional[str]],
+    ):
+        self.pool = pool
+        self.slot = slot
+        self.context = context
+        self.key = key
+        self.navigations = 0
+        self.uses = 0
+        self.crashed = False
+        self.created_at = time.time()
+
+    @property
+    def browser(self) -> Browser:
+        """Browser process hosting this context"""
+        return self.slot.browser
+
+    @property
+    def platform(self) -> str:
+        return self.key[0]
+
+    @property
+    def is_fresh(self) -> bool:
+        """True on the first lease of a newly created context"""
+        return self.uses <= 1
+
+    @property
+    def expired(self) -> bool:
+        """True if the context should be recycled instead of reused"""
+        if self.crashed or not self.slot.connected:
+            return True
+        return self.navigations >= self.pool.max_navigations
+
+    def record_navigation(self) -> None:
+        """Count a page navigation against the context budget"""
+        self.navigations += 1
+
+    def mark_crashed(self, *_: Any) -> None:
+        """Flag the context as unusable (page crash, context closed, ...)"""
+        self.crashed = True
+
+    def __repr__(self) -> str:
+        return (
+            f"<ContextLease(platform='{self.platform}', "
+            f"navigations={self.navigations}, crashed={self.crashed})>"
+        )
+
+
+class _BrowserSlot:
+    """A single Chromium process in the pool"""
+
+    def __init__(self, index: int):
+        self.index = index
+        self.browser: Optional[Browser] = None
+        self.active_contexts = 0
+        self.launch_lock = asyncio.Lock()
+
+    @property
+    def connected(self) -> bool:
+        try:
+            return self.browser is not None and self.browser.is_connected()
+        except Exception:
+            return False
+
+    def mark_disconnected(self, *_: Any) -> None:
+        self.browser = None
+
+
+class BrowserPool:
+    """
+    Pool of shared Chromium processes with per-task BrowserContexts
+
+    Features:
+    - A fixed number of browser processes shared by all spiders
+    - Contexts leased per task, balanced across the least loaded browser
+    - Idle contexts reused per (platform, proxy) so cookies and fingerprint stay stable
+    - Contexts recycled after N navigations or when they crash
+    - Crashed browser processes relaunched on demand
+    """
+
+    def __init__(
+        self,
+        size: Optional[int] = None,
+        max_contexts_per_browser: Optional[int] = None,
+        max_navigations: Optional[int] = None,
+        headless: bool = True,
+    ):
+        """
+        Initialize browser pool
+
+        Args:
+            size: Number of browser processes (default from config)
+            max_contexts_per_browser: Maximum leased contexts per browser (default from config)
+            max_navigations: Navigations served before a context is recycled (default from config)
+            headless: Run browsers in headless mode
+        """
+        self.logger = get_logger("spider.browser_pool")
+        self.size = size or config.spider.browser_pool_size
+        self.max_contexts_per_browser = (
+            max_contexts_per_browser or config.spider.browser_pool_max_contexts
+        )
+        self.max_navigations = max_navigations or config.spider.context_max_navigations
+        self.headless = headless
+
+        self._playwright: Optional[Playwright] = None
+        self._slots: List[_BrowserSlot] = [_BrowserSlot(i) for i in range(self.size)]
+        self._idle: Dict[Tuple[str, Optional[str]], List[ContextLease]] = {}
+        self._lock = asyncio.Lock()
+        self._playwright_lock = asyncio.Lock()
+        self._capacity = asyncio.Semaphore(self.size * self.max_contexts_per_browser)
+        self._closed = False
+
+        self._stats = {
+            "browsers_launched": 0,
+            "contexts_created": 0,
+            "contexts_reused": 0,
+            "contexts_recycled": 0,
+        }
+
+        self.logger.info(
+            f"Browser pool initialized (size={self.size}, "
+            f"max_contexts_per_browser={self.max_contexts_per_browser}, "
+            f"max_navigations={self.max_navigations})"
+        )
+
+    async def _ensure_playwright(self) -> Playwright:
+        async with self._playwright_lock:
+            if self._playwright is None:
+                self._playwright = await async_playwright().start()
+        return self._playwright
+
+    async def _ensure_browser(self, slot: _BrowserSlot) -> Browser:
+        """Launch the slot's browser if it is not running"""
+        async with slot.launch_lock:
+            if slot.connected:
+                return slot.browser
+            if self._closed:
+                raise RuntimeError("Browser pool is closed")
+
+            playwright = await self._ensure_playwright()
+            slot.browser = await playwright.chromium.launch(
+                headless=self.headless,
+                args=[
+                    "--disable-blink-features=AutomationControlled",
+                    "--no-sandbox",
+                    "--disable-dev-shm-usage",
+                ],
+            )
+            slot.browser.on("disconnected", slot.mark_disconnected)
+            self._stats["browsers_launched"] += 1
+            self.logger.info(f"Launched pooled browser #{slot.index}")
+            return slot.browser
+
+    def _pick_slot(self) -> _BrowserSlot:
+        """Pick the least loaded browser slot"""
+        return min(self._slots, key=lambda s: s.active_contexts)
+
+    async def acquire(
+        self,
+        platform: str,
+        context_options: Dict[str, Any],
+        proxy: Optional[str] = None,
+    ) -> ContextLease:
+        """
+        Lease a browser context
+
+        Args:
+            platform: Platform name, used to reuse idle contexts
+            context_options: Options for browser.new_context (fingerprint, headers, ...)
+            proxy: Proxy server URL
+
+        Returns:
+            Context lease (lease.is_fresh is True for a newly opened context)
+        """
+        if self._closed:
+            raise RuntimeError("Browser pool is closed")
+
+        await self._capacity.acquire()
+        key = (platform, proxy)
+        reused: Optional[ContextLease] = None
+        slot: Optional[_BrowserSlot] = None
+        stale: List[ContextLease] = []
+        try:
+            # Only the bookkeeping is locked, so launches and new contexts overlap
+            async with self._lock:
+                # Reuse an idle context for the same platform if it is still healthy
+                idle = self._idle.get(key, [])
+                while idle:
+                    lease = idle.pop()
+                    if lease.expired:
+                        stale.append(lease)
+                        continue
+                    reused = lease
+                    break
+
+                if reused is not None:
+                    reused.slot.active_contexts += 1
+                    reused.uses += 1
+                    self._stats["contexts_reused"] += 1
+                else:
+                    # Reserve the slot before launching so concurrent acquirers spread out
+                    slot = self._pick_slot()
+                    slot.active_contexts += 1
+
+            for lease in stale:
+                await self._close_lease(lease)
+            if reused is not None:
+                return reused
+
+            browser = await self._ensure_browser(slot)
+
+            options = dict(context_options)
+            if proxy:
+                options["proxy"] = {"server": proxy}
+
+            context = await browser.new_context(**options)
+
+        except BaseException:
+            # Undo the reservation without awaiting, so cancellation cannot skip it
+            if reused is not None:
+                reused.slot.active_contexts = max(0, reused.slot.active_contexts - 1)
+                self._idle.setdefault(key, []).append(reused)
+            elif slot is not None:
+                slot.active_contexts = max(0, slot.active_contexts - 1)
+            self._capacity.release()
+            raise
+
+        lease = ContextLease(self, slot, context, key)
+        context.on("close", lease.mark_crashed)
+        lease.uses = 1
+        self._stats["contexts_created"] += 1
+        return lease
+
+    async def release(self, lease: ContextLease) -> None:
+        """
+        Return a leased context to the pool
+
+        Expired or crashed contexts are closed, healthy ones are kept idle for reuse.
+        """
+        try:
+            async with self._lock:
+                lease.slot.active_contexts = max(0, lease.slot.active_contexts - 1)
+                idle_count = sum(len(v) for v in self._idle.values())
+                max_idle = self.size * self.max_contexts_per_browser
+                recycle = lease.expired or self._closed or idle_count >= max_idle
+                if not recycle:
+                    self._idle.setdefault(lease.key, []).append(lease)
+            if recycle:
+                await self._close_lease(lease)
+        finally:
+            self._capacity.release()
+
+    async def _close_lease(self, lease: ContextLease) -> None:
+        """Close a context that should not be reused"""
+        self._stats["contexts_recycled"] += 1
+        try:
+            await lease.context.close()
+        except Exception as e:
+            self.logger.debug(f"Error closing context: {e}")
+        self.logger.debug(f"Recycled context {lease}")
+
+    @asynccontextmanager
+    async def lease(
+        self,
+        platform: str,
+        context_options: Dict[str, Any],
+        proxy: Optional[str] = None,
+    ):
+        """Context manager that leases a context and releases it on exit"""
+        lease = await self.acquire(platform, context_options, proxy)
+        try:
+            yield lease
+        finally:
+            await self.release(lease)
+
+    async def close(self) -> None:
+        """Close all contexts and browser processes"""
+        async with self._lock:
+            self._closed = True
+            for leases in self._idle.values():
+                for lease in leases:
+                    await self._close_lease(lease)
+            self._idle.clear()
+
+            for slot in self._slots:
+                # Waits for a launch in progress, later ones see the pool closed
+                async with slot.launch_lock:
+                    if slot.browser is not None:
+                        try:
+                            await slot.browser.close()
+                        except Exception as e:
+                            self.logger.debug(f"Error closing browser #{slot.index}: {e}")
+                        slot.browser = None
+
+            if self._playwright is not None:
+                await self._playwright.stop()
+                self._playwright = None
+
+        self.logger.info("Browser pool closed")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool statistics"""
+        return {
+            **self._stats,
+            "browsers_running": sum(1 for s in self._slots if s.connected),
+            "active_contexts": sum(s.active_contexts for s in self._slots),
+            "idle_contexts": sum(len(v) for v in self._idle.values()),
+        }
+
+    def __repr__(self) -> str:
+        return (
+            f"<BrowserPool(size={self.size}, "
+            f"max_contexts_per_browser={self.max_contexts_per_browser})>"
+        )
+
+
+# Process-wide pool instances, one per headless mode
+_browser_pools: Dict[bool, BrowserPool] = {}
+
+
+def get_browser_pool(headless: bool = True) -> BrowserPool:
+    """Get the process-wide browser pool for a headless mode, creating it on first use"""
+    pool = _browser_pools.get(headless)
+    if pool is None or pool._closed:
+        pool = _browser_pools[headless] = BrowserPool(headless=headless)
+    return pool
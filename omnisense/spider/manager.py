@@ -4,12 +4,15 @@ Provides unified interface for managing and coordinating multiple spiders
 """
 
 import asyncio
-from typing import Any, Dict, List, Optional, Type
+import itertools
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple, Type
 from pathlib import Path
 
 from omnisense.config import config
 from omnisense.utils.logger import get_logger
 from omnisense.spider.base import BaseSpider
+from omnisense.spider.browser_pool import BrowserPool, get_browser_pool
+from omnisense.storage.redis_cache import cached_async
 
 
 class SpiderManager:
@@ -18,21 +21,51 @@ class SpiderManager:
 
     Features:
     - Dynamic spider registration and loading
-    - Concurrent spider execution
+    - Concurrent fan-out across platforms with global and per-platform caps
+    - Per-task timeouts and cancellation of outstanding tasks
+    - Streaming results in completion order via stream()
     - Task scheduling and queue management
     - Resource pooling and cleanup
     - Error handling and recovery
     """
 
-    def __init__(self, max_concurrent: Optional[int] = None):
+    def __init__(
+        self,
+        max_concurrent: Optional[int] = None,
+        browser_pool: Optional[BrowserPool] = None,
+        per_platform_concurrency: Optional[int] = None,
+        task_timeout: Optional[float] = None,
+    ):
         """
         Initialize spider manager
 
         Args:
             max_concurrent: Maximum number of concurrent spiders (default from config)
+            per_platform_concurrency: Maximum concurrent tasks on one platform
+                (default from config)
+            task_timeout: Timeout of a single task in seconds, 0 disables
+                (default from config)
+            browser_pool: Browser pool shared by spiders (default: process-wide
+                pool if enabled in config); the manager does not close it
         """
         self.logger = get_logger("spider.manager")
         self.max_concurrent = max_concurrent or config.spider.concurrent_tasks
+        self.per_platform_concurrency = max(
+            1, per_platform_concurrency or config.spider.per_platform_concurrency
+        )
+        self.task_timeout = (
+            config.spider.task_timeout if task_timeout is None else task_timeout
+        )
+
+        # Shared browser pool
+        self._process_pools = browser_pool is None and config.spider.browser_pool_enabled
+        if self._process_pools:
+            browser_pool = get_browser_pool()
+        self.browser_pool = browser_pool
+        # Pools for spiders whose headless mode differs from browser_pool's
+        self._headless_pools: Dict[bool, BrowserPool] = {}
+        # Pools created by this manager, closed by close()
+        self._own_pools: List[BrowserPool] = []
 
         # Spider registry
         self._spider_classes: Dict[str, Type[BaseSpider]] = {}
@@ -42,12 +75,16 @@ class SpiderManager:
         self._task_queue: asyncio.Queue = asyncio.Queue()
         self._running_tasks: Dict[str, asyncio.Task] = {}
         self._semaphore = asyncio.Semaphore(self.max_concurrent)
+        self._platform_semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._start_locks: Dict[str, asyncio.Lock] = {}
+        self._task_ids = itertools.count(1)
 
         # Statistics
         self._stats = {
             "total_tasks": 0,
             "completed_tasks": 0,
             "failed_tasks": 0,
+            "cancelled_tasks": 0,
             "active_spiders": 0,
         }
 
@@ -124,6 +161,7 @@ class SpiderManager:
             proxy=proxy,
             **kwargs,
         )
+        spider.browser_pool = self._pool_for(headless)
 
         self._spider_instances[platform] = spider
         self._stats["active_spiders"] += 1
@@ -131,6 +169,24 @@ class SpiderManager:
 
         return spider
 
+    def _pool_for(self, headless: bool) -> Optional[BrowserPool]:
+        """Browser pool for a spider; a pool launches all its browsers in one headless mode"""
+        pool = self.browser_pool
+        if pool is None or pool.headless == headless:
+            return pool
+        if headless not in self._headless_pools:
+            if self._process_pools:
+                self._headless_pools[headless] = get_browser_pool(headless)
+            else:
+                self._headless_pools[headless] = BrowserPool(
+                    size=pool.size,
+                    max_contexts_per_browser=pool.max_contexts_per_browser,
+                    max_navigations=pool.max_navigations,
+                    headless=headless,
+                )
+                self._own_pools.append(self._headless_pools[headless])
+        return self._headless_pools[headless]
+
     async def close_spider(self, platform: str) -> None:
         """
         Close and remove a spider instance
@@ -152,6 +208,107 @@ class SpiderManager:
             await self.close_spider(platform)
         self.logger.info("All spiders closed")
 
+    async def close(self) -> None:
+        """Close all spiders and the browser pools this manager created"""
+        await self.cancel_all()
+        await self.close_all_spiders()
+        # Shared pools stay open for their other users
+        for pool in self._own_pools:
+            await pool.close()
+        self._own_pools.clear()
+        self._headless_pools.clear()
+
+    def _platform_semaphore(self, platform: str) -> asyncio.Semaphore:
+        """Get the semaphore capping concurrent tasks on a platform"""
+        if platform not in self._platform_semaphores:
+            self._platform_semaphores[platform] = asyncio.Semaphore(
+                self.per_platform_concurrency
+            )
+        return self._platform_semaphores[platform]
+
+    async def get_started_spider(self, platform: str) -> BaseSpider:
+        """Get a spider and start it once, even when several tasks race for it"""
+        lock = self._start_locks.setdefault(platform, asyncio.Lock())
+        async with lock:
+            spider = await self.get_spider(platform)
+            if not spider._browser:
+                await spider.start()
+        return spider
+
+    @staticmethod
+    def _method_call(
+        method: str,
+        args: tuple,
+        kwargs: Dict[str, Any],
+    ) -> Callable[[BaseSpider], Awaitable[Any]]:
+        """Build a call that invokes a named spider method"""
+        def call(spider: BaseSpider) -> Awaitable[Any]:
+            if not hasattr(spider, method):
+                raise AttributeError(
+                    f"Spider '{spider.platform}' has no method '{method}'"
+                )
+            return getattr(spider, method)(*args, **kwargs)
+        return call
+
+    async def _run(
+        self,
+        platform: str,
+        call: Callable[[BaseSpider], Awaitable[Any]],
+        timeout: Optional[float] = None,
+        name: str = "task",
+    ) -> Any:
+        """
+        Run a call against a platform spider under the concurrency caps
+
+        Args:
+            platform: Platform name
+            call: Coroutine function receiving the started spider
+            timeout: Timeout in seconds (default: task_timeout, 0 disables)
+            name: Task name used in logs
+
+        Returns:
+            Call result
+        """
+        timeout = self.task_timeout if timeout is None else timeout
+
+        # Platform slot first: tasks queued behind a busy platform must not
+        # hold global slots that other platforms could use
+        async with self._platform_semaphore(platform), self._semaphore:
+            self._stats["total_tasks"] += 1
+            try:
+                spider = await self.get_started_spider(platform)
+
+                # Concurrent tasks on one platform each work in their own tab
+                if self.per_platform_concurrency > 1:
+                    async def run_call():
+                        async with spider.page_slot():
+                            return await call(spider)
+                    coro = run_call()
+                else:
+                    coro = call(spider)
+
+                if timeout:
+                    result = await asyncio.wait_for(coro, timeout=timeout)
+                else:
+                    result = await coro
+
+                self._stats["completed_tasks"] += 1
+                return result
+
+            except asyncio.TimeoutError:
+                self._stats["failed_tasks"] += 1
+                self.logger.error(f"{name} on {platform} timed out after {timeout}s")
+                raise asyncio.TimeoutError(f"{name} timed out after {timeout}s")
+            except asyncio.CancelledError:
+                self._stats["cancelled_tasks"] += 1
+                self.logger.info(f"{name} on {platform} cancelled")
+                raise
+            except Exception as e:
+                self._stats["failed_tasks"] += 1
+                self.logger.error(f"Error executing {name} on {platform}: {e}")
+                raise
+
+    @cached_async()
     async def execute_task(
         self,
         platform: str,
@@ -162,6 +319,8 @@ class SpiderManager:
         """
         Execute a method on a spider
 
+        Concurrent calls with the same arguments share one collection.
+
         Args:
             platform: Platform name
             method: Method name to execute
@@ -171,39 +330,102 @@ class SpiderManager:
         Returns:
             Method result
         """
-        async with self._semaphore:
-            try:
-                # Get or create spider
-                spider = await self.get_spider(platform)
-
-                # Start spider if not already started
-                if not spider._browser:
-                    await spider.start()
+        return await self._run(
+            platform, self._method_call(method, args, kwargs), name=method
+        )
 
-                # Execute method
-                if not hasattr(spider, method):
-                    raise AttributeError(
-                        f"Spider '{platform}' has no method '{method}'"
-                    )
+    async def _stream_calls(
+        self,
+        calls: Dict[str, Callable[[BaseSpider], Awaitable[Any]]],
+        timeout: Optional[float] = None,
+        name: str = "task",
+    ) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Fan calls out across platforms and yield results as each one finishes
 
-                method_func = getattr(spider, method)
-                result = await method_func(*args, **kwargs)
+        Outstanding tasks are cancelled when the consumer stops iterating early
+        or the consuming task is cancelled.
 
-                self._stats["completed_tasks"] += 1
-                return result
+        Args:
+            calls: Dictionary mapping platform to call
+            timeout: Per-task timeout in seconds (default: task_timeout)
+            name: Task name used in logs
 
-            except Exception as e:
-                self._stats["failed_tasks"] += 1
-                self.logger.error(
-                    f"Error executing {method} on {platform}: {e}"
+        Yields:
+            (platform, {"success": True, "data": ...}) or
+            (platform, {"success": False, "error": ...}) tuples
+        """
+        tasks: Dict[asyncio.Task, Tuple[str, str]] = {}
+        for platform, call in calls.items():
+            task_id = f"{platform}:{name}:{next(self._task_ids)}"
+            task = asyncio.create_task(self._run(platform, call, timeout, name))
+            self._running_tasks[task_id] = task
+            tasks[task] = (platform, task_id)
+
+        pending = set(tasks)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
                 )
-                raise
+                for task in done:
+                    platform, task_id = tasks[task]
+                    self._running_tasks.pop(task_id, None)
+
+                    if task.cancelled():
+                        result = {"success": False, "error": "cancelled"}
+                    elif task.exception() is not None:
+                        # Already logged by _run
+                        result = {"success": False, "error": str(task.exception())}
+                    else:
+                        result = {"success": True, "data": task.result()}
+
+                    yield platform, result
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+            for platform, task_id in tasks.values():
+                self._running_tasks.pop(task_id, None)
+
+    def stream(
+        self,
+        platforms: List[str],
+        method: str,
+        *args,
+        timeout: Optional[float] = None,
+        **kwargs,
+    ) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Execute a method on multiple spiders and stream results as they finish
+
+        Example:
+            async for platform, result in manager.stream(platforms, "search", "AI"):
+                if result["success"]:
+                    handle(platform, result["data"])
+
+        Args:
+            platforms: List of platform names
+            method: Method name to execute
+            *args: Positional arguments
+            timeout: Per-task timeout in seconds (default: task_timeout, 0 disables)
+            **kwargs: Keyword arguments
+
+        Returns:
+            Async iterator of (platform, result) tuples in completion order
+        """
+        call = self._method_call(method, args, kwargs)
+        return self._stream_calls(
+            {platform: call for platform in platforms}, timeout, method
+        )
 
     async def execute_on_multiple(
         self,
         platforms: List[str],
         method: str,
         *args,
+        timeout: Optional[float] = None,
         **kwargs,
     ) -> Dict[str, Any]:
         """
@@ -213,26 +435,36 @@ class SpiderManager:
             platforms: List of platform names
             method: Method name to execute
             *args: Positional arguments
+            timeout: Per-task timeout in seconds (default: task_timeout, 0 disables)
             **kwargs: Keyword arguments
 
         Returns:
             Dictionary mapping platform to result
         """
-        tasks = []
-        for platform in platforms:
-            task = self.execute_task(platform, method, *args, **kwargs)
-            tasks.append((platform, task))
-
         results = {}
-        for platform, task in tasks:
-            try:
-                result = await task
-                results[platform] = {"success": True, "data": result}
-            except Exception as e:
-                results[platform] = {"success": False, "error": str(e)}
-                self.logger.error(f"Task failed for {platform}: {e}")
+        async for platform, result in self.stream(
+            platforms, method, *args, timeout=timeout, **kwargs
+        ):
+            results[platform] = result
+
+        return {platform: results[platform] for platform in platforms}
+
+    async def cancel_all(self) -> int:
+        """
+        Cancel all running fan-out tasks
 
-        return results
+        Returns:
+            Number of tasks cancelled
+        """
+        tasks = [task for task in self._running_tasks.values() if not task.done()]
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        self._running_tasks.clear()
+        if tasks:
+            self.logger.info(f"Cancelled {len(tasks)} running tasks")
+        return len(tasks)
 
     async def search_all_platforms(
         self,
@@ -272,9 +504,6 @@ class SpiderManager:
                 search_results[platform] = result["data"]
             else:
                 search_results[platform] = []
-                self.logger.warning(
-                    f"Search failed for {platform}: {result.get('error')}"
-                )
 
         total_results = sum(len(v) for v in search_results.values())
         self.logger.info(
@@ -301,34 +530,34 @@ class SpiderManager:
         Returns:
             Dictionary mapping platform to user data
         """
-        results = {}
-
-        for platform, user_id in user_ids.items():
-            try:
-                spider = await self.get_spider(platform)
-                if not spider._browser:
-                    await spider.start()
-
+        def user_data_call(user_id: str) -> Callable[[BaseSpider], Awaitable[Any]]:
+            async def call(spider: BaseSpider) -> Dict[str, Any]:
                 # Get user profile
-                profile = await spider.get_user_profile(user_id)
-                results[platform] = {"profile": profile}
+                data = {"profile": await spider.get_user_profile(user_id)}
 
                 # Get user posts if requested
                 if include_posts:
-                    posts = await spider.get_user_posts(user_id, max_posts)
-                    results[platform]["posts"] = posts
+                    data["posts"] = await spider.get_user_posts(user_id, max_posts)
 
                 self.logger.info(
-                    f"Retrieved user data from {platform}: {user_id}"
+                    f"Retrieved user data from {spider.platform}: {user_id}"
                 )
+                return data
+            return call
 
-            except Exception as e:
-                self.logger.error(
-                    f"Failed to get user data from {platform}: {e}"
-                )
-                results[platform] = {"error": str(e)}
+        calls = {
+            platform: user_data_call(user_id)
+            for platform, user_id in user_ids.items()
+        }
 
-        return results
+        results = {}
+        async for platform, result in self._stream_calls(calls, name="get_user_data"):
+            if result["success"]:
+                results[platform] = result["data"]
+            else:
+                results[platform] = {"error": result["error"]}
+
+        return {platform: results[platform] for platform in user_ids}
 
     async def monitor_user_activity(
         self,
@@ -395,11 +624,15 @@ class SpiderManager:
 
     def get_stats(self) -> Dict[str, Any]:
         """Get manager statistics"""
-        return {
+        stats = {
             **self._stats,
             "registered_platforms": list(self._spider_classes.keys()),
             "active_platforms": list(self._spider_instances.keys()),
+            "running_tasks": len(self._running_tasks),
         }
+        if self.browser_pool is not None:
+            stats["browser_pool"] = self.browser_pool.get_stats()
+        return stats
 
     def reset_stats(self) -> None:
         """Reset statistics"""
@@ -407,6 +640,7 @@ class SpiderManager:
             "total_tasks": 0,
             "completed_tasks": 0,
             "failed_tasks": 0,
+            "cancelled_tasks": 0,
             "active_spiders": len(self._spider_instances),
         }
         self.logger.info("Statistics reset")
@@ -422,8 +656,10 @@ class SpiderManager:
 
         for platform, spider in self._spider_instances.items():
             try:
-                # Check if browser is active
-                if spider._browser and spider._browser.is_connected():
+                # Check if browser is active and the pooled context did not crash
+                if spider._lease is not None and spider._lease.crashed:
+                    health[platform] = False
+                elif spider._browser and spider._browser.is_connected():
                     health[platform] = True
                 else:
                     health[platform] = False
@@ -1039,20 +1039,10 @@ class AmazonSpider(BaseSpider):
                 await self._page.evaluate("window.scrollBy(0, window.innerHeight)")
                 await asyncio.sleep(random.uniform(1.5, 2.5))
 
-            results = []
-            product_elements = await self._page.query_selector_all('[data-component-type="s-search-result"]')
-
-            self.logger.info(f"Found {len(product_elements)} product elements on page")
-
-            for elem in product_elements[:max_results]:
-                try:
-                    result = await self._parse_search_result(elem)
-                    if result and result.get('id'):
-                        results.append(result)
-
-                except Exception as e:
-                    self.logger.warning(f"Failed to parse product: {e}")
-                    continue
+            results = [
+                result for result in await self._extract_search_results(max_results)
+                if result.get('id')
+            ]
 
             self.logger.info(f"Successfully parsed {len(results)} products")
             return results
@@ -1061,8 +1051,35 @@ class AmazonSpider(BaseSpider):
             self.logger.error(f"Search failed: {e}")
             return []
 
-    async def _parse_search_result(self, elem) -> Dict[str, Any]:
-        """解析搜索结果中的单个商品"""
+    # 搜索结果卡片字段（PlaywrightHelper.extract_items 格式）
+    _SEARCH_RESULT_ROOT = '[data-component-type="s-search-result"]'
+    _SEARCH_RESULT_FIELDS = {
+        'title': 'h2 a',
+        'href': 'h2 a@href',
+        'price': '.a-price .a-offscreen',
+        'original_price': '.a-price[data-a-strike="true"] .a-offscreen',
+        'rating': {'selector': '.a-icon-star-small .a-icon-alt', 'convert': lambda t: float(t.split()[0])},
+        'reviews': ['[aria-label*="stars"]@aria-label', '.a-size-base.s-underline-text'],
+        'thumbnail': 'img.s-image@src',
+        'prime': {'selector': '[aria-label="Amazon Prime"]', 'type': 'exists'},
+        'delivery_info': '[data-cy="delivery-recipe"]',
+        'availability': '.a-size-base.a-color-price',
+        'brand': '.a-size-base-plus',
+    }
+
+    async def _extract_search_results(self, limit: int) -> List[Dict[str, Any]]:
+        """一次 evaluate 解析当前页的所有搜索结果"""
+        items = await self.helper.extract_items(
+            self._page,
+            self._SEARCH_RESULT_ROOT,
+            self._SEARCH_RESULT_FIELDS,
+            limit=limit,
+        )
+        self.logger.info(f"Found {len(items)} product elements on page")
+        return [self._build_search_result(item) for item in items]
+
+    def _build_search_result(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        """将提取的字段整理为商品结果"""
         result = {
             'platform': self.platform,
             'type': 'product',
@@ -1070,10 +1087,11 @@ class AmazonSpider(BaseSpider):
         }
 
         # 商品标题和链接
-        title_elem = await elem.query_selector('h2 a')
-        if title_elem:
-            result['title'] = (await title_elem.inner_text()).strip()
-            href = await title_elem.get_attribute('href')
+        if 'title' in item:
+            result['title'] = item['title']
+
+        href = item.get('href')
+        if href:
             result['url'] = f"{self.base_url}{href}" if not href.startswith('http') else href
 
             # 提取ASIN
@@ -1084,64 +1102,24 @@ class AmazonSpider(BaseSpider):
             elif 'asin=' in href:
                 result['id'] = href.split('asin=')[-1].split('&')[0]
 
-        # 价格信息
-        price_elem = await elem.query_selector('.a-price .a-offscreen')
-        if price_elem:
-            result['price'] = (await price_elem.inner_text()).strip()
-
-        # 原价（如果有折扣）
-        original_price_elem = await elem.query_selector('.a-price[data-a-strike="true"] .a-offscreen')
-        if original_price_elem:
-            result['original_price'] = (await original_price_elem.inner_text()).strip()
-
-        # 评分
-        rating_elem = await elem.query_selector('.a-icon-star-small .a-icon-alt')
-        if rating_elem:
-            rating_text = await rating_elem.inner_text()
-            try:
-                result['rating'] = float(rating_text.split()[0])
-            except:
-                pass
+        # 价格、评分、图片、配送、品牌
+        for key in ('price', 'original_price', 'rating', 'thumbnail', 'delivery_info', 'brand'):
+            if key in item:
+                result[key] = item[key]
 
         # 评价数量
-        reviews_elem = await elem.query_selector('[aria-label*="stars"]')
-        if reviews_elem:
-            reviews_text = await reviews_elem.get_attribute('aria-label')
-            result['reviews_count'] = self.parser.parse_count(reviews_text)
-        else:
-            # 备用选择器
-            reviews_elem2 = await elem.query_selector('.a-size-base.s-underline-text')
-            if reviews_elem2:
-                reviews_text = await reviews_elem2.inner_text()
-                result['reviews_count'] = self.parser.parse_count(reviews_text)
-
-        # 商品图片
-        img = await elem.query_selector('img.s-image')
-        if img:
-            result['thumbnail'] = await img.get_attribute('src')
+        if 'reviews' in item:
+            result['reviews_count'] = self.parser.parse_count(item['reviews'])
 
         # Prime标识
-        prime = await elem.query_selector('[aria-label="Amazon Prime"]')
-        result['prime'] = prime is not None
-
-        # 配送信息
-        delivery_elem = await elem.query_selector('[data-cy="delivery-recipe"]')
-        if delivery_elem:
-            result['delivery_info'] = (await delivery_elem.inner_text()).strip()
+        result['prime'] = item.get('prime', False)
 
         # 库存状态
-        availability_elem = await elem.query_selector('.a-size-base.a-color-price')
-        if availability_elem:
-            availability_text = await availability_elem.inner_text()
-            result['in_stock'] = 'in stock' in availability_text.lower()
+        if 'availability' in item:
+            result['in_stock'] = 'in stock' in item['availability'].lower()
         else:
             result['in_stock'] = True  # 默认有货
 
-        # 品牌信息
-        brand_elem = await elem.query_selector('.a-size-base-plus')
-        if brand_elem:
-            result['brand'] = (await brand_elem.inner_text()).strip()
-
         return result
 
     async def get_user_profile(self, user_id: str, site: str = 'com') -> Dict[str, Any]:
@@ -1246,18 +1224,10 @@ class AmazonSpider(BaseSpider):
                 await asyncio.sleep(random.uniform(1.5, 2.5))
 
             posts = []
-            product_elements = await self._page.query_selector_all('[data-component-type="s-search-result"]')
-
-            for elem in product_elements[:max_posts]:
-                try:
-                    post = await self._parse_search_result(elem)
-                    if post and post.get('id'):
-                        post['seller_id'] = seller_id
-                        posts.append(post)
-
-                except Exception as e:
-                    self.logger.warning(f"Failed to parse product: {e}")
-                    continue
+            for post in await self._extract_search_results(max_posts):
+                if post.get('id'):
+                    post['seller_id'] = seller_id
+                    posts.append(post)
 
             self.logger.info(f"Got {len(posts)} products from seller")
             return posts
@@ -2124,17 +2094,10 @@ class AmazonSpider(BaseSpider):
                 await asyncio.sleep(random.uniform(1.5, 2.5))
 
             results = []
-            product_elements = await self._page.query_selector_all('[data-component-type="s-search-result"]')
-
-            for elem in product_elements[:max_results]:
-                try:
-                    result = await self._parse_search_result(elem)
-                    if result and result.get('id'):
-                        result['category'] = category
-                        results.append(result)
-                except Exception as e:
-                    self.logger.warning(f"Failed to parse product: {e}")
-                    continue
+            for result in await self._extract_search_results(max_results):
+                if result.get('id'):
+                    result['category'] = category
+                    results.append(result)
 
             self.logger.info(f"Found {len(results)} products in category")
             return results
@@ -15,6 +15,17 @@ from omnisense.spider.base import BaseSpider
 class ArxivSpider(BaseSpider):
     """arXiv爬虫 - Open-access repository for research preprints"""
 
+    # Search result card fields (PlaywrightHelper.extract_items spec)
+    _SEARCH_RESULT_FIELDS = {
+        'title': 'p.title',
+        'href': 'p.list-title a@href',
+        'authors': 'p.authors',
+        'abstract': 'span.abstract-short',
+        'primary_category': 'span.primary-subject',
+        'submitted_date': 'p.is-size-7',
+        'pdf_href': 'a[href*="/pdf/"]@href',
+    }
+
     def __init__(self, headless: bool = True, proxy: Optional[str] = None):
         super().__init__(platform="arxiv", headless=headless, proxy=proxy)
         self.base_url = "https://arxiv.org"
@@ -42,68 +53,43 @@ class ArxivSpider(BaseSpider):
             await self.navigate(search_url)
             await asyncio.sleep(random.uniform(2, 3))
 
-            results = []
-            result_elements = await self._page.query_selector_all('.arxiv-result, div[data-resultid]')
-
-            if not result_elements:
-                # Try alternative selectors
-                result_elements = await self._page.query_selector_all('li.arxiv-result')
-
-            for elem in result_elements[:max_results]:
-                try:
-                    result = {'platform': self.platform, 'type': 'preprint'}
-
-                    # Paper ID and title
-                    title_elem = await elem.query_selector('p.title')
-                    if title_elem:
-                        result['title'] = (await title_elem.inner_text()).strip()
-
-                    # arXiv ID
-                    id_link = await elem.query_selector('p.list-title a')
-                    if id_link:
-                        href = await id_link.get_attribute('href')
-                        if href:
-                            # Extract arxiv ID from URL
-                            arxiv_id = href.split('/abs/')[-1] if '/abs/' in href else href
-                            result['arxiv_id'] = arxiv_id
-                            result['url'] = f"{self.base_url}/abs/{arxiv_id}"
-                            result['id'] = hashlib.md5(arxiv_id.encode()).hexdigest()[:16]
-
-                    # Authors
-                    authors_elem = await elem.query_selector('p.authors')
-                    if authors_elem:
-                        authors_text = await authors_elem.inner_text()
-                        # Remove "Authors:" prefix
-                        result['authors'] = authors_text.replace('Authors:', '').strip()
-
-                    # Abstract
-                    abstract_elem = await elem.query_selector('span.abstract-short')
-                    if abstract_elem:
-                        result['abstract'] = await abstract_elem.inner_text()
-
-                    # Subject areas/categories
-                    subjects_elem = await elem.query_selector('span.primary-subject')
-                    if subjects_elem:
-                        result['primary_category'] = await subjects_elem.inner_text()
-
-                    # Submission date
-                    date_elem = await elem.query_selector('p.is-size-7')
-                    if date_elem:
-                        date_text = await date_elem.inner_text()
-                        result['submitted_date'] = date_text
-
-                    # PDF link
-                    pdf_link = await elem.query_selector('a[href*="/pdf/"]')
-                    if pdf_link:
-                        pdf_href = await pdf_link.get_attribute('href')
-                        result['pdf_url'] = pdf_href if pdf_href.startswith('http') else f"{self.base_url}{pdf_href}"
-
-                    if result.get('url') or result.get('title'):
-                        results.append(result)
+            # Read all result cards in a single evaluate call
+            items = await self.helper.extract_items(
+                self._page,
+                '.arxiv-result, div[data-resultid]',
+                self._SEARCH_RESULT_FIELDS,
+                limit=max_results,
+            )
 
-                except Exception as e:
-                    self.logger.debug(f"Failed to parse result: {e}")
-                    continue
+            results = []
+            for item in items:
+                result = {'platform': self.platform, 'type': 'preprint'}
+
+                if item.get('title'):
+                    result['title'] = item['title']
+
+                href = item.get('href')
+                if href:
+                    # Extract arxiv ID from URL
+                    arxiv_id = href.split('/abs/')[-1] if '/abs/' in href else href
+                    result['arxiv_id'] = arxiv_id
+                    result['url'] = f"{self.base_url}/abs/{arxiv_id}"
+                    result['id'] = hashlib.md5(arxiv_id.encode()).hexdigest()[:16]
+
+                if 'authors' in item:
+                    # Remove "Authors:" prefix
+                    result['authors'] = item['authors'].replace('Authors:', '').strip()
+
+                for key in ('abstract', 'primary_category', 'submitted_date'):
+                    if key in item:
+                        result[key] = item[key]
+
+                pdf_href = item.get('pdf_href')
+                if pdf_href:
+                    result['pdf_url'] = pdf_href if pdf_href.startswith('http') else f"{self.base_url}{pdf_href}"
+
+                if result.get('url') or result.get('title'):
+                    results.append(result)
 
             self.logger.info(f"Found {len(results)} preprints")
             return results
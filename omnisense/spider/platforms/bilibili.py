@@ -12,6 +12,7 @@ import hashlib
 import hmac
 import json
 import random
+import re
 import time
 import urllib.parse
 from datetime import datetime
@@ -557,7 +558,7 @@ class BilibiliMatcher:
 
         # 投币数过滤
         if 'min_coins' in criteria:
-            if video.get('coin_count', 0) < criteria['min_coins']:
+            if (video.get('coin_count') or 0) < criteria['min_coins']:
                 return False, 0.0
 
         # 收藏数过滤
@@ -648,15 +649,18 @@ class BilibiliMatcher:
         """评估视频统计数据质量"""
         view_count = video.get('view_count', 0)
         like_count = video.get('like_count', 0)
-        coin_count = video.get('coin_count', 0)
+        coin_count = video.get('coin_count')
         favorite_count = video.get('favorite_count', 0)
         danmaku_count = video.get('danmaku_count', 0)
 
         if view_count == 0:
             return 0.0
 
-        # 计算互动率
-        engagement_rate = (like_count + coin_count * 2 + favorite_count + danmaku_count * 0.5) / view_count
+        # 计算互动率（列表接口数据没有投币数，不计入该项）
+        interactions = like_count + favorite_count + danmaku_count * 0.5
+        if coin_count is not None:
+            interactions += coin_count * 2
+        engagement_rate = interactions / view_count
 
         # 归一化（通常优质视频的互动率在0.05-0.3之间）
         normalized_engagement = min(engagement_rate / 0.3, 1.0)
@@ -1297,8 +1301,18 @@ class BilibiliSpider(BaseSpider):
     - 动态获取
     - 直播信息
     - 支持API和网页双模式
+    - 接口响应捕获（优先读取接口JSON，DOM解析作为回退）
     """
 
+    # 各类数据对应的接口URL
+    response_patterns = {
+        'search': [r'api\.bilibili\.com/x/web-interface/(wbi/)?search/(type|all)'],
+        'user_posts': [r'api\.bilibili\.com/x/space/(wbi/)?arc/search'],
+    }
+
+    # 需要详情页数据的匹配条件（列表接口没有投币数）
+    detail_criteria = ('min_coins',)
+
     def __init__(self, headless: bool = True, proxy: Optional[str] = None):
         super().__init__(
             platform="bilibili",
@@ -1328,6 +1342,10 @@ class BilibiliSpider(BaseSpider):
 
         self.logger.info("Bilibili spider started successfully")
 
+    async def _init_page(self, page: Page) -> None:
+        """为新标签页初始化反爬措施"""
+        await self.anti_crawl.initialize(page)
+
     async def login(self, username: str = None, password: str = None) -> bool:
         """
         登录Bilibili（支持扫码或Cookie登录）
@@ -1440,65 +1458,46 @@ class BilibiliSpider(BaseSpider):
 
             search_url = f"{self.search_url}?{urlencode(search_params)}"
 
-            # 访问搜索页
-            await self.navigate(search_url)
-            await asyncio.sleep(random.uniform(2, 3))
-
-            # 检查频率限制
-            await self.anti_crawl.check_rate_limit()
-
-            # 检查风控
-            if await self.anti_crawl.detect_risk_control(self._page):
-                await self.anti_crawl.handle_risk_control(self._page)
-
-            # 滚动加载更多内容
-            await self._scroll_and_load(max_results)
-
-            # 解析视频列表
-            video_elements = await self._page.query_selector_all('.video-item, .bili-video-card')
-
-            for elem in video_elements[:max_results * 2]:
-                try:
-                    # 提取视频链接
-                    link_elem = await elem.query_selector('a[href*="/video/"]')
-                    if not link_elem:
-                        continue
-
-                    video_url = await link_elem.get_attribute('href')
-                    if not video_url:
-                        continue
-
-                    # 补全URL
-                    if video_url.startswith('//'):
-                        video_url = 'https:' + video_url
-
-                    video_id = self._extract_video_id(video_url)
-                    if not video_id or video_id in self._collected_video_ids:
-                        continue
-
-                    # 获取视频详情
-                    video_data = await self.get_post_detail(video_id)
+            # 访问搜索页，同时捕获接口返回的JSON
+            async with self.capture_responses("search") as capture:
+                await self.navigate(search_url)
+                await asyncio.sleep(random.uniform(2, 3))
 
-                    if video_data:
-                        # 内容匹配
-                        if criteria:
-                            is_match, match_score = await self.matcher.match_video(video_data, criteria)
-                            if not is_match:
-                                continue
-                            video_data['match_score'] = match_score
+                # 检查频率限制
+                await self.anti_crawl.check_rate_limit()
 
-                        results.append(video_data)
-                        self._collected_video_ids.add(video_id)
+                # 检查风控
+                if await self.anti_crawl.detect_risk_control(self._page):
+                    await self.anti_crawl.handle_risk_control(self._page)
 
-                        if len(results) >= max_results:
-                            break
+                # 滚动加载更多内容
+                await self._scroll_and_load(max_results)
 
-                    # 随机延迟
-                    await self.anti_crawl.random_delay(0.5, 1.5)
+                captured = await self.collect_captured(capture, "search", max_results * 2)
 
-                except Exception as e:
-                    self.logger.error(f"Error parsing video: {e}")
-                    continue
+            accept = self._make_detail_filter(criteria, self._collected_video_ids, self.matcher.match_video)
+            if captured and not self._needs_detail(criteria):
+                # 接口数据已包含详情，无需逐条打开详情页
+                results = await self.filter_items(captured, max_results, accept)
+            else:
+                if captured:
+                    # 列表接口缺少条件所需的字段，逐条获取详情
+                    video_ids = [video['content_id'] for video in captured
+                                 if video['content_id'] not in self._collected_video_ids]
+                else:
+                    # 解析视频列表（回退到DOM解析）
+                    video_elements = await self._page.query_selector_all('.video-item, .bili-video-card')
+
+                    # 并发获取详情
+                    video_ids = await self._extract_post_ids(
+                        video_elements[:max_results * 2], self._extract_video_id,
+                        self._collected_video_ids, link_selector='a[href*="/video/"]'
+                    )
+                results = await self.fetch_details(
+                    video_ids,
+                    limit=max_results,
+                    accept=accept,
+                )
 
             self.logger.info(f"Collected {len(results)} videos for keyword: {keyword}")
 
@@ -1578,55 +1577,40 @@ class BilibiliSpider(BaseSpider):
         posts = []
 
         try:
-            # 访问用户空间
-            space_url = f"https://space.bilibili.com/{user_id}/video?order={order}"
-            await self.navigate(space_url)
-            await asyncio.sleep(random.uniform(2, 3))
+            # 访问用户空间，同时捕获接口返回的JSON
+            async with self.capture_responses("user_posts") as capture:
+                space_url = f"https://space.bilibili.com/{user_id}/video?order={order}"
+                await self.navigate(space_url)
+                await asyncio.sleep(random.uniform(2, 3))
 
-            # 滚动加载
-            await self._scroll_and_load(max_posts)
-
-            # 解析视频列表
-            video_elements = await self._page.query_selector_all('.small-item, .list-item')
-
-            for elem in video_elements[:max_posts * 2]:
-                try:
-                    # 获取视频链接
-                    link_elem = await elem.query_selector('a[href*="/video/"]')
-                    if not link_elem:
-                        continue
-
-                    video_url = await link_elem.get_attribute('href')
-                    if video_url.startswith('//'):
-                        video_url = 'https:' + video_url
-
-                    video_id = self._extract_video_id(video_url)
-
-                    if not video_id or video_id in self._collected_video_ids:
-                        continue
-
-                    # 获取视频详情
-                    video_data = await self.get_post_detail(video_id)
-
-                    if video_data:
-                        # 内容匹配
-                        if criteria:
-                            is_match, match_score = await self.matcher.match_video(video_data, criteria)
-                            if not is_match:
-                                continue
-                            video_data['match_score'] = match_score
-
-                        posts.append(video_data)
-                        self._collected_video_ids.add(video_id)
+                # 滚动加载
+                await self._scroll_and_load(max_posts)
 
-                        if len(posts) >= max_posts:
-                            break
+                captured = await self.collect_captured(capture, "user_posts", max_posts * 2)
 
-                    await self.anti_crawl.random_delay(0.5, 1)
-
-                except Exception as e:
-                    self.logger.error(f"Error parsing user video: {e}")
-                    continue
+            accept = self._make_detail_filter(criteria, self._collected_video_ids, self.matcher.match_video)
+            if captured and not self._needs_detail(criteria):
+                # 接口数据已包含详情，无需逐条打开详情页
+                posts = await self.filter_items(captured, max_posts, accept)
+            else:
+                if captured:
+                    # 列表接口缺少条件所需的字段，逐条获取详情
+                    video_ids = [video['content_id'] for video in captured
+                                 if video['content_id'] not in self._collected_video_ids]
+                else:
+                    # 解析视频列表（回退到DOM解析）
+                    video_elements = await self._page.query_selector_all('.small-item, .list-item')
+
+                    # 并发获取详情
+                    video_ids = await self._extract_post_ids(
+                        video_elements[:max_posts * 2], self._extract_video_id,
+                        self._collected_video_ids, link_selector='a[href*="/video/"]'
+                    )
+                posts = await self.fetch_details(
+                    video_ids,
+                    limit=max_posts,
+                    accept=accept,
+                )
 
             self.logger.info(f"Collected {len(posts)} posts for user: {user_id}")
 
@@ -1975,6 +1959,84 @@ class BilibiliSpider(BaseSpider):
         except:
             return None
 
+    def _needs_detail(self, criteria: Optional[Dict[str, Any]]) -> bool:
+        """匹配条件是否用到列表接口没有的字段"""
+        return bool(criteria) and any(key in criteria for key in self.detail_criteria)
+
+    def convert_response(self, kind: str, payload: Any) -> List[Dict[str, Any]]:
+        """将捕获的接口JSON转换为与详情解析一致的数据结构"""
+        if not isinstance(payload, dict) or payload.get('code', 0) != 0:
+            return []
+        data = payload.get('data') or {}
+
+        # 评论已通过 reply 接口直接读取JSON，这里只处理视频列表
+        if kind == 'user_posts':
+            videos = (data.get('list') or {}).get('vlist') or []
+        else:
+            # search/type 直接返回视频列表，search/all 按结果类型分组
+            videos = []
+            for item in data.get('result') or []:
+                if item.get('result_type') == 'video':
+                    videos.extend(item.get('data') or [])
+                elif item.get('type') == 'video':
+                    videos.append(item)
+
+        return [self._convert_video(v) for v in videos if v.get('bvid')]
+
+    def _convert_video(self, video: Dict[str, Any]) -> Dict[str, Any]:
+        """转换搜索/投稿列表接口中的视频对象"""
+        bvid = video['bvid']
+        cover = video.get('pic') or ''
+        if cover.startswith('//'):
+            cover = 'https:' + cover
+
+        duration = video.get('duration') or video.get('length') or 0
+        if isinstance(duration, str):
+            duration = self.parser.parse_duration(duration)
+
+        pubdate = video.get('pubdate') or video.get('created')
+        stat = {
+            'view': video.get('play', 0),
+            'danmaku': video.get('video_review', 0),
+            'like': video.get('like', 0),
+            'favorite': video.get('favorites', 0),
+            'reply': video.get('review', video.get('comment', 0)),
+        }
+
+        return {
+            'content_id': bvid,
+            'platform': 'bilibili',
+            'content_type': 'video',
+            'url': f"{self.base_url}/video/{bvid}",
+            'title': re.sub(r'<[^>]+>', '', video.get('title') or ''),
+            'description': video.get('description'),
+            'cover': cover,
+            'duration': duration,
+            'partition': video.get('typename'),
+            'tags': [tag.strip() for tag in (video.get('tag') or '').split(',') if tag.strip()],
+            'uploader': {
+                'mid': str(video.get('mid', '')),
+                'name': video.get('author'),
+                'avatar': video.get('upic')
+            },
+            'view_count': stat['view'],
+            'danmaku_count': stat['danmaku'],
+            'like_count': stat['like'],
+            # 列表接口不返回投币、分享、分P和合作成员，留空表示未知
+            'coin_count': None,
+            'favorite_count': stat['favorite'],
+            'share_count': None,
+            'reply_count': stat['reply'],
+            'publish_time': datetime.fromtimestamp(pubdate) if pubdate else None,
+            'cid': None,
+            'aid': video.get('aid'),
+            'bvid': bvid,
+            'pages': None,
+            'staff': None,
+            'stat': stat,
+            'collected_at': datetime.now()
+        }
+
 
 # 便捷函数
 async def search_bilibili_videos(
@@ -440,7 +440,7 @@ class DouyinInteraction:
                 return comments
 
             # 滚动加载更多评论
-            await self._scroll_to_load_comments(page, max_comments)
+            await self.scroll_to_load_comments(page, max_comments)
 
             # 解析评论
             comment_elements = await page.query_selector_all(comment_selector)
@@ -468,7 +468,7 @@ class DouyinInteraction:
 
         return comments
 
-    async def _scroll_to_load_comments(self, page: Page, target_count: int):
+    async def scroll_to_load_comments(self, page: Page, target_count: int):
         """滚动加载更多评论"""
         last_count = 0
         no_change_count = 0
@@ -708,8 +708,17 @@ class DouyinSpider(BaseSpider):
     - 评论采集（嵌套回复）
     - 弹幕采集
     - 视频/图片下载
+    - 接口响应捕获（优先读取接口JSON，DOM解析作为回退）
     """
 
+    # 各类数据对应的接口URL
+    response_patterns = {
+        'search': [r'/aweme/v1/web/(general/search/single|search/item)/'],
+        'user_posts': [r'/aweme/v1/web/aweme/post/'],
+        'topic': [r'/aweme/v1/web/challenge/aweme/'],
+        'comments': [r'/aweme/v1/web/comment/list/\?'],
+    }
+
     def __init__(self, headless: bool = True, proxy: Optional[str] = None):
         super().__init__(
             platform="douyin",
@@ -739,6 +748,10 @@ class DouyinSpider(BaseSpider):
 
         self.logger.info("Douyin spider started successfully")
 
+    async def _init_page(self, page: Page) -> None:
+        """为新标签页初始化反爬措施"""
+        await self.anti_crawl.initialize(page)
+
     async def login(self, username: str = None, password: str = None) -> bool:
         """
         登录抖音（支持扫码或Cookie登录）
@@ -840,58 +853,38 @@ class DouyinSpider(BaseSpider):
             }
             search_url = f"{self.search_url}?{urlencode(search_params)}"
 
-            # 访问搜索页
-            await self.navigate(search_url)
-            await asyncio.sleep(random.uniform(2, 3))
-
-            # 处理可能的验证码
-            if await self.anti_crawl.handle_slider_captcha(self._page):
-                self.logger.info("Passed captcha check")
-
-            # 滚动加载更多内容
-            await self._scroll_and_load(max_results)
-
-            # 解析视频列表
-            video_elements = await self._page.query_selector_all('[data-e2e="search-result-item"]')
-
-            for elem in video_elements[:max_results * 2]:  # 获取更多以便过滤
-                try:
-                    # 提取视频ID和URL
-                    link_elem = await elem.query_selector('a')
-                    if not link_elem:
-                        continue
-
-                    video_url = await link_elem.get_attribute('href')
-                    if not video_url:
-                        continue
-
-                    video_id = self._extract_video_id(video_url)
-                    if not video_id or video_id in self._collected_video_ids:
-                        continue
-
-                    # 获取视频详情
-                    video_data = await self.get_post_detail(video_id)
+            # 访问搜索页，同时捕获接口返回的JSON
+            async with self.capture_responses("search") as capture:
+                await self.navigate(search_url)
+                await asyncio.sleep(random.uniform(2, 3))
 
-                    if video_data:
-                        # 内容匹配
-                        if criteria:
-                            is_match, match_score = await self.matcher.match_video(video_data, criteria)
-                            if not is_match:
-                                continue
-                            video_data['match_score'] = match_score
+                # 处理可能的验证码
+                if await self.anti_crawl.handle_slider_captcha(self._page):
+                    self.logger.info("Passed captcha check")
 
-                        results.append(video_data)
-                        self._collected_video_ids.add(video_id)
+                # 滚动加载更多内容
+                await self._scroll_and_load(max_results)
 
-                        if len(results) >= max_results:
-                            break
+                captured = await self.collect_captured(capture, "search", max_results * 2)
 
-                    # 随机延迟
-                    await asyncio.sleep(random.uniform(0.5, 1))
-
-                except Exception as e:
-                    self.logger.error(f"Error parsing video: {e}")
-                    continue
+            accept = self._make_detail_filter(criteria, self._collected_video_ids, self.matcher.match_video)
+            if captured:
+                # 接口数据已包含详情，无需逐条打开详情页
+                results = await self.filter_items(captured, max_results, accept)
+            else:
+                # 解析视频列表（回退到DOM解析）
+                video_elements = await self._page.query_selector_all('[data-e2e="search-result-item"]')
+
+                # 并发获取视频详情
+                video_ids = await self._extract_post_ids(
+                    video_elements[:max_results * 2], self._extract_video_id,
+                    self._collected_video_ids
+                )  # 获取更多以便过滤
+                results = await self.fetch_details(
+                    video_ids,
+                    limit=max_results,
+                    accept=accept,
+                )
 
             self.logger.info(f"Collected {len(results)} videos for keyword: {keyword}")
 
@@ -934,50 +927,35 @@ class DouyinSpider(BaseSpider):
         posts = []
 
         try:
-            # 访问用户主页
-            user_url = f"{self.base_url}/user/{user_id}"
-            await self.navigate(user_url)
-            await asyncio.sleep(random.uniform(2, 3))
-
-            # 滚动加载
-            await self._scroll_and_load(max_posts)
-
-            # 解析视频列表
-            video_elements = await self._page.query_selector_all('[data-e2e="user-video-item"]')
-
-            for elem in video_elements[:max_posts * 2]:
-                try:
-                    # 获取视频链接
-                    link_elem = await elem.query_selector('a')
-                    if not link_elem:
-                        continue
-
-                    video_url = await link_elem.get_attribute('href')
-                    video_id = self._extract_video_id(video_url)
-
-                    if not video_id or video_id in self._collected_video_ids:
-                        continue
-
-                    # 获取视频详情
-                    video_data = await self.get_post_detail(video_id)
+            # 访问用户主页，同时捕获接口返回的JSON
+            async with self.capture_responses("user_posts") as capture:
+                user_url = f"{self.base_url}/user/{user_id}"
+                await self.navigate(user_url)
+                await asyncio.sleep(random.uniform(2, 3))
 
-                    if video_data:
-                        # 内容匹配
-                        if criteria:
-                            is_match, match_score = await self.matcher.match_video(video_data, criteria)
-                            if not is_match:
-                                continue
-                            video_data['match_score'] = match_score
+                # 滚动加载
+                await self._scroll_and_load(max_posts)
 
-                        posts.append(video_data)
-                        self._collected_video_ids.add(video_id)
+                captured = await self.collect_captured(capture, "user_posts", max_posts * 2)
 
-                        if len(posts) >= max_posts:
-                            break
+            accept = self._make_detail_filter(criteria, self._collected_video_ids, self.matcher.match_video)
+            if captured:
+                # 接口数据已包含详情，无需逐条打开详情页
+                posts = await self.filter_items(captured, max_posts, accept)
+            else:
+                # 解析视频列表（回退到DOM解析）
+                video_elements = await self._page.query_selector_all('[data-e2e="user-video-item"]')
 
-                except Exception as e:
-                    self.logger.error(f"Error parsing user video: {e}")
-                    continue
+                # 并发获取视频详情
+                video_ids = await self._extract_post_ids(
+                    video_elements[:max_posts * 2], self._extract_video_id,
+                    self._collected_video_ids
+                )
+                posts = await self.fetch_details(
+                    video_ids,
+                    limit=max_posts,
+                    accept=accept,
+                )
 
             self.logger.info(f"Collected {len(posts)} posts for user: {user_id}")
 
@@ -1169,11 +1147,18 @@ class DouyinSpider(BaseSpider):
         """
         # 确保在视频页面
         video_url = f"{self.base_url}/video/{post_id}"
-        current_url = self._page.url
 
-        if post_id not in current_url:
-            await self.navigate(video_url)
-            await asyncio.sleep(2)
+        async with self.capture_responses("comments") as capture:
+            if post_id not in self._page.url:
+                await self.navigate(video_url)
+                await asyncio.sleep(2)
+
+            if capture is not None:
+                await self.interaction.scroll_to_load_comments(self._page, max_comments)
+                comments = await self.collect_captured(capture, "comments", max_comments)
+                if comments:
+                    self.logger.info(f"Collected {len(comments)} comments for video {post_id}")
+                    return comments
 
         return await self.interaction.get_video_comments(
             self._page,
@@ -1204,49 +1189,35 @@ class DouyinSpider(BaseSpider):
         videos = []
 
         try:
-            # 访问话题页
-            topic_url = f"{self.base_url}/hashtag/{topic}"
-            await self.navigate(topic_url)
-            await asyncio.sleep(random.uniform(2, 3))
-
-            # 滚动加载
-            await self._scroll_and_load(max_videos)
-
-            # 解析视频列表
-            video_elements = await self._page.query_selector_all('[data-e2e="topic-video-item"]')
-
-            for elem in video_elements[:max_videos * 2]:
-                try:
-                    link_elem = await elem.query_selector('a')
-                    if not link_elem:
-                        continue
-
-                    video_url = await link_elem.get_attribute('href')
-                    video_id = self._extract_video_id(video_url)
-
-                    if not video_id or video_id in self._collected_video_ids:
-                        continue
-
-                    # 获取视频详情
-                    video_data = await self.get_post_detail(video_id)
+            # 访问话题页，同时捕获接口返回的JSON
+            async with self.capture_responses("topic") as capture:
+                topic_url = f"{self.base_url}/hashtag/{topic}"
+                await self.navigate(topic_url)
+                await asyncio.sleep(random.uniform(2, 3))
 
-                    if video_data:
-                        # 内容匹配
-                        if criteria:
-                            is_match, match_score = await self.matcher.match_video(video_data, criteria)
-                            if not is_match:
-                                continue
-                            video_data['match_score'] = match_score
+                # 滚动加载
+                await self._scroll_and_load(max_videos)
 
-                        videos.append(video_data)
-                        self._collected_video_ids.add(video_id)
+                captured = await self.collect_captured(capture, "topic", max_videos * 2)
 
-                        if len(videos) >= max_videos:
-                            break
+            accept = self._make_detail_filter(criteria, self._collected_video_ids, self.matcher.match_video)
+            if captured:
+                # 接口数据已包含详情，无需逐条打开详情页
+                videos = await self.filter_items(captured, max_videos, accept)
+            else:
+                # 解析视频列表（回退到DOM解析）
+                video_elements = await self._page.query_selector_all('[data-e2e="topic-video-item"]')
 
-                except Exception as e:
-                    self.logger.error(f"Error parsing topic video: {e}")
-                    continue
+                # 并发获取视频详情
+                video_ids = await self._extract_post_ids(
+                    video_elements[:max_videos * 2], self._extract_video_id,
+                    self._collected_video_ids
+                )
+                videos = await self.fetch_details(
+                    video_ids,
+                    limit=max_videos,
+                    accept=accept,
+                )
 
             self.logger.info(f"Collected {len(videos)} videos for topic: #{topic}")
 
@@ -1338,6 +1309,92 @@ class DouyinSpider(BaseSpider):
         except:
             return None
 
+    def convert_response(self, kind: str, payload: Any) -> List[Dict[str, Any]]:
+        """将捕获的接口JSON转换为与DOM解析一致的数据结构"""
+        if not isinstance(payload, dict):
+            return []
+
+        if kind == 'comments':
+            return [self._convert_comment(c) for c in payload.get('comments') or [] if c.get('cid')]
+
+        # 搜索接口返回 data[].aweme_info，用户/话题接口返回 aweme_list
+        awemes = payload.get('aweme_list')
+        if awemes is None:
+            awemes = [item.get('aweme_info') for item in payload.get('data') or [] if isinstance(item, dict)]
+        return [self._convert_aweme(a) for a in awemes if a and a.get('aweme_id')]
+
+    @staticmethod
+    def _first_url(obj: Optional[Dict[str, Any]]) -> Optional[str]:
+        """取接口中 url_list 的第一个地址"""
+        urls = (obj or {}).get('url_list') or []
+        return urls[0] if urls else None
+
+    def _convert_aweme(self, aweme: Dict[str, Any]) -> Dict[str, Any]:
+        """转换接口中的视频对象"""
+        video_id = str(aweme['aweme_id'])
+        desc = aweme.get('desc') or ''
+        author = aweme.get('author') or {}
+        stats = aweme.get('statistics') or {}
+        video = aweme.get('video') or {}
+        music = aweme.get('music') or {}
+        poi = aweme.get('poi_info') or {}
+        images = aweme.get('images') or []
+        create_time = aweme.get('create_time')
+
+        return {
+            'content_id': video_id,
+            'platform': 'douyin',
+            'content_type': 'image' if images else 'video',
+            'url': f"{self.base_url}/video/{video_id}",
+            'title': desc,
+            'description': desc,
+            'cover_image': self._first_url(video.get('cover')),
+            'video_url': self._first_url(video.get('play_addr')),
+            'images': [url for url in (self._first_url(img) for img in images) if url],
+            'duration': int((video.get('duration') or 0) / 1000),
+            'resolution': f"{video['width']}x{video['height']}" if video.get('width') else None,
+            'hashtags': [t['hashtag_name'] for t in aweme.get('text_extra') or [] if t.get('hashtag_name')],
+            'mentions': self.parser.extract_mentions(desc),
+            'music': {'title': music.get('title'), 'author': music.get('author')} if music else {},
+            'author': {
+                'user_id': author.get('sec_uid'),
+                'nickname': author.get('nickname'),
+                'avatar': self._first_url(author.get('avatar_thumb')),
+            },
+            'view_count': stats.get('play_count', 0),
+            'like_count': stats.get('digg_count', 0),
+            'comment_count': stats.get('comment_count', 0),
+            'share_count': stats.get('share_count', 0),
+            'collect_count': stats.get('collect_count', 0),
+            'publish_time': datetime.fromtimestamp(create_time) if create_time else None,
+            'location': aweme.get('ip_attribution'),
+            'is_ad': bool(aweme.get('is_ads')),
+            'poi_info': {'name': poi.get('poi_name'), 'address': poi.get('address_info', {}).get('address')} if poi else {},
+            'interaction_data': {},
+            'download_links': {},
+            'collected_at': datetime.now()
+        }
+
+    def _convert_comment(self, comment: Dict[str, Any]) -> Dict[str, Any]:
+        """转换接口中的评论对象"""
+        user = comment.get('user') or {}
+        create_time = comment.get('create_time')
+        return {
+            'comment_id': str(comment['cid']),
+            'user': {
+                'user_id': user.get('sec_uid'),
+                'nickname': user.get('nickname'),
+                'avatar': self._first_url(user.get('avatar_thumb')),
+            },
+            'text': comment.get('text'),
+            'like_count': comment.get('digg_count', 0),
+            'reply_count': comment.get('reply_comment_total', 0),
+            'publish_time': datetime.fromtimestamp(create_time) if create_time else None,
+            'replies': [],
+            'is_author': comment.get('label_text') == '作者',
+            'ip_location': comment.get('ip_label'),
+        }
+
     def _extract_user_id(self, url: str) -> Optional[str]:
         """从URL中提取用户ID"""
         try:
@@ -888,11 +888,14 @@ class GitHubSpider(BaseSpider):
 
             # 解析搜索结果
             if search_type == "repositories":
-                repo_elements = await self._page.query_selector_all('.repo-list-item')
+                # 一次 evaluate 读取所有仓库卡片
+                repo_items = await self.helper.extract_items(
+                    self._page, '.repo-list-item', self._REPOSITORY_FIELDS, limit=max_results * 2
+                )
 
-                for elem in repo_elements[:max_results * 2]:
+                for item in repo_items:
                     try:
-                        repo_data = await self._parse_repository_element(elem)
+                        repo_data = self._build_repository(item)
 
                         if repo_data and repo_data.get('full_name'):
                             # 内容匹配
@@ -923,75 +926,55 @@ class GitHubSpider(BaseSpider):
 
         return results
 
+    # 仓库搜索结果字段（PlaywrightHelper.extract_items 格式）
+    _REPOSITORY_FIELDS = {
+        'href': 'a.v-align-middle@href',
+        'description': 'p.mb-1',
+        'language': '[itemprop="programmingLanguage"]',
+        'stars': 'a[href$="/stargazers"]',
+        'forks': 'a[href$="/forks"]',
+        'topics': {'selector': 'a.topic-tag', 'all': True},
+        'updated_at': 'relative-time@datetime',
+    }
+
     async def _parse_repository_element(self, element) -> Optional[Dict[str, Any]]:
         """解析仓库元素"""
         try:
-            repo_data = {
-                'platform': 'github',
-                'full_name': None,
-                'owner': None,
-                'repo': None,
-                'url': None,
-                'description': None,
-                'language': None,
-                'stars': 0,
-                'forks': 0,
-                'topics': [],
-                'updated_at': None
-            }
-
-            # 仓库名称和链接
-            title_elem = await element.query_selector('a.v-align-middle')
-            if title_elem:
-                href = await title_elem.get_attribute('href')
-                if href:
-                    parts = href.strip('/').split('/')
-                    if len(parts) >= 2:
-                        repo_data['owner'] = parts[0]
-                        repo_data['repo'] = parts[1]
-                        repo_data['full_name'] = f"{parts[0]}/{parts[1]}"
-                        repo_data['url'] = f"{self.base_url}{href}"
-
-            # 描述
-            desc_elem = await element.query_selector('p.mb-1')
-            if desc_elem:
-                repo_data['description'] = (await desc_elem.inner_text()).strip()
-
-            # 语言
-            lang_elem = await element.query_selector('[itemprop="programmingLanguage"]')
-            if lang_elem:
-                repo_data['language'] = (await lang_elem.inner_text()).strip()
-
-            # Stars
-            stars_elem = await element.query_selector('a[href$="/stargazers"]')
-            if stars_elem:
-                stars_text = await stars_elem.inner_text()
-                repo_data['stars'] = self.parser.parse_count(stars_text)
-
-            # Forks
-            forks_elem = await element.query_selector('a[href$="/forks"]')
-            if forks_elem:
-                forks_text = await forks_elem.inner_text()
-                repo_data['forks'] = self.parser.parse_count(forks_text)
-
-            # Topics
-            topic_elements = await element.query_selector_all('a.topic-tag')
-            for topic_elem in topic_elements:
-                topic = (await topic_elem.inner_text()).strip()
-                if topic:
-                    repo_data['topics'].append(topic)
-
-            # 更新时间
-            updated_elem = await element.query_selector('relative-time')
-            if updated_elem:
-                repo_data['updated_at'] = await updated_elem.get_attribute('datetime')
-
-            return repo_data if repo_data['full_name'] else None
+            item = await self.helper.extract_fields(element, self._REPOSITORY_FIELDS)
+            return self._build_repository(item)
 
         except Exception as e:
             self.logger.error(f"Error parsing repository element: {e}")
             return None
 
+    def _build_repository(self, item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """将提取的字段整理为仓库数据"""
+        repo_data = {
+            'platform': 'github',
+            'full_name': None,
+            'owner': None,
+            'repo': None,
+            'url': None,
+            'description': item.get('description'),
+            'language': item.get('language'),
+            'stars': self.parser.parse_count(item.get('stars', '')),
+            'forks': self.parser.parse_count(item.get('forks', '')),
+            'topics': [topic for topic in item.get('topics', []) if topic],
+            'updated_at': item.get('updated_at')
+        }
+
+        # 仓库名称和链接
+        href = item.get('href')
+        if href:
+            parts = href.strip('/').split('/')
+            if len(parts) >= 2:
+                repo_data['owner'] = parts[0]
+                repo_data['repo'] = parts[1]
+                repo_data['full_name'] = f"{parts[0]}/{parts[1]}"
+                repo_data['url'] = f"{self.base_url}{href}"
+
+        return repo_data if repo_data['full_name'] else None
+
     async def get_user_profile(self, username: str) -> Dict[str, Any]:
         """
         获取用户资料
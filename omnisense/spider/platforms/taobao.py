@@ -1027,19 +1027,9 @@ class TaobaoSpider(BaseSpider):
 
             results = []
             # 使用多个选择器，因为淘宝结构会变化
-            item_elements = await self._page.query_selector_all('.item, .Card--doubleCardWrapper--L2XFE73')
-
-            self.logger.info(f"找到 {len(item_elements)} 个商品元素")
-
-            for elem in item_elements[:max_results]:
-                try:
-                    result = await self._parse_search_result(elem)
-                    if result and (result.get('id') or result.get('url')):
-                        results.append(result)
-
-                except Exception as e:
-                    self.logger.warning(f"解析商品失败: {e}")
-                    continue
+            for result in await self._extract_search_results('.item, .Card--doubleCardWrapper--L2XFE73', max_results):
+                if result.get('id') or result.get('url'):
+                    results.append(result)
 
             # 应用额外过滤
             if location:
@@ -1052,60 +1042,51 @@ class TaobaoSpider(BaseSpider):
             self.logger.error(f"搜索失败: {e}")
             return []
 
-    async def _parse_search_result(self, elem) -> Dict[str, Any]:
-        """解析搜索结果中的单个商品"""
+    # 搜索结果卡片字段（PlaywrightHelper.extract_items 格式）
+    _SEARCH_RESULT_FIELDS = {
+        'title': '.title, .Title--title--jCOPvpf',
+        'href': 'a[href*="item.taobao.com"], a[href*="detail.tmall.com"]@href',
+        'price': '.price, .Price--priceInt--ZlsSi_M',
+        'sales': '.deal-cnt, .RealSales--realSales--FhTZc7U',
+        'shop': '.shop, .ShopInfo--shopName--rg6mGmy',
+        'location': '.location, .Locaddress--address--ievZpAT',
+        'thumbnail': 'img@src',
+    }
+
+    async def _extract_search_results(self, root: str, limit: int) -> List[Dict[str, Any]]:
+        """一次 evaluate 解析当前页的所有商品卡片"""
+        items = await self.helper.extract_items(self._page, root, self._SEARCH_RESULT_FIELDS, limit=limit)
+        self.logger.info(f"找到 {len(items)} 个商品元素")
+        return [self._build_search_result(item) for item in items]
+
+    def _build_search_result(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        """将提取的字段整理为商品结果"""
         result = {
             'platform': self.platform,
             'type': 'product'
         }
 
-        # 标题和链接
-        title_elem = await elem.query_selector('.title, .Title--title--jCOPvpf')
-        link_elem = await elem.query_selector('a[href*="item.taobao.com"], a[href*="detail.tmall.com"]')
-
-        if title_elem:
-            result['title'] = (await title_elem.inner_text()).strip()
-
-        if link_elem:
-            href = await link_elem.get_attribute('href')
-            if href:
-                if not href.startswith('http'):
-                    href = 'https:' + href
-                result['url'] = href
-                # 提取商品ID
-                if 'id=' in href:
-                    result['id'] = href.split('id=')[-1].split('&')[0]
-
-        # 价格
-        price_elem = await elem.query_selector('.price, .Price--priceInt--ZlsSi_M')
-        if price_elem:
-            price_text = await price_elem.inner_text()
-            result['price'] = price_text.strip()
-
-        # 销量
-        sales_elem = await elem.query_selector('.deal-cnt, .RealSales--realSales--FhTZc7U')
-        if sales_elem:
-            sales_text = await sales_elem.inner_text()
-            result['sales'] = sales_text.strip()
-
-        # 店铺名称
-        shop_elem = await elem.query_selector('.shop, .ShopInfo--shopName--rg6mGmy')
-        if shop_elem:
-            result['shop'] = (await shop_elem.inner_text()).strip()
-
-        # 发货地
-        location_elem = await elem.query_selector('.location, .Locaddress--address--ievZpAT')
-        if location_elem:
-            result['location'] = (await location_elem.inner_text()).strip()
+        # 标题、价格、销量、店铺、发货地
+        for key in ('title', 'price', 'sales', 'shop', 'location'):
+            if key in item:
+                result[key] = item[key]
+
+        # 链接
+        href = item.get('href')
+        if href:
+            if not href.startswith('http'):
+                href = 'https:' + href
+            result['url'] = href
+            # 提取商品ID
+            if 'id=' in href:
+                result['id'] = href.split('id=')[-1].split('&')[0]
 
         # 商品图片
-        img = await elem.query_selector('img')
-        if img:
-            src = await img.get_attribute('src')
-            if src:
-                if not src.startswith('http'):
-                    src = 'https:' + src
-                result['thumbnail'] = src
+        src = item.get('thumbnail')
+        if src:
+            if not src.startswith('http'):
+                src = 'https:' + src
+            result['thumbnail'] = src
 
         return result
 
@@ -1635,17 +1616,10 @@ class TaobaoSpider(BaseSpider):
                 await asyncio.sleep(random.uniform(2, 3))
 
             results = []
-            item_elements = await self._page.query_selector_all('.item, .shop-item')
-
-            for elem in item_elements[:max_results]:
-                try:
-                    result = await self._parse_search_result(elem)
-                    if result and result.get('id'):
-                        result['shop_id'] = shop_id
-                        results.append(result)
-                except Exception as e:
-                    self.logger.warning(f"解析商品失败: {e}")
-                    continue
+            for result in await self._extract_search_results('.item, .shop-item', max_results):
+                if result.get('id'):
+                    result['shop_id'] = shop_id
+                    results.append(result)
 
             self.logger.info(f"获取到 {len(results)} 个店铺商品")
             return results
@@ -1687,17 +1661,10 @@ class TaobaoSpider(BaseSpider):
                 await asyncio.sleep(random.uniform(2, 3))
 
             results = []
-            item_elements = await self._page.query_selector_all('.item, .Card--doubleCardWrapper--L2XFE73')
-
-            for elem in item_elements[:max_results]:
-                try:
-                    result = await self._parse_search_result(elem)
-                    if result and result.get('id'):
-                        result['is_hot'] = True
-                        results.append(result)
-                except Exception as e:
-                    self.logger.warning(f"解析商品失败: {e}")
-                    continue
+            for result in await self._extract_search_results('.item, .Card--doubleCardWrapper--L2XFE73', max_results):
+                if result.get('id'):
+                    result['is_hot'] = True
+                    results.append(result)
 
             self.logger.info(f"获取到 {len(results)} 个热销商品")
             return results
@@ -1838,17 +1805,10 @@ class TaobaoSpider(BaseSpider):
                 await asyncio.sleep(random.uniform(2, 3))
 
             results = []
-            item_elements = await self._page.query_selector_all('.item, .Card--doubleCardWrapper--L2XFE73')
-
-            for elem in item_elements[:max_results]:
-                try:
-                    result = await self._parse_search_result(elem)
-                    if result and result.get('id'):
-                        result['category_id'] = category_id
-                        results.append(result)
-                except Exception as e:
-                    self.logger.warning(f"解析商品失败: {e}")
-                    continue
+            for result in await self._extract_search_results('.item, .Card--doubleCardWrapper--L2XFE73', max_results):
+                if result.get('id'):
+                    result['category_id'] = category_id
+                    results.append(result)
 
             self.logger.info(f"找到 {len(results)} 个分类商品")
             return results
@@ -1882,16 +1842,10 @@ class TaobaoSpider(BaseSpider):
             recommendations = []
 
             # 查找"看了又看"推荐
-            recommend_elements = await self._page.query_selector_all('.recommend-item, .related-item')
-
-            for elem in recommend_elements[:max_results]:
-                try:
-                    rec = await self._parse_search_result(elem)
-                    if rec and rec.get('id'):
-                        rec['recommendation_type'] = 'related'
-                        recommendations.append(rec)
-                except:
-                    continue
+            for rec in await self._extract_search_results('.recommend-item, .related-item', max_results):
+                if rec.get('id'):
+                    rec['recommendation_type'] = 'related'
+                    recommendations.append(rec)
 
             self.logger.info(f"获取到 {len(recommendations)} 个推荐商品")
             return recommendations
@@ -1082,19 +1082,9 @@ class TmallSpider(BaseSpider):
 
             results = []
             # 天猫商品选择器
-            product_elements = await self._page.query_selector_all('.product, .product-item, [class*="item"]')
-
-            self.logger.info(f"Found {len(product_elements)} product elements on page")
-
-            for elem in product_elements[:max_results]:
-                try:
-                    result = await self._parse_search_result(elem)
-                    if result and result.get('id'):
-                        results.append(result)
-
-                except Exception as e:
-                    self.logger.warning(f"Failed to parse product: {e}")
-                    continue
+            for result in await self._extract_search_results('.product, .product-item, [class*="item"]', max_results):
+                if result.get('id'):
+                    results.append(result)
 
             self.logger.info(f"Successfully parsed {len(results)} products")
             return results
@@ -1103,47 +1093,54 @@ class TmallSpider(BaseSpider):
             self.logger.error(f"Search failed: {e}")
             return []
 
-    async def _parse_search_result(self, elem) -> Dict[str, Any]:
-        """解析搜索结果中的单个商品"""
+    # 搜索结果卡片字段（PlaywrightHelper.extract_items 格式）
+    _SEARCH_RESULT_FIELDS = {
+        'title': '.productTitle, [class*="title"] a, .product-title',
+        'href': '.productTitle, [class*="title"] a, .product-title@href',
+        'price': '.productPrice, [class*="price"], .price',
+        'original_price': '.productPrice-original, [class*="original"]',
+        'sales_count': '.productSales, [class*="sales"], .sale-num',
+        'shop_name': '.productShop, [class*="shop"], .shop-name',
+        'thumbnail': ['img@src', 'img@data-src'],
+        'free_shipping': {'selector': '[class*="free-shipping"], .free-ship', 'type': 'exists'},
+        'activity': '[class*="activity"], .promo-tag',
+    }
+
+    async def _extract_search_results(self, root: str, limit: int) -> List[Dict[str, Any]]:
+        """一次 evaluate 解析当前页的所有商品卡片"""
+        items = await self.helper.extract_items(self._page, root, self._SEARCH_RESULT_FIELDS, limit=limit)
+        self.logger.info(f"Found {len(items)} product elements on page")
+        return [self._build_search_result(item) for item in items]
+
+    def _build_search_result(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        """将提取的字段整理为商品结果"""
         result = {
             'platform': self.platform,
             'type': 'product'
         }
 
         # 商品标题和链接
-        title_elem = await elem.query_selector('.productTitle, [class*="title"] a, .product-title')
-        if title_elem:
-            result['title'] = (await title_elem.inner_text()).strip()
-            href = await title_elem.get_attribute('href')
-            if href:
-                if not href.startswith('http'):
-                    href = 'https:' + href
-                result['url'] = href
-
-                # 提取商品ID
-                if 'id=' in href:
-                    result['id'] = href.split('id=')[-1].split('&')[0]
-
-        # 价格信息
-        price_elem = await elem.query_selector('.productPrice, [class*="price"], .price')
-        if price_elem:
-            price_text = (await price_elem.inner_text()).strip()
-            result['price'] = price_text
-
-        # 原价
-        original_price_elem = await elem.query_selector('.productPrice-original, [class*="original"]')
-        if original_price_elem:
-            result['original_price'] = (await original_price_elem.inner_text()).strip()
-
-        # 销量
-        sales_elem = await elem.query_selector('.productSales, [class*="sales"], .sale-num')
-        if sales_elem:
-            result['sales_count'] = (await sales_elem.inner_text()).strip()
+        if 'title' in item:
+            result['title'] = item['title']
+
+        href = item.get('href')
+        if href:
+            if not href.startswith('http'):
+                href = 'https:' + href
+            result['url'] = href
+
+            # 提取商品ID
+            if 'id=' in href:
+                result['id'] = href.split('id=')[-1].split('&')[0]
+
+        # 价格、原价、销量
+        for key in ('price', 'original_price', 'sales_count'):
+            if key in item:
+                result[key] = item[key]
 
         # 店铺名称
-        shop_elem = await elem.query_selector('.productShop, [class*="shop"], .shop-name')
-        if shop_elem:
-            shop_name = (await shop_elem.inner_text()).strip()
+        shop_name = item.get('shop_name')
+        if shop_name is not None:
             result['shop'] = {'shop_name': shop_name}
 
             # 判断店铺类型
@@ -1157,25 +1154,18 @@ class TmallSpider(BaseSpider):
                 result['is_imported'] = True
 
         # 商品图片
-        img = await elem.query_selector('img')
-        if img:
-            src = await img.get_attribute('src')
-            if not src:
-                src = await img.get_attribute('data-src')
-            if src:
-                if not src.startswith('http'):
-                    src = 'https:' + src
-                result['thumbnail'] = src
+        src = item.get('thumbnail')
+        if src:
+            if not src.startswith('http'):
+                src = 'https:' + src
+            result['thumbnail'] = src
 
         # 包邮标识
-        free_shipping = await elem.query_selector('[class*="free-shipping"], .free-ship')
-        result['free_shipping'] = free_shipping is not None
+        result['free_shipping'] = item.get('free_shipping', False)
 
         # 活动标签
-        activity_elem = await elem.query_selector('[class*="activity"], .promo-tag')
-        if activity_elem:
-            activity_text = (await activity_elem.inner_text()).strip()
-            result['activities'] = [{'activity_name': activity_text}]
+        if 'activity' in item:
+            result['activities'] = [{'activity_name': item['activity']}]
 
         return result
 
@@ -1651,17 +1641,10 @@ class TmallSpider(BaseSpider):
                 await asyncio.sleep(random.uniform(2, 3))
 
             results = []
-            product_elements = await self._page.query_selector_all('.product, .item, [class*="item"]')
-
-            for elem in product_elements[:max_results]:
-                try:
-                    result = await self._parse_search_result(elem)
-                    if result and result.get('id'):
-                        result['activity_type'] = activity_type
-                        results.append(result)
-                except Exception as e:
-                    self.logger.warning(f"Failed to parse product: {e}")
-                    continue
+            for result in await self._extract_search_results('.product, .item, [class*="item"]', max_results):
+                if result.get('id'):
+                    result['activity_type'] = activity_type
+                    results.append(result)
 
             self.logger.info(f"Found {len(results)} products for activity")
             return results
@@ -1701,18 +1684,11 @@ class TmallSpider(BaseSpider):
                 await asyncio.sleep(random.uniform(2, 3))
 
             results = []
-            product_elements = await self._page.query_selector_all('.product, .product-item')
-
-            for elem in product_elements[:max_results]:
-                try:
-                    result = await self._parse_search_result(elem)
-                    if result and result.get('id'):
-                        result['is_imported'] = True
-                        result['source'] = 'tmall_global'
-                        results.append(result)
-                except Exception as e:
-                    self.logger.warning(f"Failed to parse product: {e}")
-                    continue
+            for result in await self._extract_search_results('.product, .product-item', max_results):
+                if result.get('id'):
+                    result['is_imported'] = True
+                    result['source'] = 'tmall_global'
+                    results.append(result)
 
             # 按原产国过滤
             if country:
@@ -1754,19 +1730,12 @@ class TmallSpider(BaseSpider):
                 await asyncio.sleep(random.uniform(2, 3))
 
             results = []
-            product_elements = await self._page.query_selector_all('.product, .item')
-
-            for elem in product_elements[:max_results]:
-                try:
-                    result = await self._parse_search_result(elem)
-                    if result and result.get('id'):
-                        result['source'] = 'tmall_supermarket'
-                        if result.get('shop'):
-                            result['shop']['shop_type'] = 'supermarket'
-                        results.append(result)
-                except Exception as e:
-                    self.logger.warning(f"Failed to parse product: {e}")
-                    continue
+            for result in await self._extract_search_results('.product, .item', max_results):
+                if result.get('id'):
+                    result['source'] = 'tmall_supermarket'
+                    if result.get('shop'):
+                        result['shop']['shop_type'] = 'supermarket'
+                    results.append(result)
 
             self.logger.info(f"Found {len(results)} Tmall Supermarket products")
             return results
@@ -410,7 +410,7 @@ class WeiboInteraction:
                 return comments
 
             # 滚动加载更多评论
-            await self._scroll_to_load_comments(page, max_comments)
+            await self.scroll_to_load_comments(page, max_comments)
 
             # 解析评论
             comment_elements = await page.query_selector_all(comment_selector)
@@ -438,7 +438,7 @@ class WeiboInteraction:
 
         return comments
 
-    async def _scroll_to_load_comments(self, page: Page, target_count: int):
+    async def scroll_to_load_comments(self, page: Page, target_count: int):
         """滚动加载更多评论"""
         last_count = 0
         no_change_count = 0
@@ -798,8 +798,15 @@ class WeiboSpider(BaseSpider):
     - 评论采集（嵌套回复）
     - 转发链追踪
     - KOL分析
+    - 接口响应捕获（优先读取接口JSON，DOM解析作为回退）
     """
 
+    # 各类数据对应的接口URL（搜索页为服务端渲染，仍走DOM解析）
+    response_patterns = {
+        'user_posts': [r'weibo\.com/ajax/statuses/mymblog'],
+        'comments': [r'weibo\.com/ajax/statuses/buildComments'],
+    }
+
     def __init__(self, headless: bool = True, proxy: Optional[str] = None):
         super().__init__(
             platform="weibo",
@@ -829,6 +836,10 @@ class WeiboSpider(BaseSpider):
 
         self.logger.info("Weibo spider started successfully")
 
+    async def _init_page(self, page: Page) -> None:
+        """为新标签页初始化反爬措施"""
+        await self.anti_crawl.initialize(page)
+
     async def login(self, username: str = None, password: str = None) -> bool:
         """
         登录微博
@@ -1000,44 +1011,16 @@ class WeiboSpider(BaseSpider):
             # 解析微博列表
             weibo_elements = await self._page.query_selector_all('.card-wrap')
 
-            for elem in weibo_elements[:max_results * 2]:
-                try:
-                    # 提取微博ID和URL
-                    link_elem = await elem.query_selector('.from a')
-                    if not link_elem:
-                        continue
-
-                    weibo_url = await link_elem.get_attribute('href')
-                    if not weibo_url:
-                        continue
-
-                    weibo_id = self._extract_weibo_id(weibo_url)
-                    if not weibo_id or weibo_id in self._collected_weibo_ids:
-                        continue
-
-                    # 获取微博详情
-                    weibo_data = await self.get_post_detail(weibo_id)
-
-                    if weibo_data:
-                        # 内容匹配
-                        if criteria:
-                            is_match, match_score = await self.matcher.match_weibo(weibo_data, criteria)
-                            if not is_match:
-                                continue
-                            weibo_data['match_score'] = match_score
-
-                        results.append(weibo_data)
-                        self._collected_weibo_ids.add(weibo_id)
-
-                        if len(results) >= max_results:
-                            break
-
-                    # 随机延迟
-                    await asyncio.sleep(random.uniform(0.5, 1))
-
-                except Exception as e:
-                    self.logger.error(f"Error parsing weibo: {e}")
-                    continue
+            # 并发获取详情
+            weibo_ids = await self._extract_post_ids(
+                weibo_elements[:max_results * 2], self._extract_weibo_id, self._collected_weibo_ids,
+                link_selector='.from a'
+            )
+            results = await self.fetch_details(
+                weibo_ids,
+                limit=max_results,
+                accept=self._make_detail_filter(criteria, self._collected_weibo_ids, self.matcher.match_weibo),
+            )
 
             self.logger.info(f"Collected {len(results)} weibos for keyword: {keyword}")
 
@@ -1080,53 +1063,38 @@ class WeiboSpider(BaseSpider):
         posts = []
 
         try:
-            # 访问用户主页
-            user_url = f"{self.base_url}/u/{user_id}"
-            await self.navigate(user_url)
-            await asyncio.sleep(random.uniform(2, 3))
+            # 访问用户主页，同时捕获接口返回的JSON
+            async with self.capture_responses("user_posts") as capture:
+                user_url = f"{self.base_url}/u/{user_id}"
+                await self.navigate(user_url)
+                await asyncio.sleep(random.uniform(2, 3))
 
-            # 请求节流
-            await self.anti_crawl.throttle_request()
-
-            # 滚动加载
-            await self._scroll_and_load(max_posts)
-
-            # 解析微博列表
-            weibo_elements = await self._page.query_selector_all('.card-wrap')
-
-            for elem in weibo_elements[:max_posts * 2]:
-                try:
-                    # 获取微博链接
-                    link_elem = await elem.query_selector('.from a')
-                    if not link_elem:
-                        continue
+                # 请求节流
+                await self.anti_crawl.throttle_request()
 
-                    weibo_url = await link_elem.get_attribute('href')
-                    weibo_id = self._extract_weibo_id(weibo_url)
+                # 滚动加载
+                await self._scroll_and_load(max_posts)
 
-                    if not weibo_id or weibo_id in self._collected_weibo_ids:
-                        continue
+                captured = await self.collect_captured(capture, "user_posts", max_posts * 2)
 
-                    # 获取微博详情
-                    weibo_data = await self.get_post_detail(weibo_id)
-
-                    if weibo_data:
-                        # 内容匹配
-                        if criteria:
-                            is_match, match_score = await self.matcher.match_weibo(weibo_data, criteria)
-                            if not is_match:
-                                continue
-                            weibo_data['match_score'] = match_score
-
-                        posts.append(weibo_data)
-                        self._collected_weibo_ids.add(weibo_id)
-
-                        if len(posts) >= max_posts:
-                            break
-
-                except Exception as e:
-                    self.logger.error(f"Error parsing user weibo: {e}")
-                    continue
+            accept = self._make_detail_filter(criteria, self._collected_weibo_ids, self.matcher.match_weibo)
+            if captured:
+                # 接口数据已包含详情，无需逐条打开详情页
+                posts = await self.filter_items(captured, max_posts, accept)
+            else:
+                # 解析微博列表（回退到DOM解析）
+                weibo_elements = await self._page.query_selector_all('.card-wrap')
+
+                # 并发获取详情
+                weibo_ids = await self._extract_post_ids(
+                    weibo_elements[:max_posts * 2], self._extract_weibo_id, self._collected_weibo_ids,
+                    link_selector='.from a'
+                )
+                posts = await self.fetch_details(
+                    weibo_ids,
+                    limit=max_posts,
+                    accept=accept,
+                )
 
             self.logger.info(f"Collected {len(posts)} posts for user: {user_id}")
 
@@ -1300,11 +1268,18 @@ class WeiboSpider(BaseSpider):
         """
         # 确保在微博页面
         weibo_url = f"{self.base_url}/{post_id}"
-        current_url = self._page.url
 
-        if post_id not in current_url:
-            await self.navigate(weibo_url)
-            await asyncio.sleep(2)
+        async with self.capture_responses("comments") as capture:
+            if post_id not in self._page.url:
+                await self.navigate(weibo_url)
+                await asyncio.sleep(2)
+
+            if capture is not None:
+                await self.interaction.scroll_to_load_comments(self._page, max_comments)
+                comments = await self.collect_captured(capture, "comments", max_comments)
+                if comments:
+                    self.logger.info(f"Collected {len(comments)} comments for weibo {post_id}")
+                    return comments
 
         return await self.interaction.get_weibo_comments(
             self._page,
@@ -1349,38 +1324,16 @@ class WeiboSpider(BaseSpider):
             # 解析微博列表
             weibo_elements = await self._page.query_selector_all('.card-wrap')
 
-            for elem in weibo_elements[:max_weibos * 2]:
-                try:
-                    link_elem = await elem.query_selector('.from a')
-                    if not link_elem:
-                        continue
-
-                    weibo_url = await link_elem.get_attribute('href')
-                    weibo_id = self._extract_weibo_id(weibo_url)
-
-                    if not weibo_id or weibo_id in self._collected_weibo_ids:
-                        continue
-
-                    # 获取微博详情
-                    weibo_data = await self.get_post_detail(weibo_id)
-
-                    if weibo_data:
-                        # 内容匹配
-                        if criteria:
-                            is_match, match_score = await self.matcher.match_weibo(weibo_data, criteria)
-                            if not is_match:
-                                continue
-                            weibo_data['match_score'] = match_score
-
-                        weibos.append(weibo_data)
-                        self._collected_weibo_ids.add(weibo_id)
-
-                        if len(weibos) >= max_weibos:
-                            break
-
-                except Exception as e:
-                    self.logger.error(f"Error parsing topic weibo: {e}")
-                    continue
+            # 并发获取详情
+            weibo_ids = await self._extract_post_ids(
+                weibo_elements[:max_weibos * 2], self._extract_weibo_id, self._collected_weibo_ids,
+                link_selector='.from a'
+            )
+            weibos = await self.fetch_details(
+                weibo_ids,
+                limit=max_weibos,
+                accept=self._make_detail_filter(criteria, self._collected_weibo_ids, self.matcher.match_weibo),
+            )
 
             self.logger.info(f"Collected {len(weibos)} weibos for topic: #{topic}")
 
@@ -1424,6 +1377,87 @@ class WeiboSpider(BaseSpider):
         except:
             return None
 
+    def convert_response(self, kind: str, payload: Any) -> List[Dict[str, Any]]:
+        """将捕获的接口JSON转换为与DOM解析一致的数据结构"""
+        if not isinstance(payload, dict) or payload.get('ok') not in (1, True):
+            return []
+
+        if kind == 'comments':
+            return [self._convert_comment(c) for c in payload.get('data') or [] if c.get('id')]
+
+        mblogs = (payload.get('data') or {}).get('list') or []
+        return [self._convert_mblog(m) for m in mblogs if m.get('mblogid') or m.get('idstr')]
+
+    @staticmethod
+    def _parse_created_at(created_at: Optional[str]) -> Optional[datetime]:
+        """解析接口时间格式，如 'Tue Oct 15 12:00:00 +0800 2024'"""
+        if not created_at:
+            return None
+        try:
+            return datetime.strptime(created_at, '%a %b %d %H:%M:%S %z %Y')
+        except ValueError:
+            return None
+
+    def _convert_mblog(self, mblog: Dict[str, Any]) -> Dict[str, Any]:
+        """转换时间线接口中的微博对象"""
+        weibo_id = mblog.get('mblogid') or mblog.get('idstr')
+        user = mblog.get('user') or {}
+        text = mblog.get('text_raw') or ''
+        retweeted = mblog.get('retweeted_status')
+        page_info = mblog.get('page_info') or {}
+        media = page_info.get('media_info') or {}
+        pic_infos = mblog.get('pic_infos') or {}
+
+        weibo_data = {
+            'content_id': weibo_id,
+            'platform': 'weibo',
+            'content_type': 'weibo',
+            'url': f"{self.base_url}/{user.get('idstr', '')}/{weibo_id}",
+            'text': text,
+            'images': [info.get('large', {}).get('url') for info in pic_infos.values() if info.get('large')],
+            'video_url': media.get('stream_url_hd') or media.get('stream_url'),
+            'topics': self.parser.extract_hashtags(text),
+            'mentions': self.parser.extract_mentions(text),
+            'urls': self.parser.extract_urls(text),
+            'author': {
+                'user_id': user.get('idstr'),
+                'nickname': user.get('screen_name'),
+                'avatar': user.get('profile_image_url'),
+            },
+            'repost_count': mblog.get('reposts_count', 0),
+            'comment_count': mblog.get('comments_count', 0),
+            'like_count': mblog.get('attitudes_count', 0),
+            'publish_time': self._parse_created_at(mblog.get('created_at')),
+            'source': mblog.get('source'),
+            'location': None,
+            'ip_location': (mblog.get('region_name') or '').replace('发布于', '').strip() or None,
+            'is_repost': retweeted is not None,
+            'repost_source': (retweeted or {}).get('text_raw'),
+            'heat': 0,
+            'collected_at': datetime.now()
+        }
+        weibo_data['heat'] = self.matcher._calculate_heat(weibo_data)
+        return weibo_data
+
+    def _convert_comment(self, comment: Dict[str, Any]) -> Dict[str, Any]:
+        """转换评论接口中的评论对象"""
+        user = comment.get('user') or {}
+        return {
+            'comment_id': str(comment['id']),
+            'user': {
+                'user_id': user.get('idstr'),
+                'nickname': user.get('screen_name'),
+                'avatar': user.get('profile_image_url'),
+            },
+            'text': comment.get('text_raw'),
+            'like_count': comment.get('like_counts', 0),
+            'reply_count': comment.get('total_number', 0),
+            'publish_time': self._parse_created_at(comment.get('created_at')),
+            'replies': [self._convert_comment(c) for c in comment.get('comments') or [] if isinstance(c, dict) and c.get('id')],
+            'source': comment.get('source'),
+            'ip_location': (comment.get('source') or '').replace('来自', '').strip() or None
+        }
+
 
 # 便捷函数
 async def search_weibo(
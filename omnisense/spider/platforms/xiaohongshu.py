@@ -462,7 +462,7 @@ class XiaohongshuInteraction:
                 return comments
 
             # 滚动加载更多评论
-            await self._scroll_to_load_comments(page, max_comments)
+            await self.scroll_to_load_comments(page, max_comments)
 
             # 解析评论
             comment_elements = await page.query_selector_all(comment_selector)
@@ -490,7 +490,7 @@ class XiaohongshuInteraction:
 
         return comments
 
-    async def _scroll_to_load_comments(self, page: Page, target_count: int):
+    async def scroll_to_load_comments(self, page: Page, target_count: int):
         """滚动加载更多评论"""
         last_count = 0
         no_change_count = 0
@@ -802,8 +802,16 @@ class XiaohongshuSpider(BaseSpider):
     - 图片/视频下载
     - 种草内容识别
     - 互动分析
+    - 接口响应捕获（优先读取接口JSON，DOM解析作为回退）
     """
 
+    # 各类数据对应的接口URL
+    response_patterns = {
+        'search': [r'/api/sns/web/v1/search/notes'],
+        'user_posts': [r'/api/sns/web/v1/user_posted'],
+        'comments': [r'/api/sns/web/v2/comment/page'],
+    }
+
     def __init__(self, headless: bool = True, proxy: Optional[str] = None):
         super().__init__(
             platform="xiaohongshu",
@@ -833,6 +841,10 @@ class XiaohongshuSpider(BaseSpider):
 
         self.logger.info("Xiaohongshu spider started successfully")
 
+    async def _init_page(self, page: Page) -> None:
+        """为新标签页初始化反爬措施"""
+        await self.anti_crawl.initialize(page)
+
     async def login(self, username: str = None, password: str = None) -> bool:
         """
         登录小红书（支持扫码或Cookie登录）
@@ -934,54 +946,33 @@ class XiaohongshuSpider(BaseSpider):
             }
             search_url = f"{self.search_url}?{urlencode(search_params)}"
 
-            # 访问搜索页
-            await self.navigate(search_url)
-            await asyncio.sleep(random.uniform(2, 3))
-
-            # 滚动加载更多内容
-            await self._scroll_and_load(max_results)
-
-            # 解析笔记列表
-            note_elements = await self._page.query_selector_all('.note-item, [class*="note"]')
-
-            for elem in note_elements[:max_results * 2]:
-                try:
-                    # 提取笔记ID和URL
-                    link_elem = await elem.query_selector('a')
-                    if not link_elem:
-                        continue
+            # 访问搜索页，同时捕获接口返回的JSON
+            async with self.capture_responses("search") as capture:
+                await self.navigate(search_url)
+                await asyncio.sleep(random.uniform(2, 3))
 
-                    note_url = await link_elem.get_attribute('href')
-                    if not note_url:
-                        continue
+                # 滚动加载更多内容
+                await self._scroll_and_load(max_results)
 
-                    note_id = self._extract_note_id(note_url)
-                    if not note_id or note_id in self._collected_note_ids:
-                        continue
+                captured = await self.collect_captured(capture, "search", max_results * 2)
 
-                    # 获取笔记详情
-                    note_data = await self.get_post_detail(note_id)
-
-                    if note_data:
-                        # 内容匹配
-                        if criteria:
-                            is_match, match_score = await self.matcher.match_note(note_data, criteria)
-                            if not is_match:
-                                continue
-                            note_data['match_score'] = match_score
-
-                        results.append(note_data)
-                        self._collected_note_ids.add(note_id)
-
-                        if len(results) >= max_results:
-                            break
-
-                    # 随机延迟
-                    await asyncio.sleep(random.uniform(0.5, 1))
-
-                except Exception as e:
-                    self.logger.error(f"Error parsing note: {e}")
-                    continue
+            accept = self._make_detail_filter(criteria, self._collected_note_ids, self.matcher.match_note)
+            if captured:
+                # 接口数据已包含详情，无需逐条打开详情页
+                results = await self.filter_items(captured, max_results, accept)
+            else:
+                # 解析笔记列表（回退到DOM解析）
+                note_elements = await self._page.query_selector_all('.note-item, [class*="note"]')
+
+                # 并发获取详情
+                note_ids = await self._extract_post_ids(
+                    note_elements[:max_results * 2], self._extract_note_id, self._collected_note_ids
+                )
+                results = await self.fetch_details(
+                    note_ids,
+                    limit=max_results,
+                    accept=accept,
+                )
 
             self.logger.info(f"Collected {len(results)} notes for keyword: {keyword}")
 
@@ -1023,38 +1014,15 @@ class XiaohongshuSpider(BaseSpider):
             # 解析笔记列表
             note_elements = await self._page.query_selector_all('.note-item, [class*="note"]')
 
-            for elem in note_elements[:max_results * 2]:
-                try:
-                    link_elem = await elem.query_selector('a')
-                    if not link_elem:
-                        continue
-
-                    note_url = await link_elem.get_attribute('href')
-                    note_id = self._extract_note_id(note_url)
-
-                    if not note_id or note_id in self._collected_note_ids:
-                        continue
-
-                    # 获取笔记详情
-                    note_data = await self.get_post_detail(note_id)
-
-                    if note_data:
-                        # 内容匹配
-                        if criteria:
-                            is_match, match_score = await self.matcher.match_note(note_data, criteria)
-                            if not is_match:
-                                continue
-                            note_data['match_score'] = match_score
-
-                        results.append(note_data)
-                        self._collected_note_ids.add(note_id)
-
-                        if len(results) >= max_results:
-                            break
-
-                except Exception as e:
-                    self.logger.error(f"Error parsing note: {e}")
-                    continue
+            # 并发获取详情
+            note_ids = await self._extract_post_ids(
+                note_elements[:max_results * 2], self._extract_note_id, self._collected_note_ids
+            )
+            results = await self.fetch_details(
+                note_ids,
+                limit=max_results,
+                accept=self._make_detail_filter(criteria, self._collected_note_ids, self.matcher.match_note),
+            )
 
             self.logger.info(f"Collected {len(results)} notes for tag: #{tag}")
 
@@ -1097,50 +1065,34 @@ class XiaohongshuSpider(BaseSpider):
         posts = []
 
         try:
-            # 访问用户主页
-            user_url = f"{self.base_url}/user/profile/{user_id}"
-            await self.navigate(user_url)
-            await asyncio.sleep(random.uniform(2, 3))
-
-            # 滚动加载
-            await self._scroll_and_load(max_posts)
+            # 访问用户主页，同时捕获接口返回的JSON
+            async with self.capture_responses("user_posts") as capture:
+                user_url = f"{self.base_url}/user/profile/{user_id}"
+                await self.navigate(user_url)
+                await asyncio.sleep(random.uniform(2, 3))
 
-            # 解析笔记列表
-            note_elements = await self._page.query_selector_all('.note-item, [class*="note"]')
-
-            for elem in note_elements[:max_posts * 2]:
-                try:
-                    # 获取笔记链接
-                    link_elem = await elem.query_selector('a')
-                    if not link_elem:
-                        continue
+                # 滚动加载
+                await self._scroll_and_load(max_posts)
 
-                    note_url = await link_elem.get_attribute('href')
-                    note_id = self._extract_note_id(note_url)
+                captured = await self.collect_captured(capture, "user_posts", max_posts * 2)
 
-                    if not note_id or note_id in self._collected_note_ids:
-                        continue
-
-                    # 获取笔记详情
-                    note_data = await self.get_post_detail(note_id)
-
-                    if note_data:
-                        # 内容匹配
-                        if criteria:
-                            is_match, match_score = await self.matcher.match_note(note_data, criteria)
-                            if not is_match:
-                                continue
-                            note_data['match_score'] = match_score
-
-                        posts.append(note_data)
-                        self._collected_note_ids.add(note_id)
-
-                        if len(posts) >= max_posts:
-                            break
-
-                except Exception as e:
-                    self.logger.error(f"Error parsing user note: {e}")
-                    continue
+            accept = self._make_detail_filter(criteria, self._collected_note_ids, self.matcher.match_note)
+            if captured:
+                # 接口数据已包含详情，无需逐条打开详情页
+                posts = await self.filter_items(captured, max_posts, accept)
+            else:
+                # 解析笔记列表（回退到DOM解析）
+                note_elements = await self._page.query_selector_all('.note-item, [class*="note"]')
+
+                # 并发获取详情
+                note_ids = await self._extract_post_ids(
+                    note_elements[:max_posts * 2], self._extract_note_id, self._collected_note_ids
+                )
+                posts = await self.fetch_details(
+                    note_ids,
+                    limit=max_posts,
+                    accept=accept,
+                )
 
             self.logger.info(f"Collected {len(posts)} posts for user: {user_id}")
 
@@ -1360,11 +1312,18 @@ class XiaohongshuSpider(BaseSpider):
         """
         # 确保在笔记页面
         note_url = f"{self.base_url}/explore/{post_id}"
-        current_url = self._page.url
 
-        if post_id not in current_url:
-            await self.navigate(note_url)
-            await asyncio.sleep(2)
+        async with self.capture_responses("comments") as capture:
+            if post_id not in self._page.url:
+                await self.navigate(note_url)
+                await asyncio.sleep(2)
+
+            if capture is not None:
+                await self.interaction.scroll_to_load_comments(self._page, max_comments)
+                comments = await self.collect_captured(capture, "comments", max_comments)
+                if comments:
+                    self.logger.info(f"Collected {len(comments)} comments for note {post_id}")
+                    return comments
 
         return await self.interaction.get_note_comments(
             self._page,
@@ -1438,6 +1397,100 @@ class XiaohongshuSpider(BaseSpider):
         except:
             return None
 
+    def convert_response(self, kind: str, payload: Any) -> List[Dict[str, Any]]:
+        """将捕获的接口JSON转换为与DOM解析一致的数据结构"""
+        if not isinstance(payload, dict) or not payload.get('success', True):
+            return []
+        data = payload.get('data') or {}
+
+        if kind == 'comments':
+            return [self._convert_comment(c, include_replies=True) for c in data.get('comments') or [] if c.get('id')]
+
+        if kind == 'user_posts':
+            return [self._convert_note(n.get('note_id'), n) for n in data.get('notes') or [] if n.get('note_id')]
+
+        # 搜索结果中 model_type 为 note 的条目才是笔记
+        return [
+            self._convert_note(item.get('id'), item.get('note_card') or {})
+            for item in data.get('items') or []
+            if item.get('id') and item.get('model_type', 'note') == 'note'
+        ]
+
+    def _to_count(self, value: Any) -> int:
+        """接口中的计数可能是 '1.2万' 这样的字符串"""
+        if isinstance(value, int):
+            return value
+        return self.parser.parse_count(str(value)) if value else 0
+
+    def _convert_note(self, note_id: str, card: Dict[str, Any]) -> Dict[str, Any]:
+        """转换搜索/用户笔记列表接口中的笔记卡片"""
+        user = card.get('user') or {}
+        interact = card.get('interact_info') or {}
+        cover = card.get('cover') or {}
+        title = card.get('display_title') or card.get('title')
+        images = []
+        for image in card.get('image_list') or []:
+            info = (image.get('info_list') or [{}])[-1]
+            if info.get('url') or image.get('url_default'):
+                images.append(info.get('url') or image.get('url_default'))
+
+        return {
+            'content_id': note_id,
+            'platform': 'xiaohongshu',
+            'content_type': 'video' if card.get('type') == 'video' else 'image',
+            'url': f"{self.base_url}/explore/{note_id}",
+            'title': title,
+            'description': card.get('desc') or title,
+            'cover_image': cover.get('url_default') or cover.get('url'),
+            'images': images,
+            'video_url': None,
+            'duration': 0,
+            'tags': [],
+            'topics': [],
+            'mentions': [],
+            'author': {
+                'user_id': user.get('user_id'),
+                'nickname': user.get('nickname') or user.get('nick_name'),
+                'avatar': user.get('avatar'),
+            },
+            'view_count': 0,
+            'like_count': self._to_count(interact.get('liked_count')),
+            'comment_count': self._to_count(interact.get('comment_count')),
+            'share_count': self._to_count(interact.get('shared_count')),
+            'collect_count': self._to_count(interact.get('collected_count')),
+            'publish_time': None,
+            'location': None,
+            'poi_info': {},
+            'product_links': [],
+            'is_ad': False,
+            'is_seed_content': False,
+            'engagement_analysis': {},
+            'collected_at': datetime.now()
+        }
+
+    def _convert_comment(self, comment: Dict[str, Any], include_replies: bool = False) -> Dict[str, Any]:
+        """转换评论接口中的评论对象"""
+        user = comment.get('user_info') or {}
+        create_time = comment.get('create_time')
+        replies = []
+        if include_replies:
+            replies = [self._convert_comment(r) for r in comment.get('sub_comments') or [] if r.get('id')]
+
+        return {
+            'comment_id': str(comment['id']),
+            'user': {
+                'user_id': user.get('user_id'),
+                'nickname': user.get('nickname'),
+                'avatar': user.get('image'),
+            },
+            'text': comment.get('content'),
+            'like_count': self._to_count(comment.get('like_count')),
+            'reply_count': self._to_count(comment.get('sub_comment_count')),
+            'publish_time': datetime.fromtimestamp(create_time / 1000) if create_time else None,
+            'replies': replies,
+            'ip_location': comment.get('ip_location')
+        }
+
     def _extract_user_id(self, url: str) -> Optional[str]:
         """从URL中提取用户ID"""
         try:
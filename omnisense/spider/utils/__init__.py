@@ -4,8 +4,11 @@ Spider utilities package
 
 from omnisense.spider.utils.playwright_helper import PlaywrightHelper
 from omnisense.spider.utils.parser import ContentParser
+from omnisense.spider.utils.response_capture import CapturedResponse, ResponseCapture
 
 __all__ = [
     "PlaywrightHelper",
     "ContentParser",
+    "CapturedResponse",
+    "ResponseCapture",
 ]
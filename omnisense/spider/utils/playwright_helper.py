@@ -5,8 +5,9 @@ Provides common Playwright operations and anti-detection features
 
 import asyncio
 import random
+import re
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Union
 from urllib.parse import urlparse
 
 from playwright.async_api import Page, Download
@@ -15,6 +16,42 @@ from fake_useragent import UserAgent
 from omnisense.config import config
 
 
+# Field spec accepted by PlaywrightHelper.extract_items / extract_fields:
+# "selector" (text), "selector@attr", a dict, or a list of fallbacks
+FieldSpec = Union[str, Dict[str, Any], List[Union[str, Dict[str, Any]]]]
+
+# Runs in the page: reads every field of every item in one round trip
+_EXTRACT_JS = """
+(scope, fields) => {
+    const read = (el, spec) => {
+        if (spec.attr) return el.getAttribute(spec.attr);
+        if (spec.type === 'html') return el.innerHTML;
+        return (el.innerText || el.textContent || '').trim();
+    };
+    const readSpec = (root, spec) => {
+        const nodes = spec.selector ? Array.from(root.querySelectorAll(spec.selector)) : [root];
+        if (spec.type === 'count') return nodes.length;
+        if (spec.type === 'exists') return nodes.length > 0;
+        if (spec.all) {
+            const values = nodes.map(n => read(n, spec)).filter(v => v !== null);
+            return values.length ? values : null;
+        }
+        return nodes.length ? read(nodes[0], spec) : null;
+    };
+    const item = {};
+    for (const [name, specs] of Object.entries(fields)) {
+        let value = null;
+        for (const spec of specs) {
+            value = readSpec(scope, spec);
+            if (value !== null && value !== undefined) break;
+        }
+        item[name] = value;
+    }
+    return item;
+}
+"""
+
+
 class PlaywrightHelper:
     """Helper class for Playwright operations with anti-detection features"""
 
@@ -518,6 +555,125 @@ class PlaywrightHelper:
             self.logger.error(f"Failed to extract links: {e}")
             return []
 
+    @staticmethod
+    def _normalize_field_spec(spec: FieldSpec) -> List[Dict[str, Any]]:
+        """Normalize a field spec into a list of fallback specs for the page script"""
+        if isinstance(spec, list):
+            return [one for item in spec for one in PlaywrightHelper._normalize_field_spec(item)]
+
+        if isinstance(spec, str):
+            selector, attr = spec, None
+            # "a.title@href" reads an attribute; "@href" reads it from the item root
+            match = re.match(r"^(.*)@([\w:-]+)$", spec)
+            if match:
+                selector, attr = match.group(1), match.group(2)
+            return [{"selector": selector.strip() or None, "attr": attr}]
+
+        return [{
+            "selector": spec.get("selector") or None,
+            "attr": spec.get("attr"),
+            "type": spec.get("type", "text"),
+            "all": bool(spec.get("all", False)),
+        }]
+
+    @staticmethod
+    def _field_converters(fields: Dict[str, FieldSpec]) -> Dict[str, Callable]:
+        """Collect the Python-side converters of each field (first one wins)"""
+        converters = {}
+        for name, spec in fields.items():
+            specs = spec if isinstance(spec, list) else [spec]
+            for item in specs:
+                if isinstance(item, dict) and item.get("convert"):
+                    converters[name] = item["convert"]
+                    break
+        return converters
+
+    def _convert_item(
+        self,
+        raw: Dict[str, Any],
+        converters: Dict[str, Callable],
+    ) -> Dict[str, Any]:
+        """Apply converters and drop fields whose selectors matched nothing"""
+        item = {}
+        for name, value in raw.items():
+            if value is None:
+                continue
+            converter = converters.get(name)
+            if converter is not None:
+                try:
+                    value = converter(value)
+                except Exception as e:
+                    self.logger.debug(f"Failed to convert field '{name}': {e}")
+                    continue
+            item[name] = value
+        return item
+
+    async def extract_items(
+        self,
+        page: Page,
+        root: str,
+        fields: Dict[str, FieldSpec],
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Extract a list of items from the page in a single evaluate call
+
+        Each field is a spec relative to the item root:
+        - "selector": inner text of the first match
+        - "selector@attr": attribute of the first match ("@attr" for the root itself)
+        - dict with keys selector, attr, type ("text", "html", "count", "exists"),
+          all (list of all matches) and convert (Python callable applied to the value)
+        - list of specs: fallbacks, the first one that matches is used
+
+        Fields whose selectors match nothing are omitted from the item.
+
+        Args:
+            page: Playwright page instance
+            root: Selector of the item roots (e.g. result cards)
+            fields: Mapping of field name to field spec
+            limit: Maximum number of items
+
+        Returns:
+            List of extracted items
+        """
+        specs = {name: self._normalize_field_spec(spec) for name, spec in fields.items()}
+        converters = self._field_converters(fields)
+
+        try:
+            raw_items = await page.evaluate(
+                f"""([root, fields, limit]) => {{
+                    const extract = {_EXTRACT_JS};
+                    let roots = Array.from(document.querySelectorAll(root));
+                    if (limit) roots = roots.slice(0, limit);
+                    return roots.map(el => extract(el, fields));
+                }}""",
+                [root, specs, limit or 0],
+            )
+        except Exception as e:
+            self.logger.error(f"Failed to extract items '{root}': {e}")
+            return []
+
+        return [self._convert_item(raw, converters) for raw in raw_items or []]
+
+    async def extract_fields(
+        self,
+        element: Any,
+        fields: Dict[str, FieldSpec],
+    ) -> Dict[str, Any]:
+        """
+        Extract fields of a single element in one evaluate call
+
+        Args:
+            element: Element handle used as the item root
+            fields: Mapping of field name to field spec (see extract_items)
+
+        Returns:
+            Extracted fields
+        """
+        specs = {name: self._normalize_field_spec(spec) for name, spec in fields.items()}
+        raw = await element.evaluate(_EXTRACT_JS, specs)
+        return self._convert_item(raw or {}, self._field_converters(fields))
+
     async def bypass_cloudflare(self, page: Page, max_wait: int = 30) -> bool:
         """
         Attempt to bypass Cloudflare challenge
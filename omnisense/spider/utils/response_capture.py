@@ -0,0 +1,148 @@
+"""
+Network response capture
+Reads the JSON payloads a page already receives from platform APIs instead of
+rebuilding the same data from the DOM element by element
+"""
+
+import asyncio
+import re
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, List, Optional, Set
+
+from playwright.async_api import Page, Response
+
+from omnisense.config import config
+
+
+@dataclass
+class CapturedResponse:
+    """A parsed JSON response captured from the page"""
+    url: str
+    status: int
+    payload: Any
+
+
+class ResponseCapture:
+    """
+    Capture JSON responses whose URL matches a set of patterns
+
+    Features:
+    - Subscribes to page.on("response") and filters by regex URL patterns
+    - Parses matching bodies off the event handler and streams them into an async queue
+    - Bounded queue: once full, body reads wait for the consumer, so payloads
+      captured while the page scrolls are kept until they are drained
+    - Detaches its listener and cancels pending body reads on stop()
+    """
+
+    def __init__(
+        self,
+        page: Page,
+        patterns: List[str],
+        logger,
+        max_queue: Optional[int] = None,
+    ):
+        """
+        Initialize response capture
+
+        Args:
+            page: Page to listen on
+            patterns: Regex patterns matched against response URLs
+            logger: Logger instance
+            max_queue: Maximum queued responses; further reads wait (default from config)
+        """
+        self.page = page
+        self.patterns = [re.compile(p) for p in patterns]
+        self.logger = logger
+        self.queue: asyncio.Queue = asyncio.Queue(
+            maxsize=max_queue or config.spider.capture_queue_size
+        )
+        self.captured = 0
+        self.dropped = 0
+        self._pending: Set[asyncio.Task] = set()
+        self._attached = False
+
+    def matches(self, url: str) -> bool:
+        """Check whether a URL matches one of the capture patterns"""
+        return any(p.search(url) for p in self.patterns)
+
+    def start(self) -> "ResponseCapture":
+        """Start listening for responses"""
+        if not self._attached:
+            self.page.on("response", self._on_response)
+            self._attached = True
+        return self
+
+    async def stop(self) -> None:
+        """Stop listening and cancel pending body reads"""
+        if self._attached:
+            try:
+                self.page.remove_listener("response", self._on_response)
+            except Exception as e:
+                self.logger.debug(f"Error removing response listener: {e}")
+            self._attached = False
+
+        for task in list(self._pending):
+            task.cancel()
+        if self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+        self._pending.clear()
+
+    def _on_response(self, response: Response) -> None:
+        """Response event handler, schedules parsing of matching responses"""
+        if not self.matches(response.url):
+            return
+        task = asyncio.ensure_future(self._read(response))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def _read(self, response: Response) -> None:
+        """Parse a matching response body and enqueue it"""
+        try:
+            payload = await response.json()
+        except Exception as e:
+            self.logger.debug(f"Skipping non-JSON response {response.url}: {e}")
+            return
+
+        item = CapturedResponse(url=response.url, status=response.status, payload=payload)
+        try:
+            await self.queue.put(item)
+        except asyncio.CancelledError:
+            # Stopped before the consumer made room
+            self.dropped += 1
+            raise
+        self.captured += 1
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[CapturedResponse]:
+        """
+        Wait for the next captured response
+
+        Args:
+            timeout: Seconds to wait (default from config)
+
+        Returns:
+            Captured response, or None on timeout
+        """
+        timeout = config.spider.capture_idle_timeout if timeout is None else timeout
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def responses(self, idle_timeout: Optional[float] = None) -> AsyncIterator[CapturedResponse]:
+        """
+        Iterate over captured responses until none arrives for idle_timeout seconds
+
+        Args:
+            idle_timeout: Seconds without a response that ends the iteration
+        """
+        while True:
+            item = await self.get(idle_timeout)
+            if item is None:
+                return
+            yield item
+
+    def __repr__(self) -> str:
+        return (
+            f"<ResponseCapture(patterns={len(self.patterns)}, "
+            f"captured={self.captured}, dropped={self.dropped})>"
+        )
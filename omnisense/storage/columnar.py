@@ -0,0 +1,271 @@
+"""
+Columnar storage for OmniSense
+Converts content rows to Arrow tables and keeps them as Parquet datasets
+partitioned by platform and publish date
+"""
+
+import json
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+from omnisense.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.dataset as ds
+    PYARROW_AVAILABLE = True
+except ImportError:
+    logger.warning("pyarrow not installed. Parquet export and Arrow analytics will not be available.")
+    PYARROW_AVAILABLE = False
+
+
+PARTITION_COLUMNS = ["platform", "date"]
+
+_INT_COLUMNS = ("view_count", "like_count", "comment_count", "share_count", "collect_count")
+_LIST_COLUMNS = ("media_urls", "tags")
+
+# Identity of a content item; re-collected items are appended again under it
+_KEY_COLUMNS = ["platform", "content_id"]
+
+
+def _require_pyarrow():
+    if not PYARROW_AVAILABLE:
+        raise ImportError(
+            "pyarrow is required for columnar storage. "
+            "Install it with: pip install pyarrow"
+        )
+
+
+def content_schema() -> "pa.Schema":
+    """Arrow schema of the content dataset (stats flattened into typed columns)"""
+    _require_pyarrow()
+    return pa.schema([
+        ("collection_id", pa.string()),
+        ("platform", pa.string()),
+        ("content_id", pa.string()),
+        ("content_type", pa.string()),
+        ("title", pa.string()),
+        ("description", pa.string()),
+        ("author_id", pa.string()),
+        ("author_name", pa.string()),
+        ("publish_time", pa.timestamp("s")),
+        ("view_count", pa.int64()),
+        ("like_count", pa.int64()),
+        ("comment_count", pa.int64()),
+        ("share_count", pa.int64()),
+        ("collect_count", pa.int64()),
+        ("media_urls", pa.list_(pa.string())),
+        ("tags", pa.list_(pa.string())),
+        ("sentiment_score", pa.float64()),
+        ("written_at", pa.timestamp("us")),
+        ("date", pa.string()),
+    ])
+
+
+def _parse_time(value: Any) -> Optional[datetime]:
+    """Parse epoch seconds/milliseconds or ISO strings into a naive UTC datetime"""
+    if value is None or value == "":
+        return None
+    try:
+        if isinstance(value, (int, float)) or (isinstance(value, str) and value.isdigit()):
+            ts = float(value)
+            if ts > 1e11:  # milliseconds
+                ts /= 1000
+            return datetime.fromtimestamp(ts, tz=timezone.utc).replace(tzinfo=None)
+        parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+        if parsed.tzinfo is not None:
+            parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+        return parsed
+    except (ValueError, OverflowError, OSError):
+        return None
+
+
+def _parse_list(value: Any) -> List[str]:
+    if value is None:
+        return []
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except ValueError:
+            return [value]
+    if isinstance(value, (list, tuple)):
+        return [str(v) for v in value]
+    return [str(value)]
+
+
+def _to_int(value: Any) -> int:
+    try:
+        return int(value or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def rows_to_table(rows: Iterable[Dict[str, Any]]) -> "pa.Table":
+    """
+    Build an Arrow table from content rows
+
+    Rows use the content table column names (view_count, like_count, ...);
+    media_urls and tags may be JSON strings or lists. The ``date`` partition
+    column is the publish date, or today when the publish time is unknown.
+    ``written_at`` is the time the table was built, so read_dataset() can
+    tell which copy of a re-collected item is the latest.
+
+    Args:
+        rows: Content rows
+
+    Returns:
+        Arrow table with content_schema()
+    """
+    _require_pyarrow()
+    schema = content_schema()
+    columns: Dict[str, List[Any]] = {name: [] for name in schema.names}
+    now = datetime.utcnow()
+    today = now.strftime("%Y-%m-%d")
+
+    for row in rows:
+        published = _parse_time(row.get("publish_time"))
+        for name in schema.names:
+            if name == "publish_time":
+                value = published
+            elif name == "date":
+                value = published.strftime("%Y-%m-%d") if published else today
+            elif name == "written_at":
+                value = now
+            elif name in _INT_COLUMNS:
+                value = _to_int(row.get(name))
+            elif name in _LIST_COLUMNS:
+                value = _parse_list(row.get(name))
+            elif name == "sentiment_score":
+                value = row.get(name)
+                value = float(value) if value is not None else None
+            else:
+                value = row.get(name)
+                value = str(value) if value is not None else None
+            columns[name].append(value)
+
+    return pa.table(columns, schema=schema)
+
+
+def append_dataset(table: "pa.Table", base_dir: Union[str, Path], name: str) -> int:
+    """
+    Append a table to a Parquet dataset partitioned by platform/date
+
+    Each call writes new files named after ``name`` plus a random token, so
+    earlier appends are kept, including those made under the same name.
+
+    Args:
+        table: Arrow table with content_schema()
+        base_dir: Dataset root directory
+        name: File prefix for this write (e.g. the collection ID)
+
+    Returns:
+        Number of rows written
+    """
+    _require_pyarrow()
+    if table.num_rows == 0:
+        return 0
+
+    base_dir = Path(base_dir)
+    base_dir.mkdir(parents=True, exist_ok=True)
+    ds.write_dataset(
+        table,
+        base_dir,
+        format="parquet",
+        partitioning=PARTITION_COLUMNS,
+        partitioning_flavor="hive",
+        basename_template=f"{name}-{uuid.uuid4().hex}-{{i}}.parquet",
+        existing_data_behavior="overwrite_or_ignore",
+    )
+    logger.debug(f"Appended {table.num_rows} rows to Parquet dataset {base_dir}")
+    return table.num_rows
+
+
+def read_dataset(
+    base_dir: Union[str, Path],
+    columns: Optional[List[str]] = None,
+    platform: Optional[str] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    latest: bool = True,
+) -> "pa.Table":
+    """
+    Read a Parquet content dataset
+
+    Platform and date filters prune whole partitions, and only the requested
+    columns are read from disk. Items appended more than once keep only
+    their most recently written row unless latest is False.
+
+    Args:
+        base_dir: Dataset root directory
+        columns: Columns to read (default all)
+        platform: Platform partition filter
+        start_date: First date partition (YYYY-MM-DD, inclusive)
+        end_date: Last date partition (YYYY-MM-DD, inclusive)
+        latest: Keep one row per (platform, content_id), the last written
+
+    Returns:
+        Arrow table
+    """
+    _require_pyarrow()
+    schema = content_schema()
+    base_dir = Path(base_dir)
+    if not base_dir.exists():
+        return schema.empty_table() if columns is None else schema.empty_table().select(columns)
+
+    dataset = ds.dataset(
+        base_dir,
+        format="parquet",
+        schema=schema,
+        partitioning=ds.partitioning(
+            pa.schema([(name, pa.string()) for name in PARTITION_COLUMNS]), flavor="hive"
+        ),
+    )
+
+    expression = None
+    for condition in (
+        ds.field("platform") == platform if platform else None,
+        ds.field("date") >= start_date if start_date else None,
+        ds.field("date") <= end_date if end_date else None,
+    ):
+        if condition is not None:
+            expression = condition if expression is None else expression & condition
+
+    if not latest:
+        return dataset.to_table(columns=columns, filter=expression)
+
+    needed = None if columns is None else list(dict.fromkeys(columns + _KEY_COLUMNS + ["written_at"]))
+    table = _latest_rows(dataset.to_table(columns=needed, filter=expression))
+    return table if columns is None else table.select(columns)
+
+
+def _latest_rows(table: "pa.Table") -> "pa.Table":
+    """Keep the last written row of each (platform, content_id), in table order"""
+    if table.num_rows == 0:
+        return table
+
+    # Newest first; rows of one write keep their order, the later one wins.
+    # Files written before written_at existed read it as null and sort last.
+    rows = pa.array(range(table.num_rows), pa.int64())
+    order = table.select(_KEY_COLUMNS + ["written_at"]).append_column("row", rows)
+    order = order.sort_by([("written_at", "descending"), ("row", "descending")])
+    order = order.append_column("rank", rows)
+
+    keyed = pc.is_valid(order["content_id"])
+    first = order.filter(keyed).group_by(_KEY_COLUMNS).aggregate([("rank", "min")])
+    keep = pa.concat_arrays([
+        pc.take(order["row"], first["rank_min"]).combine_chunks(),
+        order.filter(pc.invert(keyed))["row"].combine_chunks(),
+    ])
+    if len(keep) == table.num_rows:
+        return table
+    return table.take(pc.take(keep, pc.sort_indices(keep)))
+
+
+def is_arrow_table(data: Any) -> bool:
+    """True if data is a pyarrow Table"""
+    return PYARROW_AVAILABLE and isinstance(data, pa.Table)
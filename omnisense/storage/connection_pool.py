@@ -0,0 +1,180 @@
+"""
+Pooled SQLite connections for OmniSense
+One long-lived writer connection and a set of reader connections in WAL mode,
+so reads never queue behind ingestion and no request pays for connection setup
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Union
+
+import aiosqlite
+
+from omnisense.config import config
+from omnisense.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class SQLiteConnectionPool:
+    """
+    Long-lived async SQLite connections
+
+    Features:
+    - A single dedicated writer connection, serialized by a lock
+    - N reader connections (query_only) handed out through a queue
+    - WAL journal so readers see the last committed state while a write runs
+    - Tuned mmap_size, cache_size, busy_timeout and prepared-statement cache
+    - Connections opened lazily and reopened after close()
+    """
+
+    def __init__(
+        self,
+        db_path: Union[str, Path],
+        readers: Optional[int] = None,
+        busy_timeout: Optional[int] = None,
+        cache_size_kb: Optional[int] = None,
+        mmap_size: Optional[int] = None,
+        cached_statements: Optional[int] = None,
+        functions: Optional[Dict[str, Callable[[Any], Any]]] = None,
+    ):
+        """
+        Initialize connection pool
+
+        Args:
+            db_path: SQLite database path
+            readers: Number of reader connections (default from config)
+            busy_timeout: Busy timeout in milliseconds (default from config)
+            cache_size_kb: Page cache size per connection in KiB (default from config)
+            mmap_size: Memory-mapped I/O size in bytes (default from config)
+            cached_statements: Prepared statements cached per connection (default from config)
+            functions: Deterministic one-argument SQL functions registered on every connection
+        """
+        db_config = config.database
+        self.db_path = str(db_path)
+        self.readers = max(1, readers or db_config.sqlite_readers)
+        self.busy_timeout = busy_timeout if busy_timeout is not None else db_config.sqlite_busy_timeout
+        self.cache_size_kb = cache_size_kb or db_config.sqlite_cache_size_kb
+        self.mmap_size = mmap_size if mmap_size is not None else db_config.sqlite_mmap_size
+        self.cached_statements = cached_statements or db_config.sqlite_cached_statements
+        self.functions = functions or {}
+
+        self._writer: Optional[aiosqlite.Connection] = None
+        self._reader_conns: List[aiosqlite.Connection] = []
+        self._idle_readers: Optional[asyncio.Queue] = None
+        self._write_lock: Optional[asyncio.Lock] = None
+        self._open_lock: Optional[asyncio.Lock] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def is_open(self) -> bool:
+        return self._writer is not None
+
+    async def _connect(self, readonly: bool) -> aiosqlite.Connection:
+        """Open and tune one connection"""
+        db = aiosqlite.connect(
+            self.db_path,
+            timeout=self.busy_timeout / 1000,
+            cached_statements=self.cached_statements,
+        )
+        # An unclosed pool must not keep the interpreter alive on exit
+        db.daemon = True
+        db = await db
+        await db.execute("PRAGMA journal_mode=WAL")
+        await db.execute("PRAGMA synchronous=NORMAL")
+        await db.execute("PRAGMA temp_store=MEMORY")
+        await db.execute(f"PRAGMA busy_timeout={int(self.busy_timeout)}")
+        await db.execute(f"PRAGMA cache_size=-{int(self.cache_size_kb)}")
+        await db.execute(f"PRAGMA mmap_size={int(self.mmap_size)}")
+        # INSERT OR REPLACE must fire delete triggers to keep FTS tables in sync
+        await db.execute("PRAGMA recursive_triggers=ON")
+        for name, func in self.functions.items():
+            await db.create_function(name, 1, func, deterministic=True)
+        if readonly:
+            await db.execute("PRAGMA query_only=ON")
+            db.row_factory = aiosqlite.Row
+        return db
+
+    async def _ensure_open(self) -> None:
+        """Open the connections on first use in the running event loop"""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Queue and locks are bound to the loop that created them
+            if self.is_open:
+                await self._close_connections()
+            self._loop = loop
+            self._open_lock = asyncio.Lock()
+            self._write_lock = asyncio.Lock()
+            self._idle_readers = None
+
+        if self.is_open:
+            return
+
+        async with self._open_lock:
+            if self.is_open:
+                return
+            writer = await self._connect(readonly=False)
+            idle: asyncio.Queue = asyncio.Queue()
+            for _ in range(self.readers):
+                conn = await self._connect(readonly=True)
+                self._reader_conns.append(conn)
+                idle.put_nowait(conn)
+            self._idle_readers = idle
+            self._writer = writer
+            logger.info(f"SQLite pool opened: 1 writer, {self.readers} readers ({self.db_path})")
+
+    @asynccontextmanager
+    async def writer(self) -> AsyncIterator[aiosqlite.Connection]:
+        """
+        Lease the writer connection
+
+        The block runs as one transaction: it is committed on exit and rolled
+        back if the block raises.
+        """
+        await self._ensure_open()
+        async with self._write_lock:
+            db = self._writer
+            try:
+                yield db
+                await db.commit()
+            except BaseException:
+                await db.rollback()
+                raise
+
+    @asynccontextmanager
+    async def reader(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Lease a reader connection (rows are aiosqlite.Row)"""
+        await self._ensure_open()
+        idle = self._idle_readers
+        db = await idle.get()
+        try:
+            yield db
+        finally:
+            idle.put_nowait(db)
+
+    async def _close_connections(self) -> None:
+        conns = ([self._writer] if self._writer else []) + self._reader_conns
+        self._writer = None
+        self._reader_conns = []
+        self._idle_readers = None
+        for conn in conns:
+            try:
+                await conn.close()
+            except Exception as e:
+                logger.warning(f"Error closing SQLite connection: {e}")
+
+    async def close(self) -> None:
+        """Wait for leased connections to come back, then close them all"""
+        if not self.is_open:
+            return
+        if self._loop is not asyncio.get_running_loop():
+            await self._close_connections()
+            return
+
+        async with self._write_lock:
+            idle = self._idle_readers
+            for _ in range(len(self._reader_conns)):
+                await idle.get()
+            await self._close_connections()
+        logger.info("SQLite pool closed")
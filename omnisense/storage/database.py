@@ -3,18 +3,67 @@ Database management for OmniSense
 SQLite for structured data, with async support
 """
 
+import asyncio
+import re
 import sqlite3
-import aiosqlite
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 from datetime import datetime
 import json
 
 from omnisense.config import config
 from omnisense.utils.logger import get_logger
+from omnisense.storage.connection_pool import SQLiteConnectionPool
+from omnisense.storage import columnar
 
 logger = get_logger(__name__)
 
+# Indexed columns of the external-content FTS5 tables, per source table
+_FTS_TABLES = {
+    'content': ('title', 'description', 'tags'),
+    'interactions': ('text',),
+}
+
+# Trigram tokens are three characters long, shorter terms cannot be matched
+_FTS_MIN_TERM = 3
+
+# The *_cjk indexes hold one token per CJK character, so shorter terms are
+# matched there as phrases of adjacent characters
+_CJK_CHAR = re.compile(r'([\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff\uac00-\ud7af])')
+# Zero-width space: a unicode61 separator, removed again from snippets
+_CJK_SEP = '\u200b'
+
+
+def _cjk_split(text: Any) -> Optional[str]:
+    """Separate CJK characters into single-character tokens (SQL function cjk_split)"""
+    if text is None:
+        return None
+    return _CJK_CHAR.sub(_CJK_SEP + r'\1' + _CJK_SEP, str(text))
+
+_CONTENT_COLUMNS = (
+    'collection_id', 'platform', 'content_id', 'content_type', 'title', 'description',
+    'author_id', 'author_name', 'publish_time', 'view_count', 'like_count',
+    'comment_count', 'share_count', 'collect_count', 'media_urls', 'tags',
+    'sentiment_score', 'raw_data',
+)
+
+_CONTENT_INSERT = """
+    INSERT OR REPLACE INTO content
+    (collection_id, platform, content_id, content_type, title, description,
+     author_id, author_name, publish_time, view_count, like_count,
+     comment_count, share_count, collect_count, media_urls, tags,
+     sentiment_score, raw_data)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_INTERACTION_INSERT = """
+    INSERT OR REPLACE INTO interactions
+    (content_id, platform, interaction_id, interaction_type, user_id,
+     user_name, text, timestamp, like_count, reply_count, parent_id,
+     sentiment_score, raw_data)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
 
 class DatabaseManager:
     """Database manager for OmniSense using SQLite"""
@@ -23,12 +72,17 @@ class DatabaseManager:
         self.db_path = Path(config.database.sqlite_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
         self._init_database()
+        self.pool = SQLiteConnectionPool(self.db_path, functions={'cjk_split': _cjk_split})
 
     def _init_database(self):
         """Initialize database schema"""
         with sqlite3.connect(str(self.db_path)) as conn:
+            conn.create_function('cjk_split', 1, _cjk_split, deterministic=True)
             cursor = conn.cursor()
 
+            # WAL lets readers proceed during bulk writes; the mode persists in the file
+            cursor.execute("PRAGMA journal_mode=WAL")
+
             # Collections table
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS collections (
@@ -134,22 +188,114 @@ class DatabaseManager:
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_content_collection ON content(collection_id)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_interactions_content ON interactions(content_id)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_creators_platform ON creators(platform)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_content_created ON content(created_at)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_content_publish ON content(publish_time)")
+
+            self.fts_enabled = self._init_fts(cursor)
 
             conn.commit()
             logger.info("Database initialized successfully")
 
+    def _init_fts(self, cursor: sqlite3.Cursor) -> bool:
+        """
+        Create the FTS5 full-text indexes and their sync triggers
+
+        content_fts indexes title, description and tags of the content table,
+        interactions_fts indexes interaction text. Both are external-content
+        tables kept in sync by triggers. The trigram tokenizer matches any
+        substring of three or more characters, which works for Chinese text
+        without word segmentation.
+
+        content_cjk and interactions_cjk index the same columns through
+        cjk_split views, one token per CJK character, for terms shorter than a
+        trigram (美食, 旅游). Writers must register the cjk_split function.
+
+        Returns:
+            True if FTS5 is available, False to fall back to LIKE search
+        """
+        indexes = [f"{table}_{index}" for table in _FTS_TABLES for index in ('fts', 'cjk')]
+        existing = {
+            row[0] for row in cursor.execute(
+                f"SELECT name FROM sqlite_master WHERE name IN ({', '.join('?' * len(indexes))})",
+                indexes,
+            )
+        }
+
+        try:
+            for table, columns in _FTS_TABLES.items():
+                cols = ", ".join(columns)
+                cursor.execute(f"""
+                    CREATE VIRTUAL TABLE IF NOT EXISTS {table}_fts USING fts5(
+                        {cols},
+                        content='{table}', content_rowid='id', tokenize='trigram'
+                    )
+                """)
+                split = ", ".join(f"cjk_split({c}) AS {c}" for c in columns)
+                cursor.execute(f"CREATE VIEW IF NOT EXISTS {table}_cjk_source AS SELECT id, {split} FROM {table}")
+                cursor.execute(f"""
+                    CREATE VIRTUAL TABLE IF NOT EXISTS {table}_cjk USING fts5(
+                        {cols},
+                        content='{table}_cjk_source', content_rowid='id', tokenize='unicode61'
+                    )
+                """)
+        except sqlite3.OperationalError as e:
+            logger.warning(f"FTS5 unavailable, content search falls back to LIKE: {e}")
+            return False
+
+        for table, columns in _FTS_TABLES.items():
+            for index, wrap in (('fts', '{}'), ('cjk', 'cjk_split({})')):
+                fts = f"{table}_{index}"
+                cols = ", ".join(columns)
+                new = ", ".join(wrap.format(f"new.{c}") for c in columns)
+                old = ", ".join(wrap.format(f"old.{c}") for c in columns)
+                cursor.execute(f"""
+                    CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN
+                        INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new});
+                    END
+                """)
+                cursor.execute(f"""
+                    CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN
+                        INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old});
+                    END
+                """)
+                cursor.execute(f"""
+                    CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE ON {table} BEGIN
+                        INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old});
+                        INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new});
+                    END
+                """)
+
+                # Index rows written before the FTS table existed
+                if fts not in existing:
+                    cursor.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+        return True
+
     async def save_collection(self, platform: str, data: List[Dict[str, Any]],
                              collection_id: Optional[str] = None, **metadata) -> str:
-        """Save collection data to database"""
+        """
+        Save collection data to database
+
+        Content and interaction rows are written with executemany in batches of
+        ``config.database.write_batch_size``, all within a single transaction.
+        Saving more items under an existing collection_id keeps its collection
+        row (id, created_at, status) and only refreshes its metadata.
+        """
         if not collection_id:
             collection_id = f"{platform}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
 
-        async with aiosqlite.connect(str(self.db_path)) as db:
-            # Insert collection record
+        batch_size = max(1, config.database.write_batch_size)
+
+        async with self.pool.writer() as db:
+            # Insert collection record, or update it for later batches of a stream
             await db.execute("""
-                INSERT OR REPLACE INTO collections
+                INSERT INTO collections
                 (platform, collection_id, keyword, user_id, url, metadata)
                 VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(collection_id) DO UPDATE SET
+                    keyword = excluded.keyword, user_id = excluded.user_id,
+                    url = excluded.url, metadata = excluded.metadata,
+                    updated_at = CURRENT_TIMESTAMP
             """, (
                 platform,
                 collection_id,
@@ -159,81 +305,87 @@ class DatabaseManager:
                 json.dumps(metadata)
             ))
 
-            # Insert content records
+            # Insert content and interaction records in batches
+            content_rows = []
+            interaction_rows = []
             for item in data:
-                await self._save_content(db, collection_id, platform, item)
+                content_rows.append(self._content_row(collection_id, platform, item))
+                for interaction in item.get('interactions') or []:
+                    interaction_rows.append(
+                        self._interaction_row(item.get('content_id'), platform, interaction)
+                    )
+
+                if len(content_rows) >= batch_size:
+                    await db.executemany(_CONTENT_INSERT, content_rows)
+                    content_rows = []
+                if len(interaction_rows) >= batch_size:
+                    await db.executemany(_INTERACTION_INSERT, interaction_rows)
+                    interaction_rows = []
+
+            if content_rows:
+                await db.executemany(_CONTENT_INSERT, content_rows)
+            if interaction_rows:
+                await db.executemany(_INTERACTION_INSERT, interaction_rows)
 
-            await db.commit()
-            logger.info(f"Saved {len(data)} items for collection {collection_id}")
+        logger.info(f"Saved {len(data)} items for collection {collection_id}")
+
+        if config.database.parquet_append:
+            await self.append_parquet(platform, data, collection_id)
 
         return collection_id
 
-    async def _save_content(self, db: aiosqlite.Connection, collection_id: str,
-                           platform: str, item: Dict[str, Any]):
-        """Save content item to database"""
-        await db.execute("""
-            INSERT OR REPLACE INTO content
-            (collection_id, platform, content_id, content_type, title, description,
-             author_id, author_name, publish_time, view_count, like_count,
-             comment_count, share_count, collect_count, media_urls, tags,
-             sentiment_score, raw_data)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
+    @staticmethod
+    def _content_row(collection_id: str, platform: str, item: Dict[str, Any]) -> tuple:
+        """Build content row parameters"""
+        author = item.get('author') or {}
+        stats = item.get('stats') or {}
+        # Interactions have their own table, keep them out of raw_data
+        raw = {k: v for k, v in item.items() if k != 'interactions'}
+        return (
             collection_id,
             platform,
             item.get('content_id'),
             item.get('content_type'),
             item.get('title'),
             item.get('description'),
-            item.get('author', {}).get('user_id'),
-            item.get('author', {}).get('name'),
+            author.get('user_id'),
+            author.get('name'),
             item.get('publish_time'),
-            item.get('stats', {}).get('views', 0),
-            item.get('stats', {}).get('likes', 0),
-            item.get('stats', {}).get('comments', 0),
-            item.get('stats', {}).get('shares', 0),
-            item.get('stats', {}).get('collects', 0),
+            stats.get('views', 0),
+            stats.get('likes', 0),
+            stats.get('comments', 0),
+            stats.get('shares', 0),
+            stats.get('collects', 0),
             json.dumps(item.get('media_urls', [])),
-            json.dumps(item.get('tags', [])),
+            json.dumps(item.get('tags', []), ensure_ascii=False),
             item.get('sentiment_score'),
-            json.dumps(item)
-        ))
-
-        # Save interactions if present
-        interactions = item.get('interactions', [])
-        for interaction in interactions:
-            await self._save_interaction(db, item.get('content_id'), platform, interaction)
-
-    async def _save_interaction(self, db: aiosqlite.Connection, content_id: str,
-                                platform: str, interaction: Dict[str, Any]):
-        """Save interaction/comment to database"""
-        await db.execute("""
-            INSERT OR REPLACE INTO interactions
-            (content_id, platform, interaction_id, interaction_type, user_id,
-             user_name, text, timestamp, like_count, reply_count, parent_id,
-             sentiment_score, raw_data)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
+            json.dumps(raw, default=str)
+        )
+
+    @staticmethod
+    def _interaction_row(content_id: str, platform: str,
+                         interaction: Dict[str, Any]) -> tuple:
+        """Build interaction row parameters"""
+        user = interaction.get('user') or {}
+        return (
             content_id,
             platform,
             interaction.get('interaction_id'),
             interaction.get('type'),
-            interaction.get('user', {}).get('user_id'),
-            interaction.get('user', {}).get('name'),
+            user.get('user_id'),
+            user.get('name'),
             interaction.get('text'),
             interaction.get('timestamp'),
             interaction.get('like_count', 0),
             interaction.get('reply_count', 0),
             interaction.get('parent_id'),
             interaction.get('sentiment_score'),
-            json.dumps(interaction)
-        ))
+            json.dumps(interaction, default=str)
+        )
 
     async def get_collection(self, collection_id: str) -> Dict[str, Any]:
         """Retrieve collection data"""
-        async with aiosqlite.connect(str(self.db_path)) as db:
-            db.row_factory = aiosqlite.Row
-
+        async with self.pool.reader() as db:
             # Get collection metadata
             async with db.execute(
                 "SELECT * FROM collections WHERE collection_id = ?",
@@ -258,31 +410,131 @@ class DatabaseManager:
 
     async def search_content(self, platform: Optional[str] = None,
                             keyword: Optional[str] = None,
-                            limit: int = 100) -> List[Dict[str, Any]]:
-        """Search content in database"""
-        query = "SELECT * FROM content WHERE 1=1"
-        params = []
+                            limit: int = 100,
+                            offset: int = 0,
+                            start_time: Optional[str] = None,
+                            end_time: Optional[str] = None,
+                            min_likes: Optional[int] = None,
+                            min_views: Optional[int] = None,
+                            min_comments: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Search content in database
+
+        Keyword search uses the FTS5 index over title, description, tags and
+        interaction text, ranked by BM25. Each result then carries ``rank``
+        (lower is better) and a highlighted ``snippet``. Keywords with a term
+        shorter than three characters use the per-character CJK index, where
+        other short terms match whole words. Without a keyword, results are
+        ordered by newest first.
+
+        Args:
+            platform: Platform filter
+            keyword: Full-text query; whitespace separated terms must all match
+            limit: Maximum number of results
+            offset: Number of results to skip
+            start_time: Earliest publish_time (inclusive)
+            end_time: Latest publish_time (inclusive)
+            min_likes: Minimum like count
+            min_views: Minimum view count
+            min_comments: Minimum comment count
+
+        Returns:
+            Matching content rows
+        """
+        where = []
+        params: List[Any] = []
 
         if platform:
-            query += " AND platform = ?"
+            where.append("content.platform = ?")
             params.append(platform)
-
-        if keyword:
-            query += " AND (title LIKE ? OR description LIKE ?)"
-            params.extend([f"%{keyword}%", f"%{keyword}%"])
-
-        query += " ORDER BY created_at DESC LIMIT ?"
-        params.append(limit)
-
-        async with aiosqlite.connect(str(self.db_path)) as db:
-            db.row_factory = aiosqlite.Row
+        if start_time:
+            where.append("content.publish_time >= ?")
+            params.append(start_time)
+        if end_time:
+            where.append("content.publish_time <= ?")
+            params.append(end_time)
+        for column, minimum in (('like_count', min_likes), ('view_count', min_views),
+                                ('comment_count', min_comments)):
+            if minimum is not None:
+                where.append(f"content.{column} >= ?")
+                params.append(minimum)
+
+        fts_query = self._fts_query(keyword) if keyword else None
+
+        if fts_query:
+            index, match = fts_query
+            # Best hit per content, from its own text or one of its interactions
+            query = f"""
+                WITH hits AS (
+                    SELECT rowid AS id,
+                           bm25(content_{index}, 10.0, 5.0, 2.0) AS rank,
+                           snippet(content_{index}, -1, '[', ']', '...', 16) AS snippet
+                    FROM content_{index} WHERE content_{index} MATCH ?
+                    UNION ALL
+                    SELECT content.id,
+                           bm25(interactions_{index}) * 0.5 AS rank,
+                           snippet(interactions_{index}, 0, '[', ']', '...', 16) AS snippet
+                    FROM interactions_{index}
+                    JOIN interactions ON interactions.id = interactions_{index}.rowid
+                    JOIN content ON content.platform = interactions.platform
+                                AND content.content_id = interactions.content_id
+                    WHERE interactions_{index} MATCH ?
+                )
+                SELECT content.*, MIN(hits.rank) AS rank, hits.snippet AS snippet
+                FROM hits JOIN content ON content.id = hits.id
+            """
+            params = [match, match] + params
+            if where:
+                query += " WHERE " + " AND ".join(where)
+            query += " GROUP BY content.id ORDER BY rank LIMIT ? OFFSET ?"
+        else:
+            if keyword:
+                # FTS5 unavailable, or no indexable term
+                where.append("(content.title LIKE ? OR content.description LIKE ?)")
+                params.extend([f"%{keyword}%", f"%{keyword}%"])
+            query = "SELECT * FROM content"
+            if where:
+                query += " WHERE " + " AND ".join(where)
+            query += " ORDER BY content.created_at DESC LIMIT ? OFFSET ?"
+        params.extend([limit, offset])
+
+        async with self.pool.reader() as db:
             async with db.execute(query, params) as cursor:
-                results = await cursor.fetchall()
-                return [dict(row) for row in results]
+                results = [dict(row) for row in await cursor.fetchall()]
+
+        if fts_query and index == 'cjk':
+            for row in results:
+                if row['snippet']:
+                    # Join highlighted neighbours, then drop the token separators
+                    snippet = re.sub(f"\\]{_CJK_SEP}+\\[", "", row['snippet'])
+                    row['snippet'] = snippet.replace(_CJK_SEP, "")
+        return results
+
+    def _fts_query(self, keyword: str) -> Optional[Tuple[str, str]]:
+        """
+        Build an FTS5 MATCH expression and pick the index it runs on
+
+        Returns:
+            (index, expression) with index 'fts' for the trigram tables or 'cjk'
+            for the per-character tables, or None if the keyword cannot use an index
+        """
+        if not self.fts_enabled:
+            return None
+        terms = keyword.split()
+        if not terms or not all(any(ch.isalnum() for ch in term) for term in terms):
+            return None
+        if all(len(term) >= _FTS_MIN_TERM for term in terms):
+            return 'fts', self._fts_phrases(terms)
+        return 'cjk', self._fts_phrases(_cjk_split(term) for term in terms)
+
+    @staticmethod
+    def _fts_phrases(terms) -> str:
+        # Quote each term as a phrase so FTS5 operators in user input are literal
+        return " ".join('"' + term.replace('"', '""') + '"' for term in terms)
 
     async def get_statistics(self, platform: Optional[str] = None) -> Dict[str, Any]:
         """Get database statistics"""
-        async with aiosqlite.connect(str(self.db_path)) as db:
+        async with self.pool.reader() as db:
             stats = {}
 
             # Content stats
@@ -313,6 +565,109 @@ class DatabaseManager:
 
             return stats
 
+    async def append_parquet(self, platform: str, data: List[Dict[str, Any]],
+                             collection_id: str,
+                             output_dir: Optional[Union[str, Path]] = None) -> int:
+        """
+        Append collected items to the Parquet dataset
+
+        Args:
+            platform: Platform name
+            data: Collected content items
+            collection_id: Collection ID, used to name the written files
+            output_dir: Dataset directory (default config.database.parquet_path)
+
+        Returns:
+            Number of rows written
+        """
+        rows = [
+            dict(zip(_CONTENT_COLUMNS, self._content_row(collection_id, platform, item)))
+            for item in data
+        ]
+        return await asyncio.to_thread(
+            self._write_parquet, rows, output_dir, collection_id
+        )
+
+    async def export_parquet(self, collection_id: Optional[str] = None,
+                             platform: Optional[str] = None,
+                             output_dir: Optional[Union[str, Path]] = None) -> int:
+        """
+        Export stored content to the Parquet dataset
+
+        Rows are streamed from SQLite in chunks of ``config.database.write_batch_size``
+        so memory stays bounded for large tables.
+
+        Args:
+            collection_id: Only export this collection
+            platform: Only export this platform
+            output_dir: Dataset directory (default config.database.parquet_path)
+
+        Returns:
+            Number of rows written
+        """
+        columns = ", ".join(c for c in _CONTENT_COLUMNS if c != 'raw_data')
+        query = f"SELECT {columns} FROM content WHERE 1=1"
+        params = []
+        if collection_id:
+            query += " AND collection_id = ?"
+            params.append(collection_id)
+        if platform:
+            query += " AND platform = ?"
+            params.append(platform)
+
+        prefix = f"{collection_id or platform or 'export'}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        chunk_size = max(1, config.database.write_batch_size)
+        written = 0
+        part = 0
+
+        async with self.pool.reader() as db:
+            async with db.execute(query, params) as cursor:
+                while True:
+                    rows = await cursor.fetchmany(chunk_size)
+                    if not rows:
+                        break
+                    written += await asyncio.to_thread(
+                        self._write_parquet, [dict(row) for row in rows],
+                        output_dir, f"{prefix}_{part}"
+                    )
+                    part += 1
+
+        logger.info(f"Exported {written} rows to Parquet")
+        return written
+
+    def load_arrow(self, platform: Optional[str] = None,
+                   start_date: Optional[str] = None,
+                   end_date: Optional[str] = None,
+                   columns: Optional[List[str]] = None,
+                   output_dir: Optional[Union[str, Path]] = None):
+        """
+        Load content from the Parquet dataset as an Arrow table
+
+        Args:
+            platform: Platform filter
+            start_date: First publish date (YYYY-MM-DD)
+            end_date: Last publish date (YYYY-MM-DD)
+            columns: Columns to read (default all)
+            output_dir: Dataset directory (default config.database.parquet_path)
+
+        Returns:
+            pyarrow.Table
+        """
+        return columnar.read_dataset(
+            output_dir or config.database.parquet_path,
+            columns=columns, platform=platform,
+            start_date=start_date, end_date=end_date
+        )
+
+    @staticmethod
+    def _write_parquet(rows: List[Dict[str, Any]],
+                       output_dir: Optional[Union[str, Path]], name: str) -> int:
+        table = columnar.rows_to_table(rows)
+        return columnar.append_dataset(
+            table, output_dir or config.database.parquet_path, name
+        )
+
     async def close(self):
         """Close database connections"""
+        await self.pool.close()
         logger.info("Database connections closed")
@@ -4,23 +4,148 @@ Provides caching for frequently accessed data and rate limiting
 """
 
 import redis.asyncio as redis
-from typing import Any, Optional, Union
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, Union
+import asyncio
+import functools
+import hashlib
+import inspect
+import itertools
 import json
 import pickle
-from datetime import timedelta
+import threading
+import time
+import uuid
+import weakref
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+from enum import Enum
+from pathlib import Path
 
 from omnisense.config import config
 from omnisense.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+    logger.warning("zstandard not available, cached values will be stored uncompressed")
+
+# Format tag: first byte of every value written by encode_value(). Integers
+# stay untagged ASCII so INCRBY keeps working on them.
+_TAG_STR = 0x01
+_TAG_JSON = 0x02
+_TAG_PICKLE = 0x03
+_TAG_BYTES = 0x04
+_TAG_ZSTD = 0x10
+
+
+def _json_dumps(value: Any) -> bytes:
+    if ORJSON_AVAILABLE:
+        # Types JSON would turn into strings are pickled instead
+        return orjson.dumps(value, option=orjson.OPT_PASSTHROUGH_DATETIME
+                            | orjson.OPT_PASSTHROUGH_DATACLASS
+                            | orjson.OPT_PASSTHROUGH_SUBCLASS)
+    return json.dumps(value, allow_nan=False, separators=(',', ':')).encode('utf-8')
+
+
+def _json_loads(data: bytes) -> Any:
+    return orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data)
+
+
+def encode_value(value: Any, compress_min_bytes: Optional[int] = None) -> bytes:
+    """
+    Serialize a value for Redis with a format tag
+
+    Args:
+        value: Value to store
+        compress_min_bytes: Smallest payload compressed with zstd (default from config)
+
+    Returns:
+        Tagged payload (plain ASCII for integers)
+    """
+    if isinstance(value, int) and not isinstance(value, bool):
+        return str(value).encode('ascii')
+    if isinstance(value, str):
+        tag, data = _TAG_STR, value.encode('utf-8')
+    elif isinstance(value, bytes):
+        tag, data = _TAG_BYTES, value
+    else:
+        tag, data = _TAG_PICKLE, None
+        if isinstance(value, (dict, list)):
+            try:
+                tag, data = _TAG_JSON, _json_dumps(value)
+            except (TypeError, ValueError):
+                tag = _TAG_PICKLE
+        if tag == _TAG_PICKLE:
+            data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+
+    if compress_min_bytes is None:
+        compress_min_bytes = config.database.redis_compress_min_bytes
+    if ZSTD_AVAILABLE and len(data) >= compress_min_bytes:
+        compressed = zstandard.compress(data, 3)
+        if len(compressed) < len(data):
+            tag, data = tag | _TAG_ZSTD, compressed
+    return bytes((tag,)) + data
+
+
+def decode_value(payload: bytes) -> Any:
+    """Inverse of encode_value(); untagged values are read the way RedisCache used to write them"""
+    tag = payload[0] if payload else 0
+    if (tag & ~_TAG_ZSTD) not in (_TAG_STR, _TAG_JSON, _TAG_PICKLE, _TAG_BYTES):
+        return _decode_untagged(payload)
+
+    data = payload[1:]
+    if tag & _TAG_ZSTD:
+        data = zstandard.decompress(data)
+        tag &= ~_TAG_ZSTD
+    if tag == _TAG_STR:
+        return data.decode('utf-8')
+    if tag == _TAG_JSON:
+        return _json_loads(data)
+    if tag == _TAG_PICKLE:
+        return pickle.loads(data)
+    return data
+
+
+def _decode_untagged(payload: bytes) -> Any:
+    """Counters written by INCRBY and values written before format tags"""
+    if payload[:1] == b'\x80':
+        try:
+            return pickle.loads(payload)
+        except Exception:
+            pass
+    try:
+        text = payload.decode('utf-8')
+    except UnicodeDecodeError:
+        return payload
+    try:
+        return _json_loads(payload)
+    except ValueError:
+        return text
+
 
 class RedisCache:
     """Redis cache manager"""
 
-    def __init__(self):
-        self.client = None
-        self._connect()
+    def __init__(self, client: Optional[redis.Redis] = None):
+        """
+        Initialize Redis cache
+
+        Args:
+            client: Redis client with decode_responses=False (default built from the database config)
+        """
+        self.client = client
+        if client is None:
+            self._connect()
 
     def _connect(self):
         """Connect to Redis"""
@@ -58,15 +183,7 @@ class RedisCache:
             value = await self.client.get(key)
             if value is None:
                 return default
-
-            # Try to unpickle, fallback to JSON
-            try:
-                return pickle.loads(value)
-            except:
-                try:
-                    return json.loads(value)
-                except:
-                    return value.decode('utf-8')
+            return decode_value(value)
 
         except Exception as e:
             logger.error(f"Error getting key '{key}': {e}")
@@ -83,13 +200,7 @@ class RedisCache:
             return False
 
         try:
-            # Serialize value
-            if isinstance(value, (dict, list)):
-                serialized = json.dumps(value).encode('utf-8')
-            elif isinstance(value, (str, int, float, bool)):
-                serialized = str(value).encode('utf-8')
-            else:
-                serialized = pickle.dumps(value)
+            serialized = encode_value(value)
 
             # Set with optional TTL
             if ttl:
@@ -147,14 +258,8 @@ class RedisCache:
             values = await self.client.mget(*keys)
             result = {}
             for key, value in zip(keys, values):
-                if value:
-                    try:
-                        result[key] = pickle.loads(value)
-                    except:
-                        try:
-                            result[key] = json.loads(value)
-                        except:
-                            result[key] = value.decode('utf-8')
+                if value is not None:
+                    result[key] = decode_value(value)
             return result
         except Exception as e:
             logger.error(f"Error getting multiple keys: {e}")
@@ -168,11 +273,7 @@ class RedisCache:
         try:
             pipe = self.client.pipeline()
             for key, value in mapping.items():
-                if isinstance(value, (dict, list)):
-                    serialized = json.dumps(value).encode('utf-8')
-                else:
-                    serialized = pickle.dumps(value)
-
+                serialized = encode_value(value)
                 if ttl:
                     pipe.setex(key, ttl, serialized)
                 else:
@@ -228,46 +329,593 @@ class RedisCache:
             logger.info("Redis connection closed")
 
 
-# Rate limiting helper
-class RateLimiter:
-    """Rate limiter using Redis"""
+class TieredCache:
+    """
+    In-process LRU/TTL tier in front of RedisCache
+
+    Features:
+    - Hot keys (API key lookups, settings) are served from process memory
+      without a network round trip
+    - Local copies expire after local_ttl seconds and never outlive the
+      Redis TTL of the key
+    - Writes and deletes through any TieredCache are published on a pub/sub
+      channel; other processes drop their local copy of the key
+    - Local copies are kept encoded, so callers never share mutable values
+    """
+
+    def __init__(self, cache: Optional[RedisCache] = None, max_items: Optional[int] = None,
+                 local_ttl: Optional[float] = None, invalidation: Optional[bool] = None,
+                 channel: Optional[str] = None):
+        """
+        Initialize tiered cache
+
+        Args:
+            cache: Redis tier (default: a RedisCache built from the database config)
+            max_items: Values kept in the local tier (default from config)
+            local_ttl: Seconds a value stays in the local tier (default from config)
+            invalidation: Subscribe to invalidations from other processes (default from config)
+            channel: Invalidation channel (default from config)
+        """
+        database_config = config.database
+        self.cache = cache or RedisCache()
+        self.max_items = database_config.redis_local_cache_items if max_items is None else max_items
+        self.local_ttl = database_config.redis_local_cache_ttl if local_ttl is None else local_ttl
+        self.invalidation = (
+            database_config.redis_invalidation if invalidation is None else invalidation
+        )
+        self.channel = channel or database_config.redis_invalidation_channel
+
+        self._local: "OrderedDict[str, tuple]" = OrderedDict()
+        self._id = uuid.uuid4().hex.encode('ascii')
+        self._pubsub = None
+        self._listener: Optional[asyncio.Task] = None
+        self._stats = {"local_hits": 0, "redis_hits": 0, "misses": 0, "invalidations": 0}
+
+    async def start(self):
+        """Subscribe to invalidations from other processes"""
+        if not self.invalidation or not self.cache.client or self._listener:
+            return
+        try:
+            self._pubsub = self.cache.client.pubsub(ignore_subscribe_messages=True)
+            await self._pubsub.subscribe(self.channel)
+            self._listener = asyncio.create_task(self._listen())
+        except Exception as e:
+            logger.warning(f"Cache invalidation unavailable, relying on local TTL: {e}")
+            self._pubsub = None
 
-    def __init__(self, cache: RedisCache):
-        self.cache = cache
+    async def _listen(self):
+        try:
+            async for message in self._pubsub.listen():
+                if message.get('type') != 'message':
+                    continue
+                sender, _, keys = message['data'].partition(b'\x00')
+                if sender == self._id:
+                    continue
+                for key in keys.split(b'\x00'):
+                    if self._local.pop(key.decode('utf-8'), None) is not None:
+                        self._stats["invalidations"] += 1
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # Missed invalidations could leave stale copies behind
+            logger.error(f"Cache invalidation listener failed: {e}")
+            self._local.clear()
 
-    async def is_allowed(
-        self,
-        key: str,
-        max_requests: int,
-        window_seconds: int
-    ) -> bool:
-        """Check if request is allowed under rate limit"""
-        counter_key = f"rate_limit:{key}:{window_seconds}"
+    def _remember(self, key: str, payload: bytes, ttl_ms: int = -1):
+        if self.max_items <= 0 or self.local_ttl <= 0:
+            return
+        ttl = self.local_ttl if ttl_ms < 0 else min(self.local_ttl, ttl_ms / 1000)
+        self._local[key] = (time.monotonic() + ttl, payload)
+        self._local.move_to_end(key)
+        while len(self._local) > self.max_items:
+            self._local.popitem(last=False)
+
+    async def _publish(self, keys) -> None:
+        if not self.invalidation:
+            return
+        try:
+            message = self._id + b'\x00' + b'\x00'.join(key.encode('utf-8') for key in keys)
+            await self.cache.client.publish(self.channel, message)
+        except Exception as e:
+            logger.warning(f"Error publishing cache invalidation: {e}")
 
-        current = await self.cache.get(counter_key, 0)
-        if isinstance(current, bytes):
-            current = int(current.decode('utf-8'))
+    async def get(self, key: str, default: Any = None) -> Any:
+        """Get value from the local tier, then from Redis"""
+        entry = self._local.get(key)
+        if entry is not None:
+            if entry[0] > time.monotonic():
+                self._local.move_to_end(key)
+                self._stats["local_hits"] += 1
+                return decode_value(entry[1])
+            del self._local[key]
+
+        if not self.cache.client:
+            return default
+        try:
+            # Value and remaining TTL in one round trip
+            pipe = self.cache.client.pipeline(transaction=False)
+            pipe.get(key)
+            pipe.pttl(key)
+            payload, ttl_ms = await pipe.execute()
+        except Exception as e:
+            logger.error(f"Error getting key '{key}': {e}")
+            return default
 
-        if int(current) >= max_requests:
+        if payload is None:
+            self._stats["misses"] += 1
+            return default
+        self._stats["redis_hits"] += 1
+        self._remember(key, payload, ttl_ms)
+        return decode_value(payload)
+
+    async def set(self, key: str, value: Any,
+                  ttl: Optional[Union[int, timedelta]] = None) -> bool:
+        """Set value in Redis and the local tier"""
+        if not self.cache.client:
             return False
+        if isinstance(ttl, timedelta):
+            ttl = int(ttl.total_seconds())
 
-        await self.cache.increment(counter_key)
+        try:
+            payload = encode_value(value)
+            if ttl:
+                await self.cache.client.setex(key, ttl, payload)
+            else:
+                await self.cache.client.set(key, payload)
+        except Exception as e:
+            logger.error(f"Error setting key '{key}': {e}")
+            self._local.pop(key, None)
+            return False
 
-        # Set TTL on first request
-        if int(current) == 0:
-            await self.cache.set(counter_key, 1, ttl=window_seconds)
+        self._remember(key, payload, ttl * 1000 if ttl else -1)
+        await self._publish([key])
+        return True
 
+    async def delete(self, *keys: str) -> int:
+        """Delete keys from both tiers"""
+        for key in keys:
+            self._local.pop(key, None)
+        deleted = await self.cache.delete(*keys)
+        if keys and self.cache.client:
+            await self._publish(keys)
+        return deleted
+
+    def clear_local(self):
+        """Drop every local copy"""
+        self._local.clear()
+
+    def get_stats(self) -> dict:
+        """Get hit counters of both tiers"""
+        return {**self._stats, "local_items": len(self._local)}
+
+    async def close(self):
+        """Stop the invalidation listener and close the Redis tier"""
+        if self._listener:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        if self._pubsub is not None:
+            await self._pubsub.reset()
+            self._pubsub = None
+        self._local.clear()
+        await self.cache.close()
+
+
+# Process-wide cache instance
+_redis_cache: Optional[RedisCache] = None
+_redis_cache_lock = threading.Lock()
+
+
+def get_redis_cache() -> RedisCache:
+    """Get the process-wide Redis cache"""
+    global _redis_cache
+    if _redis_cache is None:
+        with _redis_cache_lock:
+            if _redis_cache is None:
+                _redis_cache = RedisCache()
+    return _redis_cache
+
+
+_MEMO_PREFIX = "omnisense:memo"
+
+
+def _normalize(value: Any) -> Any:
+    """Reduce call arguments to JSON data; raises TypeError for anything else"""
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, (list, tuple)):
+        return [_normalize(item) for item in value]
+    if isinstance(value, dict):
+        return sorted(([str(k), _normalize(v)] for k, v in value.items()), key=lambda kv: kv[0])
+    if isinstance(value, (set, frozenset)):
+        return sorted((_normalize(item) for item in value), key=repr)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return _normalize(value.value)
+    if isinstance(value, Path):
+        return str(value)
+    raise TypeError(f"Unhashable argument type: {type(value).__name__}")
+
+
+class _CoalescedCall:
+    """State of one @cached_async function"""
+
+    def __init__(self, fn: Callable[..., Awaitable[Any]], ttl: float, stale_ttl: float,
+                 shared: Optional[bool], namespace: Optional[str], max_entries: int):
+        self.fn = fn
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.shared = shared
+        self.namespace = namespace or f"{fn.__module__}.{fn.__qualname__}"
+        self.max_entries = max_entries
+        self.signature = inspect.signature(fn)
+        # Methods coalesce per instance, and across processes regardless of it
+        self.method = next(iter(self.signature.parameters), None) in ("self", "cls")
+
+        self._owners: "weakref.WeakKeyDictionary[Any, int]" = weakref.WeakKeyDictionary()
+        self._owner_ids = itertools.count()
+        self._inflight: Dict[tuple, asyncio.Task] = {}
+        self._waiters: Dict[asyncio.Task, int] = {}
+        self._memo: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._stats = {"calls": 0, "hits": 0, "stale_hits": 0, "coalesced": 0, "uncacheable": 0}
+
+    def _key(self, args: tuple, kwargs: dict) -> tuple:
+        bound = self.signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        arguments = list(bound.arguments.items())
+        owner = None
+        if self.method:
+            owner = self._owner(arguments[0][1])
+            arguments = arguments[1:]
+        digest = hashlib.sha1(_json_dumps(_normalize(arguments))).hexdigest()
+        return owner, digest
+
+    def _owner(self, instance: Any) -> Any:
+        # id() alone could be reused by a later instance
+        try:
+            owner = self._owners.get(instance)
+            if owner is None:
+                owner = self._owners[instance] = next(self._owner_ids)
+            return owner
+        except TypeError:
+            return ("id", id(instance))
+
+    async def __call__(self, *args, **kwargs) -> Any:
+        try:
+            key = self._key(args, kwargs)
+        except TypeError:
+            self._stats["uncacheable"] += 1
+            return await self.fn(*args, **kwargs)
+
+        entry = self._memo.get(key)
+        if entry is not None:
+            fresh_until, stale_until, value = entry
+            now = time.monotonic()
+            if now < fresh_until:
+                self._memo.move_to_end(key)
+                self._stats["hits"] += 1
+                return value
+            if now < stale_until:
+                # Serve the stale value while one call refreshes it
+                self._stats["stale_hits"] += 1
+                if key not in self._inflight:
+                    self._start(key, args, kwargs)
+                return value
+            del self._memo[key]
+
+        task = self._inflight.get(key)
+        if task is not None and task.get_loop() is asyncio.get_running_loop():
+            self._stats["coalesced"] += 1
+        else:
+            self._stats["calls"] += 1
+            task = self._start(key, args, kwargs)
+        return await self._join(task)
+
+    def _start(self, key: tuple, args: tuple, kwargs: dict) -> asyncio.Task:
+        task = asyncio.ensure_future(self._load(key, args, kwargs))
+        self._inflight[key] = task
+
+        def done(finished: asyncio.Task):
+            if self._inflight.get(key) is finished:
+                del self._inflight[key]
+            if not finished.cancelled() and finished.exception() is not None and finished not in self._waiters:
+                logger.warning(f"Background refresh of {self.namespace} failed: {finished.exception()}")
+
+        task.add_done_callback(done)
+        return task
+
+    async def _join(self, task: asyncio.Task) -> Any:
+        """Wait for a shared call; the last caller to give up cancels it"""
+        self._waiters[task] = self._waiters.get(task, 0) + 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if self._waiters[task] == 1:
+                task.cancel()
+            raise
+        finally:
+            self._waiters[task] -= 1
+            if not self._waiters[task]:
+                del self._waiters[task]
+
+    async def _load(self, key: tuple, args: tuple, kwargs: dict) -> Any:
+        shared = config.database.redis_memo_shared if self.shared is None else self.shared
+        if shared and self.ttl > 0:
+            value, ttl = await self._load_shared(key[1], args, kwargs)
+        else:
+            value, ttl = await self.fn(*args, **kwargs), self.ttl
+        if ttl > 0 or self.stale_ttl > 0:
+            now = time.monotonic()
+            self._memo[key] = (now + ttl, now + ttl + self.stale_ttl, value)
+            self._memo.move_to_end(key)
+            while len(self._memo) > self.max_entries:
+                self._memo.popitem(last=False)
+        return value
+
+    async def _load_shared(self, digest: str, args: tuple, kwargs: dict) -> Tuple[Any, float]:
+        """Single-flight across processes: one caller computes under a Redis lock, others wait for its result"""
+        client = get_redis_cache().client
+        if not client:
+            return await self.fn(*args, **kwargs), self.ttl
+
+        result_key = f"{_MEMO_PREFIX}:{self.namespace}:{digest}"
+        lock_key = f"{result_key}:lock"
+        token = uuid.uuid4().hex.encode("ascii")
+        lock_timeout = config.database.redis_memo_lock_timeout
+        deadline = time.monotonic() + lock_timeout
+        locked = False
+        try:
+            while True:
+                pipe = client.pipeline(transaction=False)
+                pipe.get(result_key)
+                pipe.pttl(result_key)
+                payload, ttl_ms = await pipe.execute()
+                if payload is not None:
+                    return decode_value(payload), (ttl_ms / 1000 if ttl_ms > 0 else self.ttl)
+                locked = bool(await client.set(lock_key, token, nx=True, px=int(lock_timeout * 1000)))
+                if locked or time.monotonic() >= deadline:
+                    break
+                await asyncio.sleep(0.05)
+        except Exception as e:
+            logger.warning(f"Shared cache unavailable for {self.namespace}: {e}")
+            return await self.fn(*args, **kwargs), self.ttl
+
+        try:
+            value = await self.fn(*args, **kwargs)
+            try:
+                await client.set(result_key, encode_value(value), px=int(self.ttl * 1000))
+            except Exception as e:
+                logger.warning(f"Error sharing result of {self.namespace}: {e}")
+            return value, self.ttl
+        finally:
+            if locked:
+                try:
+                    if await client.get(lock_key) == token:
+                        await client.delete(lock_key)
+                except Exception as e:
+                    logger.warning(f"Error releasing lock of {self.namespace}: {e}")
+
+    def cache_clear(self):
+        self._memo.clear()
+
+    def cache_info(self) -> dict:
+        return {**self._stats, "entries": len(self._memo), "in_flight": len(self._inflight)}
+
+
+def cached_async(ttl: float = 0, stale_ttl: float = 0, shared: Optional[bool] = None,
+                 namespace: Optional[str] = None, max_entries: int = 1024):
+    """
+    Coalesce and cache calls of an async function
+
+    Concurrent calls with equal arguments (normalized, so keyword and
+    positional forms match) share one in-flight call. Calls with arguments
+    that cannot be normalized run uncached. Callers share the result
+    object, so treat it as read-only.
+
+    Args:
+        ttl: Seconds a result is reused (0: only while in flight)
+        stale_ttl: Seconds after ttl a stale result is returned while one
+            call refreshes it in the background
+        shared: Share results and single-flight across processes through a
+            Redis lock (default from config; needs ttl > 0)
+        namespace: Cache namespace (default: module and qualified name)
+        max_entries: Results kept in process memory
+
+    Returns:
+        Decorator; the wrapper has cache_clear() and cache_info()
+    """
+    def decorator(fn: Callable[..., Awaitable[Any]]):
+        call = _CoalescedCall(fn, ttl, stale_ttl, shared, namespace, max_entries)
+
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            return await call(*args, **kwargs)
+
+        wrapper.cache_clear = call.cache_clear
+        wrapper.cache_info = call.cache_info
+        return wrapper
+
+    return decorator
+
+
+# GCRA (a token bucket stored as one timestamp): the key holds the
+# theoretical arrival time (TAT) of the next request in microseconds of the
+# Redis clock. A request fits while TAT + cost * interval - window <= now.
+_GCRA_SCRIPT = """
+if redis.replicate_commands then redis.replicate_commands() end
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) * 1000000 + tonumber(clock[2])
+local interval = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local max_wait = tonumber(ARGV[4])
+local tat = tonumber(redis.call('GET', KEYS[1])) or now
+if tat < now then tat = now end
+local new_tat = tat + interval * cost
+local wait = new_tat - window - now
+if wait < 0 then wait = 0 end
+if cost > 0 and (max_wait < 0 or wait <= max_wait) then
+    redis.call('SET', KEYS[1], string.format('%.0f', new_tat),
+               'PX', math.ceil((new_tat - now) / 1000) + 1)
+    return {1, math.ceil(wait), math.floor((window - (new_tat - now)) / interval)}
+end
+return {0, math.ceil(wait), math.floor((window - (tat - now)) / interval)}
+"""
+
+
+def _gcra(tat: Optional[float], now: float, interval: float, window: float,
+          cost: int, max_wait: float) -> Tuple[bool, float, int, float]:
+    """In-process twin of _GCRA_SCRIPT; returns (reserved, wait, remaining, TAT)"""
+    tat = max(tat or now, now)
+    new_tat = tat + interval * cost
+    wait = max(0.0, new_tat - window - now)
+    if cost > 0 and (max_wait < 0 or wait <= max_wait):
+        return True, wait, int((window - (new_tat - now)) // interval), new_tat
+    return False, wait, int((window - (tat - now)) // interval), tat
+
+
+class RateLimiter:
+    """
+    Rate limiter shared through Redis
+
+    Features:
+    - GCRA semantics: max_requests per window_seconds, bursts of at most
+      max_requests and no double burst at window boundaries
+    - Every decision is one atomic Lua script call on the Redis clock, so
+      the whole worker fleet shares one budget per key
+    - reserve() books a slot and returns the exact wait; acquire() waits it out
+    - Falls back to an in-process limiter while Redis is unreachable
+    """
+
+    KEY_PREFIX = "rate_limit"
+
+    def __init__(self, cache: Optional[RedisCache] = None, local_fallback: bool = True):
+        """
+        Initialize rate limiter
+
+        Args:
+            cache: Redis cache (default: the process-wide one)
+            local_fallback: Limit per process while Redis is unreachable, instead of raising
+        """
+        self.cache = cache or get_redis_cache()
+        self.local_fallback = local_fallback
+        self._script = self.cache.client.register_script(_GCRA_SCRIPT) if self.cache.client else None
+        self._local: Dict[str, float] = {}
+        self._redis_down = False
+
+    async def _decide(self, key: str, max_requests: int, window_seconds: float,
+                      cost: int, max_wait: Optional[float]) -> Tuple[bool, float, int]:
+        """Returns (reserved, wait in seconds, remaining requests)"""
+        if max_requests <= 0 or window_seconds <= 0:
+            raise ValueError("max_requests and window_seconds must be positive")
+        limit_key = f"{self.KEY_PREFIX}:{key}:{max_requests}:{window_seconds}"
+        window = window_seconds * 1_000_000
+        interval = window / max_requests
+        max_wait_us = -1 if max_wait is None else max_wait * 1_000_000
+
+        if self._script is not None:
+            try:
+                reserved, wait, remaining = await self._script(
+                    keys=[limit_key], args=[interval, window, cost, max_wait_us]
+                )
+                if self._redis_down:
+                    logger.info("Redis rate limiting restored")
+                    self._redis_down = False
+                return bool(reserved), wait / 1_000_000, min(max(0, remaining), max_requests)
+            except Exception as e:
+                if not self.local_fallback:
+                    raise
+                if not self._redis_down:
+                    logger.warning(f"Redis rate limiting unavailable, limiting per process: {e}")
+                    self._redis_down = True
+        elif not self.local_fallback:
+            raise ConnectionError("Redis is not connected")
+
+        now = time.monotonic() * 1_000_000
+        reserved, wait, remaining, tat = _gcra(
+            self._local.get(limit_key), now, interval, window, cost, max_wait_us
+        )
+        if reserved:
+            self._local[limit_key] = tat
+            if len(self._local) > 10000:
+                self._local = {k: v for k, v in self._local.items() if v > now}
+        return reserved, wait / 1_000_000, min(max(0, remaining), max_requests)
+
+    async def reserve(
+        self,
+        key: str,
+        max_requests: int,
+        window_seconds: float,
+        cost: int = 1,
+        max_wait: Optional[float] = None
+    ) -> Optional[float]:
+        """
+        Book cost requests and get the time to wait before making them
+
+        Args:
+            key: Budget key (e.g. platform or client)
+            max_requests: Requests allowed per window
+            window_seconds: Window length in seconds
+            cost: Requests to book
+            max_wait: Longest acceptable wait in seconds (None: any)
+
+        Returns:
+            Seconds to wait, or None if the wait would exceed max_wait
+            (nothing is booked then)
+        """
+        reserved, wait, _ = await self._decide(key, max_requests, window_seconds, cost, max_wait)
+        return wait if reserved else None
+
+    async def acquire(
+        self,
+        key: str,
+        max_requests: int,
+        window_seconds: float,
+        cost: int = 1,
+        max_wait: Optional[float] = None
+    ) -> bool:
+        """Reserve requests and sleep until they may be made; False if the wait exceeds max_wait"""
+        wait = await self.reserve(key, max_requests, window_seconds, cost, max_wait)
+        if wait is None:
+            return False
+        if wait > 0:
+            await asyncio.sleep(wait)
         return True
 
+    async def is_allowed(
+        self,
+        key: str,
+        max_requests: int,
+        window_seconds: int
+    ) -> bool:
+        """Check if request is allowed under rate limit (and count it if so)"""
+        return await self.reserve(key, max_requests, window_seconds, max_wait=0) is not None
+
     async def get_remaining(
         self,
         key: str,
         max_requests: int,
         window_seconds: int
     ) -> int:
-        """Get remaining requests in current window"""
-        counter_key = f"rate_limit:{key}:{window_seconds}"
-        current = await self.cache.get(counter_key, 0)
-        if isinstance(current, bytes):
-            current = int(current.decode('utf-8'))
-        return max(0, max_requests - int(current))
+        """Get requests that may be made right now"""
+        _, _, remaining = await self._decide(key, max_requests, window_seconds, 0, 0)
+        return remaining
+
+
+# Process-wide rate limiter instance
+_rate_limiter: Optional[RateLimiter] = None
+_rate_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Get the process-wide rate limiter"""
+    global _rate_limiter
+    if _rate_limiter is None:
+        with _rate_limiter_lock:
+            if _rate_limiter is None:
+                _rate_limiter = RateLimiter()
+    return _rate_limiter
@@ -0,0 +1,732 @@
+"""
+Vector database backends
+The collection interface VectorDatabase relies on, and a local backend of
+HNSW segments on disk with metadata in SQLite
+"""
+
+import json
+import re
+import shutil
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from omnisense.config import config
+from omnisense.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+try:
+    import faiss
+    FAISS_AVAILABLE = True
+except ImportError:
+    FAISS_AVAILABLE = False
+    logger.warning("faiss not available, the local HNSW vector backend is disabled")
+
+# Zero-copy mapping of sealed segments (IO_FLAG_MMAP still reads HNSW graphs into memory)
+_MMAP = getattr(faiss, "IO_FLAG_MMAP_IFC", faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY) if FAISS_AVAILABLE else 0
+
+
+class VectorCollection(ABC):
+    """Collection API used by VectorDatabase (the subset of chromadb's Collection it calls)"""
+
+    @abstractmethod
+    def upsert(self, ids: List[str], embeddings: Any = None,
+               metadatas: Optional[List[Dict]] = None, documents: Optional[List[str]] = None):
+        """Add documents, replacing those with the same ids"""
+
+    @abstractmethod
+    def query(self, query_embeddings: Any = None, n_results: int = 10,
+              where: Optional[Dict] = None, where_document: Optional[Dict] = None,
+              **kwargs) -> Dict[str, Any]:
+        """Nearest documents per query, as lists of ids, documents, metadatas and distances"""
+
+    @abstractmethod
+    def get(self, ids: Optional[List[str]] = None, where: Optional[Dict] = None,
+            **kwargs) -> Dict[str, Any]:
+        """Documents by id or metadata filter"""
+
+    @abstractmethod
+    def delete(self, ids: Optional[List[str]] = None, where: Optional[Dict] = None):
+        """Delete documents by id or metadata filter"""
+
+    @abstractmethod
+    def count(self) -> int:
+        """Number of documents"""
+
+
+class VectorClient(ABC):
+    """Client API used by VectorDatabase (the subset of chromadb's client it calls)"""
+
+    @abstractmethod
+    def get_or_create_collection(self, name: str, metadata: Optional[Dict] = None) -> VectorCollection:
+        """Open a collection, creating it if needed"""
+
+    @abstractmethod
+    def get_collection(self, name: str) -> VectorCollection:
+        """Open an existing collection"""
+
+    @abstractmethod
+    def delete_collection(self, name: str):
+        """Delete a collection and its data"""
+
+    @abstractmethod
+    def get_max_batch_size(self) -> int:
+        """Largest number of documents per write"""
+
+
+# Metadata comparison operators of Chroma's where filters
+_OPERATORS = {"$eq": "=", "$ne": "!=", "$gt": ">", "$gte": ">=", "$lt": "<", "$lte": "<="}
+_COLLECTION_NAME = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_.-]*$")
+# Parameters per SQL statement, below SQLite's historical limit of 999
+_SQL_CHUNK = 900
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _normalized(vectors: Any) -> np.ndarray:
+    array = np.array(vectors, dtype=np.float32, ndmin=2, copy=True)
+    faiss.normalize_L2(array)
+    return array
+
+
+class _Segment:
+    """An HNSW graph over a contiguous range of labels"""
+
+    def __init__(self, segment_id: int, base: int, index, alive: np.ndarray,
+                 file: Optional[str] = None, sealed: bool = False):
+        self.id = segment_id
+        self.base = base
+        self.index = index
+        self.alive = alive
+        self.file = file
+        self.sealed = sealed
+        self.dirty = file is None
+        # Vectors in the segment file; tombstones alone are saved in SQLite
+        self.written = self.index.ntotal if file else 0
+        self._vectors: Optional[np.ndarray] = None
+
+    @property
+    def size(self) -> int:
+        return self.index.ntotal
+
+    @property
+    def dead(self) -> bool:
+        return not self.alive[:self.size].all()
+
+    def vectors(self) -> np.ndarray:
+        """Zero-copy view of the stored vectors (memory-mapped when sealed)"""
+        if self._vectors is None or len(self._vectors) != self.size:
+            storage = faiss.downcast_index(self.index.storage)
+            self._vectors = faiss.rev_swig_ptr(
+                storage.get_xb(), self.size * self.index.d
+            ).reshape(self.size, self.index.d)
+        return self._vectors
+
+
+class HnswCollection(VectorCollection):
+    """
+    Collection of HNSW segments on disk with metadata in SQLite
+
+    Features:
+    - Vectors are appended to an in-memory HNSW segment; full segments are
+      sealed to disk and memory-mapped, so opening a collection is fast
+      whatever its size
+    - Each metadata key is an indexed SQLite column; selective where
+      filters are answered exactly from the matching vectors, broad ones
+      by overfetching HNSW neighbours and keeping those that match
+    - Upserts and deletes tombstone replaced labels; compact() rebuilds
+      the segments without them
+    - snapshot() writes the open segment and commits the metadata in one
+      transaction, so a crash rolls back to the last snapshot
+    - Cosine similarity only (vectors are L2-normalized)
+    """
+
+    def __init__(self, path: Union[str, Path], metadata: Optional[Dict] = None,
+                 m: Optional[int] = None, ef_construction: Optional[int] = None,
+                 ef_search: Optional[int] = None, segment_size: Optional[int] = None,
+                 brute_force_max: Optional[int] = None):
+        """
+        Open or create a collection
+
+        Args:
+            path: Collection directory
+            metadata: Collection metadata, stored on creation
+            m: HNSW graph degree (default from config)
+            ef_construction: HNSW build beam width (default from config)
+            ef_search: HNSW search beam width (default from config)
+            segment_size: Vectors per segment before it is sealed (default from config)
+            brute_force_max: Largest filtered set searched exactly (default from config)
+        """
+        if not FAISS_AVAILABLE:
+            raise ImportError("The local HNSW vector backend requires faiss")
+
+        database_config = config.database
+        self.path = Path(path)
+        self.name = self.path.name
+        self.m = m or database_config.vector_hnsw_m
+        self.ef_construction = ef_construction or database_config.vector_hnsw_ef_construction
+        self.ef_search = ef_search or database_config.vector_hnsw_ef_search
+        self.segment_size = segment_size or database_config.vector_segment_size
+        self.brute_force_max = (
+            database_config.vector_brute_force_max if brute_force_max is None else brute_force_max
+        )
+
+        self._lock = threading.RLock()
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(str(self.path / "collection.db"), check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS items (
+                label INTEGER PRIMARY KEY,
+                id TEXT NOT NULL UNIQUE,
+                document TEXT
+            );
+            CREATE TABLE IF NOT EXISTS segments (
+                segment INTEGER PRIMARY KEY,
+                base INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                file TEXT NOT NULL,
+                alive BLOB,
+                sealed INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS settings (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            );
+        """)
+        self.db.commit()
+
+        settings = dict(self.db.execute("SELECT key, value FROM settings"))
+        if "metadata" not in settings:
+            self.db.execute("INSERT INTO settings VALUES ('metadata', ?)", (json.dumps(metadata or {}),))
+            self.db.commit()
+        self.metadata = json.loads(settings.get("metadata", json.dumps(metadata or {})))
+        self.dim: Optional[int] = int(settings["dim"]) if "dim" in settings else None
+        # Metadata keys and whether their values are all booleans. Read from
+        # the schema: ALTER TABLE outside a transaction outlives a rollback
+        booleans = json.loads(settings.get("columns", "{}"))
+        self._columns: Dict[str, bool] = {
+            name[2:]: booleans.get(name[2:], False)
+            for _, name, *_ in self.db.execute("PRAGMA table_info(items)") if name.startswith("m_")
+        }
+        self._segments: List[_Segment] = self._load_segments()
+        # Segment ids are never reused, so compaction cannot overwrite live files
+        self._last_segment = self._segments[-1].id if self._segments else -1
+        self._obsolete: List[Path] = []
+
+    # ---- storage ----
+
+    def _load_segments(self) -> List[_Segment]:
+        segments = []
+        referenced = set()
+        for segment_id, base, size, file, alive, sealed in self.db.execute(
+            "SELECT segment, base, size, file, alive, sealed FROM segments ORDER BY segment"
+        ):
+            flags = _MMAP if sealed else 0
+            index = faiss.read_index(str(self.path / file), flags)
+            capacity = size if sealed else max(size, self.segment_size)
+            mask = np.zeros(capacity, dtype=bool)
+            mask[:size] = (
+                np.unpackbits(np.frombuffer(alive, dtype=np.uint8), count=size, bitorder="little")
+                .astype(bool) if alive is not None else True
+            )
+            segment = _Segment(segment_id, base, index, mask, file, bool(sealed))
+            segment.index.hnsw.efSearch = self.ef_search
+            segments.append(segment)
+            referenced.add(file)
+
+        # Files written after the last snapshot
+        for file in self.path.glob("segment_*.faiss"):
+            if file.name not in referenced:
+                file.unlink()
+        return segments
+
+    def _new_segment(self) -> _Segment:
+        index = faiss.IndexHNSWFlat(self.dim, self.m, faiss.METRIC_INNER_PRODUCT)
+        index.hnsw.efConstruction = self.ef_construction
+        index.hnsw.efSearch = self.ef_search
+        last = self._segments[-1] if self._segments else None
+        base = last.base + last.size if last else 0
+        self._last_segment += 1
+        segment = _Segment(self._last_segment, base, index, np.zeros(self.segment_size, dtype=bool))
+        self._segments.append(segment)
+        return segment
+
+    def _write(self, segment: _Segment, sealed: bool):
+        """Write a segment under a new file name and record it (committed by snapshot())"""
+        version = 0
+        if segment.file:
+            version = int(segment.file.rsplit("_", 1)[1].split(".")[0]) + 1
+            self._obsolete.append(self.path / segment.file)
+        file = f"segment_{segment.id}_{version}.faiss"
+        faiss.write_index(segment.index, str(self.path / file))
+        segment.file = file
+        segment.written = segment.size
+        if sealed:
+            # Serve the sealed segment from the page cache instead of the heap
+            segment.index = faiss.read_index(str(self.path / file), _MMAP)
+            segment.index.hnsw.efSearch = self.ef_search
+            segment.alive = segment.alive[:segment.size].copy()
+            segment.sealed = True
+            segment._vectors = None
+
+    def _save_segment(self, segment: _Segment):
+        alive = segment.alive[:segment.size]
+        self.db.execute(
+            "INSERT OR REPLACE INTO segments VALUES (?, ?, ?, ?, ?, ?)",
+            (segment.id, segment.base, segment.size, segment.file,
+             np.packbits(alive, bitorder="little").tobytes() if not alive.all() else None,
+             int(segment.sealed)),
+        )
+        segment.dirty = False
+
+    def _save_settings(self):
+        settings = [("columns", json.dumps(self._columns))]
+        if self.dim is not None:
+            settings.append(("dim", str(self.dim)))
+        self.db.executemany("INSERT OR REPLACE INTO settings VALUES (?, ?)", settings)
+
+    def snapshot(self):
+        """Persist every change since the last snapshot"""
+        with self._lock:
+            for segment in self._segments:
+                if segment.dirty:
+                    if not segment.sealed and (segment.file is None or segment.written != segment.size):
+                        self._write(segment, sealed=False)
+                    self._save_segment(segment)
+            self._save_settings()
+            self.db.commit()
+            for file in self._obsolete:
+                file.unlink(missing_ok=True)
+            self._obsolete = []
+
+    def close(self):
+        """Snapshot and close the metadata database"""
+        with self._lock:
+            self.snapshot()
+            self.db.close()
+
+    # ---- metadata ----
+
+    def _ensure_columns(self, metadatas: Sequence[Optional[Dict]]):
+        for metadata in metadatas:
+            for key, value in (metadata or {}).items():
+                if key not in self._columns:
+                    column = _quote(f"m_{key}")
+                    self.db.execute(f"ALTER TABLE items ADD COLUMN {column}")
+                    self.db.execute(
+                        f"CREATE INDEX IF NOT EXISTS {_quote(f'idx_m_{key}')} ON items({column})"
+                    )
+                    self._columns[key] = isinstance(value, bool)
+                elif self._columns[key] and not isinstance(value, bool):
+                    self._columns[key] = False
+
+    def _condition(self, where: Dict[str, Any], params: List[Any]) -> str:
+        """SQL condition of a Chroma-style where filter"""
+        clauses = []
+        for key, condition in where.items():
+            if key in ("$and", "$or"):
+                parts = [self._condition(part, params) for part in condition]
+                clauses.append("(" + (" AND " if key == "$and" else " OR ").join(parts) + ")")
+                continue
+
+            operator, value = next(iter(condition.items())) if isinstance(condition, dict) else ("$eq", condition)
+            if key not in self._columns:
+                # Nothing has the key: only negations match
+                clauses.append("1" if operator in ("$ne", "$nin") else "0")
+                continue
+
+            column = _quote(f"m_{key}")
+            if operator in ("$in", "$nin"):
+                params.extend(value)
+                placeholders = ", ".join("?" * len(value))
+                negate = "NOT " if operator == "$nin" else ""
+                clauses.append(f"{column} {negate}IN ({placeholders})")
+            elif operator in _OPERATORS:
+                params.append(value)
+                clauses.append(f"{column} {_OPERATORS[operator]} ?")
+            else:
+                raise ValueError(f"Unsupported where operator: {operator}")
+        return " AND ".join(clauses) or "1"
+
+    def _filter(self, where: Optional[Dict], where_document: Optional[Dict]) -> Tuple[str, List[Any]]:
+        params: List[Any] = []
+        clauses = [self._condition(where, params)] if where else []
+        for operator, text in (where_document or {}).items():
+            if operator not in ("$contains", "$not_contains"):
+                raise ValueError(f"Unsupported where_document operator: {operator}")
+            params.append(text)
+            clauses.append(f"instr(document, ?) {'>' if operator == '$contains' else '='} 0")
+        return " AND ".join(clauses) or "1", params
+
+    def _rows(self, labels: Sequence[int]) -> Dict[int, Tuple[str, Optional[str], Dict[str, Any]]]:
+        """id, document and metadata per label"""
+        keys = list(self._columns)
+        columns = "".join(f", {_quote(f'm_{key}')}" for key in keys)
+        rows = {}
+        labels = [int(label) for label in labels]
+        for start in range(0, len(labels), _SQL_CHUNK):
+            chunk = labels[start:start + _SQL_CHUNK]
+            for row in self.db.execute(
+                f"SELECT label, id, document{columns} FROM items "
+                f"WHERE label IN ({', '.join('?' * len(chunk))})", chunk
+            ):
+                metadata = {
+                    key: bool(value) if self._columns[key] else value
+                    for key, value in zip(keys, row[3:]) if value is not None
+                }
+                rows[row[0]] = (row[1], row[2], metadata)
+        return rows
+
+    def _labels(self, ids: Sequence[str]) -> List[int]:
+        labels = []
+        for start in range(0, len(ids), _SQL_CHUNK):
+            chunk = list(ids[start:start + _SQL_CHUNK])
+            labels.extend(label for (label,) in self.db.execute(
+                f"SELECT label FROM items WHERE id IN ({', '.join('?' * len(chunk))})", chunk
+            ))
+        return labels
+
+    def _kill(self, labels: Sequence[int]):
+        """Tombstone labels and drop their rows"""
+        if not len(labels):
+            return
+        labels = np.asarray(labels, dtype=np.int64)
+        for segment in self._segments:
+            inside = labels[(labels >= segment.base) & (labels < segment.base + segment.size)]
+            if len(inside):
+                segment.alive[inside - segment.base] = False
+                segment.dirty = True
+        values = [(int(label),) for label in labels]
+        self.db.executemany("DELETE FROM items WHERE label = ?", values)
+
+    # ---- collection API ----
+
+    def upsert(self, ids: List[str], embeddings: Any = None,
+               metadatas: Optional[List[Dict]] = None, documents: Optional[List[str]] = None):
+        if embeddings is None:
+            raise ValueError("The local vector backend needs embeddings")
+        vectors = _normalized(embeddings)
+        if len(vectors) != len(ids):
+            raise ValueError("ids and embeddings differ in length")
+        if len(set(ids)) != len(ids):
+            raise ValueError("ids must be unique within one upsert")
+
+        with self._lock:
+            if self.dim is None:
+                self.dim = vectors.shape[1]
+            elif vectors.shape[1] != self.dim:
+                raise ValueError(f"Embedding dimension {vectors.shape[1]} does not match {self.dim}")
+
+            self._kill(self._labels(ids))
+            if metadatas:
+                self._ensure_columns(metadatas)
+            keys = list(self._columns)
+            columns = "".join(f", {_quote(f'm_{key}')}" for key in keys)
+            placeholders = ", ?" * len(keys)
+
+            offset = 0
+            while offset < len(ids):
+                segment = self._segments[-1] if self._segments else None
+                if segment is None or segment.sealed:
+                    segment = self._new_segment()
+                take = min(len(ids) - offset, self.segment_size - segment.size)
+                start = segment.size
+                segment.index.add(vectors[offset:offset + take])
+                segment.alive[start:start + take] = True
+                segment.dirty = True
+
+                rows = []
+                for i in range(offset, offset + take):
+                    metadata = metadatas[i] if metadatas and metadatas[i] else {}
+                    rows.append((
+                        segment.base + start + i - offset, ids[i],
+                        documents[i] if documents else None,
+                        *(metadata.get(key) for key in keys),
+                    ))
+                self.db.executemany(
+                    f"INSERT INTO items (label, id, document{columns}) VALUES (?, ?, ?{placeholders})",
+                    rows,
+                )
+                offset += take
+
+                if segment.size >= self.segment_size:
+                    self._write(segment, sealed=True)
+                    self.snapshot()
+
+    def add(self, ids: List[str], embeddings: Any = None,
+            metadatas: Optional[List[Dict]] = None, documents: Optional[List[str]] = None):
+        self.upsert(ids=ids, embeddings=embeddings, metadatas=metadatas, documents=documents)
+
+    def query(self, query_embeddings: Any = None, n_results: int = 10,
+              where: Optional[Dict] = None, where_document: Optional[Dict] = None,
+              **kwargs) -> Dict[str, Any]:
+        if query_embeddings is None:
+            raise ValueError("The local vector backend needs query embeddings")
+        queries = _normalized(query_embeddings)
+
+        with self._lock:
+            segments = [segment for segment in self._segments if segment.size]
+            if not segments or self.dim is None:
+                return self._result([[] for _ in queries], [[] for _ in queries])
+
+            if where or where_document:
+                condition, params = self._filter(where, where_document)
+                # Counting through a LIMIT stops early when the filter is broad
+                matches = self.db.execute(
+                    f"SELECT COUNT(*) FROM (SELECT 1 FROM items WHERE {condition} LIMIT ?)",
+                    (*params, self.brute_force_max + 1),
+                ).fetchone()[0]
+                if matches > self.brute_force_max:
+                    scores, labels = self._search_filtered(segments, queries, n_results, condition, params)
+                else:
+                    selected = np.fromiter((label for (label,) in self.db.execute(
+                        f"SELECT label FROM items WHERE {condition}", params
+                    )), dtype=np.int64)
+                    scores, labels = self._exact(segments, queries, n_results, selected)
+            else:
+                scores, labels = self._search(segments, queries, n_results, None)
+
+            rows = self._rows(np.unique(labels[labels >= 0]))
+            hits = [[(label, score) for label, score in zip(row_labels, row_scores) if label in rows]
+                    for row_labels, row_scores in zip(labels.tolist(), scores.tolist())]
+            return self._result(hits, [[rows[label] for label, _ in row] for row in hits])
+
+    def _search(self, segments: List[_Segment], queries: np.ndarray, k: int,
+                selected: Optional[np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+        """HNSW search of every segment, restricted to live (and selected) labels"""
+        all_scores, all_labels = [], []
+        for segment in segments:
+            mask = None
+            if selected is not None:
+                inside = selected[(selected >= segment.base) & (selected < segment.base + segment.size)]
+                if not len(inside):
+                    continue
+                mask = np.zeros(segment.size, dtype=bool)
+                mask[inside - segment.base] = True
+            elif segment.dead:
+                mask = segment.alive[:segment.size]
+                if not mask.any():
+                    continue
+
+            params = faiss.SearchParametersHNSW(efSearch=max(self.ef_search, k))
+            if mask is not None:
+                bitmap = np.packbits(mask, bitorder="little")
+                params.sel = faiss.IDSelectorBitmap(segment.size, faiss.swig_ptr(bitmap))
+            scores, positions = segment.index.search(queries, min(k, segment.size), params=params)
+            all_scores.append(scores)
+            all_labels.append(np.where(positions >= 0, positions + segment.base, -1))
+
+        if not all_scores:
+            empty = np.zeros((len(queries), 0))
+            return empty, empty.astype(np.int64)
+        return self._top(np.hstack(all_scores), np.hstack(all_labels), k)
+
+    def _matching(self, labels: np.ndarray, condition: str, params: List[Any]) -> np.ndarray:
+        """The labels that satisfy a filter condition"""
+        labels = np.unique(labels[labels >= 0]).tolist()
+        matching = []
+        for start in range(0, len(labels), _SQL_CHUNK):
+            chunk = labels[start:start + _SQL_CHUNK]
+            matching.extend(label for (label,) in self.db.execute(
+                f"SELECT label FROM items WHERE label IN ({', '.join('?' * len(chunk))}) AND {condition}",
+                (*chunk, *params),
+            ))
+        return np.array(matching, dtype=np.int64)
+
+    def _search_filtered(self, segments: List[_Segment], queries: np.ndarray, k: int,
+                         condition: str, params: List[Any]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        HNSW search for a broad filter: overfetch unfiltered neighbours and
+        keep the matching ones, which avoids loading every matching label.
+        Falls back to a search restricted to all matching labels when too
+        few candidates pass.
+        """
+        total = sum(segment.size for segment in segments)
+        candidates = max(4 * k, 64)
+        while candidates <= 4 * self.brute_force_max:
+            scores, labels = self._search(segments, queries, candidates, None)
+            keep = np.isin(labels, self._matching(labels, condition, params))
+            if (keep.sum(axis=1) >= k).all() or candidates >= total:
+                return self._top(scores, np.where(keep, labels, -1), k)
+            candidates *= 4
+
+        selected = np.fromiter((label for (label,) in self.db.execute(
+            f"SELECT label FROM items WHERE {condition}", params
+        )), dtype=np.int64)
+        return self._search(segments, queries, k, selected)
+
+    def _exact(self, segments: List[_Segment], queries: np.ndarray, k: int,
+               selected: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Exact search over a small set of labels"""
+        all_scores, all_labels = [], []
+        for segment in segments:
+            inside = selected[(selected >= segment.base) & (selected < segment.base + segment.size)]
+            if len(inside):
+                all_scores.append(queries @ segment.vectors()[inside - segment.base].T)
+                all_labels.append(np.broadcast_to(inside, (len(queries), len(inside))))
+        if not all_scores:
+            empty = np.zeros((len(queries), 0))
+            return empty, empty.astype(np.int64)
+        return self._top(np.hstack(all_scores), np.hstack(all_labels), k)
+
+    @staticmethod
+    def _top(scores: np.ndarray, labels: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        scores = np.where(labels >= 0, scores, -np.inf)
+        order = np.argsort(-scores, axis=1, kind="stable")[:, :k]
+        return np.take_along_axis(scores, order, 1), np.take_along_axis(labels, order, 1)
+
+    @staticmethod
+    def _result(hits: List[List[Tuple[int, float]]], rows: List[List[tuple]]) -> Dict[str, Any]:
+        return {
+            "ids": [[row[0] for row in query_rows] for query_rows in rows],
+            "documents": [[row[1] for row in query_rows] for query_rows in rows],
+            "metadatas": [[row[2] for row in query_rows] for query_rows in rows],
+            "distances": [[1 - score for _, score in query_hits] for query_hits in hits],
+            "embeddings": None,
+        }
+
+    def get(self, ids: Optional[List[str]] = None, where: Optional[Dict] = None,
+            where_document: Optional[Dict] = None, limit: Optional[int] = None,
+            **kwargs) -> Dict[str, Any]:
+        with self._lock:
+            if ids is not None:
+                labels = self._labels(ids)
+            else:
+                condition, params = self._filter(where, where_document)
+                sql = f"SELECT label FROM items WHERE {condition} ORDER BY label"
+                if limit:
+                    sql += f" LIMIT {int(limit)}"
+                labels = [label for (label,) in self.db.execute(sql, params)]
+            rows = self._rows(labels)
+
+        ordered = [rows[label] for label in labels]
+        if ids is not None:
+            position = {id_: i for i, id_ in enumerate(ids)}
+            ordered.sort(key=lambda row: position[row[0]])
+        return {
+            "ids": [row[0] for row in ordered],
+            "documents": [row[1] for row in ordered],
+            "metadatas": [row[2] for row in ordered],
+        }
+
+    def delete(self, ids: Optional[List[str]] = None, where: Optional[Dict] = None,
+               where_document: Optional[Dict] = None):
+        with self._lock:
+            if ids is not None:
+                labels = self._labels(ids)
+            else:
+                condition, params = self._filter(where, where_document)
+                labels = [label for (label,) in self.db.execute(
+                    f"SELECT label FROM items WHERE {condition}", params
+                )]
+            self._kill(labels)
+
+    def count(self) -> int:
+        with self._lock:
+            return self.db.execute("SELECT COUNT(*) FROM items").fetchone()[0]
+
+    def compact(self):
+        """Rebuild the segments without tombstoned vectors"""
+        with self._lock:
+            self.snapshot()
+            old_segments, self._segments = self._segments, []
+            columns = "".join(f", {_quote(f'm_{key}')}" for key in self._columns)
+            rows = self.db.execute(f"SELECT label, id, document{columns} FROM items ORDER BY label").fetchall()
+            self.db.execute("DELETE FROM items")
+            self.db.execute("DELETE FROM segments")
+
+            placeholders = ", ?" * len(self._columns)
+            for start in range(0, len(rows), self.segment_size):
+                chunk = rows[start:start + self.segment_size]
+                labels = np.array([row[0] for row in chunk], dtype=np.int64)
+                vectors = np.empty((len(chunk), self.dim), dtype=np.float32)
+                for old in old_segments:
+                    inside = (labels >= old.base) & (labels < old.base + old.size)
+                    if inside.any():
+                        vectors[inside] = old.vectors()[labels[inside] - old.base]
+                segment = self._new_segment()
+                segment.index.add(vectors)
+                segment.alive[:len(chunk)] = True
+                self.db.executemany(
+                    f"INSERT INTO items (label, id, document{columns}) VALUES (?, ?, ?{placeholders})",
+                    [(segment.base + i, *row[1:]) for i, row in enumerate(chunk)],
+                )
+                if segment.size >= self.segment_size:
+                    self._write(segment, sealed=True)
+
+            self._obsolete.extend(self.path / s.file for s in old_segments if s.file)
+            self.snapshot()
+            logger.info(f"Compacted collection '{self.name}' to {len(rows)} vectors")
+
+
+class HnswClient(VectorClient):
+    """
+    Local vector database client: one HnswCollection directory per collection
+
+    Features:
+    - No server and no heavy imports; collections open lazily
+    - snapshot() and close() persist every open collection
+    """
+
+    def __init__(self, path: Optional[Union[str, Path]] = None, **options):
+        """
+        Initialize local client
+
+        Args:
+            path: Root directory of the collections (default from config)
+            **options: HnswCollection parameters
+        """
+        self.path = Path(path or config.database.vector_path)
+        self.options = options
+        self._collections: Dict[str, HnswCollection] = {}
+        self._lock = threading.Lock()
+
+    def _collection_path(self, name: str) -> Path:
+        if not _COLLECTION_NAME.match(name):
+            raise ValueError(f"Invalid collection name: {name}")
+        return self.path / name
+
+    def get_or_create_collection(self, name: str, metadata: Optional[Dict] = None) -> HnswCollection:
+        with self._lock:
+            if name not in self._collections:
+                self._collections[name] = HnswCollection(
+                    self._collection_path(name), metadata=metadata, **self.options
+                )
+            return self._collections[name]
+
+    def get_collection(self, name: str) -> HnswCollection:
+        if name not in self._collections and not self._collection_path(name).exists():
+            raise ValueError(f"Collection {name} does not exist")
+        return self.get_or_create_collection(name)
+
+    def delete_collection(self, name: str):
+        path = self._collection_path(name)
+        with self._lock:
+            collection = self._collections.pop(name, None)
+            if collection is not None:
+                collection.db.close()
+        shutil.rmtree(path, ignore_errors=True)
+
+    def get_max_batch_size(self) -> int:
+        return config.database.vector_segment_size
+
+    def snapshot(self):
+        """Persist every open collection"""
+        for collection in list(self._collections.values()):
+            collection.snapshot()
+
+    def close(self):
+        """Persist and close every open collection"""
+        with self._lock:
+            for collection in self._collections.values():
+                collection.close()
+            self._collections.clear()
@@ -1,30 +1,116 @@
 """
-Vector database management using ChromaDB
+Vector database management using ChromaDB or a local HNSW index
 For semantic search and similarity matching
 """
 
-import chromadb
-from chromadb.config import Settings
-from typing import Any, Dict, List, Optional
+import weakref
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
 from pathlib import Path
 import numpy as np
 
 from omnisense.config import config
 from omnisense.utils.logger import get_logger
+from omnisense.utils.inference_cache import text_hash
+from omnisense.matcher.embedding import EmbeddingService, get_embedding_service
+from omnisense.storage.vector_backend import HnswClient
 
 logger = get_logger(__name__)
 
+try:
+    import chromadb
+    from chromadb.config import Settings
+    CHROMADB_AVAILABLE = True
+except ImportError:
+    CHROMADB_AVAILABLE = False
+    logger.warning("chromadb not available, only the hnsw vector backend can be used")
+
+VECTOR_BACKENDS = ("chroma", "hnsw")
+
+
+def document_id(text: str) -> str:
+    """Stable id of a document: the hash of its normalized text"""
+    return f"doc_{text_hash(text)}"
+
+
+def _metadata(item: Dict[str, Any], skip: tuple) -> Dict[str, Any]:
+    """Scalar fields of an item, the only metadata Chroma accepts"""
+    return {
+        key: value for key, value in item.items()
+        if key not in skip and isinstance(value, (str, int, float, bool))
+    }
+
 
 class VectorDatabase:
-    """Vector database for semantic search using ChromaDB"""
+    """
+    Vector database for semantic search using ChromaDB or a local HNSW index
+
+    Features:
+    - database.vector_backend selects ChromaDB or HnswClient, local faiss
+      HNSW segments with metadata in SQLite (see vector_backend)
+    - Documents are upserted in batches of batch_size under content-hash ids,
+      so re-adding a document updates it instead of duplicating it
+    - Documents and queries are embedded with the matcher's embedding
+      service, reusing embeddings it already computed for the same texts
+    - index_documents() streams any iterable into a collection with progress
+    - search_many() embeds and queries many texts in one batch
+    """
 
-    def __init__(self):
+    def __init__(self, embedding_service: Optional[EmbeddingService] = None,
+                 batch_size: Optional[int] = None, backend: Optional[str] = None):
+        """
+        Initialize vector database
+
+        Args:
+            embedding_service: Embedding service (default: the process-wide
+                one, if database.vector_matcher_embeddings is set or the
+                backend is hnsw)
+            batch_size: Documents per write (default from config)
+            backend: "chroma" or "hnsw" (default from config)
+        """
+        self.backend = backend or config.database.vector_backend
+        if self.backend not in VECTOR_BACKENDS:
+            raise ValueError(f"Unknown vector backend: {self.backend}")
         self.client = None
         self.collections = {}
+        self.batch_size = max(1, batch_size or config.database.vector_batch_size)
+        self._embedding_service = embedding_service
         self._initialize()
 
+    @property
+    def embedding_service(self) -> Optional[EmbeddingService]:
+        """Embedding service, or None to let Chroma embed"""
+        # The local backend stores vectors only, it cannot embed by itself
+        if self._embedding_service is None and (
+            config.database.vector_matcher_embeddings or self.backend == "hnsw"
+        ):
+            self._embedding_service = get_embedding_service()
+        return self._embedding_service
+
+    def _embed(self, texts: List[str]) -> Optional[List[List[float]]]:
+        service = self.embedding_service
+        if service is None:
+            return None
+        return service.encode(texts).tolist()
+
+    def _max_batch_size(self) -> int:
+        # SQLite-backed clients cap the rows of one write
+        try:
+            return min(self.batch_size, self.client.get_max_batch_size())
+        except Exception:
+            return self.batch_size
+
     def _initialize(self):
-        """Initialize ChromaDB client"""
+        """Initialize the backend client"""
+        if self.backend == "hnsw":
+            self.client = HnswClient()
+            # Persist pending writes on garbage collection or interpreter exit
+            self._finalizer = weakref.finalize(self, self.client.close)
+            logger.info("Local HNSW vector database initialized successfully")
+            return
+
+        if not CHROMADB_AVAILABLE:
+            raise ImportError("The chroma vector backend requires chromadb")
         try:
             db_path = Path(config.database.chroma_path)
             db_path.mkdir(parents=True, exist_ok=True)
@@ -47,9 +133,10 @@ class VectorDatabase:
             return self.collections[name]
 
         try:
+            # Cosine distance, as semantic_search() converts it to a similarity
             collection = self.client.get_or_create_collection(
                 name=name,
-                metadata=metadata or {}
+                metadata={"hnsw:space": "cosine", **(metadata or {})}
             )
             self.collections[name] = collection
             logger.info(f"Collection '{name}' ready")
@@ -64,33 +151,117 @@ class VectorDatabase:
         documents: List[str],
         metadatas: Optional[List[Dict]] = None,
         ids: Optional[List[str]] = None,
-        embeddings: Optional[List[List[float]]] = None
-    ):
-        """Add documents to collection"""
+        embeddings: Optional[Union[List[List[float]], np.ndarray]] = None,
+        snapshot: bool = True
+    ) -> List[str]:
+        """
+        Add or update documents in batches
+
+        Args:
+            collection_name: Collection name
+            documents: Document texts
+            metadatas: Metadata per document
+            ids: Ids per document (default: content hashes)
+            embeddings: Precomputed embeddings (default: embedding service)
+            snapshot: Persist the documents before returning (hnsw backend)
+
+        Returns:
+            Ids of the documents
+        """
         collection = self.get_or_create_collection(collection_name)
 
         if not ids:
-            ids = [f"doc_{i}" for i in range(len(documents))]
+            ids = [document_id(document) for document in documents]
+        batch_size = self._max_batch_size()
 
         try:
-            if embeddings:
-                collection.add(
-                    documents=documents,
-                    metadatas=metadatas,
-                    ids=ids,
-                    embeddings=embeddings
-                )
-            else:
-                collection.add(
-                    documents=documents,
-                    metadatas=metadatas,
-                    ids=ids
+            for start in range(0, len(documents), batch_size):
+                # Upsert rejects an id repeated within one call; the last copy wins
+                rows = list({ids[i]: i for i in range(start, min(start + batch_size, len(documents)))}.values())
+                batch = [documents[i] for i in rows]
+                if embeddings is not None:
+                    batch_embeddings = np.asarray(
+                        [embeddings[i] for i in rows], dtype=np.float32
+                    ).tolist()
+                else:
+                    batch_embeddings = self._embed(batch)
+                collection.upsert(
+                    documents=batch,
+                    metadatas=[metadatas[i] for i in rows] if metadatas else None,
+                    ids=[ids[i] for i in rows],
+                    embeddings=batch_embeddings
                 )
+            if snapshot:
+                self.snapshot()
             logger.info(f"Added {len(documents)} documents to '{collection_name}'")
+            return ids
         except Exception as e:
             logger.error(f"Error adding documents: {e}")
             raise
 
+    def index_documents(
+        self,
+        collection_name: str,
+        items: Iterable[Union[str, Dict[str, Any]]],
+        text_field: str = "text",
+        batch_size: Optional[int] = None,
+        progress: Optional[Callable[[int], None]] = None
+    ) -> int:
+        """
+        Stream documents into a collection
+
+        The iterable is consumed one batch at a time, so it can be a
+        generator over millions of rows.
+
+        Args:
+            collection_name: Collection name
+            items: Texts, or dicts with the text under text_field, an optional
+                "id" and "embedding", and scalar fields kept as metadata
+            text_field: Field holding the text of dict items
+            batch_size: Documents per batch (default: the database batch size)
+            progress: Called with the number of documents indexed so far
+
+        Returns:
+            Number of documents indexed
+        """
+        batch_size = batch_size or self._max_batch_size()
+        iterator = iter(items)
+        indexed = 0
+
+        while True:
+            batch = list(islice(iterator, batch_size))
+            if not batch:
+                break
+
+            rows = [{text_field: item} if isinstance(item, str) else item for item in batch]
+            rows = [row for row in rows if row.get(text_field)]
+            if rows:
+                documents = [row[text_field] for row in rows]
+                embeddings = None
+                if all(row.get("embedding") is not None for row in rows):
+                    embeddings = [row["embedding"] for row in rows]
+                skip = (text_field, "id", "embedding")
+                metadatas = [_metadata(row, skip) for row in rows]
+                self.add_documents(
+                    collection_name,
+                    documents,
+                    metadatas=metadatas if any(metadatas) else None,
+                    ids=[
+                        document_id(row[text_field]) if row.get("id") is None else str(row["id"])
+                        for row in rows
+                    ],
+                    embeddings=embeddings,
+                    snapshot=False
+                )
+
+            indexed += len(rows)
+            logger.info(f"Indexed {indexed} documents into '{collection_name}'")
+            if progress:
+                progress(indexed)
+
+        self.snapshot()
+        return indexed
+
     def query(
         self,
         collection_name: str,
@@ -103,10 +274,13 @@ class VectorDatabase:
         """Query collection for similar documents"""
         collection = self.get_or_create_collection(collection_name)
 
+        if query_embeddings is None and query_texts:
+            query_embeddings = self._embed(query_texts)
+
         try:
-            if query_embeddings:
+            if query_embeddings is not None and len(query_embeddings):
                 results = collection.query(
-                    query_embeddings=query_embeddings,
+                    query_embeddings=np.asarray(query_embeddings, dtype=np.float32).tolist(),
                     n_results=n_results,
                     where=where,
                     where_document=where_document
@@ -126,6 +300,25 @@ class VectorDatabase:
             logger.error(f"Error querying collection: {e}")
             raise
 
+    def delete_documents(
+        self,
+        collection_name: str,
+        ids: Optional[List[str]] = None,
+        where: Optional[Dict] = None
+    ):
+        """Delete documents by id or metadata filter"""
+        if ids is None and where is None:
+            raise ValueError("Must provide either ids or where")
+
+        collection = self.get_or_create_collection(collection_name)
+        try:
+            collection.delete(ids=ids, where=where)
+            self.snapshot()
+            logger.info(f"Deleted documents from '{collection_name}'")
+        except Exception as e:
+            logger.error(f"Error deleting documents: {e}")
+            raise
+
     def delete_collection(self, name: str):
         """Delete a collection"""
         try:
@@ -137,6 +330,17 @@ class VectorDatabase:
             logger.error(f"Error deleting collection: {e}")
             raise
 
+    def snapshot(self):
+        """Persist pending writes (ChromaDB persists on every write)"""
+        if isinstance(self.client, HnswClient):
+            self.client.snapshot()
+
+    def close(self):
+        """Persist pending writes and release the backend"""
+        if isinstance(self.client, HnswClient):
+            self._finalizer()
+        self.collections.clear()
+
     def get_collection_stats(self, name: str) -> Dict:
         """Get collection statistics"""
         collection = self.get_or_create_collection(name)
@@ -159,23 +363,52 @@ class VectorDatabase:
         threshold: float = 0.7
     ) -> List[Dict]:
         """Perform semantic search"""
+        return self.search_many(collection_name, [query], top_k=top_k, threshold=threshold)[0]
+
+    def search_many(
+        self,
+        collection_name: str,
+        queries: List[str],
+        top_k: int = 10,
+        threshold: float = 0.7,
+        where: Optional[Dict] = None
+    ) -> List[List[Dict]]:
+        """
+        Semantic search for many queries in one embedding call and one query
+
+        Args:
+            collection_name: Collection name
+            queries: Query texts
+            top_k: Results per query
+            threshold: Minimum cosine similarity
+            where: Metadata filter
+
+        Returns:
+            Matches per query, best first
+        """
+        if not queries:
+            return []
+
         results = self.query(
             collection_name=collection_name,
-            query_texts=[query],
-            n_results=top_k
+            query_texts=queries,
+            n_results=top_k,
+            where=where
         )
 
-        matched_results = []
-        if results and 'distances' in results:
-            for i, distance in enumerate(results['distances'][0]):
-                # Convert distance to similarity (assuming cosine distance)
-                similarity = 1 - distance
-                if similarity >= threshold:
-                    matched_results.append({
-                        'id': results['ids'][0][i],
-                        'document': results['documents'][0][i],
-                        'metadata': results['metadatas'][0][i] if results['metadatas'] else {},
-                        'similarity': similarity
-                    })
-
-        return matched_results
+        matches: List[List[Dict]] = [[] for _ in queries]
+        if results and results.get('distances'):
+            metadatas = results.get('metadatas')
+            for q, distances in enumerate(results['distances']):
+                for i, distance in enumerate(distances):
+                    # Convert distance to similarity (assuming cosine distance)
+                    similarity = 1 - distance
+                    if similarity >= threshold:
+                        matches[q].append({
+                            'id': results['ids'][q][i],
+                            'document': results['documents'][q][i],
+                            'metadata': (metadatas[q][i] or {}) if metadatas else {},
+                            'similarity': similarity
+                        })
+
+        return matches
@@ -0,0 +1,321 @@
+"""
+Inference cache for OmniSense
+Model outputs (sentiment, embeddings, entities) keyed by model and content
+hash, so text seen in an earlier run is not sent through the model again
+"""
+
+import hashlib
+import pickle
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from omnisense.config import config
+from omnisense.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def normalize_text(text: str) -> str:
+    """Unicode NFKC with whitespace collapsed, so trivially different copies share a key"""
+    return ' '.join(unicodedata.normalize('NFKC', text).split())
+
+
+def text_hash(text: str) -> str:
+    """Hash of the normalized text"""
+    return hashlib.sha1(normalize_text(text).encode('utf-8')).hexdigest()
+
+
+class InferenceCache:
+    """
+    Two-tier cache of model outputs
+
+    Features:
+    - Keys are (model id, model version, hash of the normalized text)
+    - In-process LRU tier bounded by entry count
+    - Persistent SQLite tier bounded by size; least recently used entries are
+      evicted once the stored values exceed max_mb
+    - Hit and miss counters per tier
+    - Thread-safe, since inference runs in worker threads
+    """
+
+    _EVICT_TO = 0.9
+
+    def __init__(
+        self,
+        path: Optional[Union[str, Path]] = None,
+        memory_items: Optional[int] = None,
+        max_mb: Optional[float] = None,
+        persistent: Optional[bool] = None,
+    ):
+        """
+        Initialize inference cache
+
+        Args:
+            path: SQLite file of the persistent tier (default from config)
+            memory_items: Entries kept in the in-process tier (default from config)
+            max_mb: Size limit of the persistent tier in MiB (default from config)
+            persistent: Enable the persistent tier (default from config)
+        """
+        inference_config = config.inference
+        self.path = Path(
+            path or inference_config.cache_path or Path(config.cache_dir) / 'inference.db'
+        )
+        self.memory_items = (
+            inference_config.cache_memory_items if memory_items is None else memory_items
+        )
+        self.max_bytes = int((max_mb or inference_config.cache_max_mb) * 1024 * 1024)
+        self.persistent = inference_config.cache_persist if persistent is None else persistent
+
+        self._memory: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._db: Optional[sqlite3.Connection] = None
+        self._stored_bytes = 0
+        self._stats = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "writes": 0,
+            "evictions": 0,
+        }
+
+    @staticmethod
+    def make_key(model: str, version: str, text: str, normalize: bool = True) -> str:
+        digest = text_hash(text) if normalize else hashlib.sha1(text.encode('utf-8')).hexdigest()
+        return f"{model}|{version}|{digest}"
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        """Open the persistent tier on first use"""
+        if not self.persistent:
+            return None
+        if self._db is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            db = sqlite3.connect(str(self.path), check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.execute("""
+                CREATE TABLE IF NOT EXISTS inference_cache (
+                    key TEXT PRIMARY KEY,
+                    value BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    accessed REAL NOT NULL
+                )
+            """)
+            db.execute(
+                "CREATE INDEX IF NOT EXISTS idx_inference_cache_accessed "
+                "ON inference_cache(accessed)"
+            )
+            self._stored_bytes = db.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM inference_cache"
+            ).fetchone()[0]
+            self._db = db
+        return self._db
+
+    def _remember(self, key: str, value: Any) -> None:
+        if self.memory_items <= 0:
+            return
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+
+    def get_many(self, model: str, version: str, texts: List[str],
+                 normalize: bool = True) -> List[Optional[Any]]:
+        """
+        Look up cached outputs
+
+        Args:
+            model: Model id
+            version: Model version (backend, revision, settings that change outputs)
+            texts: Input texts
+            normalize: Key on the normalized text; disable for outputs that
+                depend on exact character offsets
+
+        Returns:
+            Cached output per text, None for misses
+        """
+        keys = [self.make_key(model, version, text, normalize) for text in texts]
+        results: List[Optional[Any]] = [None] * len(texts)
+
+        with self._lock:
+            missing: Dict[str, List[int]] = {}
+            for i, key in enumerate(keys):
+                if key in self._memory:
+                    self._memory.move_to_end(key)
+                    results[i] = self._memory[key]
+                    self._stats["memory_hits"] += 1
+                else:
+                    missing.setdefault(key, []).append(i)
+
+            db = self._connect() if missing else None
+            if db is not None:
+                found = {}
+                pending = list(missing)
+                for start in range(0, len(pending), 500):
+                    chunk = pending[start:start + 500]
+                    rows = db.execute(
+                        f"SELECT key, value FROM inference_cache "
+                        f"WHERE key IN ({','.join('?' * len(chunk))})",
+                        chunk,
+                    ).fetchall()
+                    found.update(rows)
+
+                if found:
+                    now = time.time()
+                    db.executemany(
+                        "UPDATE inference_cache SET accessed = ? WHERE key = ?",
+                        [(now, key) for key in found],
+                    )
+                    db.commit()
+                for key, blob in found.items():
+                    value = pickle.loads(blob)
+                    self._remember(key, value)
+                    for i in missing.pop(key):
+                        results[i] = value
+                        self._stats["disk_hits"] += 1
+
+            self._stats["misses"] += sum(len(indices) for indices in missing.values())
+        return results
+
+    def put_many(self, model: str, version: str, texts: List[str], values: List[Any],
+                 normalize: bool = True) -> None:
+        """Store outputs for texts"""
+        if not texts:
+            return
+
+        entries = {}
+        for text, value in zip(texts, values):
+            entries[self.make_key(model, version, text, normalize)] = value
+
+        with self._lock:
+            for key, value in entries.items():
+                self._remember(key, value)
+            self._stats["writes"] += len(entries)
+
+            db = self._connect()
+            if db is None:
+                return
+            now = time.time()
+            rows = []
+            for key, value in entries.items():
+                blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+                rows.append((key, blob, len(blob), now))
+
+            old = 0
+            keys = list(entries)
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                old += db.execute(
+                    f"SELECT COALESCE(SUM(size), 0) FROM inference_cache "
+                    f"WHERE key IN ({','.join('?' * len(chunk))})",
+                    chunk,
+                ).fetchone()[0]
+            db.executemany(
+                "INSERT OR REPLACE INTO inference_cache (key, value, size, accessed) "
+                "VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            self._stored_bytes += sum(row[2] for row in rows) - old
+            if self._stored_bytes > self.max_bytes:
+                self._evict(db)
+            db.commit()
+
+    def _evict(self, db: sqlite3.Connection) -> None:
+        """Delete least recently used entries until below the size limit"""
+        target = self.max_bytes * self._EVICT_TO
+        victims = []
+        freed = 0
+        for key, size in db.execute(
+            "SELECT key, size FROM inference_cache ORDER BY accessed"
+        ):
+            if self._stored_bytes - freed <= target:
+                break
+            victims.append((key,))
+            freed += size
+
+        db.executemany("DELETE FROM inference_cache WHERE key = ?", victims)
+        self._stored_bytes -= freed
+        self._stats["evictions"] += len(victims)
+        logger.debug(f"Evicted {len(victims)} inference cache entries ({freed} bytes)")
+
+    def get_or_compute(self, model: str, version: str, texts: List[str],
+                       compute: Callable[[List[str]], List[Any]],
+                       normalize: bool = True) -> List[Any]:
+        """
+        Return cached outputs and compute only the misses
+
+        Args:
+            model: Model id
+            version: Model version
+            texts: Input texts
+            compute: Called once with the distinct texts that missed; returns one
+                output per text
+            normalize: Key on the normalized text
+
+        Returns:
+            Output per text
+        """
+        results = self.get_many(model, version, texts, normalize)
+
+        # Texts sharing a key are computed once
+        misses: Dict[str, List[int]] = {}
+        for i, result in enumerate(results):
+            if result is None:
+                misses.setdefault(self.make_key(model, version, texts[i], normalize), []).append(i)
+        if misses:
+            pending = [texts[indices[0]] for indices in misses.values()]
+            computed = compute(pending)
+            for indices, value in zip(misses.values(), computed):
+                for i in indices:
+                    results[i] = value
+            self.put_many(model, version, pending, computed, normalize)
+        return results
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        lookups = self._stats["memory_hits"] + self._stats["disk_hits"] + self._stats["misses"]
+        hits = lookups - self._stats["misses"]
+        return {
+            **self._stats,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "memory_size": len(self._memory),
+            "disk_bytes": self._stored_bytes,
+        }
+
+    def clear(self) -> None:
+        """Drop every cached output"""
+        with self._lock:
+            self._memory.clear()
+            db = self._connect()
+            if db is not None:
+                db.execute("DELETE FROM inference_cache")
+                db.commit()
+                self._stored_bytes = 0
+
+    def close(self) -> None:
+        """Close the persistent tier"""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+# Process-wide cache instance
+_inference_cache: Optional[InferenceCache] = None
+_inference_cache_lock = threading.Lock()
+
+
+def get_inference_cache() -> Optional[InferenceCache]:
+    """Get the process-wide inference cache, or None if caching is disabled"""
+    global _inference_cache
+    if not config.inference.cache_enabled:
+        return None
+    if _inference_cache is None:
+        with _inference_cache_lock:
+            if _inference_cache is None:
+                _inference_cache = InferenceCache()
+    return _inference_cache
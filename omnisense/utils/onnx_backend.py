@@ -0,0 +1,291 @@
+"""
+ONNX Runtime inference backend for OmniSense
+Exports the sentiment classifier and the sentence embedding model to ONNX
+once, optionally quantizes them to int8, and runs them on CPU without torch
+"""
+
+import json
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+import numpy as np
+
+from omnisense.config import config
+from omnisense.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+try:
+    import onnxruntime as ort
+    ONNXRUNTIME_AVAILABLE = True
+except ImportError:
+    logger.warning("onnxruntime not installed. The ONNX inference backend will not be available.")
+    ONNXRUNTIME_AVAILABLE = False
+
+
+INPUT_NAMES = ["input_ids", "attention_mask"]
+_META_FILE = "onnx_meta.json"
+
+
+def _require_onnxruntime():
+    if not ONNXRUNTIME_AVAILABLE:
+        raise ImportError(
+            "onnxruntime is required for the ONNX inference backend. "
+            "Install it with: pip install onnxruntime onnx"
+        )
+
+
+def model_cache_dir(model_name: str, kind: str, cache_dir: Optional[Union[str, Path]] = None) -> Path:
+    """Directory an exported model is cached in: {cache_dir}/onnx/{model}/{kind}"""
+    root = Path(cache_dir) if cache_dir else Path(config.cache_dir) / "onnx"
+    return root / re.sub(r"[^\w.-]+", "--", model_name.strip("/")) / kind
+
+
+class OnnxModel:
+    """
+    ONNX Runtime session over an exported model
+
+    Features:
+    - CPU execution with full graph optimizations
+    - Tunable intra-op threads (0 lets ONNX Runtime decide)
+    - Extra metadata from the export (labels, max length) in ``meta``
+    """
+
+    def __init__(self, path: Union[str, Path], threads: Optional[int] = None,
+                 meta: Optional[Dict[str, Any]] = None):
+        """
+        Initialize ONNX model
+
+        Args:
+            path: .onnx file
+            threads: Intra-op threads (default from config)
+            meta: Export metadata
+        """
+        _require_onnxruntime()
+        threads = config.inference.onnx_threads if threads is None else threads
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads > 0:
+            options.intra_op_num_threads = threads
+        self.path = Path(path)
+        self.session = ort.InferenceSession(
+            str(self.path), options, providers=["CPUExecutionProvider"]
+        )
+        self.meta = meta or {}
+        self._input_names = {node.name for node in self.session.get_inputs()}
+
+    def run(self, inputs: Dict[str, np.ndarray]) -> np.ndarray:
+        """Run the model on tokenized inputs and return its first output"""
+        feed = {
+            name: np.asarray(value, dtype=np.int64)
+            for name, value in inputs.items() if name in self._input_names
+        }
+        return self.session.run(None, feed)[0]
+
+
+def _export(module, tokenizer, path: Path, output_name: str, max_length: int) -> None:
+    """Trace a torch module taking (input_ids, attention_mask) into an ONNX file"""
+    import torch
+
+    sample = tokenizer(["export sample"], padding=True, truncation=True,
+                       max_length=max_length, return_tensors="pt")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with torch.no_grad():
+        torch.onnx.export(
+            module,
+            (sample["input_ids"], sample["attention_mask"]),
+            str(path),
+            input_names=INPUT_NAMES,
+            output_names=[output_name],
+            dynamic_axes={
+                "input_ids": {0: "batch", 1: "sequence"},
+                "attention_mask": {0: "batch", 1: "sequence"},
+                output_name: {0: "batch"},
+            },
+            opset_version=14,
+        )
+
+
+def _quantize(source: Path, target: Path) -> None:
+    """Dynamic int8 quantization of the weights"""
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    quantize_dynamic(str(source), str(target), weight_type=QuantType.QInt8)
+
+
+def _load_cached(directory: Path, quantize: bool, threads: Optional[int]):
+    """Load a cached export and its tokenizer, or return None if not exported yet"""
+    from transformers import AutoTokenizer
+
+    path = directory / ("model.int8.onnx" if quantize else "model.onnx")
+    meta_path = directory / _META_FILE
+    if not meta_path.exists():
+        return None
+    if not path.exists():
+        if not quantize or not (directory / "model.onnx").exists():
+            return None
+        _quantize(directory / "model.onnx", path)
+    meta = json.loads(meta_path.read_text(encoding="utf-8"))
+    tokenizer = AutoTokenizer.from_pretrained(str(directory))
+    return OnnxModel(path, threads=threads, meta=meta), tokenizer
+
+
+def _save_export(directory: Path, tokenizer, meta: Dict[str, Any], quantize: bool) -> None:
+    tokenizer.save_pretrained(str(directory))
+    (directory / _META_FILE).write_text(json.dumps(meta), encoding="utf-8")
+    if quantize:
+        _quantize(directory / "model.onnx", directory / "model.int8.onnx")
+    logger.info(f"Exported ONNX model to {directory}")
+
+
+def load_sequence_classifier(model_name: str, quantize: Optional[bool] = None,
+                             threads: Optional[int] = None,
+                             cache_dir: Optional[Union[str, Path]] = None):
+    """
+    Load a sequence classification model through ONNX Runtime
+
+    The model is exported from transformers on first use and cached.
+
+    Args:
+        model_name: Hugging Face model name or path
+        quantize: Use int8 weights (default from config)
+        threads: Intra-op threads (default from config)
+        cache_dir: Export cache root (default {config.cache_dir}/onnx)
+
+    Returns:
+        (OnnxModel with ``meta["id2label"]``, tokenizer)
+    """
+    _require_onnxruntime()
+    quantize = config.inference.quantize if quantize is None else quantize
+    directory = model_cache_dir(model_name, "classifier", cache_dir)
+    loaded = _load_cached(directory, quantize, threads)
+    if loaded is not None:
+        return loaded
+
+    import torch
+    from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+    class _Classifier(torch.nn.Module):
+        def __init__(self, model):
+            super().__init__()
+            self.model = model
+
+        def forward(self, input_ids, attention_mask):
+            return self.model(input_ids=input_ids, attention_mask=attention_mask).logits
+
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    model = AutoModelForSequenceClassification.from_pretrained(model_name).eval()
+    max_length = min(tokenizer.model_max_length, 512)
+    _export(_Classifier(model), tokenizer, directory / "model.onnx", "logits", max_length)
+    meta = {
+        "id2label": {str(k): v for k, v in model.config.id2label.items()},
+        "max_length": max_length,
+        "revision": getattr(model.config, "_commit_hash", None),
+    }
+    _save_export(directory, tokenizer, meta, quantize)
+    return _load_cached(directory, quantize, threads)
+
+
+class OnnxSentenceEncoder:
+    """
+    Sentence embeddings through ONNX Runtime
+
+    Mirrors the SentenceTransformer.encode() arguments used by
+    EmbeddingService, so it can stand in for the torch model.
+    """
+
+    def __init__(self, model: OnnxModel, tokenizer):
+        self.model = model
+        self.tokenizer = tokenizer
+        self.max_length = int(model.meta.get("max_length", 128))
+
+    def encode(self, texts: List[str], batch_size: int = 32, normalize_embeddings: bool = False,
+               **kwargs) -> np.ndarray:
+        """Encode texts in length-sorted batches"""
+        if not texts:
+            return np.zeros((0, int(self.model.meta.get("dim", 0))), dtype=np.float32)
+
+        encodings = self.tokenizer(list(texts), truncation=True, max_length=self.max_length)
+        order = np.argsort([len(ids) for ids in encodings["input_ids"]], kind="stable")
+        embeddings = None
+        for start in range(0, len(order), batch_size):
+            batch = order[start:start + batch_size]
+            features = [{key: encodings[key][i] for key in encodings.keys()} for i in batch]
+            outputs = self.model.run(self.tokenizer.pad(features, return_tensors="np"))
+            if embeddings is None:
+                embeddings = np.zeros((len(texts), outputs.shape[1]), dtype=np.float32)
+            embeddings[batch] = outputs
+
+        if normalize_embeddings:
+            embeddings /= np.maximum(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12)
+        return embeddings
+
+
+def load_sentence_encoder(model_name: str, quantize: Optional[bool] = None,
+                          threads: Optional[int] = None,
+                          cache_dir: Optional[Union[str, Path]] = None) -> OnnxSentenceEncoder:
+    """
+    Load a sentence-transformers model through ONNX Runtime
+
+    The transformer and its pooling layers are exported together on first
+    use and cached.
+
+    Args:
+        model_name: sentence-transformers model name or path
+        quantize: Use int8 weights (default from config)
+        threads: Intra-op threads (default from config)
+        cache_dir: Export cache root (default {config.cache_dir}/onnx)
+
+    Returns:
+        Sentence encoder
+    """
+    _require_onnxruntime()
+    quantize = config.inference.quantize if quantize is None else quantize
+    directory = model_cache_dir(model_name, "sentence", cache_dir)
+    loaded = _load_cached(directory, quantize, threads)
+    if loaded is None:
+        import torch
+        from sentence_transformers import SentenceTransformer
+
+        class _Encoder(torch.nn.Module):
+            def __init__(self, model):
+                super().__init__()
+                self.model = model
+
+            def forward(self, input_ids, attention_mask):
+                features = {"input_ids": input_ids, "attention_mask": attention_mask}
+                return self.model(features)["sentence_embedding"]
+
+        model = SentenceTransformer(model_name, device="cpu").eval()
+        max_length = model.max_seq_length
+        _export(_Encoder(model), model.tokenizer, directory / "model.onnx",
+                "sentence_embedding", max_length)
+        auto_model = getattr(model[0], "auto_model", None)
+        meta = {
+            "max_length": max_length,
+            "dim": model.get_sentence_embedding_dimension(),
+            "revision": getattr(getattr(auto_model, "config", None), "_commit_hash", None),
+        }
+        _save_export(directory, model.tokenizer, meta, quantize)
+        loaded = _load_cached(directory, quantize, threads)
+    return OnnxSentenceEncoder(*loaded)
+
+
+def backend_version(model: Any) -> str:
+    """
+    Version tag of a loaded model for the inference cache
+
+    Outputs differ between backends and quantization, so the tag is the
+    backend plus the model revision when it is known.
+    """
+    if isinstance(model, OnnxSentenceEncoder):
+        model = model.model
+    if isinstance(model, OnnxModel):
+        tag = "onnx-int8" if model.path.name.endswith(".int8.onnx") else "onnx"
+        revision = model.meta.get("revision")
+    else:
+        tag = "torch"
+        revision = getattr(getattr(model, "config", None), "_commit_hash", None)
+    return f"{tag}:{revision or 'local'}"
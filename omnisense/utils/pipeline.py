@@ -0,0 +1,202 @@
+"""
+Streaming pipeline for OmniSense
+Connects an async item source to batch stages through bounded queues
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterable, Awaitable, Callable, Dict, List, Optional
+
+from omnisense.config import config
+from omnisense.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+Stage = Callable[[List[Any]], Awaitable[Optional[List[Any]]]]
+
+_END = object()
+
+
+@dataclass
+class StageStats:
+    """Counters for one pipeline stage"""
+    name: str
+    batches: int = 0
+    items_in: int = 0
+    items_out: int = 0
+    seconds: float = 0.0
+    first_output_at: Optional[float] = field(default=None, repr=False)
+
+
+class StreamPipeline:
+    """
+    Bounded-queue streaming pipeline
+
+    Features:
+    - Source items are grouped into micro-batches by size or flush interval
+    - Each stage runs as its own task and reads from a bounded queue, so a
+      slow stage applies backpressure all the way back to the source
+    - Stages receive a batch and return the batch to pass on (None or [] drops it)
+    - A failure in any stage cancels the others and is re-raised from run()
+    """
+
+    def __init__(
+        self,
+        stages: List[tuple],
+        batch_size: Optional[int] = None,
+        queue_size: Optional[int] = None,
+        flush_interval: Optional[float] = None,
+    ):
+        """
+        Initialize pipeline
+
+        Args:
+            stages: List of (name, stage) tuples run in order
+            batch_size: Maximum items per batch (default from config)
+            queue_size: Maximum batches buffered between stages (default from config)
+            flush_interval: Seconds after which a partial batch is flushed (default from config)
+        """
+        self.stages = stages
+        self.batch_size = max(1, batch_size or config.pipeline.batch_size)
+        self.queue_size = max(1, queue_size or config.pipeline.queue_size)
+        self.flush_interval = (
+            config.pipeline.flush_interval if flush_interval is None else flush_interval
+        )
+        self.stats: Dict[str, StageStats] = {
+            name: StageStats(name) for name, _ in stages
+        }
+        self.source_items = 0
+        self._started_at: Optional[float] = None
+
+    async def _pump(self, source: AsyncIterable[Any], items: asyncio.Queue) -> None:
+        """Read the source item by item into a bounded queue"""
+        async for item in source:
+            self.source_items += 1
+            await items.put(item)
+        await items.put(_END)
+
+    async def _batch(self, items: asyncio.Queue, queue: asyncio.Queue) -> None:
+        """Group source items into micro-batches for the first stage"""
+        batch: List[Any] = []
+        deadline = None
+        # The pending get survives flush timeouts, so no item is lost and a
+        # cancellation is never swallowed (unlike asyncio.wait_for on 3.11)
+        getter: Optional[asyncio.Future] = None
+
+        try:
+            while True:
+                if getter is None:
+                    getter = asyncio.ensure_future(items.get())
+                timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+                done, _ = await asyncio.wait({getter}, timeout=timeout)
+                if not done:
+                    # Slow source: flush what we have so downstream is not idle
+                    await queue.put(batch)
+                    batch, deadline = [], None
+                    continue
+
+                item, getter = getter.result(), None
+                if item is _END:
+                    break
+                batch.append(item)
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+                if len(batch) >= self.batch_size:
+                    await queue.put(batch)
+                    batch, deadline = [], None
+        finally:
+            if getter is not None:
+                getter.cancel()
+
+        if batch:
+            await queue.put(batch)
+        await queue.put(_END)
+
+    async def _run_stage(
+        self,
+        name: str,
+        stage: Stage,
+        inbox: asyncio.Queue,
+        outbox: Optional[asyncio.Queue],
+    ) -> None:
+        """Run one stage until the end marker arrives"""
+        stats = self.stats[name]
+        while True:
+            batch = await inbox.get()
+            if batch is _END:
+                if outbox is not None:
+                    await outbox.put(_END)
+                return
+
+            started = time.monotonic()
+            result = await stage(batch)
+            stats.seconds += time.monotonic() - started
+            stats.batches += 1
+            stats.items_in += len(batch)
+
+            if not result:
+                continue
+            stats.items_out += len(result)
+            if stats.first_output_at is None:
+                stats.first_output_at = time.monotonic() - self._started_at
+            if outbox is not None:
+                await outbox.put(result)
+
+    async def run(self, source: AsyncIterable[Any]) -> Dict[str, Any]:
+        """
+        Run the pipeline until the source is exhausted
+
+        Args:
+            source: Async iterable of items
+
+        Returns:
+            Pipeline statistics
+        """
+        self._started_at = time.monotonic()
+        queues = [asyncio.Queue(maxsize=self.queue_size) for _ in self.stages]
+        items: asyncio.Queue = asyncio.Queue(maxsize=self.batch_size)
+
+        tasks = [
+            asyncio.create_task(self._pump(source, items)),
+            asyncio.create_task(self._batch(items, queues[0])),
+        ]
+        for i, (name, stage) in enumerate(self.stages):
+            outbox = queues[i + 1] if i + 1 < len(queues) else None
+            tasks.append(asyncio.create_task(self._run_stage(name, stage, queues[i], outbox)))
+
+        try:
+            # Surface the first failure instead of waiting on a stalled queue
+            done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+            for task in done:
+                if task.exception() is not None:
+                    raise task.exception()
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        stats = self.get_stats()
+        logger.debug(
+            f"Pipeline finished: {self.source_items} items in {stats['elapsed']:.2f}s"
+        )
+        return stats
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pipeline statistics"""
+        elapsed = time.monotonic() - self._started_at if self._started_at else 0.0
+        return {
+            "source_items": self.source_items,
+            "elapsed": elapsed,
+            "stages": {
+                name: {
+                    "batches": s.batches,
+                    "items_in": s.items_in,
+                    "items_out": s.items_out,
+                    "seconds": s.seconds,
+                    "first_output_at": s.first_output_at,
+                }
+                for name, s in self.stats.items()
+            },
+        }
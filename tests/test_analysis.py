@@ -0,0 +1,383 @@
+"""
+Tests for the analysis engine
+Tests batched sentiment inference
+"""
+
+import pytest
+
+torch = pytest.importorskip("torch")
+transformers = pytest.importorskip("transformers")
+tokenizers = pytest.importorskip("tokenizers")
+
+from omnisense.analysis.engine import AnalysisEngine, SentimentAnalyzer
+from omnisense.analysis.executor import AnalysisExecutor
+from omnisense.utils.inference_cache import InferenceCache
+
+WORDS = ["[PAD]", "[UNK]", "good", "bad", "great", "awful", "movie", "food", "the", "was"]
+
+
+def _tiny_model():
+    """A randomly initialized 3-label BERT and a word-level tokenizer"""
+    vocab = {word: i for i, word in enumerate(WORDS)}
+    backend = tokenizers.Tokenizer(tokenizers.models.WordLevel(vocab, unk_token="[UNK]"))
+    backend.pre_tokenizer = tokenizers.pre_tokenizers.Whitespace()
+    tokenizer = transformers.PreTrainedTokenizerFast(
+        tokenizer_object=backend, pad_token="[PAD]", unk_token="[UNK]"
+    )
+
+    torch.manual_seed(0)
+    model = transformers.BertForSequenceClassification(transformers.BertConfig(
+        vocab_size=len(WORDS), hidden_size=16, num_hidden_layers=1, num_attention_heads=2,
+        intermediate_size=32, num_labels=3,
+        id2label={0: "negative", 1: "neutral", 2: "positive"},
+        label2id={"negative": 0, "neutral": 1, "positive": 2},
+    ))
+    model.eval()
+    return tokenizer, model
+
+
+class CountingModel(torch.nn.Module):
+    """Wraps a model and records the batch shape of every call"""
+
+    def __init__(self, model):
+        super().__init__()
+        self.inner = model
+        self.config = model.config
+        self.shapes = []
+
+    def forward(self, **inputs):
+        self.shapes.append(tuple(inputs["input_ids"].shape))
+        return self.inner(**inputs)
+
+
+@pytest.fixture
+def analyzer(monkeypatch):
+    """Sentiment analyzer backed by a tiny local model"""
+    monkeypatch.setattr(SentimentAnalyzer, "_load_model", lambda self: None)
+    analyzer = SentimentAnalyzer(
+        batch_size=2, cache=InferenceCache(memory_items=0, persistent=False)
+    )
+    analyzer.tokenizer, model = _tiny_model()
+    analyzer.model = CountingModel(model)
+    return analyzer
+
+
+class TestSentimentAnalyzer:
+    """Test batched sentiment inference"""
+
+    def test_batched_matches_single(self, analyzer):
+        """Test padding and batching do not change any prediction"""
+        texts = ["good movie", "the food was awful awful awful", "bad", "great great food"]
+        batched = analyzer.analyze_batch(texts)
+        single = [analyzer.analyze(text) for text in texts]
+
+        for b, s in zip(batched, single):
+            assert b["label"] == s["label"]
+            assert b["polarity"] == s["polarity"]
+            assert b["score"] == pytest.approx(s["score"], abs=1e-5)
+
+    def test_length_bucketed_batches(self, analyzer):
+        """Test texts are sorted by length so each batch pads to its own longest text"""
+        texts = ["good " * 8, "bad", "great " * 8, "food"]
+        analyzer.analyze_batch(texts)
+
+        assert analyzer.model.shapes == [(2, 1), (2, 8)]
+
+    def test_duplicates_and_empty_texts(self, analyzer):
+        """Test identical texts are inferred once and empty texts skip the model"""
+        results = analyzer.analyze_batch(["good movie", "", "good movie", "good movie"])
+
+        assert analyzer.model.shapes == [(1, 2)]
+        assert results[1] == {"label": "neutral", "score": 0.0}
+        assert results[0] == results[2] == results[3]
+        assert results[0] is not results[2]
+
+    def test_cached_predictions(self, analyzer, temp_dir):
+        """Test texts analyzed in an earlier run do not reach the model again"""
+        analyzer.cache = InferenceCache(path=temp_dir / "cache.db")
+        first = analyzer.analyze_batch(["good movie", "bad food"])
+
+        analyzer.cache = InferenceCache(path=temp_dir / "cache.db")
+        second = analyzer.analyze_batch(["bad food", "great", "good movie"])
+
+        assert analyzer.model.shapes == [(2, 2), (1, 1)]
+        assert second[0] == first[1] and second[2] == first[0]
+        assert analyzer.cache.get_stats()["disk_hits"] == 2
+
+    def test_without_model(self, analyzer):
+        """Test every text is neutral when the model failed to load"""
+        analyzer.model = None
+
+        assert analyzer.analyze_batch(["good", "bad"]) == [{"label": "neutral", "score": 0.0}] * 2
+
+    @pytest.mark.asyncio
+    async def test_engine_annotates_items(self, analyzer):
+        """Test the engine runs batched sentiment and annotates items"""
+        engine = AnalysisEngine.__new__(AnalysisEngine)
+        engine.sentiment_analyzer = analyzer
+        engine.executor = AnalysisExecutor(mode="inline")
+        data = [{"title": "good movie"}, {"title": "bad food"}, {"title": "good movie"}]
+
+        results = await engine.analyze(data, analysis_types=["sentiment"])
+
+        assert sum(results["sentiment"]["distribution"].values()) == 3
+        assert data[0]["sentiment"] == data[2]["sentiment"]
+        assert len(analyzer.model.shapes) == 1
+
+
+@pytest.fixture
+def saved_model(temp_dir):
+    """The tiny classifier and its tokenizer saved as a local model directory"""
+    tokenizer, model = _tiny_model()
+    path = temp_dir / "tiny-classifier"
+    tokenizer.save_pretrained(str(path))
+    model.save_pretrained(str(path))
+    return path, tokenizer, model
+
+
+class TestOnnxBackend:
+    """Test ONNX Runtime parity with the torch models"""
+
+    TEXTS = ["good movie", "the food was awful awful awful", "bad", "great great food"]
+
+    @pytest.fixture(autouse=True)
+    def _onnx(self):
+        pytest.importorskip("onnxruntime")
+        pytest.importorskip("onnx")
+
+    def test_classifier_parity(self, saved_model, temp_dir):
+        """Test exported logits match torch, in fp32 and close in int8"""
+        from omnisense.utils.onnx_backend import load_sequence_classifier
+
+        path, tokenizer, model = saved_model
+        inputs = tokenizer(self.TEXTS, padding=True, return_tensors="pt")
+        with torch.inference_mode():
+            expected = model(**inputs).logits.numpy()
+
+        fp32, _ = load_sequence_classifier(str(path), quantize=False, cache_dir=temp_dir / "onnx")
+        int8, _ = load_sequence_classifier(str(path), quantize=True, cache_dir=temp_dir / "onnx")
+        numpy_inputs = {key: value.numpy() for key, value in inputs.items()}
+
+        assert fp32.run(numpy_inputs) == pytest.approx(expected, abs=1e-4)
+        assert int8.run(numpy_inputs) == pytest.approx(expected, abs=0.1)
+        assert int8.path.stat().st_size < fp32.path.stat().st_size
+        assert fp32.meta["id2label"]["2"] == "positive"
+
+    def test_export_cached(self, saved_model, temp_dir, monkeypatch):
+        """Test a cached export is loaded without touching the torch model"""
+        from omnisense.utils.onnx_backend import load_sequence_classifier
+
+        path = saved_model[0]
+        load_sequence_classifier(str(path), quantize=False, cache_dir=temp_dir / "onnx")
+
+        def fail(*args, **kwargs):
+            raise AssertionError("torch model loaded again")
+
+        monkeypatch.setattr(
+            transformers.AutoModelForSequenceClassification, "from_pretrained", fail
+        )
+        model, tokenizer = load_sequence_classifier(
+            str(path), quantize=False, cache_dir=temp_dir / "onnx"
+        )
+        assert model.run(tokenizer(["good"], return_tensors="np")).shape == (1, 3)
+
+    def test_analyzer_parity(self, analyzer, saved_model, temp_dir):
+        """Test the analyzer gives the same sentiment on either backend"""
+        from omnisense.utils.onnx_backend import load_sequence_classifier
+
+        expected = analyzer.analyze_batch(self.TEXTS)
+        analyzer.model, analyzer.tokenizer = load_sequence_classifier(
+            str(saved_model[0]), quantize=False, cache_dir=temp_dir / "onnx"
+        )
+        results = analyzer.analyze_batch(self.TEXTS)
+
+        assert [r["label"] for r in results] == [r["label"] for r in expected]
+        assert [r["score"] for r in results] == pytest.approx([r["score"] for r in expected], abs=1e-4)
+
+    def test_sentence_encoder_parity(self, saved_model, temp_dir):
+        """Test exported sentence embeddings match SentenceTransformer.encode"""
+        st = pytest.importorskip("sentence_transformers")
+        from omnisense.utils.onnx_backend import load_sentence_encoder
+
+        encoder_path = temp_dir / "tiny-encoder"
+        transformer = st.models.Transformer(str(saved_model[0]))
+        pooling = st.models.Pooling(transformer.get_word_embedding_dimension())
+        st.SentenceTransformer(modules=[transformer, pooling]).save(str(encoder_path))
+        expected = st.SentenceTransformer(str(encoder_path)).encode(
+            self.TEXTS, normalize_embeddings=True
+        )
+
+        encoder = load_sentence_encoder(str(encoder_path), quantize=False,
+                                        cache_dir=temp_dir / "onnx")
+        result = encoder.encode(self.TEXTS, batch_size=3, normalize_embeddings=True)
+
+        assert result.shape == expected.shape
+        assert result == pytest.approx(expected, abs=1e-4)
+
+
+class TestTopicClusterer:
+    """Test tokenization and incremental topic clustering"""
+
+    SPORTS = ["football match goal striker", "striker scored goal football",
+              "football league match tonight", "goal keeper football save"]
+    COOKING = ["pasta recipe garlic sauce", "garlic butter sauce recipe",
+               "tomato pasta sauce recipe", "recipe baking bread oven"]
+
+    def test_tokenize_mixed_scripts(self):
+        """Test Chinese runs are segmented and stop words dropped"""
+        from omnisense.analysis.engine import tokenize
+
+        terms = tokenize("The iPhone 评测 视频 真的 很好看 and the camera")
+
+        assert "iphone" in terms and "camera" in terms
+        assert "the" not in terms and "and" not in terms
+        assert "评测" in terms
+        assert "真的" not in terms
+        assert all(len(term) > 1 for term in terms)
+
+    def test_batch_cluster_chinese(self):
+        """Test batch clustering gives keywords for Chinese text"""
+        from omnisense.analysis.engine import TopicClusterer
+
+        clusterer = TopicClusterer(n_clusters=2, state_dir="unused")
+        texts = ["足球比赛进球", "足球联赛比赛", "篮球比赛得分", "红烧肉做法", "红烧肉菜谱做法", "蛋糕菜谱"]
+        labels, topics = clusterer.cluster(texts)
+
+        assert len(labels) == len(texts) and len(topics) == 2
+        assert any(ord(ch) > 0x4e00 for ch in "".join(topics))
+
+    def test_incremental_updates_and_persists(self, temp_dir):
+        """Test later batches are assigned to the persisted topics without refitting"""
+        from omnisense.analysis.engine import TopicClusterer
+
+        clusterer = TopicClusterer(n_clusters=2, state_dir=temp_dir)
+        labels, topics = clusterer.cluster_incremental(self.SPORTS + self.COOKING, key="demo")
+
+        assert len(set(labels[:4])) == 1 and len(set(labels[4:])) == 1
+        assert labels[0] != labels[4]
+        assert (temp_dir / "demo.topics.pkl").exists()
+
+        reloaded = TopicClusterer(n_clusters=2, state_dir=temp_dir)
+        new_labels, new_topics = reloaded.cluster_incremental(
+            ["football goal tonight", "garlic pasta recipe"], key="demo"
+        )
+
+        assert new_labels[0] == labels[0] and new_labels[1] == labels[4]
+        assert "football" in new_topics[labels[0]]
+        assert "recipe" in new_topics[labels[4]]
+        assert reloaded._get_state("demo")["seen"] == 10
+
+    def test_incremental_concurrent_updates(self, temp_dir):
+        """Test concurrent batches of one key are all counted and saved"""
+        from concurrent.futures import ThreadPoolExecutor
+        from omnisense.analysis.engine import TopicClusterer
+
+        clusterer = TopicClusterer(n_clusters=2, state_dir=temp_dir)
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(lambda _: clusterer.cluster_incremental(self.SPORTS + self.COOKING, key="demo"),
+                          range(16)))
+
+        assert clusterer._get_state("demo")["seen"] == 16 * 8
+        assert TopicClusterer(n_clusters=2, state_dir=temp_dir)._get_state("demo")["seen"] == 16 * 8
+        assert not list(temp_dir.glob("*.tmp"))
+
+    def test_incremental_needs_k_texts_to_start(self, temp_dir):
+        """Test a new key is not started from fewer texts than topics"""
+        from omnisense.analysis.engine import TopicClusterer
+
+        clusterer = TopicClusterer(n_clusters=3, state_dir=temp_dir)
+        labels, topics = clusterer.cluster_incremental(["one text", "two texts"], key="new")
+
+        assert list(labels) == [0, 0] and topics == []
+        assert not (temp_dir / "new.topics.pkl").exists()
+
+    @pytest.mark.asyncio
+    async def test_engine_topic_key(self, temp_dir):
+        """Test the engine clusters incrementally when given a topic key"""
+        from omnisense.analysis.engine import TopicClusterer
+
+        engine = AnalysisEngine.__new__(AnalysisEngine)
+        engine.topic_clusterer = TopicClusterer(n_clusters=2, state_dir=temp_dir)
+        engine.executor = AnalysisExecutor(mode="inline")
+        data = [{"title": text} for text in self.SPORTS + self.COOKING]
+
+        results = await engine.analyze(data, analysis_types=["clustering"], topic_key="demo")
+        more = await engine.analyze([{"title": "striker goal"}], analysis_types=["clustering"],
+                                    topic_key="demo")
+
+        assert results["clusters"]["n_clusters"] == 2
+        assert more["clusters"]["distribution"] == {data[0]["cluster"]: 1}
+
+
+def _scale(array, factor):
+    """Module-level so process workers can unpickle it"""
+    return array * factor, array.sum()
+
+
+class TestAnalysisExecutor:
+    """Test offloading CPU-bound analysis steps"""
+
+    def test_pack_texts_round_trip(self):
+        """Test texts survive packing into shared-memory arrays"""
+        from omnisense.analysis.executor import pack_texts, unpack_texts
+
+        texts = ["football match", "", "足球比赛 😀", "recipe"]
+        data, offsets = pack_texts(texts)
+
+        assert data.dtype.name == "uint8" and len(offsets) == len(texts) + 1
+        assert unpack_texts(data, offsets) == texts
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("mode", ["inline", "thread"])
+    async def test_local_modes(self, mode):
+        """Test inline and thread modes return the function result"""
+        import numpy as np
+
+        executor = AnalysisExecutor(mode=mode)
+        scaled, total = await executor.run(_scale, np.arange(4), 2)
+
+        assert list(scaled) == [0, 2, 4, 6] and total == 6
+        assert await executor.run_thread(sum, [1, 2]) == 3
+
+    def test_unknown_mode(self):
+        """Test an unknown mode is rejected"""
+        with pytest.raises(ValueError):
+            AnalysisExecutor(mode="gpu")
+
+    @pytest.mark.asyncio
+    async def test_process_shared_memory(self):
+        """Test large arrays travel both ways through shared memory"""
+        import numpy as np
+
+        executor = AnalysisExecutor(mode="process", workers=1, start_method="fork",
+                                    shared_memory_min_bytes=1024)
+        try:
+            array = np.arange(10_000, dtype=np.float64)
+            scaled, total = await executor.run(_scale, array, 3)
+            small, _ = await executor.run(_scale, np.arange(3), 3)
+        finally:
+            executor.shutdown()
+
+        assert scaled == pytest.approx(array * 3) and total == array.sum()
+        assert list(small) == [0, 3, 6]
+
+    @pytest.mark.asyncio
+    async def test_engine_clusters_in_worker(self):
+        """Test batch clustering runs in the process pool"""
+        from omnisense.analysis.engine import TopicClusterer
+
+        executor = AnalysisExecutor(mode="process", workers=1, start_method="fork")
+        engine = AnalysisEngine.__new__(AnalysisEngine)
+        engine.topic_clusterer = TopicClusterer(n_clusters=2, state_dir="unused")
+        engine.executor = executor
+        data = [{"title": text} for text in TestTopicClusterer.SPORTS + TestTopicClusterer.COOKING]
+        try:
+            results = await engine.analyze(data, analysis_types=["clustering"])
+            await engine.close()
+            # The executor is shared, closing the engine leaves it running
+            assert executor._pool is not None
+        finally:
+            executor.shutdown()
+
+        assert results["clusters"]["n_clusters"] == 2
+        assert data[0]["cluster"] == data[1]["cluster"] != data[4]["cluster"]
@@ -125,6 +125,31 @@ class TestCollectionOperations:
 
         config.database.sqlite_path = original_path
 
+    @pytest.mark.asyncio
+    async def test_batches_keep_collection_row(self, temp_dir, sample_content_data):
+        """Test saving later batches under one collection ID keeps its row"""
+        from omnisense.config import config
+        original_path = config.database.sqlite_path
+
+        config.database.sqlite_path = str(temp_dir / "test.db")
+        db = DatabaseManager()
+
+        await db.save_collection(platform="douyin", data=sample_content_data[:1],
+                                 collection_id="stream", keyword="a")
+        with sqlite3.connect(config.database.sqlite_path) as conn:
+            conn.execute("UPDATE collections SET created_at = '2024-01-01 00:00:00'")
+            first = conn.execute("SELECT id FROM collections").fetchone()
+        await db.save_collection(platform="douyin", data=sample_content_data[1:],
+                                 collection_id="stream", keyword="a")
+
+        with sqlite3.connect(config.database.sqlite_path) as conn:
+            rows = conn.execute("SELECT id, created_at FROM collections").fetchall()
+        assert rows == [(first[0], "2024-01-01 00:00:00")]
+        assert (await db.get_collection("stream"))["count"] == len(sample_content_data)
+
+        await db.close()
+        config.database.sqlite_path = original_path
+
     @pytest.mark.asyncio
     async def test_collection_not_found(self, temp_dir):
         """Test retrieving non-existent collection"""
@@ -235,6 +260,107 @@ class TestContentOperations:
         config.database.sqlite_path = original_path
 
 
+class TestFullTextSearch:
+    """Test FTS5 content search"""
+
+    @pytest.mark.asyncio
+    async def test_chinese_keyword_ranked_with_snippet(self, temp_dir):
+        """Test CJK substrings match and results carry rank and snippet"""
+        from omnisense.config import config
+        original_path = config.database.sqlite_path
+
+        config.database.sqlite_path = str(temp_dir / "test.db")
+        db = DatabaseManager()
+
+        await db.save_collection(platform="douyin", data=[
+            {"content_id": "1", "title": "人工智能改变世界", "description": "人工智能的发展"},
+            {"content_id": "2", "title": "美食推荐", "description": "介绍人工智能"},
+            {"content_id": "3", "title": "旅行日记", "description": "风景"},
+        ])
+
+        results = await db.search_content(keyword="人工智能")
+
+        assert [r["content_id"] for r in results] == ["1", "2"]
+        assert "[人工智能]" in results[0]["snippet"]
+        assert results[0]["rank"] <= results[1]["rank"]
+
+        await db.close()
+        config.database.sqlite_path = original_path
+
+    @pytest.mark.asyncio
+    async def test_interaction_text_and_replace_sync(self, temp_dir, sample_interactions):
+        """Test interaction text is searchable and re-saved rows are not duplicated"""
+        from omnisense.config import config
+        original_path = config.database.sqlite_path
+
+        config.database.sqlite_path = str(temp_dir / "test.db")
+        db = DatabaseManager()
+
+        data = [{"content_id": "1", "title": "Test", "interactions": sample_interactions}]
+        await db.save_collection(platform="douyin", data=data)
+        await db.save_collection(platform="douyin", data=data)
+
+        results = await db.search_content(keyword="Great content")
+        assert [r["content_id"] for r in results] == ["1"]
+
+        await db.save_collection(platform="douyin", data=[{"content_id": "1", "title": "Renamed"}])
+        assert await db.search_content(keyword="Renamed") != []
+
+        await db.close()
+        config.database.sqlite_path = original_path
+
+    @pytest.mark.asyncio
+    async def test_filters(self, temp_dir, sample_content_data):
+        """Test platform, time range and engagement filters"""
+        from omnisense.config import config
+        original_path = config.database.sqlite_path
+
+        config.database.sqlite_path = str(temp_dir / "test.db")
+        db = DatabaseManager()
+        await db.save_collection(platform="douyin", data=sample_content_data)
+
+        results = await db.search_content(keyword="video", min_likes=150)
+        assert [r["content_id"] for r in results] == ["test_002"]
+
+        results = await db.search_content(end_time="2024-01-01 23:59:59")
+        assert [r["content_id"] for r in results] == ["test_001"]
+
+        assert await db.search_content(keyword="video", platform="weibo") == []
+
+        await db.close()
+        config.database.sqlite_path = original_path
+
+    @pytest.mark.asyncio
+    async def test_short_chinese_keyword_uses_index(self, temp_dir):
+        """Test one and two character CJK terms are matched through the index"""
+        from omnisense.config import config
+        original_path = config.database.sqlite_path
+
+        config.database.sqlite_path = str(temp_dir / "test.db")
+        db = DatabaseManager()
+        await db.save_collection(platform="douyin", data=[
+            {"content_id": "1", "title": "美食推荐", "description": "红烧肉的做法"},
+            {"content_id": "2", "title": "周末去哪", "tags": ["旅游", "AI"],
+             "interactions": [{"interaction_id": "c1", "text": "这款手机不错"}]},
+            {"content_id": "3", "title": "美丽风景", "description": "食物"},
+        ])
+
+        results = await db.search_content(keyword="美食")
+        assert [r["content_id"] for r in results] == ["1"]
+        assert "[美食]推荐" in results[0]["snippet"]
+
+        assert [r["content_id"] for r in await db.search_content(keyword="旅游 AI")] == ["2"]
+        assert [r["content_id"] for r in await db.search_content(keyword="手机")] == ["2"]
+        assert {r["content_id"] for r in await db.search_content(keyword="美")} == {"1", "3"}
+        assert await db.search_content(keyword="食推荐 美丽") == []
+
+        await db.save_collection(platform="douyin", data=[{"content_id": "1", "title": "旅行"}])
+        assert await db.search_content(keyword="美食") == []
+
+        await db.close()
+        config.database.sqlite_path = original_path
+
+
 class TestStatistics:
     """Test statistics operations"""
 
@@ -321,6 +447,31 @@ class TestInteractions:
         config.database.sqlite_path = original_path
 
 
+    @pytest.mark.asyncio
+    async def test_interactions_not_duplicated_in_raw_data(self, temp_dir, sample_interactions):
+        """Test content raw_data does not embed the interactions"""
+        import json
+        from omnisense.config import config
+        original_path = config.database.sqlite_path
+
+        db_path = temp_dir / "test.db"
+        config.database.sqlite_path = str(db_path)
+        db = DatabaseManager()
+
+        await db.save_collection(
+            platform="douyin",
+            data=[{"content_id": "test_001", "interactions": sample_interactions}],
+        )
+
+        conn = sqlite3.connect(str(db_path))
+        raw = json.loads(conn.execute("SELECT raw_data FROM content").fetchone()[0])
+        conn.close()
+
+        assert raw == {"content_id": "test_001"}
+
+        config.database.sqlite_path = original_path
+
+
 class TestDatabasePerformance:
     """Test database performance"""
 
@@ -348,6 +499,31 @@ class TestDatabasePerformance:
 
         config.database.sqlite_path = original_path
 
+    @pytest.mark.asyncio
+    async def test_batched_insert(self, temp_dir):
+        """Test batches smaller than the data set write every row in WAL mode"""
+        from omnisense.config import config
+        from tests.conftest import generate_mock_content
+
+        original_path = config.database.sqlite_path
+        original_batch = config.database.write_batch_size
+        db_path = temp_dir / "test.db"
+        config.database.sqlite_path = str(db_path)
+        config.database.write_batch_size = 7
+        db = DatabaseManager()
+
+        await db.save_collection(platform="douyin", data=generate_mock_content(50, "douyin"))
+
+        stats = await db.get_statistics()
+        assert stats["total_content"] == 50
+
+        conn = sqlite3.connect(str(db_path))
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        conn.close()
+
+        config.database.write_batch_size = original_batch
+        config.database.sqlite_path = original_path
+
     @pytest.mark.asyncio
     async def test_search_performance(self, temp_dir, performance_tracker):
         """Test search performance"""
@@ -376,6 +552,157 @@ class TestDatabasePerformance:
         config.database.sqlite_path = original_path
 
 
+class TestConnectionPool:
+    """Test pooled SQLite connections"""
+
+    @pytest.mark.asyncio
+    async def test_connections_reused(self, temp_dir, sample_content_data):
+        """Test repeated calls share the pooled connections"""
+        from omnisense.config import config
+        original_path = config.database.sqlite_path
+
+        config.database.sqlite_path = str(temp_dir / "test.db")
+        db = DatabaseManager()
+
+        await db.save_collection(platform="douyin", data=sample_content_data)
+        writer = db.pool._writer
+        await db.save_collection(platform="douyin", data=sample_content_data)
+        await db.search_content(platform="douyin")
+
+        assert db.pool._writer is writer
+        assert db.pool._idle_readers.qsize() == db.pool.readers
+
+        await db.close()
+        config.database.sqlite_path = original_path
+
+    @pytest.mark.asyncio
+    async def test_reads_not_blocked_by_write(self, temp_dir, sample_content_data):
+        """Test readers see committed rows while a write transaction is open"""
+        from omnisense.config import config
+        original_path = config.database.sqlite_path
+
+        config.database.sqlite_path = str(temp_dir / "test.db")
+        db = DatabaseManager()
+        await db.save_collection(platform="douyin", data=sample_content_data)
+
+        async with db.pool.writer() as writer:
+            await writer.execute("DELETE FROM content")
+            results = await asyncio.wait_for(db.search_content(platform="douyin"), timeout=2)
+            assert len(results) == len(sample_content_data)
+
+        assert await db.search_content(platform="douyin") == []
+
+        await db.close()
+        config.database.sqlite_path = original_path
+
+    @pytest.mark.asyncio
+    async def test_close_drains_and_reopens(self, temp_dir, sample_content_data):
+        """Test close() waits for leased readers and the pool reopens on demand"""
+        from omnisense.config import config
+        original_path = config.database.sqlite_path
+
+        config.database.sqlite_path = str(temp_dir / "test.db")
+        db = DatabaseManager()
+        await db.save_collection(platform="douyin", data=sample_content_data)
+
+        async with db.pool.reader():
+            closing = asyncio.create_task(db.close())
+            await asyncio.sleep(0.05)
+            assert not closing.done()
+        await closing
+        assert not db.pool.is_open
+
+        stats = await db.get_statistics()
+        assert stats["total_content"] == len(sample_content_data)
+
+        await db.close()
+        config.database.sqlite_path = original_path
+
+
+class TestParquetExport:
+    """Test columnar Parquet export"""
+
+    @pytest.mark.asyncio
+    async def test_export_partitions_and_flattens_stats(self, temp_dir, sample_content_data):
+        """Test export writes platform/date partitions with typed stat columns"""
+        pytest.importorskip("pyarrow")
+        from omnisense.config import config
+        original_path = config.database.sqlite_path
+
+        config.database.sqlite_path = str(temp_dir / "test.db")
+        db = DatabaseManager()
+        await db.save_collection(platform="douyin", data=sample_content_data)
+
+        written = await db.export_parquet(output_dir=temp_dir / "parquet")
+
+        assert written == len(sample_content_data)
+        assert (temp_dir / "parquet" / "platform=douyin" / "date=2024-01-01").is_dir()
+
+        table = db.load_arrow(platform="douyin", start_date="2024-01-02",
+                              output_dir=temp_dir / "parquet")
+        assert table.column("content_id").to_pylist() == ["test_002"]
+        assert table.column("like_count").to_pylist() == [200]
+        assert table.column("tags").to_pylist() == [["test", "sample"]]
+
+        await db.close()
+        config.database.sqlite_path = original_path
+
+    @pytest.mark.asyncio
+    async def test_append_on_save(self, temp_dir, sample_content_data):
+        """Test saved collections are appended and re-collected items read once, latest first"""
+        pytest.importorskip("pyarrow")
+        from omnisense.config import config
+        from omnisense.analysis.engine import TrendAnalyzer
+        from omnisense.storage import columnar
+        original_path = config.database.sqlite_path
+        original_parquet = config.database.parquet_path
+
+        config.database.sqlite_path = str(temp_dir / "test.db")
+        config.database.parquet_path = str(temp_dir / "parquet")
+        config.database.parquet_append = True
+        try:
+            db = DatabaseManager()
+            await db.save_collection(platform="douyin", data=sample_content_data,
+                                     collection_id="c1")
+            recollected = [{**item, "stats": {**item["stats"], "likes": 999}}
+                           for item in sample_content_data]
+            await db.save_collection(platform="douyin", data=recollected,
+                                     collection_id="c2")
+
+            table = db.load_arrow()
+            assert table.num_rows == len(sample_content_data)
+            assert set(table.column("collection_id").to_pylist()) == {"c2"}
+            assert set(table.column("like_count").to_pylist()) == {999}
+            assert db.load_arrow(columns=["like_count"]).column_names == ["like_count"]
+            assert columnar.read_dataset(temp_dir / "parquet", latest=False).num_rows == \
+                2 * len(sample_content_data)
+
+            trend = TrendAnalyzer().analyze_trend(table)
+            assert trend["total_items"] == table.num_rows
+            assert trend["value_stats"]["max"] == 2000
+            assert trend["direction"] == "up"
+        finally:
+            config.database.parquet_append = False
+            config.database.parquet_path = original_parquet
+            config.database.sqlite_path = original_path
+        await db.close()
+
+
+    def test_append_same_name_keeps_rows(self, temp_dir, sample_content_data):
+        """Test repeated appends under one name, like streamed batches, do not overwrite"""
+        pytest.importorskip("pyarrow")
+        from omnisense.storage import columnar
+
+        for batch in range(3):
+            table = columnar.rows_to_table(
+                [{**item, "platform": "douyin", "content_id": f"{item['content_id']}-{batch}"}
+                 for item in sample_content_data]
+            )
+            columnar.append_dataset(table, temp_dir / "parquet", "c1")
+
+        assert columnar.read_dataset(temp_dir / "parquet").num_rows == 3 * table.num_rows
+
+
 class TestDatabaseEdgeCases:
     """Test edge cases and error handling"""
 
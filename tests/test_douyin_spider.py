@@ -252,6 +252,52 @@ class TestDouyinSpider:
         is_logged_in = await spider._check_login_status()
         assert is_logged_in is False
 
+    def test_convert_search_response(self):
+        """Test converting a captured search API payload"""
+        spider = DouyinSpider(headless=True)
+        payload = {
+            'data': [
+                {'type': 1, 'aweme_info': {
+                    'aweme_id': '7123456789012345678',
+                    'desc': '测试视频 #美食',
+                    'create_time': 1700000000,
+                    'author': {'sec_uid': 'MS4wLjABAAAAtest', 'nickname': 'tester'},
+                    'statistics': {'digg_count': 10, 'comment_count': 2, 'play_count': 100},
+                    'video': {'duration': 15000, 'cover': {'url_list': ['https://cover']}},
+                    'text_extra': [{'hashtag_name': '美食'}],
+                }},
+                {'type': 16, 'user_list': []},
+            ]
+        }
+
+        videos = spider.convert_response('search', payload)
+
+        assert len(videos) == 1
+        video = videos[0]
+        assert video['content_id'] == '7123456789012345678'
+        assert video['like_count'] == 10
+        assert video['view_count'] == 100
+        assert video['duration'] == 15
+        assert video['hashtags'] == ['美食']
+        assert video['author']['user_id'] == 'MS4wLjABAAAAtest'
+        assert video['cover_image'] == 'https://cover'
+
+    def test_convert_comment_response(self):
+        """Test converting a captured comment API payload"""
+        spider = DouyinSpider(headless=True)
+        payload = {'comments': [{
+            'cid': '123', 'text': '好看', 'digg_count': 5, 'reply_comment_total': 1,
+            'create_time': 1700000000, 'ip_label': '北京',
+            'user': {'nickname': 'fan', 'sec_uid': 'abc'},
+        }]}
+
+        comments = spider.convert_response('comments', payload)
+
+        assert comments[0]['comment_id'] == '123'
+        assert comments[0]['text'] == '好看'
+        assert comments[0]['like_count'] == 5
+        assert comments[0]['ip_location'] == '北京'
+
 
 class TestConvenienceFunctions:
     """Test convenience functions"""
@@ -0,0 +1,87 @@
+"""
+Tests for the inference cache
+Tests the in-process and persistent tiers, eviction and counters
+"""
+
+import numpy as np
+import pytest
+
+from omnisense.utils.inference_cache import InferenceCache, normalize_text
+
+
+@pytest.fixture
+def cache(temp_dir):
+    """Cache with a persistent tier in a temporary directory"""
+    cache = InferenceCache(path=temp_dir / "inference.db", memory_items=100, max_mb=1)
+    yield cache
+    cache.close()
+
+
+class TestInferenceCache:
+    """Test the two-tier inference cache"""
+
+    def test_get_or_compute(self, cache):
+        """Test only distinct misses are computed"""
+        calls = []
+
+        def compute(texts):
+            calls.append(list(texts))
+            return [len(text) for text in texts]
+
+        assert cache.get_or_compute("m", "v1", ["ab", "abc", "ab"], compute) == [2, 3, 2]
+        assert cache.get_or_compute("m", "v1", ["abc", "abcd"], compute) == [3, 4]
+
+        assert calls == [["ab", "abc"], ["abcd"]]
+        stats = cache.get_stats()
+        assert stats["memory_hits"] == 1
+        assert stats["misses"] == 4
+
+    def test_keys(self, cache):
+        """Test normalized text shares a key, but model and version do not"""
+        cache.put_many("m", "v1", ["Hello   world"], [1])
+
+        assert normalize_text("Ｈello\n world ") == "Hello world"
+        assert cache.get_many("m", "v1", ["Hello world", "Ｈello world"]) == [1, 1]
+        assert cache.get_many("m", "v2", ["Hello world"]) == [None]
+        assert cache.get_many("other", "v1", ["Hello world"]) == [None]
+        assert cache.get_many("m", "v1", ["Hello  world"], normalize=False) == [None]
+
+    def test_persistent_tier(self, cache, temp_dir):
+        """Test outputs survive a restart and are promoted to memory"""
+        cache.put_many("m", "v1", ["a", "b"], [np.arange(3), {"label": "positive"}])
+        cache.close()
+
+        restored = InferenceCache(path=temp_dir / "inference.db")
+        values = restored.get_many("m", "v1", ["a", "b", "c"])
+        restored.get_many("m", "v1", ["a"])
+
+        assert values[0].tolist() == [0, 1, 2]
+        assert values[1] == {"label": "positive"}
+        assert values[2] is None
+        stats = restored.get_stats()
+        assert (stats["disk_hits"], stats["memory_hits"], stats["misses"]) == (2, 1, 1)
+        restored.close()
+
+    def test_size_eviction(self, temp_dir):
+        """Test least recently used entries are evicted past the size limit"""
+        cache = InferenceCache(path=temp_dir / "inference.db", memory_items=0, max_mb=0.05)
+        blob = b"x" * 10000
+        cache.put_many("m", "v1", ["old", "kept"], [blob, blob])
+        cache.get_many("m", "v1", ["kept"])
+        for i in range(4):
+            cache.put_many("m", "v1", [f"new {i}"], [blob])
+
+        stats = cache.get_stats()
+        assert stats["evictions"] > 0
+        assert stats["disk_bytes"] <= 0.05 * 1024 * 1024
+        assert cache.get_many("m", "v1", ["old", "kept", "new 3"])[0] is None
+        assert cache.get_many("m", "v1", ["new 3"])[0] == blob
+        cache.close()
+
+    def test_memory_only(self, temp_dir):
+        """Test the persistent tier can be disabled"""
+        cache = InferenceCache(path=temp_dir / "inference.db", persistent=False)
+        cache.put_many("m", "v1", ["a"], [1])
+
+        assert cache.get_many("m", "v1", ["a"]) == [1]
+        assert not (temp_dir / "inference.db").exists()
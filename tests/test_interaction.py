@@ -0,0 +1,121 @@
+"""
+Tests for interaction processing
+Tests the batch path against per-item processing
+"""
+
+import pytest
+
+from omnisense.interaction.manager import (
+    BaseInteractionProcessor,
+    CommentProcessor,
+    InteractionManager,
+)
+
+
+def _items():
+    """Content items with comment threads, repeated texts and edge cases"""
+    texts = [
+        "Great   video!! @alice #tech 😀",
+        "the camera is great, the battery is not",
+        "学到了 很多 #教程",
+        "Great   video!! @alice #tech 😀",
+        "",
+    ]
+    items = []
+    for i in range(4):
+        interactions = [
+            {
+                "interaction_id": f"c{i}_{j}",
+                "type": "comment" if j % 3 else "like",
+                "user": {"user_id": f"user_{j % 2}"},
+                "text": texts[(i + j) % len(texts)],
+                "parent_id": f"c{i}_{j - 1}" if j % 2 else None,
+            }
+            for j in range(6)
+        ]
+        items.append({"content_id": str(i), "interactions": interactions})
+    items[1]["interactions"].append({})
+    items[2]["interactions"].append({"type": "share", "user": {}})
+    items.append({"content_id": "empty", "interactions": []})
+    items.append({"content_id": "none"})
+    items.append({"content_id": "broken", "interactions": [{"text": None}]})
+    return items
+
+
+class FakeSentimentAnalyzer:
+    """Records the texts of every batched call"""
+
+    def __init__(self):
+        self.calls = []
+
+    async def analyze_batch_async(self, texts):
+        self.calls.append(list(texts))
+        return [
+            {"label": "positive", "score": 0.9, "polarity": 1} if "great" in text.lower()
+            else {"label": "neutral", "score": 0.0}
+            for text in texts
+        ]
+
+
+async def _per_item(processor, items):
+    return [await processor._process_item(item) for item in items]
+
+
+class TestInteractionBatch:
+    """Test batched interaction processing"""
+
+    @pytest.mark.asyncio
+    async def test_batch_matches_per_item(self):
+        """Test the batch path produces the same items as process()"""
+        expected = await _per_item(CommentProcessor("test"), _items())
+        results = await CommentProcessor("test").process_batch(_items())
+
+        assert results == expected
+        assert results[0]["interaction_summary"]["top_users"][0]["count"] == 3
+        assert "comment_tree" in results[4] and "comment_tree" not in results[5]
+        assert results[6] == {"content_id": "broken", "interactions": [{"text": None}]}
+
+    @pytest.mark.asyncio
+    async def test_repeated_texts_get_own_objects(self):
+        """Test interactions sharing a text do not share mutable results"""
+        results = await CommentProcessor("test").process_batch(_items())
+        first, repeat = results[0]["interactions"][0], results[0]["interactions"][3]
+
+        assert first["text"] == repeat["text"] == "Great video!! @alice #tech"
+        assert first["mentions"] == repeat["mentions"] == ["alice"]
+        assert first["mentions"] is not repeat["mentions"]
+        assert first["sentiment"] is not repeat["sentiment"]
+
+    @pytest.mark.asyncio
+    async def test_batched_sentiment(self):
+        """Test sentiment runs once per batch over the distinct texts"""
+        analyzer = FakeSentimentAnalyzer()
+        manager = InteractionManager(sentiment_analyzer=analyzer)
+        results = await manager.process("test", _items())
+
+        assert len(analyzer.calls) == 1
+        assert len(analyzer.calls[0]) == len(set(analyzer.calls[0])) == 4
+        sentiment = results[0]["interactions"][0]["sentiment"]
+        assert sentiment == {"score": 0.9, "label": "positive", "confidence": 0.9}
+        assert results[0]["interaction_summary"]["sentiment_distribution"]["positive"] == 4
+
+    @pytest.mark.asyncio
+    async def test_custom_processor_runs_per_item(self):
+        """Test a processor overriding a step keeps its behavior"""
+
+        class UpperProcessor(BaseInteractionProcessor):
+            def _clean_text(self, text):
+                return text.upper()
+
+        results = await UpperProcessor("test").process_batch(_items())
+
+        assert results[0]["interactions"][0]["text"] == "GREAT   VIDEO!! @ALICE #TECH 😀"
+
+    @pytest.mark.asyncio
+    async def test_manager_returns_every_item(self):
+        """Test the manager returns items in order, malformed ones unchanged"""
+        data = _items()
+        results = await InteractionManager().process("test", data)
+
+        assert [item["content_id"] for item in results] == [item["content_id"] for item in data]
+        assert results[6]["interactions"] == [{"text": None}]
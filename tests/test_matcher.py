@@ -0,0 +1,364 @@
+"""
+Tests for content matching
+Tests the embedding service and MatcherManager batch scoring
+"""
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from omnisense.matcher.embedding import EmbeddingService
+from omnisense.matcher.manager import (
+    Deduplicator,
+    MatcherManager,
+    MultiModalMatcher,
+    SimHashIndex,
+    VectorIndex,
+    simhash64,
+)
+from omnisense.matcher import dedup_store
+from omnisense.matcher.dedup_store import BloomDedupStore, bloom_parameters
+from omnisense.utils.inference_cache import InferenceCache
+
+
+class FakeModel:
+    """Deterministic stand-in for a SentenceTransformer"""
+
+    def __init__(self):
+        self.calls = []
+
+    def encode(self, texts, normalize_embeddings=False, **kwargs):
+        self.calls.append(list(texts))
+        vectors = np.array(
+            [[1.0, 0.0] if "ai" in text.lower() else [0.0, 1.0] for text in texts],
+            dtype=np.float32,
+        )
+        return vectors
+
+
+@pytest.fixture
+def service():
+    """Embedding service backed by a fake model"""
+    service = EmbeddingService(
+        batch_size=64, max_wait_ms=20, query_cache_size=2,
+        cache=InferenceCache(memory_items=0, persistent=False),
+    )
+    service._model = FakeModel()
+    return service
+
+
+class TestEmbeddingService:
+    """Test the shared embedding service"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_coalesced(self, service):
+        """Test concurrent embed() calls share one model call"""
+        results = await asyncio.gather(*[
+            service.embed([f"text {i}", "AI"]) for i in range(10)
+        ])
+
+        assert len(service.model.calls) == 1
+        # Repeated texts are encoded once
+        assert len(service.model.calls[0]) == 11
+        assert all(r.shape == (2, 2) for r in results)
+        assert results[3][1].tolist() == [1.0, 0.0]
+
+    @pytest.mark.asyncio
+    async def test_batch_size_respected(self, service):
+        """Test a batch is flushed once it reaches batch_size"""
+        service.batch_size = 4
+
+        await asyncio.gather(*[service.embed([f"a{i}", f"b{i}"]) for i in range(4)])
+
+        assert [len(call) for call in service.model.calls] == [4, 4]
+
+    def test_inference_cache(self, service):
+        """Test texts embedded before are served from the inference cache"""
+        service.cache = InferenceCache(persistent=False)
+        first = service.encode(["AI news", "cooking"])
+        second = service.encode(["cooking", "AI  news", "weather"])
+
+        assert service.model.calls == [["AI news", "cooking"], ["weather"]]
+        assert second[1].tolist() == first[0].tolist()
+        assert service.get_stats()["inference_cache"]["memory_hits"] == 2
+
+    def test_query_cache(self, service):
+        """Test query embeddings are cached with LRU eviction"""
+        service.encode_query("q1")
+        service.encode_query("q1")
+        service.encode_query("q2")
+        service.encode_query("q3")
+
+        stats = service.get_stats()
+        assert stats["query_cache_hits"] == 1
+        assert stats["query_cache_size"] == 2
+        assert len(service.model.calls) == 3
+
+
+class TestMatcherManager:
+    """Test batched matching"""
+
+    @pytest.mark.asyncio
+    async def test_match_scores_list_in_one_batch(self, service):
+        """Test the whole list is embedded together and filtered by score"""
+        manager = MatcherManager()
+        manager.matchers["douyin"] = MultiModalMatcher(service)
+        manager.deduplicator = Deduplicator(service, semantic=False, simhash=False)
+
+        data = [
+            {"content_id": str(i), "title": f"AI news {i}" if i % 2 else f"cooking {i}"}
+            for i in range(10)
+        ]
+        results = await manager.match(
+            "douyin", data, criteria={"semantic_query": "AI", "keywords": ["ai"]}
+        )
+
+        assert [item["content_id"] for item in results] == ["1", "3", "5", "7", "9"]
+        assert all(item["match_score"] == pytest.approx(1.0) for item in results)
+        # One call for the query, one for all item texts
+        assert len(service.model.calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_match_without_criteria_only_deduplicates(self, service):
+        """Test exact and near duplicates are dropped without criteria"""
+        manager = MatcherManager()
+        manager.matchers["douyin"] = MultiModalMatcher(service)
+        manager.deduplicator = Deduplicator(service)
+
+        data = [
+            {"content_id": "1", "title": "AI news"},
+            {"content_id": "2", "title": "AI news"},
+            {"content_id": "3", "title": "AI news!"},
+            {"content_id": "4", "title": "cooking"},
+        ]
+        results = await manager.match("douyin", data)
+
+        assert [item["content_id"] for item in results] == ["1", "4"]
+        assert len(service.model.calls) == 1
+
+
+def _unit(rows):
+    vectors = np.asarray(rows, dtype=np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+class TestDeduplicator:
+    """Test near-duplicate detection"""
+
+    @pytest.mark.asyncio
+    async def test_near_duplicates_across_batches(self, service):
+        """Test items close to an indexed item are flagged in later batches"""
+        dedup = Deduplicator(service, threshold=0.9, simhash=False)
+
+        first = await dedup.check_batch([{"title": "AI one"}], platform="weibo")
+        second = await dedup.check_batch(
+            [{"title": "AI two"}, {"title": "recipe"}], platform="weibo"
+        )
+        other_platform = await dedup.check_batch([{"title": "AI three"}], platform="douyin")
+
+        assert first == [False]
+        assert second == [True, False]
+        assert other_platform == [False]
+
+    def test_index_switches_to_hnsw(self):
+        """Test the flat index is upgraded past the threshold and still finds vectors"""
+        rng = np.random.default_rng(0)
+        vectors = _unit(rng.normal(size=(50, 8)))
+        index = VectorIndex(8, hnsw_threshold=40)
+
+        index.add(vectors[:30])
+        assert not index.is_hnsw
+        index.add(vectors[30:])
+
+        assert index.is_hnsw
+        assert index.size == 50
+        assert index.search(vectors[:5]) == pytest.approx(np.ones(5), abs=1e-4)
+
+    @pytest.mark.asyncio
+    async def test_index_persisted_per_platform(self, temp_dir, service):
+        """Test saved indexes are reloaded by a new deduplicator"""
+        dedup = Deduplicator(service, index_dir=temp_dir)
+        await dedup.add_content({"title": "x", "platform": "weibo"}, vector=np.array([3.0, 4.0]))
+        dedup.save()
+
+        assert (temp_dir / "weibo.faiss").exists()
+
+        restored = Deduplicator(service, index_dir=temp_dir)
+        scores = restored.get_index("weibo").search(_unit([[3.0, 4.0]]))
+        assert scores[0] == pytest.approx(1.0)
+
+    @pytest.mark.asyncio
+    async def test_simhash_tier_skips_model(self, service):
+        """Test near-identical text is dropped before the embedding model runs"""
+        dedup = Deduplicator(service)
+        article = "Breaking: new AI model released today with record benchmark scores " * 3
+
+        first = await dedup.check_batch([{"title": article}], platform="weibo")
+        second = await dedup.check_batch(
+            [{"title": article + "!!"}, {"title": article.upper() + " #ai"}], platform="weibo"
+        )
+
+        assert first == [False]
+        assert second == [True, True]
+        assert len(service.model.calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_simhash_state_persisted(self, temp_dir, service):
+        """Test exact and near-identical items are still caught after a restart"""
+        dedup = Deduplicator(service, semantic=False, index_dir=temp_dir)
+        assert not await dedup.is_duplicate({"title": "daily market report for monday morning"},
+                                            platform="weibo")
+        dedup.save()
+
+        assert (temp_dir / "weibo.simhash.npz").exists()
+        assert (temp_dir / "weibo.bloom.npz").exists()
+
+        restored = Deduplicator(service, semantic=False, simhash=False, index_dir=temp_dir)
+        assert await restored.is_duplicate({"title": "daily market report for monday morning"},
+                                           platform="weibo")
+
+        restored = Deduplicator(service, semantic=False, index_dir=temp_dir)
+        assert await restored.is_duplicate({"title": "Daily market report for monday morning."},
+                                           platform="weibo")
+        assert not await restored.is_duplicate({"title": "recipe"}, platform="weibo")
+
+    @pytest.mark.asyncio
+    async def test_reset_forgets_persisted_indexes(self, temp_dir, service):
+        """Test near copies of items seen before a reset are new again, also after a restart"""
+        dedup = Deduplicator(service, threshold=0.9, index_dir=temp_dir)
+        assert await dedup.check_batch(
+            [{"title": "daily market report for monday morning"}], platform="weibo") == [False]
+        dedup.save()
+
+        await dedup.reset()
+        restored = Deduplicator(service, threshold=0.9, index_dir=temp_dir)
+
+        assert not list(temp_dir.glob("weibo.faiss")) + list(temp_dir.glob("weibo.simhash.npz"))
+        assert await restored.check_batch(
+            [{"title": "Daily market report for monday morning."}], platform="weibo") == [False]
+        assert await dedup.check_batch(
+            [{"title": "Daily market report for monday morning!"}], platform="weibo") == [False]
+
+
+class TestSimHash:
+    """Test SimHash fingerprints and the LSH index"""
+
+    def test_fingerprints_batch_independent(self):
+        """Test a text gets the same fingerprint alone or inside a batch"""
+        texts = ["人工智能新闻", "a", "", "hello world " * 100, "Hello World " * 100]
+        batch = simhash64(texts)
+
+        assert batch.dtype == np.uint64
+        assert batch.tolist() == [simhash64([text])[0] for text in texts]
+        # Case is folded
+        assert batch[3] == batch[4]
+
+    def test_index_finds_within_distance(self):
+        """Test sorted bands and the unsorted tail both answer queries"""
+        rng = np.random.default_rng(0)
+        hashes = rng.integers(0, 2 ** 63, size=50, dtype=np.uint64)
+        index = SimHashIndex(distance=3)
+        index.TAIL_SIZE = 10
+        index.add(hashes[:30])
+        index.add(hashes[30:])
+
+        near = hashes ^ np.uint64(0b1011)
+        far = hashes ^ np.uint64(0b11111)
+
+        assert index.query(near).all()
+        assert not index.query(far).any()
+
+    def test_within_batch(self):
+        """Test later near copies in a batch are flagged against kept items only"""
+        index = SimHashIndex(distance=3)
+        hashes = np.array([0, 0b1, 2 ** 40 - 1, 0b11], dtype=np.uint64)
+        skip = np.array([True, False, False, False])
+
+        assert index.within_batch(hashes, skip).tolist() == [False, False, False, True]
+
+
+class TestBloomDedupStore:
+    """Test the bounded in-process hash store"""
+
+    @pytest.mark.asyncio
+    async def test_check_and_add(self):
+        """Test keys are flagged once seen, per namespace and within a call"""
+        store = BloomDedupStore(capacity=1000, error_rate=0.001, ttl=0)
+
+        assert await store.check_and_add("weibo", ["a", "b", "a"]) == [False, False, True]
+        assert await store.check_and_add("weibo", ["b", "c"]) == [True, False]
+        assert await store.check_and_add("douyin", ["a"]) == [False]
+
+    @pytest.mark.asyncio
+    async def test_memory_fixed_and_error_rate(self):
+        """Test the filter size does not grow and false positives stay near the target"""
+        store = BloomDedupStore(capacity=10000, error_rate=0.01, ttl=0)
+        await store.check_and_add("weibo", [f"seen-{i}" for i in range(10000)])
+        size = store._filter("weibo")["bits"].nbytes
+
+        flags = await store.check_and_add("weibo", [f"new-{i}" for i in range(10000)])
+
+        assert store._filter("weibo")["bits"].nbytes == size
+        assert size == bloom_parameters(10000, 0.01)[0] // 8
+        assert sum(flags) < 300
+
+    @pytest.mark.asyncio
+    async def test_keys_age_out(self, monkeypatch):
+        """Test keys are kept for the TTL and forgotten afterwards"""
+        now = [1000.0]
+        monkeypatch.setattr(dedup_store.time, "time", lambda: now[0])
+        store = BloomDedupStore(capacity=100, ttl=300, generations=4)
+
+        await store.check_and_add("weibo", ["a"])
+        now[0] += 299
+        assert await store.check_and_add("weibo", ["a"]) == [True]
+        now[0] += 500
+        assert await store.check_and_add("weibo", ["a"]) == [False]
+
+    @pytest.mark.asyncio
+    async def test_snapshot(self, temp_dir):
+        """Test a snapshot is reloaded, and ignored if the filter size changed"""
+        store = BloomDedupStore(snapshot_dir=temp_dir, capacity=100, ttl=0)
+        await store.check_and_add("weibo", ["a"])
+        store.save()
+
+        restored = BloomDedupStore(snapshot_dir=temp_dir, capacity=100, ttl=0)
+        resized = BloomDedupStore(snapshot_dir=temp_dir, capacity=5000, ttl=0)
+
+        assert await restored.check_and_add("weibo", ["a"]) == [True]
+        assert await resized.check_and_add("weibo", ["a"]) == [False]
+
+    @pytest.mark.asyncio
+    async def test_reset_removes_snapshot(self, temp_dir):
+        """Test keys seen before a reset are not reloaded from the snapshot"""
+        store = BloomDedupStore(snapshot_dir=temp_dir, capacity=100, ttl=0)
+        await store.check_and_add("weibo", ["a"])
+        store.save()
+
+        await store.reset()
+
+        assert not (temp_dir / "weibo.bloom.npz").exists()
+        assert await store.check_and_add("weibo", ["a"]) == [False]
+
+
+class TestRedisDedupStore:
+    """Test the Redis-backed hash store"""
+
+    @pytest.mark.asyncio
+    async def test_shared_between_stores(self):
+        """Test two stores on one Redis see each other's keys"""
+        fakeredis = pytest.importorskip("fakeredis")
+        pytest.importorskip("lupa")
+        client = fakeredis.FakeAsyncRedis()
+        worker_a = dedup_store.RedisDedupStore(client=client, capacity=1000, ttl=600)
+        worker_b = dedup_store.RedisDedupStore(client=client, capacity=1000, ttl=600)
+
+        assert await worker_a.check_and_add("weibo", ["a", "b", "a"]) == [False, False, True]
+        assert await worker_b.check_and_add("weibo", ["b", "c"]) == [True, False]
+        assert await worker_b.check_and_add("douyin", ["a"]) == [False]
+        ttls = [await client.ttl(key) for key in await client.keys("*")]
+        assert len(ttls) == 2 and all(0 < ttl <= 800 for ttl in ttls)
+
+        await worker_a.reset()
+        assert await client.keys("*") == []
@@ -0,0 +1,97 @@
+"""
+Tests for the streaming pipeline
+"""
+
+import asyncio
+
+import pytest
+
+from omnisense.utils.pipeline import StreamPipeline
+
+
+async def _source(n, delay=0.0):
+    for i in range(n):
+        if delay:
+            await asyncio.sleep(delay)
+        yield i
+
+
+class TestStreamPipeline:
+    """Tests for StreamPipeline"""
+
+    @pytest.mark.asyncio
+    async def test_stages_run_in_order(self):
+        """Test items flow through every stage in batches"""
+        saved = []
+
+        async def double(batch):
+            return [x * 2 for x in batch]
+
+        async def drop_odd_index(batch):
+            return [x for x in batch if x % 4 == 0]
+
+        async def save(batch):
+            saved.extend(batch)
+            return batch
+
+        pipeline = StreamPipeline(
+            [("double", double), ("filter", drop_odd_index), ("save", save)],
+            batch_size=3, queue_size=1, flush_interval=10,
+        )
+        stats = await pipeline.run(_source(10))
+
+        assert saved == [0, 4, 8, 12, 16]
+        assert stats["source_items"] == 10
+        assert stats["stages"]["double"]["batches"] == 4
+        assert stats["stages"]["save"]["items_out"] == 5
+
+    @pytest.mark.asyncio
+    async def test_backpressure_bounds_source(self):
+        """Test a slow stage keeps the source from running ahead"""
+        pulled = []
+        in_flight = []
+
+        async def source():
+            for i in range(50):
+                pulled.append(i)
+                yield i
+
+        async def slow(batch):
+            in_flight.append(len(pulled) - sum(len(b) for b in processed))
+            await asyncio.sleep(0.005)
+            processed.append(batch)
+            return batch
+
+        processed = []
+        pipeline = StreamPipeline([("slow", slow)], batch_size=2, queue_size=1, flush_interval=10)
+        await pipeline.run(source())
+
+        # Source may only run ahead by the bounded queues, never the whole stream
+        assert max(in_flight) <= 2 * 2 + 2 + 2
+        assert sum(len(b) for b in processed) == 50
+
+    @pytest.mark.asyncio
+    async def test_partial_batch_flushed_on_slow_source(self):
+        """Test a partial batch reaches the stages after flush_interval"""
+        first_seen = []
+
+        async def record(batch):
+            first_seen.append(len(batch))
+            return batch
+
+        pipeline = StreamPipeline([("record", record)], batch_size=100, flush_interval=0.02)
+        stats = await pipeline.run(_source(3, delay=0.03))
+
+        assert stats["stages"]["record"]["batches"] >= 2
+        assert sum(first_seen) == 3
+
+    @pytest.mark.asyncio
+    async def test_stage_failure_propagates(self):
+        """Test a failing stage stops the pipeline with its error"""
+        async def boom(batch):
+            raise RuntimeError("stage failed")
+
+        pipeline = StreamPipeline([("boom", boom)], batch_size=2)
+
+        with pytest.raises(RuntimeError, match="stage failed"):
+            await asyncio.wait_for(pipeline.run(_source(100)), timeout=2)
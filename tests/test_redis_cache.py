@@ -0,0 +1,317 @@
+"""
+Tests for the Redis cache
+Tests the tagged serializer, the in-process tier, request coalescing and rate limiting
+"""
+
+import asyncio
+import pickle
+from datetime import datetime
+
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+
+from omnisense.storage import redis_cache
+from omnisense.storage.redis_cache import RedisCache, TieredCache, decode_value, encode_value
+
+
+def _tiered(server, **kwargs):
+    return TieredCache(RedisCache(fakeredis.FakeAsyncRedis(server=server)),
+                       max_items=100, local_ttl=60, **kwargs)
+
+
+class TestSerializer:
+    """Test the tagged value format"""
+
+    @pytest.mark.parametrize("value", [
+        "text", "", "123", 42, -7, 1.5, True, None, b"\x80raw",
+        {"a": [1, 2.5, None]}, [{"nested": "列表"}], {1: "int key"},
+        {"when": datetime(2024, 1, 2, 3, 4)}, ("tuple", 1),
+    ])
+    def test_round_trip(self, value):
+        """Test values come back with their type"""
+        assert decode_value(encode_value(value)) == value
+
+    def test_integers_stay_incrementable(self):
+        """Test integers are stored as plain ASCII for INCRBY"""
+        assert encode_value(42) == b"42"
+        assert decode_value(b"43") == 43
+
+    def test_large_values_compressed(self):
+        """Test payloads over the threshold are compressed"""
+        pytest.importorskip("zstandard")
+        value = {"items": ["same text"] * 1000}
+        payload = encode_value(value, compress_min_bytes=1024)
+
+        assert len(payload) < 1024
+        assert decode_value(payload) == value
+
+    def test_untagged_values(self):
+        """Test values written before format tags still decode"""
+        assert decode_value(pickle.dumps({"a": 1})) == {"a": 1}
+        assert decode_value(b'{"a": 1}') == {"a": 1}
+        assert decode_value(b"alice") == "alice"
+
+    @pytest.mark.asyncio
+    async def test_redis_cache_types(self):
+        """Test RedisCache returns what was set"""
+        cache = RedisCache(fakeredis.FakeAsyncRedis())
+        await cache.set_many({"n": 3, "s": "3", "d": {"k": "v"}})
+
+        assert await cache.get_many("n", "s", "d", "missing") == {"n": 3, "s": "3", "d": {"k": "v"}}
+        assert await cache.increment("n") == 4
+
+
+class TestTieredCache:
+    """Test the in-process tier in front of Redis"""
+
+    @pytest.mark.asyncio
+    async def test_local_hits(self):
+        """Test repeated reads are served without Redis"""
+        cache = _tiered(fakeredis.FakeServer(), invalidation=False)
+        await cache.cache.client.set("apikey:abc", encode_value("alice"))
+
+        assert await cache.get("apikey:abc") == "alice"
+        await cache.cache.client.delete("apikey:abc")
+        assert await cache.get("apikey:abc") == "alice"
+        assert cache.get_stats()["local_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_local_copies_not_shared(self):
+        """Test callers mutating a cached dict do not change the cache"""
+        cache = _tiered(fakeredis.FakeServer(), invalidation=False)
+        await cache.set("user", {"roles": ["viewer"]})
+
+        (await cache.get("user"))["roles"].append("admin")
+
+        assert await cache.get("user") == {"roles": ["viewer"]}
+
+    @pytest.mark.asyncio
+    async def test_local_copy_respects_redis_ttl(self, monkeypatch):
+        """Test local copies never outlive the key"""
+        cache = _tiered(fakeredis.FakeServer(), invalidation=False)
+        await cache.set("short", {"v": 1}, ttl=1)
+        now = redis_cache.time.monotonic()
+        await cache.cache.client.delete("short")
+
+        monkeypatch.setattr(redis_cache.time, "monotonic", lambda: now + 2)
+        assert await cache.get("short") is None
+
+    @pytest.mark.asyncio
+    async def test_invalidation_between_processes(self):
+        """Test a write in one process evicts the other's local copy"""
+        server = fakeredis.FakeServer()
+        worker_a, worker_b = _tiered(server, invalidation=True), _tiered(server, invalidation=True)
+        await worker_a.start()
+        await worker_b.start()
+        try:
+            await worker_a.set("settings", {"theme": "light"})
+            assert await worker_b.get("settings") == {"theme": "light"}
+
+            await worker_a.set("settings", {"theme": "dark"})
+            for _ in range(50):
+                if worker_b.get_stats()["invalidations"]:
+                    break
+                await asyncio.sleep(0.02)
+
+            assert await worker_b.get("settings") == {"theme": "dark"}
+            assert worker_a.get_stats()["invalidations"] == 0
+        finally:
+            await worker_a.close()
+            await worker_b.close()
+
+
+class TestCachedAsync:
+    """Test request coalescing and memoization"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_coalesced(self):
+        """Test equal concurrent calls run once, whichever argument form"""
+        calls = []
+
+        @redis_cache.cached_async()
+        async def collect(platform, keyword, limit=10):
+            calls.append((platform, keyword, limit))
+            await asyncio.sleep(0.05)
+            return {"items": [keyword] * limit}
+
+        results = await asyncio.gather(
+            collect("weibo", "AI"), collect("weibo", keyword="AI", limit=10),
+            collect(platform="weibo", keyword="AI"), collect("weibo", "ML"),
+        )
+
+        assert len(calls) == 2
+        assert results[0] is results[1] is results[2]
+        assert await collect("weibo", "AI") == results[0] and len(calls) == 3
+
+    @pytest.mark.asyncio
+    async def test_errors_shared_not_cached(self):
+        """Test waiters share a failure and the next call retries"""
+        calls = []
+
+        @redis_cache.cached_async(ttl=60)
+        async def flaky():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            if len(calls) == 1:
+                raise RuntimeError("platform down")
+            return "ok"
+
+        results = await asyncio.gather(flaky(), flaky(), return_exceptions=True)
+
+        assert all(isinstance(result, RuntimeError) for result in results)
+        assert await flaky() == "ok" and await flaky() == "ok"
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_stale_while_revalidate(self, monkeypatch):
+        """Test a stale result is served while one call refreshes it"""
+        versions = iter(range(10))
+
+        @redis_cache.cached_async(ttl=10, stale_ttl=60)
+        async def report():
+            return next(versions)
+
+        assert await report() == 0
+        now = redis_cache.time.monotonic()
+        monkeypatch.setattr(redis_cache.time, "monotonic", lambda: now + 20)
+
+        assert await report() == 0
+        await asyncio.sleep(0)
+        assert await report() == 1
+        assert report.cache_info()["stale_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_methods_per_instance(self):
+        """Test instances do not share in-process results"""
+
+        class Engine:
+            def __init__(self, name):
+                self.name = name
+
+            @redis_cache.cached_async(ttl=60)
+            async def query(self, question):
+                return f"{self.name}: {question}"
+
+        assert await Engine("a").query("q") == "a: q"
+        assert await Engine("b").query("q") == "b: q"
+
+    @pytest.mark.asyncio
+    async def test_uncacheable_arguments(self):
+        """Test calls with opaque arguments run uncached"""
+        calls = []
+
+        @redis_cache.cached_async(ttl=60)
+        async def handle(callback):
+            calls.append(callback)
+            return callback()
+
+        await handle(lambda: 1)
+        await handle(lambda: 1)
+
+        assert len(calls) == 2 and handle.cache_info()["uncacheable"] == 2
+
+    @pytest.mark.asyncio
+    async def test_last_caller_cancels(self):
+        """Test the shared call is cancelled only when every caller gave up"""
+        started, cancelled = asyncio.Event(), []
+
+        @redis_cache.cached_async()
+        async def slow():
+            started.set()
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(1)
+                raise
+
+        first, second = asyncio.ensure_future(slow()), asyncio.ensure_future(slow())
+        await started.wait()
+        first.cancel()
+        await asyncio.sleep(0.01)
+        assert not cancelled
+
+        second.cancel()
+        await asyncio.sleep(0.01)
+        assert cancelled
+
+    @pytest.mark.asyncio
+    async def test_shared_between_processes(self, monkeypatch):
+        """Test a second process reuses the result computed under the Redis lock"""
+        calls = []
+
+        async def compute(question):
+            calls.append(question)
+            await asyncio.sleep(0.05)
+            return {"answer": question.upper()}
+
+        worker_a = redis_cache.cached_async(ttl=60, shared=True, namespace="nl")(compute)
+        worker_b = redis_cache.cached_async(ttl=60, shared=True, namespace="nl")(compute)
+        # Separate decorators keep separate in-process state, like two processes
+        cache = RedisCache(fakeredis.FakeAsyncRedis())
+        monkeypatch.setattr(redis_cache, "get_redis_cache", lambda: cache)
+
+        results = await asyncio.gather(worker_a("why"), worker_b("why"))
+
+        assert results == [{"answer": "WHY"}] * 2
+        assert calls == ["why"]
+
+
+class TestRateLimiter:
+    """Test the GCRA rate limiter"""
+
+    @pytest.fixture
+    def limiter(self):
+        pytest.importorskip("lupa")
+        return redis_cache.RateLimiter(RedisCache(fakeredis.FakeAsyncRedis()))
+
+    @pytest.mark.asyncio
+    async def test_burst_then_paced(self, limiter):
+        """Test a full burst is allowed, then one request per interval"""
+        allowed = [await limiter.is_allowed("api", 5, 60) for _ in range(7)]
+
+        assert allowed == [True] * 5 + [False] * 2
+        assert await limiter.get_remaining("api", 5, 60) == 0
+        assert await limiter.get_remaining("other", 5, 60) == 5
+
+    @pytest.mark.asyncio
+    async def test_reserve_returns_wait(self, limiter):
+        """Test reservations queue up one interval apart"""
+        waits = [await limiter.reserve("crawl:weibo", 2, 10) for _ in range(4)]
+
+        assert waits[:2] == [0, 0]
+        assert waits[2] == pytest.approx(5, abs=0.1)
+        assert waits[3] == pytest.approx(10, abs=0.1)
+        assert await limiter.reserve("crawl:weibo", 2, 10, max_wait=1) is None
+
+    @pytest.mark.asyncio
+    async def test_workers_share_budget(self):
+        """Test limiters on one Redis never exceed the budget together"""
+        pytest.importorskip("lupa")
+        client = fakeredis.FakeAsyncRedis()
+        workers = [redis_cache.RateLimiter(RedisCache(client)) for _ in range(4)]
+
+        allowed = await asyncio.gather(
+            *(worker.is_allowed("crawl:douyin", 10, 60) for worker in workers for _ in range(5))
+        )
+
+        assert sum(allowed) == 10
+        assert 0 < await client.pttl("rate_limit:crawl:douyin:10:60") <= 60_000
+
+    @pytest.mark.asyncio
+    async def test_local_fallback(self):
+        """Test the limiter keeps limiting per process when Redis fails"""
+        limiter = redis_cache.RateLimiter(RedisCache(fakeredis.FakeAsyncRedis()))
+
+        async def down(*args, **kwargs):
+            raise ConnectionError("redis down")
+
+        limiter._script = down
+
+        assert [await limiter.is_allowed("api", 2, 60) for _ in range(3)] == [True, True, False]
+        assert await limiter.reserve("api", 2, 60) == pytest.approx(30, abs=0.1)
+
+        strict = redis_cache.RateLimiter(RedisCache(fakeredis.FakeAsyncRedis()), local_fallback=False)
+        strict._script = down
+        with pytest.raises(ConnectionError):
+            await strict.is_allowed("api", 2, 60)
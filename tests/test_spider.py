@@ -9,6 +9,7 @@ from unittest.mock import Mock, patch, AsyncMock, MagicMock
 
 from omnisense.spider.base import BaseSpider
 from omnisense.spider.manager import SpiderManager
+from omnisense.spider.browser_pool import BrowserPool
 from omnisense.spider.utils.playwright_helper import PlaywrightHelper
 from omnisense.spider.utils.parser import ContentParser
 
@@ -192,6 +193,310 @@ class TestSpiderManager:
         assert manager._stats["completed_tasks"] == 0
 
 
+class SlowSpider(MockSpider):
+    """Mock spider whose search takes a configurable delay"""
+
+    delays = {}
+
+    async def search(self, keyword: str, max_results: int = 20):
+        await asyncio.sleep(self.delays.get(self.platform, 0))
+        if self.delays.get(self.platform) is None:
+            raise RuntimeError("search failed")
+        return [{"id": self.platform, "title": keyword}]
+
+
+class TestSpiderManagerFanOut:
+    """Tests for concurrent fan-out in SpiderManager"""
+
+    def _manager(self, delays, **kwargs):
+        SlowSpider.delays = delays
+        manager = SpiderManager(max_concurrent=10, browser_pool=None, **kwargs)
+        for platform in delays:
+            manager.register_spider(platform, SlowSpider)
+        # Pretend every spider is already started
+        manager._spider_instances = {}
+        for platform in delays:
+            spider = SlowSpider(platform=platform)
+            spider._browser = Mock()
+            manager._spider_instances[platform] = spider
+        return manager
+
+    @pytest.mark.asyncio
+    async def test_execute_on_multiple_runs_concurrently(self):
+        """Total time is bounded by the slowest platform"""
+        manager = self._manager({"a": 0.2, "b": 0.2, "c": 0.2})
+
+        start = asyncio.get_event_loop().time()
+        results = await manager.execute_on_multiple(["a", "b", "c"], "search", "AI")
+        elapsed = asyncio.get_event_loop().time() - start
+
+        assert list(results) == ["a", "b", "c"]
+        assert all(r["success"] for r in results.values())
+        assert elapsed < 0.5
+
+    @pytest.mark.asyncio
+    async def test_stream_yields_in_completion_order(self):
+        """Results arrive as each platform finishes"""
+        manager = self._manager({"slow": 0.2, "fast": 0.01, "broken": None})
+
+        order = []
+        async for platform, result in manager.stream(["slow", "fast", "broken"], "search", "AI"):
+            order.append((platform, result["success"]))
+
+        assert order[-1] == ("slow", True)
+        assert ("broken", False) in order
+        assert manager.get_stats()["failed_tasks"] == 1
+
+    @pytest.mark.asyncio
+    async def test_task_timeout(self):
+        """Tasks exceeding the timeout are reported as failures"""
+        manager = self._manager({"slow": 1.0, "fast": 0.01})
+
+        results = await manager.execute_on_multiple(["slow", "fast"], "search", "AI", timeout=0.1)
+
+        assert results["fast"]["success"] is True
+        assert results["slow"]["success"] is False
+        assert "timed out" in results["slow"]["error"]
+
+    @pytest.mark.asyncio
+    async def test_stream_break_cancels_outstanding(self):
+        """Leaving the stream early cancels the remaining tasks"""
+        manager = self._manager({"slow": 5.0, "fast": 0.01})
+
+        stream = manager.stream(["slow", "fast"], "search", "AI")
+        async for platform, result in stream:
+            break
+        await stream.aclose()
+
+        assert platform == "fast"
+        assert manager._running_tasks == {}
+        assert manager.get_stats()["cancelled_tasks"] == 1
+
+    @pytest.mark.asyncio
+    async def test_per_platform_concurrency(self):
+        """Tasks on the same platform respect the per-platform cap"""
+        manager = self._manager({"a": 0.1}, per_platform_concurrency=1)
+
+        start = asyncio.get_event_loop().time()
+        await asyncio.gather(*(manager.execute_task("a", "search", f"AI {i}") for i in range(3)))
+        elapsed = asyncio.get_event_loop().time() - start
+
+        assert elapsed >= 0.3
+
+    @pytest.mark.asyncio
+    async def test_busy_platform_does_not_starve_others(self):
+        """Tasks waiting on a busy platform do not hold global slots"""
+        manager = self._manager({"a": 0.2, "b": 0.01}, per_platform_concurrency=1)
+        manager._semaphore = asyncio.Semaphore(2)
+
+        queued = [asyncio.ensure_future(manager.execute_task("a", "search", f"AI {i}"))
+                  for i in range(3)]
+        await asyncio.sleep(0)
+        start = asyncio.get_event_loop().time()
+        await manager.execute_task("b", "search", "AI")
+        elapsed = asyncio.get_event_loop().time() - start
+        await asyncio.gather(*queued)
+
+        assert elapsed < 0.15
+
+    @pytest.mark.asyncio
+    async def test_identical_tasks_coalesced(self):
+        """Concurrent identical tasks share one collection"""
+        manager = self._manager({"a": 0.1})
+
+        results = await asyncio.gather(
+            *(manager.execute_task("a", "search", "AI", max_results=5) for _ in range(3))
+        )
+
+        assert all(result == results[0] for result in results)
+        assert manager.get_stats()["total_tasks"] == 1
+
+    @pytest.mark.asyncio
+    async def test_failure_logged_once(self):
+        """A failed platform is logged by the task runner only"""
+        manager = self._manager({"ok": 0, "broken": None})
+        manager.logger = Mock()
+
+        results = await manager.search_all_platforms("AI", platforms=["ok", "broken"])
+
+        assert results["broken"] == []
+        assert manager.logger.error.call_count == 1
+        manager.logger.warning.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_get_user_data_from_multiple(self):
+        """User data is gathered from every platform"""
+        manager = self._manager({"a": 0, "b": 0})
+
+        results = await manager.get_user_data_from_multiple({"a": "u1", "b": "u2"}, max_posts=5)
+
+        assert results["a"]["profile"]["user_id"] == "u1"
+        assert len(results["b"]["posts"]) == 2
+
+
+def _mock_pooled_playwright():
+    """Build a mocked Playwright whose browsers hand out fresh contexts"""
+    def new_context(**kwargs):
+        context = AsyncMock()
+        context.on = Mock()
+        return context
+
+    browser = AsyncMock()
+    browser.is_connected = Mock(return_value=True)
+    browser.on = Mock()
+    browser.new_context = AsyncMock(side_effect=new_context)
+
+    playwright = AsyncMock()
+    playwright.chromium.launch = AsyncMock(return_value=browser)
+    return playwright
+
+
+class TestBrowserPool:
+    """Tests for BrowserPool"""
+
+    @pytest.mark.asyncio
+    async def test_reuses_idle_context_for_platform(self):
+        """Test that a released context is leased again for the same platform"""
+        pool = BrowserPool(size=1, max_contexts_per_browser=4, max_navigations=10)
+
+        with patch("omnisense.spider.browser_pool.async_playwright") as mock_pw:
+            mock_pw.return_value.start = AsyncMock(return_value=_mock_pooled_playwright())
+
+            lease = await pool.acquire("test", {})
+            assert lease.is_fresh
+            await pool.release(lease)
+
+            again = await pool.acquire("test", {})
+            assert again is lease
+            assert not again.is_fresh
+
+            other = await pool.acquire("other", {})
+            assert other is not lease
+
+        stats = pool.get_stats()
+        assert stats["browsers_launched"] == 1
+        assert stats["contexts_created"] == 2
+        assert stats["contexts_reused"] == 1
+
+    @pytest.mark.asyncio
+    async def test_launches_do_not_block_each_other(self):
+        """Test browsers launch concurrently and an idle context is leased meanwhile"""
+        pool = BrowserPool(size=3, max_contexts_per_browser=4, max_navigations=10)
+        playwright = _mock_pooled_playwright()
+        browser = playwright.chromium.launch.return_value
+        state = {"active": 0, "peak": 0}
+
+        async def launch(**kwargs):
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+            await asyncio.sleep(0.05)
+            state["active"] -= 1
+            return browser
+
+        with patch("omnisense.spider.browser_pool.async_playwright") as mock_pw:
+            mock_pw.return_value.start = AsyncMock(return_value=playwright)
+            idle = await pool.acquire("idle", {})
+            await pool.release(idle)
+            playwright.chromium.launch = AsyncMock(side_effect=launch)
+            browser.is_connected = Mock(return_value=False)
+
+            a, b = [asyncio.ensure_future(pool.acquire(p, {})) for p in ("a", "b")]
+            await asyncio.sleep(0.01)
+            browser.is_connected = Mock(return_value=True)
+            assert await asyncio.wait_for(pool.acquire("idle", {}), 0.02) is idle
+            await asyncio.gather(a, b)
+
+        assert state["peak"] == 2
+        assert sum(slot.active_contexts for slot in pool._slots) == 3
+
+    @pytest.mark.asyncio
+    async def test_recycles_after_max_navigations(self):
+        """Test that contexts are closed once their navigation budget is spent"""
+        pool = BrowserPool(size=1, max_contexts_per_browser=4, max_navigations=2)
+
+        with patch("omnisense.spider.browser_pool.async_playwright") as mock_pw:
+            mock_pw.return_value.start = AsyncMock(return_value=_mock_pooled_playwright())
+
+            lease = await pool.acquire("test", {})
+            lease.record_navigation()
+            lease.record_navigation()
+            await pool.release(lease)
+
+            lease.context.close.assert_called_once()
+            fresh = await pool.acquire("test", {})
+            assert fresh is not lease
+
+    @pytest.mark.asyncio
+    async def test_crashed_context_not_reused(self):
+        """Test that crashed contexts are recycled on release"""
+        pool = BrowserPool(size=1, max_contexts_per_browser=4, max_navigations=10)
+
+        with patch("omnisense.spider.browser_pool.async_playwright") as mock_pw:
+            mock_pw.return_value.start = AsyncMock(return_value=_mock_pooled_playwright())
+
+            async with pool.lease("test", {}) as lease:
+                lease.mark_crashed()
+
+            assert pool.get_stats()["idle_contexts"] == 0
+            assert pool.get_stats()["contexts_recycled"] == 1
+
+    @pytest.mark.asyncio
+    async def test_spider_leases_from_pool(self):
+        """Test that a spider with a pool leases a context instead of launching"""
+        pool = BrowserPool(size=1, max_contexts_per_browser=4, max_navigations=10)
+        spider = MockSpider(platform="test")
+        spider.browser_pool = pool
+
+        with patch("omnisense.spider.browser_pool.async_playwright") as mock_pw:
+            mock_pw.return_value.start = AsyncMock(return_value=_mock_pooled_playwright())
+            spider.helper.apply_stealth_scripts = AsyncMock()
+
+            await spider.start()
+            assert spider._lease is not None
+            assert spider._context is spider._lease.context
+
+            await spider.navigate("https://example.com")
+            assert spider._lease.navigations == 1
+
+            await spider.stop()
+            assert spider._lease is None
+            assert pool.get_stats()["idle_contexts"] == 1
+
+    @pytest.mark.asyncio
+    async def test_manager_pools_by_headless_mode(self):
+        """Test a headed spider does not lease from the headless pool"""
+        pool = BrowserPool(size=1, max_contexts_per_browser=4, max_navigations=10)
+        manager = SpiderManager(browser_pool=pool)
+        manager.register_spider("headless", MockSpider)
+        manager.register_spider("headed", MockSpider)
+
+        headless = await manager.get_spider("headless")
+        headed = await manager.get_spider("headed", headless=False)
+
+        assert headless.browser_pool is pool
+        assert headed.browser_pool is not pool and headed.browser_pool.headless is False
+        assert headed.browser_pool.size == pool.size
+        await manager.close()
+        assert headed.browser_pool._closed
+        assert not pool._closed
+
+    @pytest.mark.asyncio
+    async def test_manager_keeps_process_pools_open(self, monkeypatch):
+        """Test closing a manager leaves the process-wide pools to their other users"""
+        from omnisense.config import config
+        from omnisense.spider.browser_pool import get_browser_pool
+
+        monkeypatch.setattr(config.spider, "browser_pool_enabled", True)
+        manager = SpiderManager()
+        manager.register_spider("headed", MockSpider)
+        headed = await manager.get_spider("headed", headless=False)
+
+        await manager.close()
+
+        assert manager.browser_pool is get_browser_pool() and not manager.browser_pool._closed
+        assert headed.browser_pool is get_browser_pool(False) and not headed.browser_pool._closed
+
+
 class TestPlaywrightHelper:
     """Tests for PlaywrightHelper"""
 
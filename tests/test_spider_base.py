@@ -389,6 +389,327 @@ class TestScreenshot:
         spider._page.screenshot.assert_called_once()
 
 
+class TestTabPool:
+    """Test tab pool and concurrent detail fetching"""
+
+    def _make_spider(self, mock_spider_class, max_pages=3):
+        import asyncio
+
+        class DetailSpider(mock_spider_class):
+            async def get_post_detail(self, post_id: str):
+                page = self._page
+                self.active += 1
+                self.peak = max(self.peak, self.active)
+                await asyncio.sleep(0.01)
+                self.active -= 1
+                return {"post_id": post_id, "page": page}
+
+        def new_page():
+            page = Mock()
+            page.is_closed = Mock(return_value=False)
+            page.close = AsyncMock(side_effect=lambda: page.is_closed.configure_mock(return_value=True))
+            return page
+
+        spider = DetailSpider(platform="test_platform")
+        spider.active = 0
+        spider.peak = 0
+        spider.max_pages = max_pages
+        spider.helper = Mock(apply_stealth_scripts=AsyncMock())
+        spider._context = Mock()
+        spider._context.new_page = AsyncMock(side_effect=new_page)
+        spider._page = AsyncMock()
+        return spider
+
+    @pytest.mark.asyncio
+    async def test_fetch_details_concurrent_in_order(self, mock_spider_class):
+        """Test details are fetched on separate tabs and returned in input order"""
+        spider = self._make_spider(mock_spider_class)
+        ids = [str(i) for i in range(9)]
+
+        results = await spider.fetch_details(ids, concurrency=3)
+
+        assert [r["post_id"] for r in results] == ids
+        assert spider.peak == 3
+        assert spider._context.new_page.await_count == 3
+        assert all(r["page"] is not spider._main_page for r in results)
+        # Outside of a slot the main page is used again
+        assert spider._page is spider._main_page
+
+    @pytest.mark.asyncio
+    async def test_fetch_details_limit_and_filter(self, mock_spider_class):
+        """Test accept filter and limit stop the fetch early"""
+        spider = self._make_spider(mock_spider_class)
+        ids = [str(i) for i in range(20)]
+
+        async def accept(post_id, detail):
+            return int(post_id) % 2 == 0
+
+        results = await spider.fetch_details(ids, concurrency=2, limit=3, accept=accept)
+
+        assert [r["post_id"] for r in results] == ["0", "2", "4"]
+        assert spider.peak <= 2
+
+    @pytest.mark.asyncio
+    async def test_fetch_details_limit_with_tabs_in_flight(self, mock_spider_class):
+        """Test details finishing after the limit are neither accepted nor emitted"""
+        spider = self._make_spider(mock_spider_class)
+        accepted, emitted = [], []
+
+        async def accept(post_id, detail):
+            accepted.append(post_id)
+            return True
+
+        async def emit(item):
+            emitted.append(item["post_id"])
+
+        spider._emit = emit
+        results = await spider.fetch_details([str(i) for i in range(6)], concurrency=3,
+                                             limit=2, accept=accept)
+
+        assert [r["post_id"] for r in results] == accepted == emitted
+        assert len(results) == 2
+
+    @pytest.mark.asyncio
+    async def test_slot_released_after_close(self, mock_spider_class):
+        """Test a tab leased while the pool is closed is closed on release"""
+        spider = self._make_spider(mock_spider_class, max_pages=1)
+
+        async with spider.page_slot() as page:
+            await spider._close_extra_pages()
+
+        page.close.assert_awaited_once()
+        assert spider._idle_pages is None
+
+    @pytest.mark.asyncio
+    async def test_post_ids_and_detail_filter(self, mock_spider_class):
+        """Test list IDs skip collected posts and the filter marks accepted ones"""
+        spider = mock_spider_class(platform="test_platform")
+
+        def element(href):
+            link = Mock(get_attribute=AsyncMock(return_value=href))
+            return Mock(query_selector=AsyncMock(return_value=link))
+
+        collected = {"1"}
+        ids = await spider._extract_post_ids(
+            [element(f"//site/video/{i}") for i in ("1", "2", "2", "3")],
+            lambda url: url.rsplit("/", 1)[-1] if url.startswith("https:") else None,
+            collected,
+        )
+
+        async def match(detail, criteria):
+            return detail["likes"] >= criteria["min_likes"], 0.5
+
+        accept = spider._make_detail_filter({"min_likes": 10}, collected, match)
+        detail = {"likes": 20}
+
+        assert ids == ["2", "3"]
+        assert await accept("2", detail) and detail["match_score"] == 0.5
+        assert not await accept("2", {"likes": 20})
+        assert not await accept("3", {"likes": 1})
+        assert collected == {"1", "2"}
+
+    @pytest.mark.asyncio
+    async def test_close_extra_pages(self, mock_spider_class):
+        """Test stop closes the tabs of the pool"""
+        spider = self._make_spider(mock_spider_class, max_pages=2)
+        await spider.fetch_details(["1", "2"])
+        pages = list(spider._extra_pages)
+
+        await spider._close_extra_pages()
+
+        assert len(pages) == 2
+        for page in pages:
+            page.close.assert_awaited_once()
+        assert spider._extra_pages == []
+
+
+class TestCollectStream:
+    """Test streaming collection"""
+
+    @pytest.mark.asyncio
+    async def test_collect_stream_yields_before_search_returns(self, mock_spider_class):
+        """Test items accepted by fetch_details are yielded while collecting"""
+        import asyncio
+
+        release = asyncio.Event()
+
+        class StreamingSpider(mock_spider_class):
+            async def search(self, keyword: str, max_results: int = 20):
+                results = await self.fetch_details(["1", "2"], concurrency=1)
+                await release.wait()
+                return results + [{"post_id": "3"}]
+
+        spider = StreamingSpider(platform="test_platform")
+        stream = spider.collect_stream(keyword="AI", max_count=10)
+
+        first = await stream.__anext__()
+        assert first["post_id"] == "1"
+        assert not release.is_set()
+
+        release.set()
+        rest = [item["post_id"] async for item in stream]
+        assert rest == ["2", "3"]
+
+    @pytest.mark.asyncio
+    async def test_collect_respects_max_count(self, mock_spider_class):
+        """Test collect() stops at max_count"""
+        class ListSpider(mock_spider_class):
+            async def get_user_posts(self, user_id: str, max_posts: int = 20):
+                return [{"post_id": str(i)} for i in range(10)]
+
+        spider = ListSpider(platform="test_platform")
+
+        items = await spider.collect(user_id="u1", max_count=4)
+
+        assert [item["post_id"] for item in items] == ["0", "1", "2", "3"]
+
+    @pytest.mark.asyncio
+    async def test_collect_requires_target(self, mock_spider_class):
+        """Test collect() without keyword, user or url"""
+        spider = mock_spider_class(platform="test_platform")
+
+        with pytest.raises(ValueError):
+            await spider.collect()
+
+
+class TestResponseCapture:
+    """Test network response capture"""
+
+    def _make_page(self):
+        page = Mock()
+        page.handlers = []
+        page.on = Mock(side_effect=lambda event, handler: page.handlers.append(handler))
+        page.remove_listener = Mock(side_effect=lambda event, handler: page.handlers.remove(handler))
+        return page
+
+    def _make_response(self, url, payload):
+        response = Mock()
+        response.url = url
+        response.status = 200
+        response.json = AsyncMock(return_value=payload)
+        return response
+
+    @pytest.mark.asyncio
+    async def test_capture_matching_responses(self):
+        """Test only matching JSON responses are queued"""
+        from omnisense.spider.utils.response_capture import ResponseCapture
+
+        page = self._make_page()
+        capture = ResponseCapture(page, [r"/api/search"], Mock()).start()
+
+        for handler in list(page.handlers):
+            handler(self._make_response("https://x.com/api/search?q=1", {"items": [1]}))
+            handler(self._make_response("https://x.com/static/app.js", None))
+
+        item = await capture.get(timeout=1)
+        assert item.payload == {"items": [1]}
+        assert await capture.get(timeout=0.05) is None
+
+        await capture.stop()
+        assert page.handlers == []
+
+    @pytest.mark.asyncio
+    async def test_full_queue_waits_for_consumer(self):
+        """Test responses beyond the queue size are kept until drained"""
+        import asyncio
+        from omnisense.spider.utils.response_capture import ResponseCapture
+
+        page = self._make_page()
+        capture = ResponseCapture(page, [r"/api/search"], Mock(), max_queue=2).start()
+
+        for i in range(5):
+            page.handlers[0](self._make_response(f"https://x.com/api/search?p={i}", {"page": i}))
+        await asyncio.sleep(0.05)
+
+        assert [r.payload["page"] async for r in capture.responses(0.1)] == [0, 1, 2, 3, 4]
+        assert capture.captured == 5 and capture.dropped == 0
+        await capture.stop()
+
+    @pytest.mark.asyncio
+    async def test_collect_captured_converts_and_dedups(self, mock_spider_class):
+        """Test captured payloads are converted, de-duplicated and limited"""
+        class CaptureSpider(mock_spider_class):
+            response_patterns = {"search": [r"/api/search"]}
+
+            def convert_response(self, kind, payload):
+                return [{"content_id": i} for i in payload["ids"]]
+
+        spider = CaptureSpider(platform="test_platform")
+        page = self._make_page()
+        spider._page = page
+
+        async with spider.capture_responses("search") as capture:
+            handler = page.handlers[0]
+            handler(self._make_response("https://x.com/api/search?p=1", {"ids": ["a", "b"]}))
+            handler(self._make_response("https://x.com/api/search?p=2", {"ids": ["b", "c", "d"]}))
+            items = await spider.collect_captured(capture, "search", limit=3, idle_timeout=0.1)
+
+        assert [i["content_id"] for i in items] == ["a", "b", "c"]
+        assert page.handlers == []
+
+    @pytest.mark.asyncio
+    async def test_capture_disabled_without_patterns(self, mock_spider_class):
+        """Test capture yields None so callers fall back to the DOM"""
+        spider = mock_spider_class(platform="test_platform")
+        spider._page = self._make_page()
+
+        async with spider.capture_responses("search") as capture:
+            assert capture is None
+            assert await spider.collect_captured(capture, "search") == []
+
+
+class TestBulkExtraction:
+    """Test declarative single-evaluate extraction"""
+
+    def test_normalize_field_spec(self):
+        """Test shorthand, dict and fallback field specs"""
+        from omnisense.spider.utils.playwright_helper import PlaywrightHelper
+
+        normalize = PlaywrightHelper._normalize_field_spec
+
+        assert normalize("h2 a") == [{"selector": "h2 a", "attr": None}]
+        assert normalize("h2 a@href") == [{"selector": "h2 a", "attr": "href"}]
+        assert normalize("@data-id") == [{"selector": None, "attr": "data-id"}]
+        assert normalize(['a[href*="@"]', "img@data-src"]) == [
+            {"selector": 'a[href*="@"]', "attr": None},
+            {"selector": "img", "attr": "data-src"},
+        ]
+        assert normalize({"selector": ".tag", "all": True})[0]["all"] is True
+
+    @pytest.mark.asyncio
+    async def test_extract_items_single_evaluate(self):
+        """Test items are read in one evaluate call and converted in Python"""
+        from omnisense.spider.utils.playwright_helper import PlaywrightHelper
+
+        helper = PlaywrightHelper(Mock())
+        page = AsyncMock()
+        page.evaluate = AsyncMock(return_value=[
+            {"title": "A", "rating": "4.5 out of 5", "prime": True, "price": None},
+            {"title": "B", "rating": "n/a", "prime": False, "price": "$3"},
+        ])
+
+        items = await helper.extract_items(
+            page,
+            ".card",
+            {
+                "title": "h2",
+                "rating": {"selector": ".stars", "convert": lambda t: float(t.split()[0])},
+                "prime": {"selector": ".prime", "type": "exists"},
+                "price": ".price",
+            },
+            limit=2,
+        )
+
+        page.evaluate.assert_awaited_once()
+        root, specs, limit = page.evaluate.call_args[0][1]
+        assert root == ".card" and limit == 2
+        assert specs["prime"][0]["type"] == "exists"
+
+        assert items[0] == {"title": "A", "rating": 4.5, "prime": True}
+        # Failed conversions and missing fields are omitted
+        assert items[1] == {"title": "B", "prime": False, "price": "$3"}
+
+
 class TestAbstractMethods:
     """Test that abstract methods must be implemented"""
 
@@ -0,0 +1,171 @@
+"""
+Tests for the local HNSW vector backend
+Tests upserts, deletes, where filters, snapshots and compaction
+"""
+
+import numpy as np
+import pytest
+
+pytest.importorskip("faiss")
+
+from omnisense.storage.vector_backend import HnswClient, HnswCollection
+from omnisense.storage.vector_db import document_id
+
+
+def _vectors(n, dim=16, seed=0):
+    return np.random.default_rng(seed).standard_normal((n, dim)).astype(np.float32)
+
+
+def _collection(path, **kwargs):
+    options = {"m": 8, "ef_construction": 40, "ef_search": 32, "segment_size": 50, "brute_force_max": 10}
+    options.update(kwargs)
+    return HnswCollection(path, **options)
+
+
+@pytest.fixture
+def collection(temp_dir):
+    collection = _collection(temp_dir / "posts")
+    vectors = _vectors(120)
+    collection.upsert(
+        ids=[f"p{i}" for i in range(120)],
+        embeddings=vectors,
+        documents=[f"post {i} {'football' if i % 2 else 'cooking'}" for i in range(120)],
+        metadatas=[{"platform": "weibo" if i % 3 else "douyin", "likes": i, "hot": i % 10 == 0}
+                   for i in range(120)],
+    )
+    collection.vectors = vectors
+    return collection
+
+
+class TestHnswCollection:
+    """Test the collection API"""
+
+    def test_query_finds_itself(self, collection):
+        """Test each stored vector is its own nearest neighbour across segments"""
+        result = collection.query(query_embeddings=collection.vectors[[3, 70, 119]], n_results=3)
+
+        assert [ids[0] for ids in result["ids"]] == ["p3", "p70", "p119"]
+        assert result["distances"][0][0] == pytest.approx(0, abs=1e-4)
+        assert result["metadatas"][0][0] == {"platform": "douyin", "likes": 3, "hot": False}
+        assert len(collection._segments) == 3 and collection._segments[0].sealed
+
+    def test_upsert_replaces_and_delete(self, collection):
+        """Test replaced and deleted vectors are no longer returned"""
+        collection.upsert(ids=["p3"], embeddings=collection.vectors[[4]], documents=["moved"])
+        collection.delete(ids=["p4"])
+
+        result = collection.query(query_embeddings=collection.vectors[[3, 4]], n_results=2)
+
+        assert collection.count() == 119
+        assert result["ids"][1][0] == "p3" and "p4" not in result["ids"][1]
+        assert "p3" not in result["ids"][0][1:]
+        assert collection.get(ids=["p3"])["documents"] == ["moved"]
+
+    @pytest.mark.parametrize("where, expected", [
+        ({"platform": "douyin"}, lambda i: i % 3 == 0),
+        ({"likes": {"$gte": 100}}, lambda i: i >= 100),
+        ({"hot": True}, lambda i: i % 10 == 0),
+        ({"$and": [{"platform": {"$ne": "douyin"}}, {"likes": {"$in": [1, 2, 3, 4]}}]},
+         lambda i: i in (1, 2, 4)),
+        ({"$or": [{"likes": {"$lt": 2}}, {"likes": {"$gt": 117}}]}, lambda i: i < 2 or i > 117),
+    ])
+    def test_where_filters(self, collection, where, expected):
+        """Test filtered queries, exact and through HNSW, return only matches"""
+        matching = {f"p{i}" for i in range(120) if expected(i)}
+
+        result = collection.query(query_embeddings=collection.vectors[:2], n_results=200, where=where)
+
+        assert set(result["ids"][0]) == matching
+        assert set(collection.get(where=where)["ids"]) == matching
+        assert all(a <= b for a, b in zip(result["distances"][0], result["distances"][0][1:]))
+
+    def test_where_document(self, collection):
+        """Test document substring filters"""
+        result = collection.query(query_embeddings=collection.vectors[:1], n_results=5,
+                                  where_document={"$contains": "football"})
+
+        assert len(result["ids"][0]) == 5
+        assert all(int(id_[1:]) % 2 for id_ in result["ids"][0])
+
+    def test_snapshot_and_reopen(self, collection, temp_dir):
+        """Test a snapshot survives reopening, unsnapshotted writes do not"""
+        collection.delete(ids=["p0"])
+        collection.snapshot()
+        collection.upsert(ids=["lost"], embeddings=_vectors(1, seed=9), metadatas=[{"lang": "en"}])
+        collection.db.close()
+
+        reopened = _collection(temp_dir / "posts")
+        result = reopened.query(query_embeddings=collection.vectors[[0, 55]], n_results=1)
+
+        assert reopened.count() == 119
+        assert reopened.get(ids=["lost"])["ids"] == []
+        assert result["ids"][0][0] != "p0" and result["ids"][1][0] == "p55"
+        assert len(list((temp_dir / "posts").glob("segment_*.faiss"))) == 3
+        reopened.upsert(ids=["kept"], embeddings=_vectors(1, seed=9), metadatas=[{"lang": "en"}])
+        assert reopened.get(where={"lang": "en"})["ids"] == ["kept"]
+
+    def test_compact(self, collection, temp_dir):
+        """Test compaction drops tombstones and keeps every live vector"""
+        collection.delete(where={"platform": "douyin"})
+        collection.compact()
+
+        assert sum(segment.size for segment in collection._segments) == 80
+        result = collection.query(query_embeddings=collection.vectors[[1, 119]], n_results=1)
+        assert [ids[0] for ids in result["ids"]] == ["p1", "p119"]
+
+        collection.db.close()
+        assert _collection(temp_dir / "posts").count() == 80
+
+
+class _Embeddings:
+    def encode(self, texts):
+        return np.stack([_vectors(1, seed=len(text))[0] for text in texts])
+
+
+class TestHnswClient:
+    """Test the client and its use by VectorDatabase"""
+
+    def test_collections(self, temp_dir):
+        """Test collections are created, reopened and deleted"""
+        client = HnswClient(temp_dir, segment_size=50)
+        client.get_or_create_collection("a").upsert(ids=["x"], embeddings=_vectors(1))
+        client.close()
+
+        client = HnswClient(temp_dir, segment_size=50)
+        assert client.get_collection("a").count() == 1
+        client.delete_collection("a")
+        with pytest.raises(ValueError):
+            client.get_collection("a")
+        with pytest.raises(ValueError):
+            client.get_or_create_collection("../escape")
+
+    def test_vector_database_backend(self, temp_dir, monkeypatch):
+        """Test VectorDatabase searches through the local backend"""
+        from omnisense.config import config
+        from omnisense.storage.vector_db import VectorDatabase
+
+        monkeypatch.setattr(config.database, "vector_path", str(temp_dir / "vectors"))
+        db = VectorDatabase(embedding_service=_Embeddings(), backend="hnsw")
+        db.index_documents("posts", [{"text": "a" * n, "platform": "weibo"} for n in range(1, 20)])
+
+        results = db.search_many("posts", ["a" * 7], top_k=1, threshold=0.99)
+
+        assert results[0][0]["document"] == "a" * 7
+        assert db.get_collection_stats("posts")["count"] == 19
+        db.close()
+
+    def test_vector_database_writes_persist(self, temp_dir, monkeypatch):
+        """Test added and deleted documents survive without an explicit close"""
+        from omnisense.config import config
+        from omnisense.storage.vector_db import VectorDatabase
+
+        monkeypatch.setattr(config.database, "vector_path", str(temp_dir / "vectors"))
+        db = VectorDatabase(embedding_service=_Embeddings(), backend="hnsw")
+        db.add_documents("posts", ["a" * n for n in range(1, 11)])
+        db.delete_documents("posts", ids=[document_id("a")])
+
+        reopened = VectorDatabase(embedding_service=_Embeddings(), backend="hnsw")
+
+        assert reopened.get_collection_stats("posts")["count"] == 9
+        db.close()
+        reopened.close()
@@ -0,0 +1,86 @@
+"""
+Tests for the vector database
+Tests batched ingestion and multi-query search
+"""
+
+import zlib
+
+import numpy as np
+import pytest
+
+pytest.importorskip("chromadb")
+
+from omnisense.config import config
+from omnisense.storage.vector_db import VectorDatabase, document_id
+
+
+class FakeEmbeddingService:
+    """Bag-of-words vectors; records the size of every encode call"""
+
+    def __init__(self):
+        self.calls = []
+
+    def encode(self, texts):
+        self.calls.append(len(texts))
+        vectors = np.zeros((len(texts), 32), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for word in text.lower().split():
+                vectors[row, zlib.crc32(word.encode()) % 32] += 1
+        return vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-9)
+
+
+@pytest.fixture
+def db(temp_dir, monkeypatch):
+    monkeypatch.setattr(config.database, "chroma_path", str(temp_dir / "chroma"))
+    return VectorDatabase(embedding_service=FakeEmbeddingService(), batch_size=3)
+
+
+class TestVectorDatabase:
+    """Test batched ingestion and search"""
+
+    def test_content_hash_ids_upsert(self, db):
+        """Test re-adding documents updates them instead of colliding"""
+        ids = db.add_documents("comments", ["great video", "bad audio"])
+        again = db.add_documents("comments", ["great   video", "new comment"],
+                                 metadatas=[{"likes": 3}, {"likes": 1}])
+
+        assert ids[0] == again[0] == document_id("great video")
+        assert db.get_collection_stats("comments")["count"] == 3
+
+    def test_batches_and_duplicates(self, db):
+        """Test writes are chunked and repeated texts in a batch are merged"""
+        texts = ["same text"] * 4 + [f"comment {i}" for i in range(5)]
+        db.add_documents("comments", texts)
+
+        assert db.embedding_service.calls == [1, 3, 3]
+        assert db.get_collection_stats("comments")["count"] == 6
+
+    def test_index_documents_streams(self, db):
+        """Test a generator is indexed batch by batch with progress"""
+        progress = []
+
+        def rows():
+            for i in range(7):
+                yield {"id": i, "text": f"football match {i}", "platform": "weibo", "tags": ["x"]}
+            yield {"text": ""}
+
+        indexed = db.index_documents("posts", rows(), progress=progress.append)
+
+        assert indexed == 7 and progress == [3, 6, 7]
+        result = db.client.get_collection("posts").get(ids=["0"])
+        assert result["metadatas"][0] == {"platform": "weibo"}
+
+    def test_search_many(self, db):
+        """Test many queries are embedded once and answered together"""
+        db.add_documents("posts", ["football match tonight", "pasta recipe garlic",
+                                   "football league goal"])
+        db.embedding_service.calls.clear()
+
+        results = db.search_many("posts", ["football goal", "garlic pasta", "zzz"],
+                                 top_k=2, threshold=0.3)
+
+        assert db.embedding_service.calls == [3]
+        assert results[0][0]["document"] == "football league goal"
+        assert results[1][0]["document"] == "pasta recipe garlic"
+        assert results[2] == []
+        assert db.semantic_search("posts", "garlic pasta", top_k=2, threshold=0.3) == results[1]